@@ -0,0 +1,21 @@
+"""Add sha256 checksum to files for ETag support
+
+Revision ID: 078
+Revises: 077
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "078"
+down_revision = "077"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("files", sa.Column("checksum", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("files", "checksum")
@@ -0,0 +1,41 @@
+"""Add llm_response_cache table for content-addressed AI analysis results
+
+Revision ID: 079
+Revises: 078
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "079"
+down_revision = "078"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("cache_key", sa.String(64), primary_key=True),
+        sa.Column("file_sha256", sa.String(64), nullable=False),
+        sa.Column("analysis_type", sa.String(50), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("prompt_version", sa.String(16), nullable=False),
+        sa.Column("language", sa.String(10), nullable=True),
+        sa.Column("response", JSONB, nullable=False),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("last_accessed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_llm_response_cache_file_sha256", "llm_response_cache", ["file_sha256"])
+    op.create_index("ix_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"])
+    op.create_index("ix_llm_response_cache_last_accessed_at", "llm_response_cache", ["last_accessed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_response_cache_last_accessed_at", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_expires_at", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_file_sha256", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
@@ -0,0 +1,39 @@
+"""Add collaborative_document_updates for incremental Yjs persistence
+
+Revision ID: 080
+Revises: 079
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "080"
+down_revision = "079"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "collaborative_document_updates",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "document_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("collaborative_documents.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("update", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_collaborative_document_updates_document_id",
+        "collaborative_document_updates",
+        ["document_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_collaborative_document_updates_document_id", table_name="collaborative_document_updates")
+    op.drop_table("collaborative_document_updates")
@@ -0,0 +1,60 @@
+"""Add composite and partial indexes for hot query paths
+
+Revision ID: 081
+Revises: 080
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '081'
+down_revision: Union[str, None] = '080'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    # Notification list: WHERE user_id = ? ORDER BY created_at DESC
+    ("ix_notifications_user_created", "notifications", ["user_id", "created_at"], None),
+    # Unread badge and mark-all-read only ever touch unread rows
+    ("ix_notifications_user_unread", "notifications", ["user_id", "created_at"], "is_read = false"),
+    # Audit trail and daily summaries: WHERE project_id = ? AND created_at range
+    ("ix_audit_logs_project_created", "audit_logs", ["project_id", "created_at"], None),
+    # Version history: WHERE entity_type = ? AND entity_id = ? ORDER BY version_number DESC
+    ("ix_entity_versions_entity_version", "entity_versions", ["entity_type", "entity_id", "version_number"], None),
+    # "My projects" lookups; unique_project_member only serves project_id-first lookups
+    ("ix_project_members_user_id", "project_members", ["user_id"], None),
+]
+
+# Single-column indexes made redundant by a composite above that leads with the same column(s)
+SUPERSEDED = [
+    ("ix_notifications_user_id", "notifications", ["user_id"]),
+    ("ix_audit_logs_project_id", "audit_logs", ["project_id"]),
+    ("ix_entity_versions_entity", "entity_versions", ["entity_type", "entity_id"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps these large tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+        for name, table, _ in SUPERSEDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,37 @@
+"""Add user_inbox_counts for O(1) inbox badge counts
+
+Revision ID: 082
+Revises: 081
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "082"
+down_revision = "081"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_inbox_counts",
+        sa.Column(
+            "user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("approval_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("task_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rfi_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("meeting_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("defect_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("valid_until", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_inbox_counts")
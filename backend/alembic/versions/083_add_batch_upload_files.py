@@ -0,0 +1,44 @@
+"""Add batch_upload_files for resumable chunked batch uploads
+
+Revision ID: 083
+Revises: 082
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "083"
+down_revision = "082"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("batch_uploads", sa.Column("entity_type", sa.String(50), nullable=True))
+    op.add_column("batch_uploads", sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=True))
+
+    op.create_table(
+        "batch_upload_files",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("batch_upload_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("batch_uploads.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("content_type", sa.String(100), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("received_bytes", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("chunk_sizes", postgresql.JSON(), nullable=False),
+        sa.Column("sha256", sa.String(64), nullable=True),
+        sa.Column("storage_path", sa.String(500), nullable=False),
+        sa.Column("status", sa.String(20), server_default="pending", nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_batch_upload_files_batch_upload_id", "batch_upload_files", ["batch_upload_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_batch_upload_files_batch_upload_id", table_name="batch_upload_files")
+    op.drop_table("batch_upload_files")
+    op.drop_column("batch_uploads", "entity_id")
+    op.drop_column("batch_uploads", "entity_type")
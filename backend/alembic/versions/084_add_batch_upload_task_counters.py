@@ -0,0 +1,25 @@
+"""Add processing task counters to batch_uploads
+
+Revision ID: 084
+Revises: 083
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "084"
+down_revision = "083"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("batch_uploads", sa.Column("total_tasks", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("batch_uploads", sa.Column("completed_tasks", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("batch_uploads", sa.Column("failed_tasks", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("batch_uploads", "failed_tasks")
+    op.drop_column("batch_uploads", "completed_tasks")
+    op.drop_column("batch_uploads", "total_tasks")
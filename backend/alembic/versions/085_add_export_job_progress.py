@@ -0,0 +1,28 @@
+"""Add per-file progress and resume checkpoint to export_jobs
+
+Revision ID: 085
+Revises: 084
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "085"
+down_revision = "084"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("export_jobs", sa.Column("files_total", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("export_jobs", sa.Column("files_processed", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("export_jobs", sa.Column("bytes_written", sa.BigInteger(), server_default="0", nullable=False))
+    op.add_column("export_jobs", sa.Column("checkpoint", postgresql.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("export_jobs", "checkpoint")
+    op.drop_column("export_jobs", "bytes_written")
+    op.drop_column("export_jobs", "files_processed")
+    op.drop_column("export_jobs", "files_total")
@@ -0,0 +1,64 @@
+"""Add analytics_rollups for pre-aggregated dashboard counts
+
+Revision ID: 086
+Revises: 085
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "086"
+down_revision = "085"
+branch_labels = None
+depends_on = None
+
+# entity type -> (table, project column, {dimension: column})
+SOURCES = {
+    "project": ("projects", "id", {"status": "status"}),
+    "equipment": ("equipment", "project_id", {"status": "status"}),
+    "material": ("materials", "project_id", {"status": "status"}),
+    "inspection": ("inspections", "project_id", {"status": "status"}),
+    "rfi": ("rfis", "project_id", {"status": "status", "priority": "priority", "category": "category"}),
+    "defect": ("defects", "project_id", {"status": "status", "severity": "severity", "category": "category"}),
+    "task": ("tasks", "project_id", {"status": "status", "priority": "priority"}),
+    "budget": ("budget_line_items", "project_id", {"category": "category"}),
+    "checklist": ("checklist_instances", "project_id", {"status": "status"}),
+    "area": ("construction_areas", "project_id", {"status": "status"}),
+    "approval": ("approval_requests", "project_id", {"status": "current_status"}),
+    "meeting": ("meetings", "project_id", {"status": "status"}),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_rollups",
+        sa.Column(
+            "project_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("entity_type", sa.String(50), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("dimension", sa.String(50), primary_key=True),
+        sa.Column("value", sa.String(100), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_analytics_rollups_entity_day", "analytics_rollups", ["entity_type", "day"])
+
+    for entity_type, (table, project_column, dimensions) in SOURCES.items():
+        buckets = [("total", "''", "")]
+        buckets += [(dimension, f"COALESCE({column}, '')", f", COALESCE({column}, '')") for dimension, column in dimensions.items()]
+        for dimension, value, grouping in buckets:
+            op.execute(
+                f"INSERT INTO analytics_rollups (project_id, entity_type, day, dimension, value, count) "
+                f"SELECT {project_column}, '{entity_type}', date(created_at), '{dimension}', {value}, count(*) "
+                f"FROM {table} WHERE {project_column} IS NOT NULL AND created_at IS NOT NULL "
+                f"GROUP BY {project_column}, date(created_at){grouping}"
+            )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analytics_rollups_entity_day", table_name="analytics_rollups")
+    op.drop_table("analytics_rollups")
@@ -0,0 +1,33 @@
+"""Unique ACC issue id on rfis and an ACC sync watermark per project link
+
+Revision ID: 087
+Revises: 086
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "087"
+down_revision = "086"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("acc_project_links", sa.Column("acc_sync_watermark", sa.DateTime(), nullable=True))
+    # Earlier syncs could import the same ACC issue twice; keep the most recently updated
+    # copy linked and detach the others (they stay as local RFIs) so the index can be built
+    op.execute(
+        "UPDATE rfis SET acc_rfi_id = NULL, sync_status = 'not_synced' WHERE id IN ("
+        "SELECT id FROM (SELECT id, row_number() OVER ("
+        "PARTITION BY acc_rfi_id ORDER BY updated_at DESC NULLS LAST, created_at DESC, id"
+        ") AS copy FROM rfis WHERE acc_rfi_id IS NOT NULL) AS linked WHERE copy > 1)"
+    )
+    op.drop_index("ix_rfis_acc_rfi_id", table_name="rfis")
+    op.create_index("uq_rfis_acc_rfi_id", "rfis", ["acc_rfi_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_rfis_acc_rfi_id", table_name="rfis")
+    op.create_index("ix_rfis_acc_rfi_id", "rfis", ["acc_rfi_id"])
+    op.drop_column("acc_project_links", "acc_sync_watermark")
@@ -1,18 +1,20 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.metrics import metrics
 from app.core.security import get_current_admin_user
 from app.db.session import get_db
 from app.models.project import Project, ProjectMember
 from app.models.user import User
 from app.schemas.project import ProjectResponse
 from app.schemas.user import UserResponse
+from app.services.llm_cache_service import get_llm_cache
 
 
 class AdminUserUpdate(BaseModel):
@@ -67,3 +69,23 @@ async def list_all_projects(
         .order_by(Project.created_at.desc())
     )
     return result.scalars().all()
+
+
+@router.get("/metrics")
+async def get_metrics(
+    admin: User = Depends(get_current_admin_user),
+):
+    return metrics.snapshot()
+
+
+@router.delete("/llm-cache")
+async def invalidate_llm_cache(
+    file_sha256: Optional[str] = Query(default=None, pattern="^[0-9a-f]{64}$"),
+    analysis_type: Optional[str] = Query(default=None, max_length=50),
+    admin: User = Depends(get_current_admin_user),
+):
+    cache = get_llm_cache()
+    if cache is None:
+        return {"deleted": 0}
+    deleted = await cache.invalidate(file_hash=file_sha256, analysis_type=analysis_type)
+    return {"deleted": deleted}
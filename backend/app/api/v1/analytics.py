@@ -2,22 +2,18 @@ from datetime import datetime, timedelta
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from sqlalchemy import Date, case, cast, func, select
+from sqlalchemy import Date, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
-from app.db.session import get_db
-from app.models.approval import ApprovalRequest
+from app.db.session import get_read_db
 from app.models.area import ConstructionArea
 from app.models.audit import AuditLog
-from app.models.equipment import ApprovalStatus, Equipment
+from app.models.equipment import ApprovalStatus
 from app.models.equipment_template import EquipmentApprovalSubmission
-from app.models.defect import Defect
-from app.models.inspection import Inspection, InspectionStatus
-from app.models.material import Material
+from app.models.inspection import InspectionStatus
 from app.models.material_template import MaterialApprovalSubmission
-from app.models.meeting import Meeting
-from app.models.project import Project, ProjectMember, ProjectStatus
+from app.models.project import ProjectMember, ProjectStatus
 from app.models.rfi import RFI, RFIStatus
 from app.models.user import User
 from app.schemas.analytics import (
@@ -30,16 +26,25 @@ from app.schemas.analytics import (
     TrendDataPoint,
     WeeklyActivityPoint,
 )
+from app.services.analytics_rollup_service import TOTAL_DIMENSION, daily_totals, rollup_counts, total
 from app.utils import utcnow
 
 router = APIRouter()
 
 
+def _distribution(counts: dict, entity_type: str, dimension: str) -> list[DistributionItem]:
+    return [
+        DistributionItem(label=label, value=value)
+        for label, value in counts[(entity_type, dimension)].items()
+        if label
+    ]
+
+
 @router.get("/metrics", response_model=MetricsResponse)
 async def get_analytics_metrics(
     start_date: str = Query(None, description="Start date in ISO format (YYYY-MM-DD)"),
     end_date: str = Query(None, description="End date in ISO format (YYYY-MM-DD)"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get overall analytics metrics (KPIs) for the dashboard"""
@@ -56,122 +61,44 @@ async def get_analytics_metrics(
 
     accessible_projects = select(ProjectMember.project_id).where(
         ProjectMember.user_id == current_user.id
-    ).scalar_subquery()
+    )
 
-    # Get project counts
-    project_query = select(
-        func.count().label('total'),
-        func.sum(case((Project.status == ProjectStatus.ACTIVE.value, 1), else_=0)).label('active')
-    ).where(Project.id.in_(accessible_projects))
-    if date_filter_start:
-        project_query = project_query.where(Project.created_at >= date_filter_start)
-    if date_filter_end:
-        project_query = project_query.where(Project.created_at <= date_filter_end)
-
-    project_result = await db.execute(project_query)
-    project_counts = project_result.first()
-
-    # Get inspection counts
-    inspection_query = select(
-        func.count().label('total'),
-        func.sum(case((Inspection.status == InspectionStatus.PENDING.value, 1), else_=0)).label('pending'),
-        func.sum(case((Inspection.status == InspectionStatus.COMPLETED.value, 1), else_=0)).label('completed')
-    ).where(Inspection.project_id.in_(accessible_projects))
-    if date_filter_start:
-        inspection_query = inspection_query.where(Inspection.created_at >= date_filter_start)
-    if date_filter_end:
-        inspection_query = inspection_query.where(Inspection.created_at <= date_filter_end)
-
-    inspection_result = await db.execute(inspection_query)
-    inspection_counts = inspection_result.first()
-
-    # Get equipment counts
-    equipment_query = select(
-        func.count().label('total'),
-        func.sum(case((Equipment.status == ApprovalStatus.APPROVED.value, 1), else_=0)).label('approved')
-    ).where(Equipment.project_id.in_(accessible_projects))
-    if date_filter_start:
-        equipment_query = equipment_query.where(Equipment.created_at >= date_filter_start)
-    if date_filter_end:
-        equipment_query = equipment_query.where(Equipment.created_at <= date_filter_end)
-
-    equipment_result = await db.execute(equipment_query)
-    equipment_counts = equipment_result.first()
-
-    # Get material counts
-    material_query = select(
-        func.count().label('total'),
-        func.sum(case((Material.status == ApprovalStatus.APPROVED.value, 1), else_=0)).label('approved')
-    ).where(Material.project_id.in_(accessible_projects))
-    if date_filter_start:
-        material_query = material_query.where(Material.created_at >= date_filter_start)
-    if date_filter_end:
-        material_query = material_query.where(Material.created_at <= date_filter_end)
-
-    material_result = await db.execute(material_query)
-    material_counts = material_result.first()
-
-    # Get meeting counts
-    meeting_query = select(func.count()).where(Meeting.project_id.in_(accessible_projects))
-    if date_filter_start:
-        meeting_query = meeting_query.where(Meeting.created_at >= date_filter_start)
-    if date_filter_end:
-        meeting_query = meeting_query.where(Meeting.created_at <= date_filter_end)
-
-    meeting_result = await db.execute(meeting_query)
-    total_meetings = meeting_result.scalar() or 0
-
-    # Get RFI counts
-    rfi_query = select(
-        func.count().label('total'),
-        func.sum(case((RFI.status == RFIStatus.OPEN.value, 1), else_=0)).label('open'),
-        func.sum(case((RFI.status == RFIStatus.CLOSED.value, 1), else_=0)).label('closed')
-    ).where(RFI.project_id.in_(accessible_projects))
-    if date_filter_start:
-        rfi_query = rfi_query.where(RFI.created_at >= date_filter_start)
-    if date_filter_end:
-        rfi_query = rfi_query.where(RFI.created_at <= date_filter_end)
-
-    rfi_result = await db.execute(rfi_query)
-    rfi_counts = rfi_result.first()
-
-    # Get approval request counts
-    approval_query = select(
-        func.count().label('total'),
-        func.sum(case((ApprovalRequest.current_status == "pending", 1), else_=0)).label('pending'),
-        func.sum(case((ApprovalRequest.current_status == "approved", 1), else_=0)).label('approved')
-    ).where(ApprovalRequest.project_id.in_(accessible_projects))
-    if date_filter_start:
-        approval_query = approval_query.where(ApprovalRequest.created_at >= date_filter_start)
-    if date_filter_end:
-        approval_query = approval_query.where(ApprovalRequest.created_at <= date_filter_end)
-
-    approval_result = await db.execute(approval_query)
-    approval_counts = approval_result.first()
+    counts = await rollup_counts(
+        db, accessible_projects,
+        ["project", "inspection", "equipment", "material", "meeting", "rfi", "approval"],
+        [TOTAL_DIMENSION, "status"],
+        start=date_filter_start.date() if date_filter_start else None,
+        end=date_filter_end.date() if date_filter_end else None,
+    )
+
+    def status_count(entity_type: str, status: str) -> int:
+        return counts[(entity_type, "status")].get(status, 0)
 
     # Calculate approval rate (equipment + materials)
-    total_approval_items = (equipment_counts.total or 0) + (material_counts.total or 0)
-    total_approved_items = (equipment_counts.approved or 0) + (material_counts.approved or 0)
+    total_approval_items = total(counts, "equipment") + total(counts, "material")
+    total_approved_items = (
+        status_count("equipment", ApprovalStatus.APPROVED.value) + status_count("material", ApprovalStatus.APPROVED.value)
+    )
     approval_rate = (total_approved_items / total_approval_items * 100) if total_approval_items > 0 else 0.0
 
     return MetricsResponse(
-        total_projects=project_counts.total or 0,
-        active_projects=project_counts.active or 0,
-        total_inspections=inspection_counts.total or 0,
-        pending_inspections=inspection_counts.pending or 0,
-        completed_inspections=inspection_counts.completed or 0,
-        total_equipment=equipment_counts.total or 0,
-        approved_equipment=equipment_counts.approved or 0,
-        total_materials=material_counts.total or 0,
-        approved_materials=material_counts.approved or 0,
-        total_meetings=total_meetings,
+        total_projects=total(counts, "project"),
+        active_projects=status_count("project", ProjectStatus.ACTIVE.value),
+        total_inspections=total(counts, "inspection"),
+        pending_inspections=status_count("inspection", InspectionStatus.PENDING.value),
+        completed_inspections=status_count("inspection", InspectionStatus.COMPLETED.value),
+        total_equipment=total(counts, "equipment"),
+        approved_equipment=status_count("equipment", ApprovalStatus.APPROVED.value),
+        total_materials=total(counts, "material"),
+        approved_materials=status_count("material", ApprovalStatus.APPROVED.value),
+        total_meetings=total(counts, "meeting"),
         approval_rate=round(approval_rate, 2),
-        total_rfis=rfi_counts.total or 0,
-        open_rfis=rfi_counts.open or 0,
-        closed_rfis=rfi_counts.closed or 0,
-        total_approvals=approval_counts.total or 0,
-        pending_approvals=approval_counts.pending or 0,
-        approved_approvals=approval_counts.approved or 0,
+        total_rfis=total(counts, "rfi"),
+        open_rfis=status_count("rfi", RFIStatus.OPEN.value),
+        closed_rfis=status_count("rfi", RFIStatus.CLOSED.value),
+        total_approvals=total(counts, "approval"),
+        pending_approvals=status_count("approval", "pending"),
+        approved_approvals=status_count("approval", "approved"),
     )
 
 
@@ -179,7 +106,7 @@ async def get_analytics_metrics(
 async def get_project_trends(
     start_date: str = Query(None, description="Start date in ISO format (YYYY-MM-DD)"),
     end_date: str = Query(None, description="End date in ISO format (YYYY-MM-DD)"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get time series data for project trends (line/bar chart)"""
@@ -213,10 +140,18 @@ async def get_project_trends(
                 q = q.where(f)
         return q.group_by(cast(date_col, Date))
 
-    inspection_q = build_daily_count(Inspection, Inspection.created_at)
-    equipment_q = build_daily_count(Equipment, Equipment.created_at)
-    material_q = build_daily_count(Material, Material.created_at)
-    rfi_created_q = build_daily_count(RFI, RFI.created_at)
+    created = await daily_totals(
+        db, accessible_projects, ["inspection", "equipment", "material", "rfi"],
+        start=start_datetime.date(), end=end_datetime.date(),
+    )
+    results = {
+        key: {str(day): count for day, count in created[entity_type].items()}
+        for key, entity_type in [
+            ("inspections", "inspection"), ("equipment", "equipment"),
+            ("materials", "material"), ("rfi_created", "rfi"),
+        ]
+    }
+
     rfi_closed_q = build_daily_count(RFI, RFI.updated_at, [RFI.status == RFIStatus.CLOSED.value])
 
     equip_sub_q = build_daily_count(EquipmentApprovalSubmission, EquipmentApprovalSubmission.submitted_at)
@@ -232,10 +167,7 @@ async def get_project_trends(
         [MaterialApprovalSubmission.status.in_(decided_statuses)],
     )
 
-    results = {}
     for key, q in [
-        ("inspections", inspection_q), ("equipment", equipment_q),
-        ("materials", material_q), ("rfi_created", rfi_created_q),
         ("rfi_closed", rfi_closed_q), ("equip_sub", equip_sub_q),
         ("mat_sub", mat_sub_q), ("equip_dec", equip_dec_q), ("mat_dec", mat_dec_q),
     ]:
@@ -265,7 +197,7 @@ async def get_project_trends(
 async def get_distributions(
     start_date: str = Query(None, description="Start date in ISO format (YYYY-MM-DD)"),
     end_date: str = Query(None, description="End date in ISO format (YYYY-MM-DD)"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get distribution data for pie/donut charts"""
@@ -282,120 +214,30 @@ async def get_distributions(
 
     accessible_projects = select(ProjectMember.project_id).where(
         ProjectMember.user_id == current_user.id
-    ).scalar_subquery()
-
-    # Get inspection status distribution
-    inspection_query = select(Inspection.status, func.count(Inspection.id).label('count')).where(
-        Inspection.project_id.in_(accessible_projects)
-    )
-    if date_filter_start:
-        inspection_query = inspection_query.where(Inspection.created_at >= date_filter_start)
-    if date_filter_end:
-        inspection_query = inspection_query.where(Inspection.created_at <= date_filter_end)
-    inspection_query = inspection_query.group_by(Inspection.status)
-
-    inspection_result = await db.execute(inspection_query)
-    inspection_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in inspection_result.all()
-    ]
-
-    # Get equipment status distribution
-    equipment_query = select(Equipment.status, func.count(Equipment.id).label('count')).where(
-        Equipment.project_id.in_(accessible_projects)
     )
-    if date_filter_start:
-        equipment_query = equipment_query.where(Equipment.created_at >= date_filter_start)
-    if date_filter_end:
-        equipment_query = equipment_query.where(Equipment.created_at <= date_filter_end)
-    equipment_query = equipment_query.group_by(Equipment.status)
-
-    equipment_result = await db.execute(equipment_query)
-    equipment_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in equipment_result.all()
-    ]
 
-    # Get material status distribution
-    material_query = select(Material.status, func.count(Material.id).label('count')).where(
-        Material.project_id.in_(accessible_projects)
+    counts = await rollup_counts(
+        db, accessible_projects,
+        ["inspection", "equipment", "material", "project", "rfi", "approval"],
+        ["status"],
+        start=date_filter_start.date() if date_filter_start else None,
+        end=date_filter_end.date() if date_filter_end else None,
     )
-    if date_filter_start:
-        material_query = material_query.where(Material.created_at >= date_filter_start)
-    if date_filter_end:
-        material_query = material_query.where(Material.created_at <= date_filter_end)
-    material_query = material_query.group_by(Material.status)
-
-    material_result = await db.execute(material_query)
-    material_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in material_result.all()
-    ]
-
-    # Get project status distribution
-    project_query = select(Project.status, func.count(Project.id).label('count')).where(
-        Project.id.in_(accessible_projects)
-    )
-    if date_filter_start:
-        project_query = project_query.where(Project.created_at >= date_filter_start)
-    if date_filter_end:
-        project_query = project_query.where(Project.created_at <= date_filter_end)
-    project_query = project_query.group_by(Project.status)
-
-    project_result = await db.execute(project_query)
-    project_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in project_result.all()
-    ]
-
-    # Get RFI status distribution
-    rfi_query = select(RFI.status, func.count(RFI.id).label('count')).where(
-        RFI.project_id.in_(accessible_projects)
-    )
-    if date_filter_start:
-        rfi_query = rfi_query.where(RFI.created_at >= date_filter_start)
-    if date_filter_end:
-        rfi_query = rfi_query.where(RFI.created_at <= date_filter_end)
-    rfi_query = rfi_query.group_by(RFI.status)
-
-    rfi_result = await db.execute(rfi_query)
-    rfi_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in rfi_result.all()
-    ]
-
-    # Get approval status distribution
-    approval_query = select(
-        ApprovalRequest.current_status, func.count(ApprovalRequest.id).label('count')
-    ).where(
-        ApprovalRequest.project_id.in_(accessible_projects)
-    )
-    if date_filter_start:
-        approval_query = approval_query.where(ApprovalRequest.created_at >= date_filter_start)
-    if date_filter_end:
-        approval_query = approval_query.where(ApprovalRequest.created_at <= date_filter_end)
-    approval_query = approval_query.group_by(ApprovalRequest.current_status)
-
-    approval_result = await db.execute(approval_query)
-    approval_distribution = [
-        DistributionItem(label=row.current_status, value=row.count)
-        for row in approval_result.all()
-    ]
 
     return DistributionsResponse(
-        inspection_status=inspection_distribution,
-        equipment_status=equipment_distribution,
-        material_status=material_distribution,
-        project_status=project_distribution,
-        rfi_status=rfi_distribution,
-        approval_status=approval_distribution,
+        inspection_status=_distribution(counts, "inspection", "status"),
+        equipment_status=_distribution(counts, "equipment", "status"),
+        material_status=_distribution(counts, "material", "status"),
+        project_status=_distribution(counts, "project", "status"),
+        rfi_status=_distribution(counts, "rfi", "status"),
+        approval_status=_distribution(counts, "approval", "status"),
     )
 
 
 @router.get("/projects/{project_id}/dashboard-stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
     project_id: UUID = Path(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     membership = await db.execute(
@@ -407,55 +249,14 @@ async def get_dashboard_stats(
     if not membership.scalars().first() and not current_user.is_super_admin:
         raise HTTPException(status_code=403, detail="Not a project member")
 
-    equip_result = await db.execute(
-        select(Equipment.status, func.count(Equipment.id).label("count"))
-        .where(Equipment.project_id == project_id)
-        .group_by(Equipment.status)
+    counts = await rollup_counts(
+        db, [project_id], ["equipment", "material", "rfi", "approval", "defect"], ["status", "severity"],
     )
-    equipment_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in equip_result.all()
-    ]
-
-    mat_result = await db.execute(
-        select(Material.status, func.count(Material.id).label("count"))
-        .where(Material.project_id == project_id)
-        .group_by(Material.status)
-    )
-    material_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in mat_result.all()
-    ]
-
-    rfi_result = await db.execute(
-        select(RFI.status, func.count(RFI.id).label("count"))
-        .where(RFI.project_id == project_id)
-        .group_by(RFI.status)
-    )
-    rfi_distribution = [
-        DistributionItem(label=row.status, value=row.count)
-        for row in rfi_result.all()
-    ]
-
-    approval_result = await db.execute(
-        select(ApprovalRequest.current_status, func.count(ApprovalRequest.id).label("count"))
-        .where(ApprovalRequest.project_id == project_id)
-        .group_by(ApprovalRequest.current_status)
-    )
-    approval_distribution = [
-        DistributionItem(label=row.current_status, value=row.count)
-        for row in approval_result.all()
-    ]
-
-    defect_severity_result = await db.execute(
-        select(Defect.severity, func.count(Defect.id).label("count"))
-        .where(Defect.project_id == project_id)
-        .group_by(Defect.severity)
-    )
-    findings_severity = [
-        DistributionItem(label=row.severity, value=row.count)
-        for row in defect_severity_result.all()
-    ]
+    equipment_distribution = _distribution(counts, "equipment", "status")
+    material_distribution = _distribution(counts, "material", "status")
+    rfi_distribution = _distribution(counts, "rfi", "status")
+    approval_distribution = _distribution(counts, "approval", "status")
+    findings_severity = _distribution(counts, "defect", "severity")
 
     today = utcnow().date()
     start_date = today - timedelta(days=13)
@@ -9,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user, verify_project_access
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.analytics import CustomKpiDefinition
 from app.models.defect import Defect
 from app.models.equipment import Equipment
@@ -31,9 +31,10 @@ from app.schemas.analytics_bi import (
 )
 from app.services.analytics_service import (
     compute_kpi_status,
-    compute_kpi_value,
+    compute_kpi_values,
     get_entity_trends,
     get_kpi_trend,
+    get_kpi_trends,
     get_project_benchmarks,
     record_kpi_snapshots,
 )
@@ -54,7 +55,7 @@ async def get_trends(
     entity_type: str = Query(..., description="Entity type to analyze"),
     project_id: Optional[UUID] = Query(None, description="Filter by project"),
     days: int = Query(30, ge=1, le=365, description="Number of days to look back"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     if project_id:
@@ -69,7 +70,7 @@ async def get_trends(
 
 @router.get("/benchmarks", response_model=BenchmarkResponse)
 async def get_benchmarks(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     benchmarks = await get_project_benchmarks(db, current_user)
@@ -111,7 +112,7 @@ async def create_kpi_definition(
 @router.get("/kpi-definitions", response_model=list[KpiResponse])
 async def list_kpi_definitions(
     project_id: Optional[UUID] = Query(None, description="Filter by project"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     accessible_projects = select(ProjectMember.project_id).where(
@@ -178,7 +179,7 @@ async def delete_kpi_definition(
 @router.get("/kpi-values", response_model=list[KpiValueResponse])
 async def get_kpi_values(
     project_id: Optional[UUID] = Query(None, description="Filter KPIs by project"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     accessible_projects = select(ProjectMember.project_id).where(
@@ -196,12 +197,14 @@ async def get_kpi_values(
     result = await db.execute(query.order_by(CustomKpiDefinition.display_order))
     kpis = result.scalars().all()
 
+    computed_values = await compute_kpi_values(db, kpis)
+    trends = await get_kpi_trends(db, [kpi.id for kpi in kpis], days=14)
+
     values = []
     for kpi in kpis:
-        computed = await compute_kpi_value(db, kpi)
+        computed = computed_values[kpi.id]
         status = compute_kpi_status(computed, kpi.target_value, kpi.warning_threshold)
-        trend_data = await get_kpi_trend(db, kpi.id, days=14)
-        trend = [KpiSnapshotPoint(snapshot_date=t["snapshot_date"], value=t["value"]) for t in trend_data]
+        trend = [KpiSnapshotPoint(snapshot_date=t["snapshot_date"], value=t["value"]) for t in trends[kpi.id]]
         values.append(
             KpiValueResponse(
                 kpi_id=kpi.id,
@@ -236,7 +239,7 @@ async def record_snapshots(
 async def get_kpi_history(
     kpi_id: UUID,
     days: int = Query(30, ge=1, le=365, description="Number of days to look back"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     result = await db.execute(
@@ -260,7 +263,7 @@ async def get_kpi_history(
 async def export_csv(
     entity_type: str = Query(..., description="Entity type to export"),
     project_id: Optional[UUID] = Query(None, description="Filter by project"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     model = EXPORT_MODEL_MAP.get(entity_type)
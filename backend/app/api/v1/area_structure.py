@@ -18,6 +18,7 @@ from app.schemas.area import (
 )
 from app.services.area_structure_service import (
     compute_area_checklist_progress,
+    compute_areas_checklist_progress,
     create_checklists_for_area,
     process_bulk_area_tree,
 )
@@ -166,4 +167,15 @@ async def get_area_checklist_summary(
     if not result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Area not found")
 
-    return await compute_area_checklist_progress(db, area_id)
+    return await compute_area_checklist_progress(db, project_id, area_id)
+
+
+@router.get("/projects/{project_id}/area-checklist-summaries")
+async def get_area_checklist_summaries(
+    project_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    await verify_project_access(project_id, current_user, db)
+    progress = await compute_areas_checklist_progress(db, project_id)
+    return {str(area_id): summary for area_id, summary in progress.items()}
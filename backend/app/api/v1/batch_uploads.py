@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, UploadFile
 from fastapi import File as FastAPIFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,14 +15,24 @@ from sqlalchemy.orm import selectinload
 from app.config import Settings, get_settings
 from app.core.permissions import Permission, require_permission
 from app.core.security import get_current_user, verify_project_access
-from app.db.session import AsyncSessionLocal, get_db
-from app.models.batch_upload import BatchUpload
-from app.models.file import File
+from app.db.session import get_db
+from app.models.batch_upload import BatchUpload, BatchUploadFile
 from app.models.project import ProjectMember
 from app.models.user import User
-from app.schemas.batch_upload import BatchUploadResponse, BatchUploadStatusResponse
-from app.services.storage_service import generate_storage_path
-from app.utils import utcnow
+from app.schemas.batch_upload import (
+    BatchUploadFileProgress,
+    BatchUploadResponse,
+    BatchUploadSessionCreate,
+    BatchUploadSessionResponse,
+    BatchUploadStatusResponse,
+)
+from app.services.batch_upload_service import UploadChunkError, store_chunk
+from app.services.storage_service import (
+    StorageBackend,
+    generate_storage_path,
+    get_storage_backend,
+    iter_upload_file,
+)
 from app.utils.localization import get_language_from_request, translate_message
 
 router = APIRouter()
@@ -37,81 +48,94 @@ ALLOWED_ENTITY_TYPES = {
 }
 
 
-async def process_batch_files(
-    batch_id: uuid.UUID,
-    project_id: uuid.UUID,
-    user_id: uuid.UUID,
-    file_data_list: list[dict],
+def _enqueue_finalize(batch: BatchUpload) -> None:
+    from app.worker.tasks.batch_upload import finalize_batch_upload_task
+
+    try:
+        finalize_batch_upload_task.delay(str(batch.id))
+    except Exception as exc:
+        # Chunks are already durable; POST .../complete re-enqueues
+        logger.error("Failed to enqueue finalization for batch %s: %s", batch.id, exc)
+
+
+def _upload_size(upload_file: UploadFile) -> int:
+    if upload_file.size is not None:
+        return upload_file.size
+    upload_file.file.seek(0, 2)
+    size = upload_file.file.tell()
+    upload_file.file.seek(0)
+    return size
+
+
+def _validate_batch(entity_type: str, sizes: list[int]) -> None:
+    if entity_type not in ALLOWED_ENTITY_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid entity_type: {entity_type}")
+    if len(sizes) > MAX_BATCH_FILES:
+        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_FILES} files per batch")
+    if len(sizes) == 0:
+        raise HTTPException(status_code=400, detail="No files provided")
+    if any(size > MAX_SINGLE_FILE_SIZE for size in sizes):
+        raise HTTPException(status_code=413, detail="File exceeds 50 MB limit")
+    if sum(sizes) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail="Total batch size exceeds 1 GB limit")
+
+
+def _new_batch(
+    project_id: UUID,
+    user_id: UUID,
     entity_type: str,
-    entity_id: uuid.UUID,
-    settings: Settings,
-) -> None:
-    from app.services.storage_service import _create_storage_backend
-    storage = _create_storage_backend(settings)
-
-    async with AsyncSessionLocal() as db:
-        try:
-            result = await db.execute(
-                select(BatchUpload).where(BatchUpload.id == batch_id)
-            )
-            batch = result.scalar_one_or_none()
-            if not batch:
-                logger.error("Batch %s not found", batch_id)
-                return
-
-            batch.status = "processing"
-            await db.commit()
-
-            for file_info in file_data_list:
-                try:
-                    storage_path = generate_storage_path(
-                        user_id=user_id,
-                        project_id=project_id,
-                        entity_type=entity_type,
-                        entity_id=entity_id,
-                        filename=file_info["filename"],
-                    )
-                    content = file_info["content"]
-                    file_size = await storage.save_bytes(
-                        content, storage_path, file_info["content_type"]
-                    )
-
-                    file_record = File(
-                        project_id=project_id,
-                        entity_type=entity_type,
-                        entity_id=entity_id,
-                        filename=file_info["filename"],
-                        file_type=file_info["content_type"],
-                        file_size=file_size,
-                        storage_path=storage_path,
-                        uploaded_by_id=user_id,
-                        batch_upload_id=batch_id,
-                    )
-                    db.add(file_record)
-                    batch.processed_files += 1
-
-                except Exception as exc:
-                    logger.error("Failed to process file %s: %s", file_info["filename"], exc)
-                    batch.failed_files += 1
-
-            batch.status = "completed" if batch.failed_files == 0 else "failed"
-            batch.completed_at = utcnow()
-            await db.commit()
-
-        except Exception as exc:
-            logger.error("Batch processing error for %s: %s", batch_id, exc)
-            try:
-                batch.status = "failed"
-                batch.completed_at = utcnow()
-                await db.commit()
-            except Exception:
-                pass
+    entity_id: Optional[UUID],
+    files: list[tuple[str, str, int, Optional[str]]],
+    category: Optional[str],
+    building: Optional[str],
+    floor: Optional[str],
+) -> BatchUpload:
+    metadata = {}
+    if category:
+        metadata["category"] = category
+    if building:
+        metadata["building"] = building
+    if floor:
+        metadata["floor"] = floor
+
+    resolved_entity_id = entity_id or project_id
+    batch = BatchUpload(
+        project_id=project_id,
+        uploaded_by=user_id,
+        total_files=len(files),
+        processed_files=0,
+        failed_files=0,
+        status="uploading",
+        entity_type=entity_type,
+        entity_id=resolved_entity_id,
+        metadata_json=metadata if metadata else None,
+    )
+    batch.upload_files = [
+        BatchUploadFile(
+            id=uuid.uuid4(),
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            received_bytes=0,
+            chunk_sizes=[],
+            sha256=sha256.lower() if sha256 else None,
+            status="pending",
+            storage_path=generate_storage_path(
+                user_id=user_id,
+                project_id=project_id,
+                entity_type=entity_type,
+                entity_id=resolved_entity_id,
+                filename=filename,
+            ),
+        )
+        for filename, content_type, size, sha256 in files
+    ]
+    return batch
 
 
 @router.post("/projects/{project_id}/batch-uploads", response_model=BatchUploadResponse)
 async def create_batch_upload(
     project_id: UUID,
-    background_tasks: BackgroundTasks,
     files: list[UploadFile] = FastAPIFile(...),
     entity_type: str = "project",
     entity_id: Optional[UUID] = None,
@@ -121,72 +145,190 @@ async def create_batch_upload(
     member: ProjectMember = require_permission(Permission.CREATE),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    storage: StorageBackend = Depends(get_storage_backend),
     settings: Settings = Depends(get_settings),
 ):
-    if entity_type not in ALLOWED_ENTITY_TYPES:
-        raise HTTPException(status_code=400, detail=f"Invalid entity_type: {entity_type}")
+    """Single-request batch upload. Files are streamed from the spooled request body
+    to storage, then finalized by the same Celery job as resumable sessions."""
+    sizes = [_upload_size(f) for f in files]
+    _validate_batch(entity_type, sizes)
+
+    batch = _new_batch(
+        project_id, current_user.id, entity_type, entity_id,
+        [
+            (f.filename or "unnamed", f.content_type or "application/octet-stream", size, None)
+            for f, size in zip(files, sizes)
+        ],
+        category, building, floor,
+    )
+    db.add(batch)
+    await db.flush()
 
-    if len(files) > MAX_BATCH_FILES:
-        raise HTTPException(status_code=400, detail=f"Maximum {MAX_BATCH_FILES} files per batch")
+    semaphore = asyncio.Semaphore(max(1, settings.batch_upload_parallelism))
 
-    if len(files) == 0:
-        raise HTTPException(status_code=400, detail="No files provided")
+    async def spool(upload: BatchUploadFile, upload_file: UploadFile) -> None:
+        async with semaphore:
+            try:
+                await store_chunk(storage, upload, 0, iter_upload_file(upload_file))
+            except Exception as exc:
+                logger.error("Failed to spool file %s: %s", upload.filename, exc)
+                upload.status = "failed"
+                upload.error = str(exc)
+
+    await asyncio.gather(*(spool(u, f) for u, f in zip(batch.upload_files, files)))
+    batch.status = "pending"
+    await db.commit()
+    await db.refresh(batch, ["uploader"])
 
-    resolved_entity_id = entity_id or project_id
+    _enqueue_finalize(batch)
+    return batch
 
-    file_data_list = []
-    total_size = 0
 
-    for upload_file in files:
-        content = await upload_file.read()
-        file_size = len(content)
+@router.post("/projects/{project_id}/batch-uploads/sessions", response_model=BatchUploadSessionResponse)
+async def create_batch_upload_session(
+    project_id: UUID,
+    data: BatchUploadSessionCreate,
+    member: ProjectMember = require_permission(Permission.CREATE),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    settings: Settings = Depends(get_settings),
+):
+    """Start a resumable upload; PATCH each file's chunks, then POST .../complete."""
+    _validate_batch(data.entity_type, [f.size for f in data.files])
 
-        if file_size > MAX_SINGLE_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File '{upload_file.filename}' exceeds 50 MB limit"
-            )
+    batch = _new_batch(
+        project_id, current_user.id, data.entity_type, data.entity_id,
+        [(f.filename, f.content_type, f.size, f.sha256) for f in data.files],
+        data.category, data.building, data.floor,
+    )
+    # Empty files have nothing to send
+    for upload in batch.upload_files:
+        if upload.size == 0:
+            upload.status = "uploaded"
+    db.add(batch)
+    await db.commit()
+    await db.refresh(batch, ["uploader"])
 
-        total_size += file_size
-        if total_size > MAX_BATCH_SIZE:
-            raise HTTPException(status_code=413, detail="Total batch size exceeds 1 GB limit")
+    return BatchUploadSessionResponse(
+        **BatchUploadResponse.model_validate(batch).model_dump(),
+        chunk_size=settings.upload_chunk_max_bytes,
+        upload_files=[BatchUploadFileProgress.model_validate(u) for u in batch.upload_files],
+    )
 
-        file_data_list.append({
-            "filename": upload_file.filename or "unnamed",
-            "content_type": upload_file.content_type or "application/octet-stream",
-            "content": content,
-        })
 
-    metadata = {}
-    if category:
-        metadata["category"] = category
-    if building:
-        metadata["building"] = building
-    if floor:
-        metadata["floor"] = floor
+async def _get_upload_file(
+    db: AsyncSession,
+    project_id: UUID,
+    batch_id: UUID,
+    file_id: UUID,
+    user: User,
+    request: Optional[Request],
+    lock: bool = False,
+) -> BatchUploadFile:
+    query = (
+        select(BatchUploadFile)
+        .join(BatchUpload, BatchUpload.id == BatchUploadFile.batch_upload_id)
+        .where(
+            BatchUploadFile.id == file_id,
+            BatchUpload.id == batch_id,
+            BatchUpload.project_id == project_id,
+            BatchUpload.uploaded_by == user.id,
+        )
+    )
+    if lock:
+        # Serializes concurrent PATCHes for the same file
+        query = query.with_for_update(of=BatchUploadFile)
+    upload = await db.scalar(query)
+    if not upload:
+        language = get_language_from_request(request)
+        raise HTTPException(status_code=404, detail=translate_message("resources.not_found", language))
+    return upload
 
-    batch = BatchUpload(
-        project_id=project_id,
-        uploaded_by=current_user.id,
-        total_files=len(file_data_list),
-        status="pending",
-        metadata_json=metadata if metadata else None,
+
+@router.head("/projects/{project_id}/batch-uploads/{batch_id}/files/{file_id}")
+async def get_upload_offset(
+    project_id: UUID,
+    batch_id: UUID,
+    file_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    upload = await _get_upload_file(db, project_id, batch_id, file_id, current_user, request)
+    return Response(
+        status_code=200,
+        headers={
+            "Upload-Offset": str(upload.received_bytes),
+            "Upload-Length": str(upload.size),
+            "Cache-Control": "no-store",
+        },
     )
-    db.add(batch)
+
+
+@router.patch("/projects/{project_id}/batch-uploads/{batch_id}/files/{file_id}", status_code=204)
+async def upload_chunk(
+    project_id: UUID,
+    batch_id: UUID,
+    file_id: UUID,
+    request: Request,
+    upload_offset: int = Header(alias="Upload-Offset", ge=0),
+    upload_checksum: Optional[str] = Header(None, alias="Upload-Checksum"),
+    member: ProjectMember = require_permission(Permission.CREATE),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    storage: StorageBackend = Depends(get_storage_backend),
+    settings: Settings = Depends(get_settings),
+):
+    upload = await _get_upload_file(db, project_id, batch_id, file_id, current_user, request, lock=True)
+    try:
+        new_offset = await store_chunk(
+            storage, upload, upload_offset, request.stream(),
+            checksum_header=upload_checksum, max_bytes=settings.upload_chunk_max_bytes,
+        )
+    except UploadChunkError as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=str(exc),
+            headers={"Upload-Offset": str(upload.received_bytes)},
+        )
     await db.commit()
-    await db.refresh(batch, ["uploader"])
+    return Response(status_code=204, headers={"Upload-Offset": str(new_offset)})
 
-    background_tasks.add_task(
-        process_batch_files,
-        batch_id=batch.id,
-        project_id=project_id,
-        user_id=current_user.id,
-        file_data_list=file_data_list,
-        entity_type=entity_type,
-        entity_id=resolved_entity_id,
-        settings=settings,
+
+@router.post("/projects/{project_id}/batch-uploads/{batch_id}/complete", response_model=BatchUploadResponse)
+async def complete_batch_upload(
+    project_id: UUID,
+    batch_id: UUID,
+    request: Request,
+    member: ProjectMember = require_permission(Permission.CREATE),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    result = await db.execute(
+        select(BatchUpload)
+        .where(
+            BatchUpload.id == batch_id,
+            BatchUpload.project_id == project_id,
+            BatchUpload.uploaded_by == current_user.id,
+        )
+        .options(selectinload(BatchUpload.uploader), selectinload(BatchUpload.upload_files))
+        # Waits for a running finalization, so its final status is seen below
+        .with_for_update(of=BatchUpload)
     )
+    batch = result.scalar_one_or_none()
+    if not batch:
+        language = get_language_from_request(request)
+        raise HTTPException(status_code=404, detail=translate_message("resources.not_found", language))
+    if batch.status not in ("uploading", "pending"):
+        raise HTTPException(status_code=409, detail=f"Batch is already {batch.status}")
+
+    incomplete = [u.filename for u in batch.upload_files if u.status in ("pending", "uploading")]
+    if incomplete:
+        raise HTTPException(status_code=409, detail=f"Files not fully uploaded: {', '.join(incomplete[:5])}")
 
+    batch.status = "pending"
+    await db.commit()
+    _enqueue_finalize(batch)
     return batch
 
 
@@ -38,7 +38,12 @@ from app.services.blueprint_extraction_service import (
     run_image_extraction,
     run_pdf_extraction,
 )
-from app.services.storage_service import StorageBackend, generate_storage_path, get_storage_backend
+from app.services.storage_service import (
+    StorageBackend,
+    compute_checksum,
+    generate_storage_path,
+    get_storage_backend,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -123,6 +128,7 @@ async def upload_blueprint(
             file_type=file.content_type or "application/pdf",
             file_size=file_size,
             storage_path=storage_path,
+            checksum=compute_checksum(content),
             uploaded_by_id=current_user.id,
         )
         db.add(file_record)
@@ -161,6 +167,7 @@ async def upload_blueprint(
             file_type=file.content_type or "image/png",
             file_size=file_size,
             storage_path=storage_path,
+            checksum=compute_checksum(content),
             uploaded_by_id=current_user.id,
         )
         db.add(file_record)
@@ -1,6 +1,4 @@
 import logging
-import os
-import weasyprint
 from urllib.parse import quote
 from uuid import UUID
 
@@ -47,6 +45,7 @@ from app.services.audit_service import create_audit_log, get_model_dict
 from app.services.email_renderer import render_checklist_email, render_checklist_pdf_html
 from app.services.email_service import EmailService
 from app.services.notification_service import notify_project_admins
+from app.services.pdf_render_service import render_pdf
 
 router = APIRouter()
 
@@ -739,8 +738,7 @@ async def export_checklist_pdf(
         language=language,
     )
 
-    templates_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates")
-    pdf_bytes = weasyprint.HTML(string=html, base_url=templates_dir).write_pdf()
+    pdf_bytes = await render_pdf(html)
 
     filename = f"checklist_{instance.unit_identifier}_{instance.created_at.strftime('%Y%m%d')}.pdf"
     encoded_filename = quote(filename)
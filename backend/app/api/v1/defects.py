@@ -1,4 +1,3 @@
-import asyncio
 from typing import Optional
 from uuid import UUID
 
@@ -8,6 +7,7 @@ from sqlalchemy import String, case, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
 from app.core.permissions import Permission, require_permission
 from app.core.security import get_current_user, verify_project_access
 from app.db.session import get_db
@@ -33,6 +33,7 @@ from app.services.notification_service import (
     notify_user,
 )
 from app.services.ai_service import analyze_defect_image
+from app.services.pdf_render_service import pdf_job_accepted, submit_pdf_job
 from app.services.storage_service import StorageBackend, get_storage_backend
 from app.utils import utcnow
 
@@ -198,8 +199,13 @@ async def export_defects_pdf(
     defects = list(result.scalars().all())
 
     language = current_user.language or "he"
-    pdf_bytes = await generate_defects_report_pdf(db, defects, project, storage, language=language)
     filename = f"defects_report_{str(project.id)[:8]}_{utcnow().strftime('%Y%m%d')}.pdf"
+    if len(defects) > get_settings().pdf_render_job_threshold:
+        defect_ids = [d.id for d in defects]
+        job = await submit_pdf_job(db, project_id, current_user.id, "defects", defect_ids, filename, language)
+        return await pdf_job_accepted(db, job)
+
+    pdf_bytes = await generate_defects_report_pdf(db, defects, project, storage, language=language)
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
@@ -228,7 +234,7 @@ async def analyze_defect_image_endpoint(
         raise HTTPException(status_code=400, detail="Image too large. Maximum 10MB.")
 
     try:
-        result = await asyncio.to_thread(analyze_defect_image, content, file.content_type, language)
+        result = await analyze_defect_image(content, file.content_type, language)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
 
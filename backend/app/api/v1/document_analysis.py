@@ -49,7 +49,7 @@ async def trigger_analysis(
 
     try:
         content = await storage.get_file_content(file_record.storage_path)
-        ai_result = analyze_document(
+        ai_result = await analyze_document(
             file_content=content,
             file_type=file_record.file_type or "application/octet-stream",
             analysis_type=body.analysis_type,
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-import io
 import json as json_module
 import logging
-import zipfile
 from typing import Optional
 from uuid import UUID
 
@@ -126,11 +124,11 @@ async def process_export_job(
                 if export_type == ExportType.PROJECT and project_id:
                     filename = f"project_{project_id}_export.zip"
                     storage_path = f"exports/{job_id}/{filename}"
-                    file_size = await export_service.create_export_archive(project_id, storage_path)
+                    file_size = await export_service.create_export_archive(job, storage, storage_path)
                 elif export_type == ExportType.ORGANIZATION:
                     if organization_id:
                         result = await db.execute(
-                            select(Project).where(Project.organization_id == organization_id)
+                            select(Project).where(Project.organization_id == organization_id).order_by(Project.id)
                         )
                         projects = result.scalars().all()
                     else:
@@ -141,28 +139,16 @@ async def process_export_job(
                         accessible_project_ids = [row[0] for row in result.all()]
 
                         result = await db.execute(
-                            select(Project).where(Project.id.in_(accessible_project_ids))
+                            select(Project).where(Project.id.in_(accessible_project_ids)).order_by(Project.id)
                         )
                         projects = result.scalars().all()
 
-                    zip_buffer = io.BytesIO()
-                    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as org_zip:
-                        for project in projects:
-                            project_data = await export_service.export_project_json(project.id)
-                            project_json = json_module.dumps(project_data, indent=2, default=str)
-                            org_zip.writestr(
-                                f"{project.id}/project_data.json",
-                                project_json
-                            )
-
-                    zip_buffer.seek(0)
-                    content = zip_buffer.read()
                     if organization_id:
                         filename = f"organization_{organization_id}_export.zip"
                     else:
                         filename = f"all_projects_{job.requested_by_id}_export.zip"
                     storage_path = f"exports/{job_id}/{filename}"
-                    file_size = await storage.save_bytes(content, storage_path)
+                    file_size = await export_service.create_projects_archive(job, storage, storage_path, projects)
                 else:
                     raise ValueError("Invalid export configuration")
 
@@ -178,6 +164,8 @@ async def process_export_job(
 
         except Exception as e:
             logger.exception(f"Export job {job_id} failed: {str(e)}")
+            # Keep the sealed segments and checkpoint so a resumed ZIP export continues from them
+            await db.rollback()
             job = await db.get(ExportJob, job_id)
             if job:
                 job.status = ExportStatus.FAILED
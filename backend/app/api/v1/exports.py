@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 from pathlib import Path
 from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
-from fastapi.responses import Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -19,12 +19,17 @@ from app.models.project import ProjectMember
 from app.models.user import User
 from app.schemas.export import ExportJobResponse, ExportRequest
 from app.services.storage_service import StorageBackend, get_storage_backend
+from app.utils import utcnow
+from app.utils.http_range import build_file_response, is_not_modified, not_modified_response, weak_etag
 from app.utils.localization import get_language_from_request, translate_message
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# A processing export that has not reported progress for this long is assumed to be dead
+EXPORT_STALLED_AFTER = timedelta(minutes=15)
+
 
 @router.post("/projects/{project_id}/exports", response_model=ExportJobResponse)
 async def create_project_export(
@@ -119,6 +124,55 @@ async def get_export_job(
     return job
 
 
+@router.post("/projects/{project_id}/exports/{export_id}/resume", response_model=ExportJobResponse)
+async def resume_project_export(
+    project_id: UUID,
+    export_id: UUID,
+    background_tasks: BackgroundTasks,
+    member: ProjectMember = require_permission(Permission.MANAGE_SETTINGS),
+    db: AsyncSession = Depends(get_db),
+    storage: StorageBackend = Depends(get_storage_backend),
+    request: Request = None,
+):
+    """Restart a failed or stalled export; ZIP exports continue from their last checkpoint."""
+    result = await db.execute(
+        select(ExportJob)
+        .where(ExportJob.id == export_id, ExportJob.project_id == project_id)
+        .options(selectinload(ExportJob.requested_by))
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        language = get_language_from_request(request)
+        error_message = translate_message('export_job_not_found', language)
+        raise HTTPException(
+            status_code=404,
+            detail=error_message or "Export job not found"
+        )
+
+    if job.export_type == ExportType.REPORT:
+        raise HTTPException(status_code=409, detail="Report renders cannot be resumed; request the report again")
+
+    stalled = job.status == ExportStatus.PROCESSING and job.updated_at < utcnow() - EXPORT_STALLED_AFTER
+    if job.status != ExportStatus.FAILED and not stalled:
+        raise HTTPException(status_code=409, detail="Only failed or stalled exports can be resumed")
+
+    job.status = ExportStatus.PENDING
+    job.error_message = None
+    background_tasks.add_task(
+        process_export_job,
+        job.id,
+        job.export_format,
+        job.export_type,
+        project_id,
+        None,
+        storage,
+    )
+
+    await db.commit()
+    return job
+
+
 @router.get("/projects/{project_id}/exports/{export_id}/download")
 async def download_export_file(
     project_id: UUID,
@@ -158,9 +212,13 @@ async def download_export_file(
     if not job.file_path:
         raise HTTPException(status_code=500, detail="Export file path is missing")
 
+    etag = weak_etag(job.id, job.file_path, job.file_size, job.completed_at)
+    if is_not_modified(request, etag, job.completed_at):
+        return not_modified_response(etag, job.completed_at)
+
     try:
-        content = await storage.get_file_content(job.file_path)
-    except Exception as e:
+        file_size = await storage.get_file_size(job.file_path)
+    except Exception:
         logger.exception(f"Failed to retrieve export file {job.file_path}")
         raise HTTPException(status_code=500, detail="Failed to retrieve export file")
 
@@ -169,15 +227,22 @@ async def download_export_file(
         ExportFormat.JSON: "application/json",
         ExportFormat.CSV: "text/csv; charset=utf-8",
         ExportFormat.ZIP: "application/zip",
+        ExportFormat.PDF: "application/pdf",
     }
     media_type = media_type_map.get(job.export_format, "application/octet-stream")
 
-    return Response(
-        content=content,
+    # Streamed with Range support, so large archives neither load into memory nor restart on a dropped download
+    return build_file_response(
+        request,
+        storage,
+        job.file_path,
+        size=file_size,
         media_type=media_type,
+        etag=etag,
+        last_modified=job.completed_at,
         headers={
             "Content-Disposition": f"attachment; filename=\"{filename}\""
-        }
+        },
     )
 
 
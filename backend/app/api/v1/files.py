@@ -7,7 +7,6 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile
 from fastapi import File as FastAPIFile
-from fastapi.responses import Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -23,7 +22,27 @@ from app.models.project import ProjectMember
 from app.models.user import User
 from app.schemas.file import FileResponse
 from app.services.audit_service import create_audit_log, get_model_dict
-from app.services.storage_service import StorageBackend, generate_storage_path, get_storage_backend
+from app.services.image_derivative_service import (
+    delete_derivatives,
+    enqueue_image_derivatives,
+    is_image,
+)
+from app.services.storage_service import (
+    ChecksumStream,
+    StorageBackend,
+    generate_storage_path,
+    get_storage_backend,
+    iter_upload_file,
+)
+from app.utils.http_range import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    build_file_response,
+    is_not_modified,
+    not_modified_response,
+    strong_etag,
+    weak_etag,
+)
 from app.utils.localization import get_language_from_request, translate_message
 
 router = APIRouter()
@@ -79,7 +98,8 @@ async def upload_file(
         entity_id=entity_id,
         filename=file.filename or "unnamed"
     )
-    file_size = await storage.save_file(file, storage_path)
+    stream = ChecksumStream(iter_upload_file(file))
+    file_size = await storage.save_stream(stream, storage_path, file.content_type or "application/octet-stream")
     file_record = File(
         project_id=project_id,
         entity_type=entity_type,
@@ -88,6 +108,7 @@ async def upload_file(
         file_type=file.content_type or "application/octet-stream",
         file_size=file_size,
         storage_path=storage_path,
+        checksum=stream.hexdigest,
         uploaded_by_id=current_user.id
     )
     db.add(file_record)
@@ -100,6 +121,7 @@ async def upload_file(
     )
 
     await db.commit()
+    enqueue_image_derivatives(file_record)
     await db.refresh(file_record, ["uploaded_by"])
     return file_record
 
@@ -146,6 +168,8 @@ async def delete_file(
         await storage.delete_file(file_record.storage_path)
     except Exception:
         pass
+    if is_image(file_record.file_type):
+        await delete_derivatives(storage, file_record.storage_path)
 
     await create_audit_log(
         db, current_user, "file", file_record.id, AuditAction.DELETE,
@@ -176,14 +200,35 @@ async def serve_file_content(
         error_message = translate_message('resources.file_not_found', language)
         raise HTTPException(status_code=404, detail=error_message)
 
-    content = await storage.get_file_content(file_record.storage_path)
+    if file_record.checksum:
+        etag = strong_etag(file_record.checksum)
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = weak_etag(file_record.id, file_record.storage_path, file_record.file_size, file_record.uploaded_at)
+        cache_control = REVALIDATE_CACHE_CONTROL
+    if is_not_modified(request, etag, file_record.uploaded_at):
+        return not_modified_response(etag, file_record.uploaded_at, cache_control)
+
+    try:
+        file_size = await storage.get_file_size(file_record.storage_path)
+    except FileNotFoundError:
+        language = get_language_from_request(request)
+        error_message = translate_message('resources.file_not_found', language)
+        raise HTTPException(status_code=404, detail=error_message)
+
     encoded_filename = quote(file_record.filename)
-    return Response(
-        content=content,
+    return build_file_response(
+        request,
+        storage,
+        file_record.storage_path,
+        size=file_size,
         media_type=file_record.file_type or "application/octet-stream",
+        etag=etag,
+        last_modified=file_record.uploaded_at,
+        cache_control=cache_control,
         headers={
-            "Content-Disposition": f"inline; filename=\"{encoded_filename}\"; filename*=UTF-8''{encoded_filename}"
-        }
+            "Content-Disposition": f"inline; filename=\"{encoded_filename}\"; filename*=UTF-8''{encoded_filename}",
+        },
     )
 
 
@@ -222,9 +267,20 @@ async def serve_local_file(
     try:
         # Validate path to prevent directory traversal attacks
         validate_storage_path(path, settings.local_storage_path)
-        content = await storage.get_file_content(path)
+        file_size = await storage.get_file_size(path)
+        # Storage paths carry a unique per-upload prefix, so path and size identify the content
+        etag = weak_etag(path, file_size)
+        if is_not_modified(request, etag, None):
+            return not_modified_response(etag)
         mime_type, _ = mimetypes.guess_type(path)
-        return Response(content=content, media_type=mime_type or "application/octet-stream")
+        return build_file_response(
+            request,
+            storage,
+            path,
+            size=file_size,
+            media_type=mime_type or "application/octet-stream",
+            etag=etag,
+        )
     except FileNotFoundError:
         language = get_language_from_request(request)
         error_message = translate_message('resources.file_not_found', language)
@@ -3,13 +3,14 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.schemas.inbox import (
+    InboxCountsResponse,
     InboxDefectItem,
     InboxMeetingItem,
     InboxResponse,
@@ -22,6 +23,7 @@ from app.services.inbox_service import (
     fetch_inbox_rfis,
     fetch_inbox_tasks,
     get_inbox,
+    get_inbox_counts,
 )
 
 router = APIRouter()
@@ -31,17 +33,30 @@ router = APIRouter()
 async def get_my_inbox(
     project_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        return await get_inbox(db, current_user.id, project_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/my-inbox/counts", response_model=InboxCountsResponse)
+async def get_my_inbox_counts(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return await get_inbox(db, current_user.id, project_id, limit)
+    # Primary session: a recomputed count is written back to user_inbox_counts
+    return await get_inbox_counts(db, current_user.id, store=True)
 
 
 @router.get("/my-tasks", response_model=list[InboxTaskItem])
 async def get_my_tasks(
     project_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return await fetch_inbox_tasks(db, current_user.id, project_id, limit)
@@ -51,7 +66,7 @@ async def get_my_tasks(
 async def get_my_rfis(
     project_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return await fetch_inbox_rfis(db, current_user.id, project_id, limit)
@@ -61,7 +76,7 @@ async def get_my_rfis(
 async def get_my_meetings(
     project_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return await fetch_inbox_meetings(db, current_user.id, project_id, limit)
@@ -71,7 +86,7 @@ async def get_my_meetings(
 async def get_my_defects(
     project_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=200),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return await fetch_inbox_defects(db, current_user.id, project_id, limit)
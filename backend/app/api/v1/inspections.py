@@ -10,6 +10,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
 from app.core.permissions import Permission, check_permission, require_permission
 from app.core.security import get_current_user, verify_project_access
 from app.db.session import get_db
@@ -36,6 +37,7 @@ from app.schemas.inspection_template import InspectionStageTemplateResponse
 from app.services.audit_service import create_audit_log, get_model_dict
 from app.services.inspection_report_service import generate_inspections_report_pdf
 from app.services.notification_service import notify_project_admins
+from app.services.pdf_render_service import pdf_job_accepted, submit_pdf_job
 from app.utils import utcnow
 
 logger = logging.getLogger(__name__)
@@ -314,8 +316,13 @@ async def export_inspections_pdf(
     inspections = list(result.scalars().all())
 
     language = current_user.language or "he"
-    pdf_bytes = generate_inspections_report_pdf(inspections, project, language=language)
     filename = f"inspections_report_{str(project.id)[:8]}_{utcnow().strftime('%Y%m%d')}.pdf"
+    if len(inspections) > get_settings().pdf_render_job_threshold:
+        inspection_ids = [i.id for i in inspections]
+        job = await submit_pdf_job(db, project_id, current_user.id, "inspections", inspection_ids, filename, language)
+        return await pdf_job_accepted(db, job)
+
+    pdf_bytes = await generate_inspections_report_pdf(inspections, project, language=language)
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
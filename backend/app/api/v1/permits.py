@@ -28,7 +28,13 @@ from app.schemas.permit import (
 )
 from app.services.audit_service import create_audit_log, get_model_dict
 from app.services.notification_service import notify_project_admins
-from app.services.storage_service import StorageBackend, generate_storage_path, get_storage_backend
+from app.services.storage_service import (
+    ChecksumStream,
+    StorageBackend,
+    generate_storage_path,
+    get_storage_backend,
+    iter_upload_file,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -358,7 +364,8 @@ async def upload_permit_document(
         entity_id=permit_id,
         filename=file.filename or "unnamed"
     )
-    file_size = await storage.save_file(file, storage_path)
+    stream = ChecksumStream(iter_upload_file(file))
+    file_size = await storage.save_stream(stream, storage_path, file.content_type or "application/octet-stream")
     file_record = File(
         project_id=permit.project_id,
         entity_type="permit",
@@ -367,6 +374,7 @@ async def upload_permit_document(
         file_type=file.content_type or "application/octet-stream",
         file_size=file_size,
         storage_path=storage_path,
+        checksum=stream.hexdigest,
         uploaded_by_id=current_user.id
     )
     db.add(file_record)
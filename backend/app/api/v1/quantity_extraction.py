@@ -1,6 +1,4 @@
-import asyncio
 import logging
-from functools import partial
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from pydantic import ValidationError
@@ -8,7 +6,7 @@ from pydantic import ValidationError
 from app.core.security import get_current_user
 from app.models.user import User
 from app.schemas.quantity_extraction import QuantityExtractionResponse
-from app.services.quantity_extraction_service import extract_quantities
+from app.services.quantity_extraction_service import extract_quantities_cached
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -30,11 +28,7 @@ async def extract_quantities_endpoint(
         raise HTTPException(status_code=400, detail="File size exceeds 20MB limit")
 
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            partial(extract_quantities, file_content=content, file_type=file.content_type, language=language),
-        )
+        result = await extract_quantities_cached(content, file.content_type, language)
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.security import get_current_user, verify_project_access
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.project import Project
 from app.models.scheduled_report import ReportTemplate, ScheduledReport
 from app.models.user import User
@@ -54,7 +54,7 @@ async def get_inspection_summary(
     project_id: UUID,
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -79,7 +79,7 @@ async def get_approval_status(
     project_id: UUID,
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -89,7 +89,7 @@ async def get_approval_status(
 @router.get("/projects/{project_id}/reports/rfi-aging")
 async def get_rfi_aging(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -101,7 +101,7 @@ async def get_attendance(
     project_id: UUID,
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -113,7 +113,7 @@ async def get_labor_costs(
     project_id: UUID,
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -126,7 +126,7 @@ async def export_payroll(
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
     format: str = Query("csv", pattern="^csv$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -147,7 +147,7 @@ async def export_report(
     format: str = Query("csv", pattern="^csv$"),
     date_from: datetime = Query(None),
     date_to: datetime = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -192,7 +192,7 @@ async def get_compliance_audit(
     project_id: UUID,
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -205,7 +205,7 @@ async def export_compliance_audit(
     date_from: datetime = Query(...),
     date_to: datetime = Query(...),
     format: str = Query("csv", pattern="^csv$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -252,7 +252,7 @@ async def preview_weekly_report(
     date_from: date = Query(...),
     date_to: date = Query(...),
     language: str = Query("he"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -275,7 +275,7 @@ async def preview_weekly_report(
 @router.get("/projects/{project_id}/report-templates", response_model=list[ReportTemplateResponse])
 async def list_report_templates(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -328,7 +328,7 @@ async def delete_report_template(
 @router.get("/projects/{project_id}/scheduled-reports", response_model=list[ScheduledReportResponse])
 async def list_scheduled_reports(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     await verify_project_access(project_id, current_user, db)
@@ -13,6 +13,8 @@ from app.models.user import User
 from app.schemas.schedule_risk import (
     CriticalPathResponse,
     CriticalPathTask,
+    MonteCarloRequest,
+    MonteCarloResponse,
     ProjectRiskSummary,
     ScheduleRiskResponse,
     WhatIfScenarioRequest,
@@ -23,7 +25,8 @@ from app.services.schedule_risk_service import (
     calculate_critical_path,
     calculate_historical_variance,
     generate_mitigation_suggestions,
-    simulate_scenario,
+    run_monte_carlo_simulation,
+    simulate_task_delay,
 )
 from app.utils import utcnow
 
@@ -153,7 +156,7 @@ async def get_task_schedule_risk(
         predicted_delay_days = (estimated_hours / 8.0) * max(0, avg_delay_factor - 1.0)
 
         # Generate mitigation suggestions
-        mitigation_data = generate_mitigation_suggestions(
+        mitigation_data = await generate_mitigation_suggestions(
             critical_path_data, variance_data, confidence_data
         )
 
@@ -201,11 +204,11 @@ async def get_project_critical_path(
         critical_tasks.append(
             CriticalPathTask(
                 task_id=task_info["task_id"],
-                task_title=task_info["title"],
+                task_title=task_info["task_title"],
                 start_date=task_info.get("start_date"),
                 due_date=task_info.get("due_date"),
-                duration_days=task_info["duration"],
-                slack_days=task_info.get("slack", 0.0),
+                duration_days=task_info["duration_days"],
+                slack_days=task_info.get("slack_days", 0.0),
             )
         )
 
@@ -249,11 +252,10 @@ async def run_what_if_scenario(
 
     try:
         # Run scenario simulation
-        scenario_result = await simulate_scenario(
+        scenario_result = await simulate_task_delay(
             db=db,
             project_id=project_id,
-            scenario_type="delay",
-            affected_task_ids=[scenario.task_id],
+            task_id=scenario.task_id,
             delay_days=scenario.delay_days,
         )
 
@@ -284,3 +286,36 @@ async def run_what_if_scenario(
     except Exception as e:
         logger.exception(f"Failed to run what-if scenario for task {scenario.task_id}")
         raise HTTPException(status_code=500, detail=f"Scenario simulation failed: {str(e)}")
+
+
+@router.post("/projects/{project_id}/schedule-risk/monte-carlo", response_model=MonteCarloResponse)
+async def run_monte_carlo(
+    project_id: UUID,
+    request: MonteCarloRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Simulate the schedule with sampled task durations to get completion date percentiles"""
+    await verify_project_access(project_id, current_user, db)
+
+    try:
+        result = await run_monte_carlo_simulation(db, project_id, request.iterations, request.seed)
+    except Exception as e:
+        logger.exception(f"Failed to run Monte Carlo simulation for project {project_id}")
+        raise HTTPException(status_code=500, detail=f"Monte Carlo simulation failed: {str(e)}")
+
+    return MonteCarloResponse(
+        project_id=project_id,
+        iterations=result["iterations"],
+        deterministic_duration_days=result["deterministic_duration"],
+        mean_duration_days=result["mean_duration"],
+        p50_duration_days=result["p50_duration"],
+        p80_duration_days=result["p80_duration"],
+        p95_duration_days=result["p95_duration"],
+        project_start_date=result["project_start_date"],
+        p50_completion_date=result["p50_completion_date"],
+        p80_completion_date=result["p80_completion_date"],
+        p95_completion_date=result["p95_completion_date"],
+        task_criticality=result["task_criticality"],
+        processing_time_ms=result["processing_time_ms"],
+    )
@@ -1,3 +1,4 @@
+from typing import Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -14,11 +15,27 @@ router = APIRouter()
 
 @router.get("/vendors/analytics/all")
 async def get_all_vendors_analytics(
+    sort_by: Literal[vendor_analytics_service.SORT_FIELDS] = Query("total_spending"),
+    sort_order: Literal["asc", "desc"] = Query("desc"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    analytics = await vendor_analytics_service.get_all_vendors_analytics(db=db)
-    return {"vendors": analytics}
+    total, analytics = await vendor_analytics_service.get_all_vendors_analytics(
+        db=db,
+        sort_by=sort_by,
+        descending=sort_order == "desc",
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+    return {
+        "vendors": analytics,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total + page_size - 1) // page_size,
+    }
 
 
 @router.get("/vendors/analytics/by-trade")
@@ -26,4 +26,4 @@ async def websocket_endpoint(
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        manager.disconnect(websocket, project_id)
+        await manager.disconnect(websocket, project_id)
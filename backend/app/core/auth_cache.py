@@ -0,0 +1,141 @@
+"""
+Auth and permission resolution cache.
+
+Two layers sit in front of the user, membership and permission queries:
+- a per-request memo stored on the request's ``AsyncSession.info``, so repeated
+  ``verify_project_access`` calls in one handler reuse the same ``ProjectMember``;
+- a short-TTL in-process cache of plain column values and permission sets, so hot
+  read endpoints can resolve auth without touching the database. Cached rows are
+  re-attached to the request session with ``merge(load=False)``, which issues no SQL.
+
+Entries are invalidated from ORM flush events whenever users, project members,
+project/organization roles or permission overrides change, at the flush and again at the
+commit, which also tells other instances through the realtime broker (see
+``app.core.commit_cache``).
+"""
+
+import copy
+from typing import Any, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import get_settings
+from app.core.commit_cache import MISSING, CommitInvalidatedCache
+
+REQUEST_MEMO_KEY = "auth_cache"
+
+T = TypeVar("T")
+
+
+def row_values(instance: Any) -> dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(instance).mapper.column_attrs}
+
+
+async def attach(db: AsyncSession, model: type[T], values: dict[str, Any]) -> T:
+    """Re-attach a cached row to the session as a persistent instance without a SELECT."""
+    instance = model(**copy.deepcopy(values))
+    make_transient_to_detached(instance)
+    return await db.merge(instance, load=False)
+
+
+def request_memo(db: AsyncSession) -> dict:
+    return db.info.setdefault(REQUEST_MEMO_KEY, {})
+
+
+class AuthCache(CommitInvalidatedCache):
+    """Users by id, memberships by (user, project) and permission sets by (member, variant)."""
+
+    def get_user(self, user_id: UUID) -> Optional[dict]:
+        values = self.lookup(("user", user_id), kind="user")
+        return None if values is MISSING else values
+
+    def set_user(self, user_id: UUID, values: dict, generation: int) -> None:
+        self.store(("user", user_id), values, generation)
+
+    def get_member(self, user_id: UUID, project_id: UUID) -> Any:
+        """Cached member columns, None for a cached non-member, or MISSING."""
+        return self.lookup(("member", user_id, project_id), kind="member")
+
+    def set_member(self, user_id: UUID, project_id: UUID, values: Optional[dict], generation: int) -> None:
+        self.store(("member", user_id, project_id), values, generation)
+
+    def get_permissions(self, member_id: UUID, variant: str) -> Optional[frozenset[str]]:
+        entry = self.lookup(("permissions", member_id, variant), kind="permissions")
+        return None if entry is MISSING else entry[1]
+
+    def set_permissions(
+        self, member_id: UUID, project_id: UUID, variant: str, permissions: set[str], generation: int
+    ) -> None:
+        self.store(("permissions", member_id, variant), (project_id, frozenset(permissions)), generation)
+
+    def _invalidate(self, change: dict) -> None:
+        kind = change.get("kind")
+        if kind == "user":
+            self._entries.pop(("user", UUID(change["user_id"])), None)
+        elif kind == "member":
+            if change.get("user_id") and change.get("project_id"):
+                self._entries.pop(("member", UUID(change["user_id"]), UUID(change["project_id"])), None)
+            if change.get("member_id"):
+                member_id = UUID(change["member_id"])
+                self._drop(lambda key, value: key[0] == "permissions" and key[1] == member_id)
+        elif kind == "project":
+            project_id = UUID(change["project_id"])
+            self._drop(lambda key, value: (
+                (key[0] == "member" and key[2] == project_id)
+                or (key[0] == "permissions" and value[0] == project_id)
+            ))
+
+    def watches(self, model: type) -> bool:
+        return _invalidations_for_class(model)
+
+    def collect(self, session: Session) -> list[dict]:
+        invalidations = []
+        for instance in [*session.new, *session.dirty, *session.deleted]:
+            invalidations.extend(_invalidations_for(instance))
+        return invalidations
+
+    def collected(self, session: Session, changes: list[dict]) -> None:
+        # Drop now so this transaction re-reads, and again after commit so concurrent
+        # requests cannot re-cache the pre-commit rows
+        for change in changes:
+            self.invalidate(change)
+        session.info.pop(REQUEST_MEMO_KEY, None)
+
+
+auth_cache = AuthCache("auth", get_settings().auth_cache_ttl_seconds)
+
+
+def _invalidations_for_class(cls: type) -> bool:
+    from app.models.permission_override import PermissionOverride
+    from app.models.project import ProjectMember
+    from app.models.role import OrganizationRole, ProjectRole
+    from app.models.user import User
+
+    return issubclass(cls, (User, ProjectMember, PermissionOverride, ProjectRole, OrganizationRole))
+
+
+def _invalidations_for(instance: Any) -> list[dict]:
+    from app.models.permission_override import PermissionOverride
+    from app.models.project import ProjectMember
+    from app.models.role import OrganizationRole, ProjectRole
+    from app.models.user import User
+
+    if isinstance(instance, User):
+        return [{"kind": "user", "user_id": str(instance.id)}]
+    if isinstance(instance, ProjectMember):
+        return [{
+            "kind": "member",
+            "user_id": str(instance.user_id) if instance.user_id else None,
+            "project_id": str(instance.project_id) if instance.project_id else None,
+            "member_id": str(instance.id) if instance.id else None,
+        }]
+    if isinstance(instance, PermissionOverride):
+        return [{"kind": "member", "member_id": str(instance.project_member_id)}]
+    if isinstance(instance, ProjectRole):
+        return [{"kind": "project", "project_id": str(instance.project_id)}]
+    if isinstance(instance, OrganizationRole):
+        return [{"kind": "all"}]
+    return []
@@ -0,0 +1,193 @@
+"""
+Per-process caches invalidated when the rows behind them are committed.
+
+``CommitInvalidatedCache`` keeps entries in an LRU ``OrderedDict`` with a TTL. Subclasses say
+which flushed instances change what (``collect``), which models bulk statements must clear
+the cache for (``watches``) and how a change drops entries (``_invalidate``). Changes wait in
+``Session.info`` until the commit, are then applied locally and published on the realtime
+broker, and other instances drop whatever the change touches. Every change bumps a
+generation counter, so a value loaded while a change was being committed is not cached.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MISSING = object()
+
+# Lets an instance ignore its own broadcasts: it has already applied its changes
+INSTANCE_ID = uuid.uuid4().hex
+
+
+class CommitInvalidatedCache:
+    def __init__(self, name: str, ttl_seconds: float, max_entries: Optional[int] = None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.channel = f"{name}:invalidate"
+        self.pending_key = f"{name}_cache_changes"
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+        self._subscribed = False
+        event.listen(Session, "after_flush", self._collect_changes)
+        event.listen(Session, "do_orm_execute", self._collect_bulk_changes)
+        event.listen(Session, "after_commit", self._apply_changes)
+        event.listen(Session, "after_rollback", self._discard_changes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and (self.max_entries is None or self.max_entries > 0)
+
+    @property
+    def generation(self) -> int:
+        """Snapshot before a read and pass to ``store``, so a change applied meanwhile wins."""
+        return self._generation
+
+    def collect(self, session: Session) -> list[dict]:
+        """Changes made by a flush; ``{"kind": "all"}`` drops every entry."""
+        return []
+
+    def watches(self, model: type) -> bool:
+        """Whether bulk statements on ``model`` can change cached values."""
+        return False
+
+    def collected(self, session: Session, changes: list[dict]) -> None:
+        """Called when changes are queued for the commit."""
+
+    def lookup(self, key: Hashable, **labels: str) -> Any:
+        """The cached value, or MISSING."""
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and time.monotonic() - entry[0] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    metrics.inc(f"{self.name}_cache_hits_total", **labels)
+                    return entry[1]
+        metrics.inc(f"{self.name}_cache_misses_total", **labels)
+        return MISSING
+
+    def store(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Cache a value, unless it was loaded before a change at ``generation`` was applied."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_load(self, db: AsyncSession, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled or db.info.get(self.pending_key):
+            # Uncommitted changes in this session are not in the shared entries yet
+            return await load()
+        await self.ensure_subscribed()
+        generation = self._generation
+        value = self.lookup(key)
+        if value is MISSING:
+            value = await load()
+            self.store(key, value, generation)
+        return value
+
+    def apply(self, change: dict) -> None:
+        """Apply a change committed by this instance."""
+        self.invalidate(change)
+
+    def invalidate(self, change: dict) -> None:
+        """Drop whatever entries a change touches."""
+        with self._lock:
+            self._generation += 1
+            if change.get("kind") == "all":
+                self._entries.clear()
+            else:
+                self._invalidate(change)
+
+    def _invalidate(self, change: dict) -> None:
+        """Drop a change's entries; called with the lock held."""
+        self._entries.clear()
+
+    def _drop(self, matches: Callable[[Hashable, Any], bool]) -> None:
+        for key in [key for key, (_, value) in self._entries.items() if matches(key, value)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _queue(self, session: Session, changes: list[dict]) -> None:
+        session.info.setdefault(self.pending_key, []).extend(changes)
+        self.collected(session, changes)
+
+    def _collect_changes(self, session: Session, flush_context) -> None:
+        changes = self.collect(session)
+        if changes:
+            self._queue(session, changes)
+
+    def _collect_bulk_changes(self, orm_execute_state) -> None:
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and self.watches(mapper.class_):
+            # Bulk statements carry no instances to inspect, so drop everything
+            self._queue(orm_execute_state.session, [{"kind": "all"}])
+
+    def _apply_changes(self, session: Session) -> None:
+        changes = session.info.pop(self.pending_key, None)
+        if not changes:
+            return
+        for change in changes:
+            self.apply(change)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.create_task(self._publish(changes))
+
+    def _discard_changes(self, session: Session) -> None:
+        session.info.pop(self.pending_key, None)
+
+    async def _publish(self, changes: list[dict]) -> None:
+        from app.services.pubsub_broker import get_broker
+
+        try:
+            await get_broker().publish(self.channel, json.dumps({"origin": INSTANCE_ID, "changes": changes}))
+        except Exception as e:
+            logger.warning("Failed to publish %s cache invalidation: %s", self.name, e)
+
+    async def ensure_subscribed(self) -> None:
+        if self._subscribed or not self.enabled:
+            return
+        from app.services.pubsub_broker import get_broker
+
+        self._subscribed = True
+        try:
+            await get_broker().subscribe(self.channel, self._on_changes)
+        except Exception as e:
+            self._subscribed = False
+            logger.warning("%s cache could not subscribe to invalidations: %s", self.name, e)
+
+    async def _on_changes(self, channel: str, raw: str) -> None:
+        message = json.loads(raw)
+        if message.get("origin") == INSTANCE_ID:
+            return
+        for change in message["changes"]:
+            self.invalidate(change)
@@ -6,7 +6,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.security import get_current_user
+from app.core.auth_cache import auth_cache
+from app.core.security import get_current_user, get_project_member
 from app.db.session import get_db
 from app.models.project import ProjectMember
 from app.models.role import ProjectRole
@@ -65,6 +66,11 @@ ROLE_PERMISSIONS: dict[str, set[str]] = {
 async def get_effective_permissions(member: ProjectMember, db: AsyncSession) -> set[str]:
     from app.models.permission_override import PermissionOverride
 
+    generation = auth_cache.generation
+    cached = auth_cache.get_permissions(member.id, "v1") if member.id else None
+    if cached is not None:
+        return set(cached)
+
     base = set(ROLE_PERMISSIONS.get(member.role, set()))
     result = await db.execute(
         select(PermissionOverride).where(PermissionOverride.project_member_id == member.id)
@@ -75,6 +81,8 @@ async def get_effective_permissions(member: ProjectMember, db: AsyncSession) ->
             base.add(override.permission)
         else:
             base.discard(override.permission)
+    if member.id:
+        auth_cache.set_permissions(member.id, member.project_id, "v1", base, generation)
     return base
 
 
@@ -97,6 +105,11 @@ async def get_effective_permissions_v2(member: ProjectMember, db: AsyncSession)
     """
     from app.models.permission_override import PermissionOverride
 
+    generation = auth_cache.generation
+    cached = auth_cache.get_permissions(member.id, "v2") if member.id else None
+    if cached is not None:
+        return set(cached)
+
     # Try to find a custom ProjectRole matching the member's role name
     query = (
         select(ProjectRole)
@@ -126,6 +139,8 @@ async def get_effective_permissions_v2(member: ProjectMember, db: AsyncSession)
         else:
             base.discard(override.permission)
 
+    if member.id:
+        auth_cache.set_permissions(member.id, member.project_id, "v2", base, generation)
     return base
 
 
@@ -135,14 +150,8 @@ def require_permission(permission: Permission):
         current_user: User = Depends(get_current_user),
         db: AsyncSession = Depends(get_db),
     ) -> ProjectMember:
+        member = await get_project_member(project_id, current_user.id, db)
         if getattr(current_user, "is_super_admin", False):
-            result = await db.execute(
-                select(ProjectMember).where(
-                    ProjectMember.project_id == project_id,
-                    ProjectMember.user_id == current_user.id,
-                )
-            )
-            member = result.scalars().first()
             if member:
                 return member
             placeholder = ProjectMember(
@@ -152,13 +161,6 @@ def require_permission(permission: Permission):
             )
             return placeholder
 
-        result = await db.execute(
-            select(ProjectMember).where(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == current_user.id,
-            )
-        )
-        member = result.scalars().first()
         if not member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -177,18 +179,16 @@ def require_permission(permission: Permission):
 
 
 async def check_permission(permission: Permission, project_id: UUID, user_id: UUID, db: AsyncSession) -> None:
-    user_result = await db.execute(select(User).where(User.id == user_id))
-    user = user_result.scalar_one_or_none()
-    if user and user.is_super_admin:
+    cached_user = auth_cache.get_user(user_id)
+    if cached_user is not None:
+        is_super_admin = cached_user.get("is_super_admin", False)
+    else:
+        user_result = await db.execute(select(User.is_super_admin).where(User.id == user_id))
+        is_super_admin = user_result.scalar_one_or_none()
+    if is_super_admin:
         return
 
-    result = await db.execute(
-        select(ProjectMember).where(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == user_id,
-        )
-    )
-    member = result.scalars().first()
+    member = await get_project_member(project_id, user_id, db)
     if not member:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
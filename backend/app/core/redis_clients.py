@@ -0,0 +1,25 @@
+"""
+Async Redis clients for optional caches, one per event loop.
+
+``redis.asyncio`` connections are bound to the loop that opened them, and Celery tasks run
+in their own loop, so a client shared between loops fails with loop errors that the caches
+would only ever see as misses.
+"""
+
+import asyncio
+import weakref
+
+import redis.asyncio as aioredis
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, aioredis.Redis]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_cache_redis(redis_url: str) -> aioredis.Redis:
+    """The running loop's client for ``redis_url``, with short timeouts: callers treat Redis as optional."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(redis_url)
+    if client is None:
+        client = clients[redis_url] = aioredis.from_url(redis_url, socket_connect_timeout=1, socket_timeout=2)
+    return client
@@ -10,6 +10,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.auth_cache import MISSING, attach, auth_cache, request_memo, row_values
 from app.db.session import get_db
 from app.models.project import ProjectMember
 from app.models.user import User
@@ -74,8 +75,17 @@ async def get_current_user(
             detail="Invalid or expired token"
         )
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    await auth_cache.ensure_subscribed()
+    # Taken before the read so a change committed meanwhile isn't overwritten by the old row
+    generation = auth_cache.generation
+    cached = auth_cache.get_user(user_id)
+    if cached is not None:
+        user = await attach(db, User, cached)
+    else:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user:
+            auth_cache.set_user(user_id, row_values(user), generation)
 
     if not user:
         raise HTTPException(
@@ -115,21 +125,47 @@ async def get_current_admin_user(
     return current_user
 
 
-async def verify_project_access(
+async def get_project_member(
     project_id: UUID,
-    current_user: User,
+    user_id: UUID,
     db: AsyncSession,
-) -> ProjectMember:
-    if current_user.is_super_admin:
+) -> Optional[ProjectMember]:
+    """Membership lookup memoized per request and cached briefly across requests."""
+    memo = request_memo(db)
+    key = ("member", user_id, project_id)
+    if key in memo:
+        return memo[key]
+
+    generation = auth_cache.generation
+    cached = auth_cache.get_member(user_id, project_id)
+    if cached is MISSING:
         result = await db.execute(
             select(ProjectMember).where(
                 ProjectMember.project_id == project_id,
-                ProjectMember.user_id == current_user.id,
+                ProjectMember.user_id == user_id,
             )
         )
         member = result.scalars().first()
-        if member:
-            return member
+        auth_cache.set_member(user_id, project_id, row_values(member) if member else None, generation)
+    elif cached is None:
+        member = None
+    else:
+        member = await attach(db, ProjectMember, cached)
+
+    memo[key] = member
+    return member
+
+
+async def verify_project_access(
+    project_id: UUID,
+    current_user: User,
+    db: AsyncSession,
+) -> ProjectMember:
+    member = await get_project_member(project_id, current_user.id, db)
+    if member:
+        return member
+
+    if current_user.is_super_admin:
         placeholder = ProjectMember(
             project_id=project_id,
             user_id=current_user.id,
@@ -137,16 +173,7 @@ async def verify_project_access(
         )
         return placeholder
 
-    result = await db.execute(
-        select(ProjectMember).where(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == current_user.id,
-        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="You do not have access to this project",
     )
-    member = result.scalars().first()
-    if not member:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have access to this project",
-        )
-    return member
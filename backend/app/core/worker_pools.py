@@ -0,0 +1,93 @@
+"""
+Process pools for CPU-bound work (chart and PDF rendering, schedule simulations), and
+de-duplication of identical concurrent calls.
+
+Pools are started on first use with spawned, not forked, workers: the server process has an
+event loop and open sockets that a forked child would inherit. A pool whose worker died
+(e.g. out of memory) is discarded, so the next call starts a fresh one. ``shutdown_worker_pools``
+stops them all from the app lifespan.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from app.config import get_settings
+
+T = TypeVar("T")
+
+_pools: list["WorkerPool"] = []
+
+
+class WorkerPool:
+    """A lazily started pool of spawned processes, sized by the ``workers_setting`` setting."""
+
+    def __init__(self, workers_setting: str, initializer: Optional[Callable[[], None]] = None):
+        self.workers_setting = workers_setting
+        self.initializer = initializer
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        _pools.append(self)
+
+    def get(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=getattr(get_settings(), self.workers_setting),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        pool = self.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # Only the pool that broke: a concurrent call may already have started a fresh one
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def shutdown_worker_pools() -> None:
+    for pool in _pools:
+        pool.shutdown()
+
+
+class InflightCalls:
+    """Identical concurrent calls, keyed by the caller, share the first call's result."""
+
+    def __init__(self) -> None:
+        self._futures: dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        if key in self._futures:
+            return await asyncio.shield(self._futures[key])
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so an unawaited shared future doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._futures.pop(key, None)
+        future.set_result(result)
+        return result
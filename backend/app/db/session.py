@@ -1,11 +1,82 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
+from app.core.metrics import metrics
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+POOL_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a free connection."""
+
+    metrics_name = "primary"
+
+    def _do_get(self):
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.inc("db_pool_timeouts_total", pool=self.metrics_name)
+            raise
+        finally:
+            metrics.observe(
+                "db_pool_wait_ms", (time.monotonic() - start) * 1000,
+                buckets=POOL_WAIT_BUCKETS_MS, pool=self.metrics_name,
+            )
+
+
+def _record_pool_usage(pool: InstrumentedQueuePool) -> None:
+    metrics.set_gauge("db_pool_checked_out", pool.checkedout(), pool=pool.metrics_name)
+    metrics.set_gauge("db_pool_overflow", max(pool.overflow(), 0), pool=pool.metrics_name)
+
+
+def build_engine(url: str, name: str) -> AsyncEngine:
+    if url.startswith("sqlite"):
+        return create_async_engine(url, echo=settings.debug)
+
+    pool_class = type(f"{name.title()}QueuePool", (InstrumentedQueuePool,), {"metrics_name": name})
+    new_engine = create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=pool_class,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            # SQLAlchemy's own prepared-statement cache and asyncpg's; set both to 0 behind
+            # PgBouncer in transaction pooling mode
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+    pool = new_engine.sync_engine.pool
+
+    @event.listens_for(new_engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.inc("db_pool_checkouts_total", pool=name)
+        _record_pool_usage(pool)
+
+    @event.listens_for(new_engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        _record_pool_usage(pool)
+
+    metrics.set_gauge("db_pool_size", settings.db_pool_size, pool=name)
+    return new_engine
+
+
+engine = build_engine(settings.database_url, "primary")
+
+# Without a replica URL, reads share the primary engine and pool
+read_engine = build_engine(settings.database_read_url, "replica") if settings.database_read_url else engine
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -13,6 +84,12 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 class Base(DeclarativeBase):
     pass
@@ -26,3 +103,16 @@ async def get_db():
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db():
+    """Session for read-only endpoints; routed to the read replica when one is configured.
+
+    Replicas lag slightly behind the primary, so only use this where a just-written
+    row not showing up for a moment is acceptable.
+    """
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
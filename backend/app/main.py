@@ -16,6 +16,7 @@ from slowapi.errors import RateLimitExceeded
 from app.api.v1.router import api_router
 from app.config import get_settings
 from app.core.logging import RequestLoggingMiddleware, setup_logging
+from app.core.worker_pools import shutdown_worker_pools
 from app.middleware.rate_limiter import get_rate_limiter
 from app.db.seeds.checklist_templates import seed_checklist_templates
 from app.db.seeds.consultant_types import seed_consultant_types
@@ -23,7 +24,12 @@ from app.db.seeds.equipment_templates import seed_equipment_templates
 from app.db.seeds.inspection_templates import seed_inspection_templates
 from app.db.seeds.marketplace_templates import seed_marketplace
 from app.db.seeds.material_templates import seed_material_templates
+from app.services.collab_room_service import collab_service
+from app.services.integration_http import close_http_clients
 from app.services.mcp_server import mcp
+from app.services.pdf_render_service import PdfRenderError, PdfRenderTimeout, PdfTooLargeError
+from app.services.pubsub_broker import close_broker
+from app.services.websocket_manager import manager as ws_manager
 from app.utils.localization import get_language_from_request
 
 settings = get_settings()
@@ -61,6 +67,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error running database seeds: {e}")
     yield
+    await collab_service.shutdown()
+    await ws_manager.shutdown()
+    await close_broker()
+    shutdown_worker_pools()
+    await close_http_clients()
 
 
 class LanguageDetectionMiddleware(BaseHTTPMiddleware):
@@ -146,6 +157,18 @@ async def response_validation_error_handler(request: Request, exc: ResponseValid
     )
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
+
+@app.exception_handler(PdfRenderError)
+async def pdf_render_error_handler(request: Request, exc: PdfRenderError):
+    if isinstance(exc, PdfTooLargeError):
+        status_code = 413
+    elif isinstance(exc, PdfRenderTimeout):
+        status_code = 504
+    else:
+        status_code = 500
+    logger.warning("PDF render failed on %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse(status_code=status_code, content={"detail": str(exc)})
+
 app.add_middleware(RequestLoggingMiddleware)
 app.add_middleware(LanguageDetectionMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
@@ -1,8 +1,9 @@
 from app.models.acc_sync import AccProjectLink, AccUserMapping, RfiSyncLog
 from app.models.approval import ApprovalRequest, ApprovalStep
+from app.models.approval_decision import ApprovalDecision
 from app.models.area import AreaChecklistAssignment, AreaProgress, ConstructionArea
 from app.models.audit import AuditLog
-from app.models.batch_upload import BatchUpload
+from app.models.batch_upload import BatchUpload, BatchUploadFile
 from app.models.billing import BillingHistory, Invoice, PaymentMethod
 from app.models.bim import AutodeskConnection, BimModel
 from app.models.blueprint_extraction import BlueprintExtraction, BlueprintImport
@@ -17,7 +18,7 @@ from app.models.checklist import (
     ChecklistTemplate,
     ItemResponseStatus,
 )
-from app.models.collaborative_document import CollaborativeDocument, DocumentCollaborator
+from app.models.collaborative_document import CollaborativeDocument, CollaborativeDocumentUpdate, DocumentCollaborator
 from app.models.contact import Contact
 from app.models.contact_group import ContactGroup, ContactGroupMember
 from app.models.defect import Defect, DefectAssignee
@@ -27,6 +28,7 @@ from app.models.entity_version import EntityVersion
 from app.models.document_review import DocumentComment, DocumentReview, ReviewStatus
 from app.models.document_version import DocumentAnnotation, DocumentVersion
 from app.models.equipment import Equipment, EquipmentChecklist
+from app.models.equipment_submission import EquipmentSubmission
 from app.models.equipment_template import (
     ConsultantType,
     EquipmentApprovalDecision,
@@ -35,6 +37,7 @@ from app.models.equipment_template import (
     EquipmentTemplateConsultant,
 )
 from app.models.file import File
+from app.models.inbox_count import UserInboxCount
 from app.models.inspection import Finding, Inspection, InspectionStage
 from app.models.inspection_template import InspectionConsultantType, InspectionStageTemplate
 from app.models.invitation import ProjectInvitation
@@ -63,6 +66,7 @@ from app.models.permit import Permit, PermitStatus, PermitType
 from app.models.project import Project, ProjectMember
 from app.models.resource_permission import ResourcePermission
 from app.models.role import OrganizationRole, ProjectRole, Role
+from app.models.llm_response_cache import LLMResponseCache
 from app.models.scan_history import ScanHistory
 from app.models.rfi import RFI, RFICategory, RFIEmailLog, RFIPriority, RFIResponse, RFIStatus
 from app.models.risk_score import RiskLevel, RiskScore
@@ -72,7 +76,7 @@ from app.models.safety_incident import IncidentSeverity, IncidentStatus, SafetyI
 from app.models.safety_training import SafetyTraining, TrainingStatus
 from app.models.toolbox_talk import TalkAttendee, TalkStatus, ToolboxTalk
 from app.models.user import User
-from app.models.analytics import CustomKpiDefinition, KpiSnapshot
+from app.models.analytics import AnalyticsRollup, CustomKpiDefinition, KpiSnapshot
 from app.models.budget import BudgetLineItem, ChangeOrder, CostEntry
 from app.models.vendor import Vendor, VendorPerformance
 from app.models.organization import Organization, OrganizationMember
@@ -97,6 +101,7 @@ __all__ = [
     "Contact",
     "Equipment",
     "EquipmentChecklist",
+    "EquipmentSubmission",
     "ConsultantType",
     "EquipmentTemplate",
     "EquipmentTemplateConsultant",
@@ -121,6 +126,7 @@ __all__ = [
     "PermitStatus",
     "PermitType",
     "ApprovalRequest",
+    "ApprovalDecision",
     "ApprovalStep",
     "ConstructionArea",
     "AreaProgress",
@@ -178,6 +184,7 @@ __all__ = [
     "OrganizationMember",
     "CustomKpiDefinition",
     "KpiSnapshot",
+    "AnalyticsRollup",
     "PushSubscription",
     "Discussion",
     "UserCalendarToken",
@@ -214,7 +221,11 @@ __all__ = [
     "Vendor",
     "VendorPerformance",
     "ScanHistory",
+    "LLMResponseCache",
+    "UserInboxCount",
     "BatchUpload",
+    "BatchUploadFile",
     "CollaborativeDocument",
+    "CollaborativeDocumentUpdate",
     "DocumentCollaborator",
 ]
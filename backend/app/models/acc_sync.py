@@ -29,6 +29,8 @@ class AccProjectLink(Base):
     acc_project_id: Mapped[str] = mapped_column(String(255), nullable=False)
     acc_hub_id: Mapped[str] = mapped_column(String(255), nullable=False)
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Latest ACC updatedAt pulled in a complete sync; the next poll only asks for newer issues
+    acc_sync_watermark: Mapped[Optional[datetime]] = mapped_column(DateTime)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: utcnow())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: utcnow(), onupdate=lambda: utcnow()
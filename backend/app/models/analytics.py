@@ -1,7 +1,7 @@
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -49,3 +49,24 @@ class KpiSnapshot(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default="now()")
 
     kpi = relationship("CustomKpiDefinition", back_populates="snapshots")
+
+
+class AnalyticsRollup(Base):
+    """Entity counts per project, creation day and one categorical dimension.
+
+    Every source row counts once under the ``total`` dimension (value ``""``) and once per
+    rolled-up column, e.g. ``("status", "open")``. Kept current by the write hooks in
+    ``analytics_rollup_service``; a periodic rebuild reconciles database-side cascades.
+    """
+
+    __tablename__ = "analytics_rollups"
+    __table_args__ = (
+        Index("ix_analytics_rollups_entity_day", "entity_type", "day"),
+    )
+
+    project_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    entity_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    dimension: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[str] = mapped_column(String(100), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
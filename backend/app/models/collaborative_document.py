@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, LargeBinary, String
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, LargeBinary, String
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,6 +30,17 @@ class CollaborativeDocument(Base):
     collaborators = relationship("DocumentCollaborator", back_populates="document", cascade="all, delete-orphan")
 
 
+class CollaborativeDocumentUpdate(Base):
+    """Yjs update not yet compacted into ``CollaborativeDocument.yjs_state``."""
+
+    __tablename__ = "collaborative_document_updates"
+
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    document_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("collaborative_documents.id", ondelete="CASCADE"), index=True)
+    update: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: utcnow())
+
+
 class DocumentCollaborator(Base):
     __tablename__ = "document_collaborators"
 
@@ -5,8 +5,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -17,11 +17,14 @@ class ExportFormat(str, Enum):
     JSON = "json"
     CSV = "csv"
     ZIP = "zip"
+    PDF = "pdf"
 
 
 class ExportType(str, Enum):
     PROJECT = "project"
     ORGANIZATION = "organization"
+    # Rendered report PDFs, queued by the report endpoints rather than requested here
+    REPORT = "report"
 
 
 class ExportStatus(str, Enum):
@@ -43,6 +46,11 @@ class ExportJob(Base):
     file_path: Mapped[Optional[str]] = mapped_column(String(500))
     file_size: Mapped[Optional[int]] = mapped_column(BigInteger)
     error_message: Mapped[Optional[str]] = mapped_column(Text)
+    files_total: Mapped[int] = mapped_column(Integer, default=0)
+    files_processed: Mapped[int] = mapped_column(Integer, default=0)
+    bytes_written: Mapped[int] = mapped_column(BigInteger, default=0)
+    # Sealed archive segments and zip entries, so an interrupted ZIP export can resume
+    checkpoint: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     requested_by_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: utcnow())
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: utcnow(), onupdate=lambda: utcnow())
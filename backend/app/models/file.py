@@ -23,6 +23,7 @@ class File(Base):
     file_type: Mapped[Optional[str]] = mapped_column(String(100))
     file_size: Mapped[Optional[int]] = mapped_column(Integer)
     storage_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    checksum: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: utcnow())
     uploaded_by_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"))
     batch_upload_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("batch_uploads.id", ondelete="SET NULL"), nullable=True)
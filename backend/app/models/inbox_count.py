@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+from app.utils import utcnow
+
+
+class UserInboxCount(Base):
+    """Materialized inbox badge counts; a row is deleted whenever a change can alter that user's inbox."""
+
+    __tablename__ = "user_inbox_counts"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    approval_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    task_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rfi_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    meeting_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    defect_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Upcoming meetings drop out of the inbox as time passes, so counts also expire
+    valid_until: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: utcnow(), onupdate=lambda: utcnow())
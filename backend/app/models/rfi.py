@@ -54,7 +54,8 @@ class RFI(Base):
         Index("ix_rfis_status", "status"),
         Index("ix_rfis_rfi_number", "rfi_number"),
         Index("ix_rfis_email_thread_id", "email_thread_id"),
-        Index("ix_rfis_acc_rfi_id", "acc_rfi_id"),
+        # Unique so ACC sync can upsert on it; NULLs (RFIs never synced) don't collide
+        Index("uq_rfis_acc_rfi_id", "acc_rfi_id", unique=True),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
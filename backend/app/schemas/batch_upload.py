@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.core.validators import CamelCaseModel
 from app.schemas.user import UserResponse
@@ -18,6 +18,31 @@ class BatchUploadCreate(BaseModel):
     floor: Optional[str] = None
 
 
+class BatchUploadFileSpec(CamelCaseModel):
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(default="application/octet-stream", max_length=100)
+    size: int = Field(ge=0)
+    sha256: Optional[str] = Field(default=None, pattern=r"^[0-9a-fA-F]{64}$")
+
+
+class BatchUploadSessionCreate(CamelCaseModel):
+    entity_type: str = "project"
+    entity_id: Optional[UUID] = None
+    category: Optional[str] = None
+    building: Optional[str] = None
+    floor: Optional[str] = None
+    files: list[BatchUploadFileSpec] = Field(min_length=1)
+
+
+class BatchUploadFileProgress(CamelCaseModel):
+    id: UUID
+    filename: str
+    size: int
+    received_bytes: int
+    status: str
+    error: Optional[str] = None
+
+
 class BatchUploadFileResponse(CamelCaseModel):
     id: UUID
     filename: str
@@ -33,6 +58,9 @@ class BatchUploadResponse(CamelCaseModel):
     total_files: int
     processed_files: int
     failed_files: int
+    total_tasks: int = 0
+    completed_tasks: int = 0
+    failed_tasks: int = 0
     status: str
     metadata_json: Optional[dict] = None
     created_at: datetime
@@ -46,9 +74,17 @@ class BatchUploadStatusResponse(CamelCaseModel):
     total_files: int
     processed_files: int
     failed_files: int
+    total_tasks: int = 0
+    completed_tasks: int = 0
+    failed_tasks: int = 0
     status: str
     metadata_json: Optional[dict] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
     uploader: Optional[UserResponse] = None
     files: list[BatchUploadFileResponse] = []
+
+
+class BatchUploadSessionResponse(BatchUploadResponse):
+    chunk_size: int
+    upload_files: list[BatchUploadFileProgress] = []
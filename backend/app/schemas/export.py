@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from app.core.validators import CamelCaseModel
 from app.models.export_job import ExportFormat, ExportType
@@ -18,6 +18,12 @@ class ExportRequest(BaseModel):
     project_id: Optional[UUID] = None
     organization_id: Optional[UUID] = None
 
+    @model_validator(mode="after")
+    def reject_report_exports(self) -> "ExportRequest":
+        if self.export_format == ExportFormat.PDF or self.export_type == ExportType.REPORT:
+            raise ValueError("PDF reports are requested from their report endpoints")
+        return self
+
 
 class ExportJobResponse(CamelCaseModel):
     """Response schema for export job data (auto-converts to camelCase)"""
@@ -30,6 +36,9 @@ class ExportJobResponse(CamelCaseModel):
     file_path: Optional[str] = None
     file_size: Optional[int] = None
     error_message: Optional[str] = None
+    files_total: int = 0
+    files_processed: int = 0
+    bytes_written: int = 0
     requested_by: Optional[UserResponse] = None
     created_at: datetime
     updated_at: datetime
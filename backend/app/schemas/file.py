@@ -17,5 +17,6 @@ class FileResponse(CamelCaseModel):
     file_type: Optional[str] = None
     file_size: Optional[int] = None
     storage_path: str
+    checksum: Optional[str] = None
     uploaded_at: datetime
     uploaded_by: UserResponse | None = None
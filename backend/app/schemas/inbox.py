@@ -35,7 +35,7 @@ class InboxRFIItem(CamelCaseModel):
     project_id: UUID
     project_name: str
     subject: str
-    rfi_number: int
+    rfi_number: str
     priority: str
     status: str
     due_date: Optional[date] = None
@@ -84,3 +84,4 @@ class InboxCountsResponse(CamelCaseModel):
 class InboxResponse(CamelCaseModel):
     counts: InboxCountsResponse
     items: list[InboxItem]
+    next_cursor: Optional[str] = None
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal, Optional
 from uuid import UUID
 
@@ -55,6 +55,33 @@ class WhatIfScenarioResponse(CamelCaseModel):
     total_project_delay_days: float
 
 
+class MonteCarloRequest(BaseModel):
+    iterations: int = Field(default=2000, ge=100, le=20000, description="Number of sampled schedules")
+    seed: Optional[int] = Field(default=None, description="Random seed, for reproducible runs")
+
+
+class TaskCriticality(CamelCaseModel):
+    task_id: UUID
+    task_title: str
+    criticality_index: float
+
+
+class MonteCarloResponse(CamelCaseModel):
+    project_id: UUID
+    iterations: int
+    deterministic_duration_days: float
+    mean_duration_days: float
+    p50_duration_days: float
+    p80_duration_days: float
+    p95_duration_days: float
+    project_start_date: date
+    p50_completion_date: date
+    p80_completion_date: date
+    p95_completion_date: date
+    task_criticality: list[TaskCriticality] = []
+    processing_time_ms: int
+
+
 class CriticalPathTask(CamelCaseModel):
     task_id: UUID
     task_title: str
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +10,11 @@ from app.utils import utcnow
 logger = logging.getLogger(__name__)
 
 
+def _to_naive_utc(value: datetime) -> datetime:
+    # Local timestamps are stored as naive UTC; ACC's carry an offset
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
 class ACCConflictResolver:
     """Handles conflict detection and resolution between ACC and BuilderOps."""
 
@@ -38,9 +43,9 @@ class ACCConflictResolver:
             return False
 
         try:
-            acc_updated_at = datetime.fromisoformat(
+            acc_updated_at = _to_naive_utc(datetime.fromisoformat(
                 acc_updated_str.replace("Z", "+00:00")
-            )
+            ))
         except Exception as e:
             logger.warning(f"Failed to parse ACC updatedAt: {e}")
             return False
@@ -191,7 +196,7 @@ class ACCConflictResolver:
             }
 
         try:
-            acc_updated_at = datetime.fromisoformat(acc_updated_str.replace("Z", "+00:00"))
+            acc_updated_at = _to_naive_utc(datetime.fromisoformat(acc_updated_str.replace("Z", "+00:00")))
         except Exception as e:
             logger.error(f"Failed to parse ACC timestamp: {e}")
             rfi.sync_status = "synced"
@@ -1,14 +1,12 @@
 import logging
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
 
-import httpx
-
-from app.services.aps_service import APSService
+from app.services.aps_service import APS_BASE_URL, APS_UPSTREAM, APSService
+from app.services.integration_http import get_http_client
 
 logger = logging.getLogger(__name__)
 
-APS_BASE_URL = "https://developer.api.autodesk.com"
-
 
 class ACCIssuesClient:
     """Client for ACC Issues API v2."""
@@ -17,6 +15,12 @@ class ACCIssuesClient:
         self.aps_service = aps_service
         self.base_url = APS_BASE_URL
 
+    async def _request(self, method: str, path: str, user_token: str, **kwargs: Any) -> dict[str, Any]:
+        headers = {"Authorization": f"Bearer {user_token}", **kwargs.pop("headers", {})}
+        resp = await get_http_client(APS_UPSTREAM).request(method, path, headers=headers, **kwargs)
+        resp.raise_for_status()
+        return resp.json()
+
     async def get_acc_projects(self, user_token: str) -> list[dict[str, Any]]:
         """
         List ACC projects for user.
@@ -27,13 +31,7 @@ class ACCIssuesClient:
         Returns:
             List of ACC projects
         """
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/construction/admin/v1/projects",
-                headers={"Authorization": f"Bearer {user_token}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        data = await self._request("GET", "/construction/admin/v1/projects", user_token)
         return data.get("results", [])
 
     async def list_acc_rfis(
@@ -42,30 +40,28 @@ class ACCIssuesClient:
         container_id: str,
         limit: int = 100,
         offset: int = 0,
+        updated_since: Optional[datetime] = None,
     ) -> dict[str, Any]:
         """
-        List ACC issues/RFIs with pagination.
+        List ACC issues/RFIs with pagination, in ascending ``updatedAt`` order.
 
         Args:
             user_token: User's 3-legged OAuth token
             container_id: ACC container ID (project container)
             limit: Maximum number of results per page
             offset: Pagination offset
+            updated_since: Only issues updated at or after this UTC time
 
         Returns:
             dict with 'results' and 'pagination' keys
         """
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/issues/v2/containers/{container_id}/issues",
-                headers={"Authorization": f"Bearer {user_token}"},
-                params={
-                    "limit": limit,
-                    "offset": offset,
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+        # Oldest change first, displayId breaking ties, so offsets are stable across pages
+        params: dict[str, Any] = {"limit": limit, "offset": offset, "sortBy": "updatedAt,displayId"}
+        if updated_since:
+            params["filter[updatedAt]"] = f"{updated_since.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}Z.."
+        return await self._request(
+            "GET", f"/issues/v2/containers/{container_id}/issues", user_token, params=params,
+        )
 
     async def get_acc_rfi(
         self,
@@ -84,13 +80,7 @@ class ACCIssuesClient:
         Returns:
             ACC issue data
         """
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{self.base_url}/issues/v2/containers/{container_id}/issues/{issue_id}",
-                headers={"Authorization": f"Bearer {user_token}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        return await self._request("GET", f"/issues/v2/containers/{container_id}/issues/{issue_id}", user_token)
 
     async def create_acc_rfi(
         self,
@@ -109,14 +99,11 @@ class ACCIssuesClient:
         Returns:
             Created ACC issue data
         """
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{self.base_url}/issues/v2/containers/{container_id}/issues",
-                json=issue_data,
-                headers={
-                    "Authorization": f"Bearer {user_token}",
-                    "Content-Type": "application/json",
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+        # A create is a POST, so the shared client doesn't retry it: a timed-out one may have gone through
+        return await self._request(
+            "POST",
+            f"/issues/v2/containers/{container_id}/issues",
+            user_token,
+            json=issue_data,
+            headers={"Content-Type": "application/json"},
+        )
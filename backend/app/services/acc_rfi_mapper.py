@@ -1,6 +1,7 @@
 import logging
+import re
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy import func, select
@@ -34,53 +35,83 @@ class ACCRFIMapper:
         """
         rfi_number = await self._generate_rfi_number(acc_issue)
 
-        subject = acc_issue.get("title", "ACC RFI")
-        question = acc_issue.get("description", "")
-
-        category = self._map_category(
-            acc_issue.get("issueType", {}).get("title", "")
-        )
-        priority = self._map_priority(acc_issue.get("priority", ""))
-        status = self._map_status(acc_issue.get("status", ""))
-
         created_by_email = acc_issue.get("createdBy", {}).get("email", "")
-        created_by_id = await user_mapper.map_acc_user_to_builderops_user(
-            created_by_email,
-            project_id
-        )
-
+        user_ids = {
+            created_by_email: await user_mapper.map_acc_user_to_builderops_user(created_by_email, project_id),
+        }
         assigned_to_email = acc_issue.get("assignedTo", {}).get("email")
-        assigned_to_id = None
         if assigned_to_email:
-            assigned_to_id = await user_mapper.map_acc_user_to_builderops_user(
+            user_ids[assigned_to_email] = await user_mapper.map_acc_user_to_builderops_user(
                 assigned_to_email,
                 project_id
             )
 
-        to_email = assigned_to_email or created_by_email or "noreply@autodesk.com"
-        to_name = acc_issue.get("assignedTo", {}).get("name")
+        return {"rfi_number": rfi_number, **self.map_issue_fields(acc_issue, user_ids)}
 
-        due_date = self._parse_due_date(acc_issue.get("dueDate"))
-        location = acc_issue.get("location", {}).get("name")
-        attachments = self._map_attachments(acc_issue.get("attachments", []))
+    def map_issue_fields(self, acc_issue: dict[str, Any], user_ids: dict[str, uuid.UUID]) -> dict[str, Any]:
+        """
+        Map the ACC-owned RFI fields of an issue, given its users already resolved by email.
+
+        Everything ``map_acc_issue_to_rfi`` returns except ``rfi_number``.
+        """
+        created_by_email = acc_issue.get("createdBy", {}).get("email", "")
+        assigned_to_email = acc_issue.get("assignedTo", {}).get("email")
 
         return {
-            "rfi_number": rfi_number,
-            "subject": subject,
-            "question": question,
-            "category": category,
-            "priority": priority,
-            "status": status,
-            "created_by_id": created_by_id,
-            "assigned_to_id": assigned_to_id,
-            "to_email": to_email,
-            "to_name": to_name,
+            "subject": acc_issue.get("title", "ACC RFI"),
+            "question": acc_issue.get("description", ""),
+            "category": self._map_category(acc_issue.get("issueType", {}).get("title", "")),
+            "priority": self._map_priority(acc_issue.get("priority", "")),
+            "status": self._map_status(acc_issue.get("status", "")),
+            "created_by_id": user_ids[created_by_email],
+            "assigned_to_id": user_ids.get(assigned_to_email) if assigned_to_email else None,
+            "to_email": assigned_to_email or created_by_email or "noreply@autodesk.com",
+            "to_name": acc_issue.get("assignedTo", {}).get("name"),
             "cc_emails": [],
-            "due_date": due_date,
-            "location": location,
-            "attachments": attachments
+            "due_date": self._parse_due_date(acc_issue.get("dueDate")),
+            "location": acc_issue.get("location", {}).get("name"),
+            "attachments": self._map_attachments(acc_issue.get("attachments", [])),
         }
 
+    async def allocate_rfi_numbers(self, acc_issues: list[dict[str, Any]]) -> dict[str, str]:
+        """
+        RFI numbers for a batch of new issues, keyed by ACC issue id.
+
+        Same scheme as ``_generate_rfi_number`` but with one lookup for the whole batch.
+        """
+        candidates = {
+            acc_issue["id"]: f"RFI-ACC-{acc_issue.get('displayId', acc_issue['id'])}"
+            for acc_issue in acc_issues
+        }
+        if not candidates:
+            return {}
+
+        result = await self.db.execute(
+            select(RFI.rfi_number).where(RFI.rfi_number.in_(set(candidates.values())))
+        )
+        taken = set(result.scalars().all())
+
+        numbers = {}
+        seq = None
+        prefix = f"RFI-ACC-{utcnow().year}-"
+        for issue_id, rfi_number in candidates.items():
+            if rfi_number in taken:
+                if seq is None:
+                    seq = await self._max_sequence(prefix)
+                seq += 1
+                rfi_number = f"{prefix}{seq:05d}"
+            taken.add(rfi_number)
+            numbers[issue_id] = rfi_number
+        return numbers
+
+    async def _max_sequence(self, prefix: str) -> int:
+        result = await self.db.execute(
+            select(func.max(RFI.rfi_number)).where(RFI.rfi_number.like(f"{prefix}%"))
+        )
+        max_number = result.scalar()
+        match = re.search(r"(\d+)$", max_number) if max_number else None
+        return int(match.group(1)) if match else 0
+
     async def _generate_rfi_number(self, acc_issue: dict[str, Any]) -> str:
         """Generate unique RFI number from ACC issue."""
         acc_issue_number = acc_issue.get("displayId", acc_issue.get("id", ""))
@@ -90,21 +121,8 @@ class ACCRFIMapper:
             select(RFI.rfi_number).where(RFI.rfi_number == rfi_number)
         )
         if result.scalar_one_or_none():
-            year = utcnow().year
-            prefix = f"RFI-ACC-{year}-"
-            result = await self.db.execute(
-                select(func.max(RFI.rfi_number)).where(
-                    RFI.rfi_number.like(f"{prefix}%")
-                )
-            )
-            max_number = result.scalar()
-            if max_number:
-                import re
-                match = re.search(r"(\d+)$", max_number)
-                seq = int(match.group(1)) + 1 if match else 1
-            else:
-                seq = 1
-            rfi_number = f"{prefix}{seq:05d}"
+            prefix = f"RFI-ACC-{utcnow().year}-"
+            rfi_number = f"{prefix}{await self._max_sequence(prefix) + 1:05d}"
 
         return rfi_number
 
@@ -151,9 +169,13 @@ class ACCRFIMapper:
             return None
 
         try:
-            return datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
+            due_date = datetime.fromisoformat(due_date_str.replace("Z", "+00:00"))
         except Exception:
             return None
+        # Stored as naive UTC like every other timestamp column
+        if due_date.tzinfo:
+            due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+        return due_date
 
     def _map_attachments(self, acc_attachments: list) -> list[dict[str, Any]]:
         """Map ACC attachments to RFI attachment format."""
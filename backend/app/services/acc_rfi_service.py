@@ -2,14 +2,14 @@ import logging
 import uuid
 from typing import Any
 
-import httpx
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.models.acc_sync import AccProjectLink, RfiSyncLog
 from app.models.rfi import RFI
-from app.services.aps_service import APSService
+from app.services.aps_service import APS_UPSTREAM, APSService
+from app.services.integration_http import get_http_client
 from app.services.rfi_service import RFIService
 from app.utils import utcnow
 
@@ -82,21 +82,23 @@ async def push_rfi_to_acc(db: AsyncSession, rfi: RFI, project_id: uuid.UUID) ->
     try:
         token = await get_acc_token(db)
         payload = map_rfi_to_acc_format(rfi)
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            if rfi.acc_rfi_id:
-                resp = await client.patch(
-                    f"{ACC_RFI_BASE}/projects/{link.acc_project_id}/rfis/{rfi.acc_rfi_id}",
-                    json=payload,
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-                )
-            else:
-                resp = await client.post(
-                    f"{ACC_RFI_BASE}/projects/{link.acc_project_id}/rfis",
-                    json=payload,
-                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-                )
-            resp.raise_for_status()
-            data = resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        if rfi.acc_rfi_id:
+            resp = await client.patch(
+                f"{ACC_RFI_BASE}/projects/{link.acc_project_id}/rfis/{rfi.acc_rfi_id}",
+                json=payload,
+                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+                timeout=30.0,
+            )
+        else:
+            resp = await client.post(
+                f"{ACC_RFI_BASE}/projects/{link.acc_project_id}/rfis",
+                json=payload,
+                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+                timeout=30.0,
+            )
+        resp.raise_for_status()
+        data = resp.json()
 
         if not rfi.acc_rfi_id:
             rfi.acc_rfi_id = data.get("id")
@@ -138,13 +140,14 @@ async def pull_rfis_from_acc(
 
     try:
         token = await get_acc_token(db)
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            resp = await client.get(
-                f"{ACC_RFI_BASE}/projects/{link.acc_project_id}/rfis",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            acc_rfis = resp.json().get("results", [])
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.get(
+            f"{ACC_RFI_BASE}/projects/{link.acc_project_id}/rfis",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=60.0,
+        )
+        resp.raise_for_status()
+        acc_rfis = resp.json().get("results", [])
 
     except Exception as exc:
         logger.error("Failed to pull RFIs from ACC for project %s: %s", project_id, exc)
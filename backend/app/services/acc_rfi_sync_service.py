@@ -1,15 +1,21 @@
+import asyncio
 import logging
 import uuid
-from typing import Any
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from typing import Any, Optional
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.config import get_settings
+from app.models.acc_sync import AccProjectLink
 from app.models.project import Project
 from app.models.rfi import RFI
 from app.services.acc_conflict_resolver import ACCConflictResolver
+from app.services.acc_issues_client import ACCIssuesClient
 from app.services.acc_polling_service import ACCPollingService
 from app.services.acc_rfi_mapper import ACCRFIMapper
 from app.services.acc_user_mapper import ACCUserMapper
@@ -18,6 +24,23 @@ from app.utils import utcnow
 
 logger = logging.getLogger(__name__)
 
+# Columns an ACC sync overwrites on an RFI that already exists
+UPSERT_UPDATE_FIELDS = (
+    "subject", "question", "category", "priority", "status", "assigned_to_id", "to_email", "to_name",
+    "cc_emails", "due_date", "location", "attachments", "sync_status", "last_synced_at", "updated_at",
+)
+
+
+def _parse_acc_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ACC ISO timestamp to naive UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
 
 class ACCRFISyncService:
     """Orchestrates ACC RFI sync operations."""
@@ -29,17 +52,20 @@ class ACCRFISyncService:
         self.mapper = ACCRFIMapper(db)
         self.conflict_resolver = ACCConflictResolver(db)
         self.user_mapper = ACCUserMapper(db)
+        self.issues_client = ACCIssuesClient(self.aps_service)
         self.poller = ACCPollingService(db, self.aps_service)
-        self.poller.sync_service = self  # Set reference for polling
 
     async def sync_project_rfis(
         self,
         project_id: uuid.UUID,
         user_id: uuid.UUID,
-        container_id: str
+        container_id: str,
+        full: bool = False,
     ) -> dict[str, Any]:
         """
         Pull RFIs from ACC and sync them to BuilderOps.
+
+        Only issues updated since the project link's watermark are pulled unless ``full``.
         Returns sync summary with created/updated counts and conflicts.
         """
         try:
@@ -52,183 +78,185 @@ class ACCRFISyncService:
             if not project:
                 raise ValueError(f"Project not found: {project_id}")
 
-            created_count = 0
-            updated_count = 0
-            conflict_count = 0
-            errors = []
-
-            offset = 0
-            limit = 100
-            has_more = True
-
-            while has_more:
+            result = await self.db.execute(
+                select(AccProjectLink).where(AccProjectLink.project_id == project_id)
+            )
+            link = result.scalar_one_or_none()
+            updated_since = link.acc_sync_watermark if link and not full else None
+
+            summary = {"created": 0, "updated": 0, "conflicts": 0, "errors": []}
+            # Latest updatedAt of each page that was synced, by offset
+            synced_pages: dict[int, Optional[datetime]] = {}
+
+            async for offset, acc_issues, error in self._fetch_pages(user_token, container_id, updated_since):
+                if error:
+                    logger.error(f"Failed to fetch ACC RFIs at offset {offset}: {error}")
+                    summary["errors"].append({"offset": offset, "error": str(error)})
+                    continue
                 try:
-                    acc_data = await self.aps_service.list_acc_rfis(
-                        user_token=user_token,
-                        container_id=container_id,
-                        limit=limit,
-                        offset=offset
-                    )
-
-                    acc_issues = acc_data.get("results", [])
-                    if not acc_issues:
-                        has_more = False
-                        break
-
-                    for acc_issue in acc_issues:
-                        try:
-                            result = await self._sync_single_rfi(
-                                acc_issue=acc_issue,
-                                project_id=project_id,
-                                container_id=container_id
-                            )
-
-                            if result == "created":
-                                created_count += 1
-                            elif result == "updated":
-                                updated_count += 1
-                            elif result == "conflict":
-                                conflict_count += 1
-
-                        except Exception as e:
-                            logger.error(f"Failed to sync ACC issue {acc_issue.get('id')}: {e}")
-                            errors.append({
-                                "issue_id": acc_issue.get("id"),
-                                "error": str(e)
-                            })
-
-                    offset += limit
-                    pagination = acc_data.get("pagination", {})
-                    total_results = pagination.get("totalResults", 0)
-                    has_more = offset < total_results
-
+                    async with self.db.begin_nested():
+                        counts = await self._sync_page(acc_issues, project_id)
                 except Exception as e:
-                    logger.error(f"Failed to fetch ACC RFIs at offset {offset}: {e}")
-                    errors.append({"offset": offset, "error": str(e)})
-                    has_more = False
+                    logger.error(f"Failed to sync ACC RFIs at offset {offset}: {e}")
+                    summary["errors"].append({"offset": offset, "error": str(e)})
+                    continue
+                for key, count in counts.items():
+                    summary[key] += count
+                synced_pages[offset] = max(
+                    filter(None, (_parse_acc_timestamp(i.get("updatedAt")) for i in acc_issues)), default=None,
+                )
+
+            if link:
+                link.acc_sync_watermark = self._advance_watermark(updated_since, synced_pages)
 
             await self.db.commit()
 
-            return {
-                "created": created_count,
-                "updated": updated_count,
-                "conflicts": conflict_count,
-                "errors": errors,
-                "synced_at": utcnow().isoformat()
-            }
+            return {**summary, "synced_at": utcnow().isoformat()}
 
         except Exception as e:
             logger.error(f"Failed to sync project RFIs: {e}")
             raise
 
-    async def _sync_single_rfi(
+    def _advance_watermark(
+        self, watermark: Optional[datetime], synced_pages: dict[int, Optional[datetime]],
+    ) -> Optional[datetime]:
+        """
+        Move the watermark over the pages synced in sequence from the first one.
+
+        Pages are sorted by ``updatedAt``, so everything before the first missing page is
+        older than what it held; moving past a gap, or past the newest issue seen when pages
+        arrive out of order, would skip the gap's issues for good.
+        """
+        offset = 0
+        while offset in synced_pages:
+            latest = synced_pages[offset]
+            if latest and (watermark is None or latest > watermark):
+                watermark = latest
+            offset += self.settings.acc_sync_page_size
+        return watermark
+
+    async def _fetch_pages(
         self,
-        acc_issue: dict[str, Any],
-        project_id: uuid.UUID,
-        container_id: str
-    ) -> str:
+        user_token: str,
+        container_id: str,
+        updated_since: Optional[datetime],
+    ) -> AsyncIterator[tuple[int, list[dict[str, Any]], Optional[Exception]]]:
         """
-        Sync a single ACC issue to BuilderOps.
-        Uses mapper, conflict_resolver, user_mapper.
-        Returns: 'created' | 'updated' | 'conflict'
+        Yield ``(offset, issues, error)`` for every page of matching issues.
+
+        The first page gives the total; the rest are fetched concurrently and yielded as they
+        arrive, while the caller writes each page to the database in turn.
         """
-        acc_rfi_id = acc_issue.get("id")
+        limit = self.settings.acc_sync_page_size
+
+        async def fetch(offset: int) -> tuple[int, dict[str, Any], Optional[Exception]]:
+            try:
+                data = await self.issues_client.list_acc_rfis(
+                    user_token=user_token,
+                    container_id=container_id,
+                    limit=limit,
+                    offset=offset,
+                    updated_since=updated_since,
+                )
+                return offset, data, None
+            except Exception as e:
+                return offset, {}, e
+
+        offset, first, error = await fetch(0)
+        yield offset, first.get("results", []), error
+        if error:
+            return
+
+        total_results = first.get("pagination", {}).get("totalResults", 0)
+        semaphore = asyncio.Semaphore(self.settings.acc_sync_page_concurrency)
+
+        async def bounded_fetch(offset: int) -> tuple[int, dict[str, Any], Optional[Exception]]:
+            async with semaphore:
+                return await fetch(offset)
+
+        pending = [asyncio.ensure_future(bounded_fetch(o)) for o in range(limit, total_results, limit)]
+        try:
+            for next_page in asyncio.as_completed(pending):
+                offset, data, error = await next_page
+                yield offset, data.get("results", []), error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _sync_page(self, acc_issues: list[dict[str, Any]], project_id: uuid.UUID) -> dict[str, int]:
+        """
+        Sync one page of ACC issues: one prefetch of their RFIs, one user lookup and one
+        bulk upsert, with conflicted RFIs flagged instead of overwritten.
+        """
+        acc_issues = [acc_issue for acc_issue in acc_issues if acc_issue.get("id")]
+        if not acc_issues:
+            return {"created": 0, "updated": 0, "conflicts": 0}
 
         result = await self.db.execute(
-            select(RFI)
-            .options(selectinload(RFI.created_by))
-            .where(RFI.acc_rfi_id == acc_rfi_id)
+            select(RFI).where(RFI.acc_rfi_id.in_([acc_issue["id"] for acc_issue in acc_issues]))
         )
-        existing_rfi = result.scalar_one_or_none()
-
-        if existing_rfi:
-            conflict = await self.conflict_resolver.detect_conflicts(
-                existing_rfi,
-                acc_issue,
-                self.mapper
-            )
-            if conflict:
-                existing_rfi.sync_status = "conflict"
-                await self.db.flush()
-                return "conflict"
+        existing = {rfi.acc_rfi_id: rfi for rfi in result.scalars().all()}
 
-            await self._update_rfi_from_acc(existing_rfi, acc_issue)
-            return "updated"
-        else:
-            await self._create_rfi_from_acc(acc_issue, project_id)
-            return "created"
-
-    async def _create_rfi_from_acc(
-        self,
-        acc_issue: dict[str, Any],
-        project_id: uuid.UUID,
-    ) -> RFI:
-        """Create a new RFI from ACC issue data."""
-        rfi_data = await self.mapper.map_acc_issue_to_rfi(
-            acc_issue,
-            project_id,
-            self.user_mapper
-        )
+        emails = set()
+        for acc_issue in acc_issues:
+            emails.add(acc_issue.get("createdBy", {}).get("email", ""))
+            if acc_issue.get("assignedTo", {}).get("email"):
+                emails.add(acc_issue["assignedTo"]["email"])
+        user_ids = await self.user_mapper.map_acc_users(emails, project_id)
 
-        rfi = RFI(
-            project_id=project_id,
-            rfi_number=rfi_data["rfi_number"],
-            subject=rfi_data["subject"],
-            question=rfi_data["question"],
-            category=rfi_data["category"],
-            priority=rfi_data["priority"],
-            status=rfi_data["status"],
-            created_by_id=rfi_data["created_by_id"],
-            assigned_to_id=rfi_data.get("assigned_to_id"),
-            to_email=rfi_data["to_email"],
-            to_name=rfi_data.get("to_name"),
-            cc_emails=rfi_data.get("cc_emails", []),
-            due_date=rfi_data.get("due_date"),
-            location=rfi_data.get("location"),
-            attachments=rfi_data.get("attachments", []),
-            acc_rfi_id=acc_issue.get("id"),
-            acc_origin=True,
-            sync_status="synced",
-            last_synced_at=utcnow(),
+        rfi_numbers = await self.mapper.allocate_rfi_numbers(
+            [acc_issue for acc_issue in acc_issues if acc_issue["id"] not in existing]
         )
 
-        self.db.add(rfi)
-        await self.db.flush()
-        await self.db.refresh(rfi)
-
-        logger.info(f"Created RFI {rfi.rfi_number} from ACC issue {acc_issue.get('id')}")
-        return rfi
-
-    async def _update_rfi_from_acc(
-        self,
-        rfi: RFI,
-        acc_issue: dict[str, Any],
-    ) -> None:
-        """Update existing RFI with ACC issue data."""
-        rfi_data = await self.mapper.map_acc_issue_to_rfi(
-            acc_issue,
-            rfi.project_id,
-            self.user_mapper
+        now = utcnow()
+        rows = []
+        created = updated = conflicts = 0
+        for acc_issue in acc_issues:
+            rfi = existing.get(acc_issue["id"])
+            if rfi and await self.conflict_resolver.detect_conflicts(rfi, acc_issue, self.mapper):
+                rfi.sync_status = "conflict"
+                conflicts += 1
+                continue
+
+            fields = self.mapper.map_issue_fields(acc_issue, user_ids)
+            if rfi:
+                # Keep who raised it and where it lives; only ACC-owned fields are refreshed
+                fields.update(project_id=rfi.project_id, rfi_number=rfi.rfi_number, created_by_id=rfi.created_by_id)
+                updated += 1
+            else:
+                fields.update(project_id=project_id, rfi_number=rfi_numbers[acc_issue["id"]])
+                created += 1
+            rows.append({
+                **fields,
+                "acc_rfi_id": acc_issue["id"],
+                "acc_origin": rfi.acc_origin if rfi else True,
+                "sync_status": "synced",
+                # Equal timestamps, so the next sync doesn't mistake this write for a local edit
+                "last_synced_at": now,
+                "updated_at": now,
+            })
+
+        if rows:
+            await self._upsert_rfis(rows)
+            # The prefetched objects are stale after the upsert
+            for rfi in existing.values():
+                if rfi.sync_status != "conflict":
+                    self.db.expunge(rfi)
+
+        logger.info(f"Synced ACC page: {created} created, {updated} updated, {conflicts} conflicts")
+        return {"created": created, "updated": updated, "conflicts": conflicts}
+
+    async def _upsert_rfis(self, rows: list[dict[str, Any]]) -> None:
+        insert = pg_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(RFI)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RFI.acc_rfi_id],
+                set_={field: stmt.excluded[field] for field in UPSERT_UPDATE_FIELDS},
+            ),
+            rows,
         )
 
-        rfi.subject = rfi_data["subject"]
-        rfi.question = rfi_data["question"]
-        rfi.category = rfi_data["category"]
-        rfi.priority = rfi_data["priority"]
-        rfi.status = rfi_data["status"]
-        rfi.assigned_to_id = rfi_data.get("assigned_to_id")
-        rfi.to_email = rfi_data["to_email"]
-        rfi.to_name = rfi_data.get("to_name")
-        rfi.cc_emails = rfi_data.get("cc_emails", [])
-        rfi.due_date = rfi_data.get("due_date")
-        rfi.location = rfi_data.get("location")
-        rfi.attachments = rfi_data.get("attachments", [])
-        rfi.sync_status = "synced"
-        rfi.last_synced_at = utcnow()
-
-        await self.db.flush()
-        logger.info(f"Updated RFI {rfi.rfi_number} from ACC issue {acc_issue.get('id')}")
-
     async def resolve_conflict(
         self,
         rfi: RFI,
@@ -54,6 +54,51 @@ class ACCUserMapper:
         new_user = await self._create_placeholder_user(email_lower)
         return new_user.id
 
+    async def map_acc_users(
+        self,
+        acc_user_emails: set[str],
+        project_id: uuid.UUID
+    ) -> dict[str, uuid.UUID]:
+        """
+        Batch form of ``map_acc_user_to_builderops_user``: one lookup for every email,
+        placeholder users created together for the ones not found.
+
+        Returns a mapping from each given email (as given) to its user id.
+        """
+        mapped: dict[str, uuid.UUID] = {}
+        if "" in acc_user_emails:
+            mapped[""] = await self._get_or_create_system_user()
+
+        by_lower: dict[str, list[str]] = {}
+        for email in acc_user_emails:
+            if email:
+                by_lower.setdefault(email.lower(), []).append(email)
+        if not by_lower:
+            return mapped
+
+        result = await self.db.execute(
+            select(User.id, func.lower(User.email)).where(func.lower(User.email).in_(by_lower))
+        )
+        found = {email_lower: user_id for user_id, email_lower in result.all()}
+
+        missing = [email_lower for email_lower in by_lower if email_lower not in found]
+        if missing:
+            new_users = [
+                User(email=email_lower, full_name=email_lower.split("@")[0].title(), is_active=True,
+                     company="External (ACC)")
+                for email_lower in missing
+            ]
+            self.db.add_all(new_users)
+            await self.db.flush()
+            for new_user in new_users:
+                found[new_user.email] = new_user.id
+            logger.info(f"Created {len(new_users)} external users for ACC project {project_id}")
+
+        for email_lower, emails in by_lower.items():
+            for email in emails:
+                mapped[email] = found[email_lower]
+        return mapped
+
     async def _find_user_by_email(self, email: str) -> Optional[User]:
         """Find user by email (case-insensitive)."""
         result = await self.db.execute(
@@ -4,7 +4,8 @@ from typing import Any, Optional
 import httpx
 from fastapi import HTTPException
 
-from app.services.aps_service import APSService
+from app.services.aps_service import APS_UPSTREAM, APSService
+from app.services.integration_http import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -59,47 +60,47 @@ class ACCWebhookClient:
         )
 
         try:
-            async with httpx.AsyncClient() as client:
-                hook_responses = []
-                for event_type in event_types:
-                    webhook_payload = {
-                        "callbackUrl": callback_url,
-                        "scope": {
-                            "container": container_id,
-                        },
-                        "hookAttribute": {
-                            "containerId": container_id,
-                        },
-                        "filter": "$[?(@.payload.containerId == '" + container_id + "')]",
-                    }
-
-                    resp = await client.post(
-                        f"{self.base_url}/systems/data/events/{event_type}-1.0/hooks",
-                        json=webhook_payload,
-                        headers={
-                            "Authorization": f"Bearer {user_token}",
-                            "Content-Type": "application/json",
-                        },
-                    )
-                    resp.raise_for_status()
-                    hook_data = resp.json()
-                    hook_responses.append({
-                        "event_type": event_type,
-                        "hook_id": hook_data.get("hookId"),
-                        "status": hook_data.get("status"),
-                    })
-
-                    logger.info(
-                        f"Registered webhook hook_id={hook_data.get('hookId')} "
-                        f"for event {event_type} on container {container_id}"
-                    )
-
-                return {
-                    "container_id": container_id,
-                    "callback_url": callback_url,
-                    "hooks": hook_responses,
+            client = get_http_client(APS_UPSTREAM)
+            hook_responses = []
+            for event_type in event_types:
+                webhook_payload = {
+                    "callbackUrl": callback_url,
+                    "scope": {
+                        "container": container_id,
+                    },
+                    "hookAttribute": {
+                        "containerId": container_id,
+                    },
+                    "filter": "$[?(@.payload.containerId == '" + container_id + "')]",
                 }
 
+                resp = await client.post(
+                    f"{self.base_url}/systems/data/events/{event_type}-1.0/hooks",
+                    json=webhook_payload,
+                    headers={
+                        "Authorization": f"Bearer {user_token}",
+                        "Content-Type": "application/json",
+                    },
+                )
+                resp.raise_for_status()
+                hook_data = resp.json()
+                hook_responses.append({
+                    "event_type": event_type,
+                    "hook_id": hook_data.get("hookId"),
+                    "status": hook_data.get("status"),
+                })
+
+                logger.info(
+                    f"Registered webhook hook_id={hook_data.get('hookId')} "
+                    f"for event {event_type} on container {container_id}"
+                )
+
+            return {
+                "container_id": container_id,
+                "callback_url": callback_url,
+                "hooks": hook_responses,
+            }
+
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"Failed to register ACC webhook: status={e.response.status_code}, "
@@ -143,19 +144,19 @@ class ACCWebhookClient:
         )
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.delete(
-                    f"{self.base_url}/systems/{system}/events/{event}/hooks/{hook_id}",
-                    headers={"Authorization": f"Bearer {user_token}"},
-                )
-                # 200 = deleted, 204 = no content (also success), 404 = already deleted
-                if resp.status_code in (200, 204, 404):
-                    logger.info(f"Successfully unregistered webhook {hook_id}")
-                    return True
-
-                resp.raise_for_status()
+            client = get_http_client(APS_UPSTREAM)
+            resp = await client.delete(
+                f"{self.base_url}/systems/{system}/events/{event}/hooks/{hook_id}",
+                headers={"Authorization": f"Bearer {user_token}"},
+            )
+            # 200 = deleted, 204 = no content (also success), 404 = already deleted
+            if resp.status_code in (200, 204, 404):
+                logger.info(f"Successfully unregistered webhook {hook_id}")
                 return True
 
+            resp.raise_for_status()
+            return True
+
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"Failed to unregister ACC webhook {hook_id}: "
@@ -5,11 +5,11 @@ import time
 from datetime import date
 from uuid import UUID
 
-from google import genai
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.services.email_service import EmailService, validate_email
+from app.services.llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -245,13 +245,12 @@ async def generate_weekly_progress_narrative(
     prompt_template = WEEKLY_PROGRESS_PROMPT_HE if language == "he" else WEEKLY_PROGRESS_PROMPT_EN
     prompt = prompt_template.format(data=json.dumps(weekly_data, indent=2))
 
-    client = genai.Client(api_key=api_key)
     model_name = settings.gemini_model
 
     contents = [prompt]
 
     start = time.time()
-    response = client.models.generate_content(model=model_name, contents=contents)
+    response = await get_llm_gateway().generate_content(contents, model=model_name, operation="generate_weekly_progress_narrative")
     elapsed_ms = int((time.time() - start) * 1000)
 
     if not response.text:
@@ -320,13 +319,12 @@ async def generate_inspection_summary_narrative(
     prompt_template = INSPECTION_SUMMARY_PROMPT_HE if language == "he" else INSPECTION_SUMMARY_PROMPT_EN
     prompt = prompt_template.format(data=json.dumps(inspection_data, indent=2))
 
-    client = genai.Client(api_key=api_key)
     model_name = settings.gemini_model
 
     contents = [prompt]
 
     start = time.time()
-    response = client.models.generate_content(model=model_name, contents=contents)
+    response = await get_llm_gateway().generate_content(contents, model=model_name, operation="generate_inspection_summary_narrative")
     elapsed_ms = int((time.time() - start) * 1000)
 
     if not response.text:
@@ -411,13 +409,12 @@ async def select_relevant_photos(
         max_photos=max_photos,
     )
 
-    client = genai.Client(api_key=api_key)
     model_name = settings.gemini_model
 
     contents = [prompt]
 
     start = time.time()
-    response = client.models.generate_content(model=model_name, contents=contents)
+    response = await get_llm_gateway().generate_content(contents, model=model_name, operation="select_relevant_photos")
     elapsed_ms = int((time.time() - start) * 1000)
 
     if not response.text:
@@ -1,10 +1,11 @@
 import json
 import time
 
-from google import genai
 from google.genai import types
 
 from app.config import get_settings
+from app.services.llm_cache_service import get_or_compute, prompt_version
+from app.services.llm_gateway import get_llm_gateway
 
 PROMPTS = {
     "extract_text": (
@@ -107,7 +108,7 @@ def parse_defects_response(text: str) -> list[dict]:
     return high_confidence if high_confidence else validated[:1]
 
 
-def analyze_defect_image(file_content: bytes, file_type: str, language: str = "en") -> dict:
+async def analyze_defect_image(file_content: bytes, file_type: str, language: str = "en") -> dict:
     settings = get_settings()
     api_key = settings.gemini_api_key
     if not api_key:
@@ -119,16 +120,26 @@ def analyze_defect_image(file_content: bytes, file_type: str, language: str = "e
         language=lang_name,
     )
 
-    client = genai.Client(api_key=api_key)
+    model_name = settings.gemini_model
+    return await get_or_compute(
+        file_content,
+        "defect_image",
+        model_name,
+        prompt_version(prompt),
+        lambda: _run_defect_analysis(file_content, file_type, prompt, model_name),
+        language=language,
+    )
+
+
+async def _run_defect_analysis(file_content: bytes, file_type: str, prompt: str, model_name: str) -> dict:
     mime_type = file_type or "image/jpeg"
     contents = [
         types.Part.from_bytes(data=file_content, mime_type=mime_type),
         prompt,
     ]
 
-    model_name = settings.gemini_model
     start = time.time()
-    response = client.models.generate_content(model=model_name, contents=contents)
+    response = await get_llm_gateway().generate_content(contents, model=model_name, operation="analyze_defect_image")
     elapsed_ms = int((time.time() - start) * 1000)
 
     if not response.text:
@@ -145,19 +156,28 @@ def analyze_defect_image(file_content: bytes, file_type: str, language: str = "e
     return {"defects": defects, "processing_time_ms": elapsed_ms}
 
 
-def analyze_document(file_content: bytes, file_type: str, analysis_type: str, model: str | None = None) -> dict:
+async def analyze_document(file_content: bytes, file_type: str, analysis_type: str, model: str | None = None) -> dict:
     settings = get_settings()
     api_key = settings.gemini_api_key
     if not api_key:
         raise ValueError("GEMINI_API_KEY is not configured")
 
     model_name = model or settings.gemini_model
-    client = genai.Client(api_key=api_key)
 
     prompt = PROMPTS.get(analysis_type)
     if not prompt:
         raise ValueError(f"Unknown analysis type: {analysis_type}. Must be one of: {list(PROMPTS.keys())}")
 
+    return await get_or_compute(
+        file_content,
+        f"document_{analysis_type}",
+        model_name,
+        prompt_version(prompt),
+        lambda: _run_document_analysis(file_content, file_type, prompt, model_name),
+    )
+
+
+async def _run_document_analysis(file_content: bytes, file_type: str, prompt: str, model_name: str) -> dict:
     mime_type = file_type or "application/octet-stream"
     contents = [
         types.Part.from_bytes(data=file_content, mime_type=mime_type),
@@ -165,7 +185,7 @@ def analyze_document(file_content: bytes, file_type: str, analysis_type: str, mo
     ]
 
     start = time.time()
-    response = client.models.generate_content(model=model_name, contents=contents)
+    response = await get_llm_gateway().generate_content(contents, model=model_name, operation="analyze_document")
     elapsed_ms = int((time.time() - start) * 1000)
 
     if not response.text:
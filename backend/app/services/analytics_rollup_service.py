@@ -0,0 +1,382 @@
+"""
+Daily analytics rollups.
+
+Dashboards count entities per project by status, severity and category. Rather than
+scanning every source table on each load, ``analytics_rollups`` keeps those counts per
+project and creation day, and the readers below sum the (far fewer) rollup rows.
+
+The counts are maintained inside the writing transaction: an ``after_flush`` hook turns
+the flushed inserts, deletes and dimension changes into count deltas and upserts them, so
+a rolled-back write leaves the rollups as they were. Where a change can't be read off the
+instances (attributes that were never loaded, bulk statements), the affected rollups are
+rebuilt with an ``INSERT ... SELECT`` instead. ``refresh_all_rollups`` rebuilds everything
+and runs periodically to absorb rows removed by database-side cascades.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import Any, Optional, Union
+from uuid import UUID
+
+from sqlalchemy import Date, Select, String, delete, event, func, insert, inspect, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import AsyncSessionLocal
+from app.models.analytics import AnalyticsRollup
+from app.models.approval import ApprovalRequest
+from app.models.area import ConstructionArea
+from app.models.budget import BudgetLineItem
+from app.models.checklist import ChecklistInstance
+from app.models.defect import Defect
+from app.models.equipment import Equipment
+from app.models.inspection import Inspection
+from app.models.material import Material
+from app.models.meeting import Meeting
+from app.models.project import Project
+from app.models.rfi import RFI
+from app.models.task import Task
+
+TOTAL_DIMENSION = "total"
+REBUILD_KEY = "analytics_rollup_rebuild"
+
+ProjectFilter = Union[list[UUID], Select]
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    model: type
+    # Rollup dimension -> model attribute
+    dimensions: dict[str, str]
+    project_field: str = "project_id"
+
+
+ROLLUP_SOURCES: dict[str, RollupSource] = {
+    "project": RollupSource(Project, {"status": "status"}, project_field="id"),
+    "equipment": RollupSource(Equipment, {"status": "status"}),
+    "material": RollupSource(Material, {"status": "status"}),
+    "inspection": RollupSource(Inspection, {"status": "status"}),
+    "rfi": RollupSource(RFI, {"status": "status", "priority": "priority", "category": "category"}),
+    "defect": RollupSource(Defect, {"status": "status", "severity": "severity", "category": "category"}),
+    "task": RollupSource(Task, {"status": "status", "priority": "priority"}),
+    "budget": RollupSource(BudgetLineItem, {"category": "category"}),
+    "checklist": RollupSource(ChecklistInstance, {"status": "status"}),
+    "area": RollupSource(ConstructionArea, {"status": "status"}),
+    "approval": RollupSource(ApprovalRequest, {"status": "current_status"}),
+    "meeting": RollupSource(Meeting, {"status": "status"}),
+}
+
+_ENTITY_BY_MODEL = {source.model: entity_type for entity_type, source in ROLLUP_SOURCES.items()}
+
+RollupKey = tuple[UUID, str, date, str, str]
+
+
+def _bucket(value: Any) -> str:
+    if value is None:
+        return ""
+    return value.value if isinstance(value, Enum) else str(value)
+
+
+def _keys(entity_type: str, source: RollupSource, values: dict) -> list[RollupKey]:
+    project_id = values[source.project_field]
+    day = values["created_at"].date()
+    keys = [(project_id, entity_type, day, TOTAL_DIMENSION, "")]
+    for dimension, field in source.dimensions.items():
+        keys.append((project_id, entity_type, day, dimension, _bucket(values[field])))
+    return keys
+
+
+def _fields(source: RollupSource) -> list[str]:
+    return [source.project_field, "created_at", *source.dimensions.values()]
+
+
+def _current_values(instance: Any, fields: list[str], new: bool = False) -> Optional[dict]:
+    values = inspect(instance).dict
+    if new:
+        # Columns never set on a new instance were inserted as NULL
+        values = {field: None for field in fields} | values
+    if any(field not in values for field in fields):
+        return None
+    return {field: values[field] for field in fields}
+
+
+def _previous_values(instance: Any, fields: list[str]) -> Optional[dict]:
+    attrs = inspect(instance).attrs
+    values = {}
+    for field in fields:
+        history = attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.unchanged:
+            values[field] = history.unchanged[0]
+        else:
+            # Never loaded, so the value the rollups counted is unknown
+            return None
+    return values
+
+
+def rebuild_statements(entity_type: str, project_ids: Optional[ProjectFilter] = None) -> list:
+    """Statements that recount one entity type's rollups from its source table."""
+    source = ROLLUP_SOURCES[entity_type]
+    model = source.model
+    project_column = getattr(model, source.project_field)
+    day = func.date(model.created_at, type_=Date)
+
+    def counted(dimension: str, value=None) -> Select:
+        query = (
+            select(
+                project_column,
+                literal(entity_type, String),
+                day,
+                literal(dimension, String),
+                literal("", String) if value is None else value,
+                func.count(),
+            )
+            .where(project_column.isnot(None), model.created_at.isnot(None))
+            .group_by(project_column, day, *([] if value is None else [value]))
+        )
+        return query if project_ids is None else query.where(project_column.in_(project_ids))
+
+    selects = [counted(TOTAL_DIMENSION)]
+    for dimension, field in source.dimensions.items():
+        selects.append(counted(dimension, func.coalesce(getattr(model, field), "")))
+
+    clear = delete(AnalyticsRollup).where(AnalyticsRollup.entity_type == entity_type)
+    if project_ids is not None:
+        clear = clear.where(AnalyticsRollup.project_id.in_(project_ids))
+    fill = insert(AnalyticsRollup).from_select(
+        ["project_id", "entity_type", "day", "dimension", "value", "count"],
+        union_all(*selects),
+    )
+    return [clear, fill]
+
+
+async def rebuild_rollups(db: AsyncSession, project_ids: Optional[list[UUID]] = None) -> None:
+    """Recount every entity type's rollups, for the given projects or all of them."""
+    for entity_type in ROLLUP_SOURCES:
+        for statement in rebuild_statements(entity_type, project_ids):
+            await db.execute(statement)
+
+
+async def refresh_all_rollups() -> dict:
+    """Rebuild all rollups, one transaction per entity type."""
+    async with AsyncSessionLocal() as db:
+        for entity_type in ROLLUP_SOURCES:
+            for statement in rebuild_statements(entity_type):
+                await db.execute(statement)
+            await db.commit()
+        rows = (await db.execute(select(func.count()).select_from(AnalyticsRollup))).scalar()
+    return {"entity_types": len(ROLLUP_SOURCES), "rows": rows}
+
+
+def _filtered(query: Select, projects: ProjectFilter, start: Optional[date], end: Optional[date]) -> Select:
+    query = query.where(AnalyticsRollup.project_id.in_(projects))
+    if start is not None:
+        query = query.where(AnalyticsRollup.day >= start)
+    if end is not None:
+        query = query.where(AnalyticsRollup.day <= end)
+    return query
+
+
+async def rollup_counts(
+    db: AsyncSession,
+    projects: ProjectFilter,
+    entity_types: list[str],
+    dimensions: list[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> dict[tuple[str, str], dict[str, int]]:
+    """Counts per ``(entity_type, dimension)`` and value, for entities created in ``[start, end]``."""
+    query = _filtered(
+        select(
+            AnalyticsRollup.entity_type,
+            AnalyticsRollup.dimension,
+            AnalyticsRollup.value,
+            func.sum(AnalyticsRollup.count).label("count"),
+        )
+        .where(AnalyticsRollup.entity_type.in_(entity_types), AnalyticsRollup.dimension.in_(dimensions))
+        .group_by(AnalyticsRollup.entity_type, AnalyticsRollup.dimension, AnalyticsRollup.value),
+        projects, start, end,
+    )
+    counts: dict[tuple[str, str], dict[str, int]] = {
+        (entity_type, dimension): {} for entity_type in entity_types for dimension in dimensions
+    }
+    for row in (await db.execute(query)).all():
+        if row.count:
+            counts[(row.entity_type, row.dimension)][row.value] = int(row.count)
+    return counts
+
+
+def total(counts: dict[tuple[str, str], dict[str, int]], entity_type: str) -> int:
+    return counts.get((entity_type, TOTAL_DIMENSION), {}).get("", 0)
+
+
+async def daily_totals(
+    db: AsyncSession,
+    projects: ProjectFilter,
+    entity_types: list[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> dict[str, dict[date, int]]:
+    """Entities created per day, by entity type."""
+    query = _filtered(
+        select(AnalyticsRollup.entity_type, AnalyticsRollup.day, func.sum(AnalyticsRollup.count).label("count"))
+        .where(AnalyticsRollup.entity_type.in_(entity_types), AnalyticsRollup.dimension == TOTAL_DIMENSION)
+        .group_by(AnalyticsRollup.entity_type, AnalyticsRollup.day)
+        .order_by(AnalyticsRollup.day),
+        projects, start, end,
+    )
+    totals: dict[str, dict[date, int]] = {entity_type: {} for entity_type in entity_types}
+    for row in (await db.execute(query)).all():
+        if row.count:
+            totals[row.entity_type][row.day] = int(row.count)
+    return totals
+
+
+async def project_totals(
+    db: AsyncSession, projects: ProjectFilter, entity_types: list[str],
+) -> dict[UUID, dict[str, int]]:
+    """Entity counts per project, by entity type."""
+    query = _filtered(
+        select(AnalyticsRollup.project_id, AnalyticsRollup.entity_type, func.sum(AnalyticsRollup.count).label("count"))
+        .where(AnalyticsRollup.entity_type.in_(entity_types), AnalyticsRollup.dimension == TOTAL_DIMENSION)
+        .group_by(AnalyticsRollup.project_id, AnalyticsRollup.entity_type),
+        projects, None, None,
+    )
+    totals: dict[UUID, dict[str, int]] = defaultdict(dict)
+    for row in (await db.execute(query)).all():
+        totals[row.project_id][row.entity_type] = int(row.count or 0)
+    return totals
+
+
+def _collect_deltas(session: Session) -> tuple[dict[RollupKey, int], set[tuple[Any, str]]]:
+    deltas: dict[RollupKey, int] = defaultdict(int)
+    rebuilds: set[tuple[Any, str]] = set()
+
+    def tally(entity_type: str, source: RollupSource, values: Optional[dict], sign: int, project_id: Any) -> None:
+        if values is None or values["created_at"] is None:
+            rebuilds.add((project_id, entity_type))
+            return
+        if values[source.project_field] is None:
+            return
+        for key in _keys(entity_type, source, values):
+            deltas[key] += sign
+
+    for instance in session.new:
+        entity_type = _ENTITY_BY_MODEL.get(type(instance))
+        if entity_type:
+            source = ROLLUP_SOURCES[entity_type]
+            values = _current_values(instance, _fields(source), new=True)
+            tally(entity_type, source, values, 1, values and values[source.project_field])
+
+    for instance in session.dirty:
+        entity_type = _ENTITY_BY_MODEL.get(type(instance))
+        if not entity_type:
+            continue
+        source = ROLLUP_SOURCES[entity_type]
+        fields = _fields(source)
+        attrs = inspect(instance).attrs
+        if not any(attrs[field].history.has_changes() for field in fields):
+            continue
+        before = _previous_values(instance, fields)
+        after = _current_values(instance, fields)
+        project_id = (after or before or {}).get(source.project_field)
+        if before is None or after is None:
+            rebuilds.add((project_id, entity_type))
+            if before and before[source.project_field] != project_id:
+                rebuilds.add((before[source.project_field], entity_type))
+            continue
+        tally(entity_type, source, before, -1, before[source.project_field])
+        tally(entity_type, source, after, 1, project_id)
+
+    for instance in session.deleted:
+        entity_type = _ENTITY_BY_MODEL.get(type(instance))
+        if entity_type:
+            source = ROLLUP_SOURCES[entity_type]
+            values = _previous_values(instance, _fields(source))
+            project_id = values[source.project_field] if values else inspect(instance).dict.get(source.project_field)
+            tally(entity_type, source, values, -1, project_id)
+
+    # A deleted project's rollups go with it (the foreign key cascades)
+    gone = {instance.id for instance in session.deleted if isinstance(instance, Project)}
+    deltas = {key: delta for key, delta in deltas.items() if delta and key[0] not in gone}
+    rebuilds = {(project_id, entity_type) for project_id, entity_type in rebuilds if project_id not in gone}
+    return deltas, rebuilds
+
+
+def _apply(connection, deltas: dict[RollupKey, int], rebuilds: set[tuple[Any, str]]) -> None:
+    everywhere = {entity_type for project_id, entity_type in rebuilds if project_id is None}
+    for entity_type in everywhere:
+        for statement in rebuild_statements(entity_type):
+            connection.execute(statement)
+    by_entity: dict[str, list] = defaultdict(list)
+    for project_id, entity_type in rebuilds:
+        if entity_type not in everywhere:
+            by_entity[entity_type].append(project_id)
+    for entity_type, project_ids in by_entity.items():
+        for statement in rebuild_statements(entity_type, project_ids):
+            connection.execute(statement)
+
+    rows = [
+        {"project_id": project_id, "entity_type": entity_type, "day": day, "dimension": dimension, "value": value, "count": delta}
+        for (project_id, entity_type, day, dimension, value), delta in deltas.items()
+        if entity_type not in everywhere and project_id not in by_entity.get(entity_type, ())
+    ]
+    if not rows:
+        return
+    upsert = (pg_insert if connection.dialect.name == "postgresql" else sqlite_insert)(AnalyticsRollup).values(rows)
+    connection.execute(upsert.on_conflict_do_update(
+        index_elements=["project_id", "entity_type", "day", "dimension", "value"],
+        set_={"count": AnalyticsRollup.count + upsert.excluded.count},
+    ))
+
+
+@event.listens_for(Session, "after_flush")
+def _update_rollups(session: Session, flush_context) -> None:
+    deltas, rebuilds = _collect_deltas(session)
+    if deltas or rebuilds:
+        # Same transaction as the write, so a rolled-back change keeps the old counts
+        _apply(session.connection(), deltas, rebuilds)
+
+
+def _bulk_rows(orm_execute_state) -> list[dict]:
+    """The parameter rows of an ORM bulk statement, e.g. ``session.execute(insert(Model), rows)``."""
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, dict):
+        return [parameters]
+    return list(parameters or ())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_changes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    entity_type = _ENTITY_BY_MODEL.get(mapper.class_) if mapper is not None else None
+    if not entity_type:
+        return
+    pending = orm_execute_state.session.info.setdefault(REBUILD_KEY, set())
+    project_field = ROLLUP_SOURCES[entity_type].project_field
+    rows = _bulk_rows(orm_execute_state) if orm_execute_state.is_insert else []
+    if rows and all(row.get(project_field) for row in rows):
+        # Inserted (or upserted) rows name their projects; recount just those
+        pending.update((row[project_field], entity_type) for row in rows)
+    else:
+        # The statement hasn't run yet; recount its entity type before the commit
+        pending.add((None, entity_type))
+
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_after_bulk_changes(session: Session) -> None:
+    rebuilds = session.info.pop(REBUILD_KEY, None)
+    if rebuilds:
+        _apply(session.connection(), {}, rebuilds)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bulk_changes(session: Session) -> None:
+    session.info.pop(REBUILD_KEY, None)
@@ -1,10 +1,17 @@
-from datetime import timedelta
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Sequence
+from datetime import date, timedelta
 from uuid import UUID
 
-from sqlalchemy import func, select, text
+from sqlalchemy import ColumnElement, func, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
 from app.models.analytics import CustomKpiDefinition, KpiSnapshot
 from app.models.area import ConstructionArea
 from app.models.budget import BudgetLineItem, CostEntry
@@ -17,8 +24,11 @@ from app.models.project import Project, ProjectMember
 from app.models.rfi import RFI
 from app.models.task import Task
 from app.models.user import User
+from app.services.analytics_rollup_service import daily_totals, project_totals
 from app.utils import utcnow
 
+logger = logging.getLogger(__name__)
+
 ENTITY_MODEL_MAP = {
     "equipment": Equipment,
     "material": Material,
@@ -32,55 +42,64 @@ ENTITY_MODEL_MAP = {
 }
 
 
-async def compute_kpi_value(db: AsyncSession, kpi: CustomKpiDefinition) -> float:
+def _kpi_aggregate(kpi: CustomKpiDefinition) -> tuple[type, ColumnElement] | None:
+    """The model a KPI aggregates over and its aggregate, with the KPI's filter as a FILTER clause.
+
+    Returns None for KPIs that always evaluate to 0 (unknown entity type or field).
+    """
     entity_type = kpi.entity_type
+    average = kpi.calculation == "average"
 
     if entity_type == "budget" and kpi.calculation in ("sum", "average"):
-        return await compute_budget_kpi(db, kpi)
+        column = getattr(CostEntry, kpi.field_name or "amount", None)
+        if column is None:
+            column = CostEntry.amount
+        return CostEntry, (func.avg if average else func.sum)(column)
 
     model = ENTITY_MODEL_MAP.get(entity_type)
     if model is None:
-        return 0.0
+        return None
 
-    if kpi.calculation == "count":
-        query = select(func.count(model.id))
-    elif kpi.calculation in ("average", "sum") and kpi.field_name:
+    if kpi.calculation in ("average", "sum") and kpi.field_name:
         column = getattr(model, kpi.field_name, None)
         if column is None:
-            return 0.0
-        agg_func = func.avg if kpi.calculation == "average" else func.sum
-        query = select(agg_func(column))
+            return None
+        aggregate = (func.avg if average else func.sum)(column)
     else:
-        query = select(func.count(model.id))
-
-    if kpi.project_id is not None and hasattr(model, "project_id"):
-        query = query.where(model.project_id == kpi.project_id)
+        aggregate = func.count(model.id)
 
     if kpi.filter_config and isinstance(kpi.filter_config, dict):
         status_filter = kpi.filter_config.get("status")
         if status_filter and hasattr(model, "status"):
-            query = query.where(model.status == status_filter)
+            aggregate = aggregate.filter(model.status == status_filter)
 
-    result = await db.execute(query)
-    value = result.scalar()
-    return float(value) if value is not None else 0.0
+    return model, aggregate
 
 
-async def compute_budget_kpi(db: AsyncSession, kpi: CustomKpiDefinition) -> float:
-    field_name = kpi.field_name or "amount"
-    column = getattr(CostEntry, field_name, None)
-    if column is None:
-        column = CostEntry.amount
+async def compute_kpi_values(db: AsyncSession, kpis: Sequence[CustomKpiDefinition]) -> dict[UUID, float]:
+    """Evaluate KPIs with one aggregate query per (source model, project)."""
+    values = {kpi.id: 0.0 for kpi in kpis}
+    groups: dict[tuple[type, UUID | None], list[tuple[UUID, ColumnElement]]] = defaultdict(list)
+    for kpi in kpis:
+        compiled = _kpi_aggregate(kpi)
+        if compiled is None:
+            continue
+        model, aggregate = compiled
+        project_id = kpi.project_id if hasattr(model, "project_id") else None
+        groups[(model, project_id)].append((kpi.id, aggregate))
 
-    agg_func = func.avg if kpi.calculation == "average" else func.sum
-    query = select(agg_func(column))
+    for (model, project_id), aggregates in groups.items():
+        query = select(*(aggregate for _, aggregate in aggregates)).select_from(model)
+        if project_id is not None:
+            query = query.where(model.project_id == project_id)
+        row = (await db.execute(query)).one()
+        for (kpi_id, _), value in zip(aggregates, row):
+            values[kpi_id] = float(value) if value is not None else 0.0
+    return values
 
-    if kpi.project_id is not None:
-        query = query.where(CostEntry.project_id == kpi.project_id)
 
-    result = await db.execute(query)
-    value = result.scalar()
-    return float(value) if value is not None else 0.0
+async def compute_kpi_value(db: AsyncSession, kpi: CustomKpiDefinition) -> float:
+    return (await compute_kpi_values(db, [kpi]))[kpi.id]
 
 
 def compute_kpi_status(value: float, target: float | None, threshold: float | None) -> str:
@@ -93,31 +112,70 @@ def compute_kpi_status(value: float, target: float | None, threshold: float | No
     return "off_track"
 
 
-async def record_kpi_snapshots(db: AsyncSession, project_id: UUID) -> int:
-    today = utcnow().date()
+async def _upsert_kpi_snapshots(db: AsyncSession, values: dict[UUID, float], snapshot_date: date) -> None:
+    if not values:
+        return
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(KpiSnapshot).values([
+        {"kpi_id": kpi_id, "value": value, "snapshot_date": snapshot_date}
+        for kpi_id, value in values.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[KpiSnapshot.kpi_id, KpiSnapshot.snapshot_date],
+        set_={"value": stmt.excluded.value},
+    ))
+
+
+async def record_projects_kpi_snapshots(db: AsyncSession, project_ids: Sequence[UUID]) -> int:
     query = select(CustomKpiDefinition).where(
-        CustomKpiDefinition.project_id == project_id,
+        CustomKpiDefinition.project_id.in_(project_ids),
         CustomKpiDefinition.is_active == True,
     )
     result = await db.execute(query)
     kpis = result.scalars().all()
 
-    count = 0
-    for kpi in kpis:
-        value = await compute_kpi_value(db, kpi)
-        stmt = pg_insert(KpiSnapshot).values(
-            kpi_id=kpi.id,
-            value=value,
-            snapshot_date=today,
-        ).on_conflict_do_update(
-            constraint="uq_kpi_snapshot_date",
-            set_={"value": value},
-        )
-        await db.execute(stmt)
-        count += 1
-
+    values = await compute_kpi_values(db, kpis)
+    await _upsert_kpi_snapshots(db, values, utcnow().date())
     await db.flush()
-    return count
+    return len(values)
+
+
+async def record_kpi_snapshots(db: AsyncSession, project_id: UUID) -> int:
+    return await record_projects_kpi_snapshots(db, [project_id])
+
+
+async def record_all_kpi_snapshots() -> dict:
+    """Snapshot every project's active KPIs; batches of projects run concurrently, each in its own transaction."""
+    settings = get_settings()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CustomKpiDefinition.project_id)
+            .where(CustomKpiDefinition.is_active == True, CustomKpiDefinition.project_id.isnot(None))
+            .distinct()
+        )
+        project_ids = list(result.scalars().all())
+
+    batch_size = max(1, settings.kpi_snapshot_batch_size)
+    batches = [project_ids[i:i + batch_size] for i in range(0, len(project_ids), batch_size)]
+    semaphore = asyncio.Semaphore(max(1, settings.kpi_snapshot_concurrency))
+
+    async def record(batch: list[UUID]) -> int | None:
+        async with semaphore:
+            try:
+                async with AsyncSessionLocal() as db:
+                    count = await record_projects_kpi_snapshots(db, batch)
+                    await db.commit()
+                    return count
+            except Exception:
+                logger.exception("KPI snapshots failed for %d projects", len(batch))
+                return None
+
+    counts = await asyncio.gather(*(record(batch) for batch in batches))
+    return {
+        "projects": len(project_ids),
+        "snapshots": sum(count for count in counts if count is not None),
+        "failed_batches": sum(1 for count in counts if count is None),
+    }
 
 
 async def get_kpi_trend(db: AsyncSession, kpi_id: UUID, days: int = 14) -> list[dict]:
@@ -134,6 +192,22 @@ async def get_kpi_trend(db: AsyncSession, kpi_id: UUID, days: int = 14) -> list[
     return [{"snapshot_date": row.snapshot_date, "value": row.value} for row in result.all()]
 
 
+async def get_kpi_trends(db: AsyncSession, kpi_ids: Sequence[UUID], days: int = 14) -> dict[UUID, list[dict]]:
+    start_date = utcnow().date() - timedelta(days=days)
+    query = (
+        select(KpiSnapshot.kpi_id, KpiSnapshot.snapshot_date, KpiSnapshot.value)
+        .where(
+            KpiSnapshot.kpi_id.in_(kpi_ids),
+            KpiSnapshot.snapshot_date >= start_date,
+        )
+        .order_by(KpiSnapshot.snapshot_date)
+    )
+    trends: dict[UUID, list[dict]] = {kpi_id: [] for kpi_id in kpi_ids}
+    for row in (await db.execute(query)).all():
+        trends[row.kpi_id].append({"snapshot_date": row.snapshot_date, "value": row.value})
+    return trends
+
+
 async def get_entity_trends(
     db: AsyncSession,
     entity_type: str,
@@ -141,33 +215,22 @@ async def get_entity_trends(
     days: int = 30,
     user_id: UUID | None = None,
 ) -> list[dict]:
-    model = ENTITY_MODEL_MAP.get(entity_type)
-    if model is None:
+    if entity_type not in ENTITY_MODEL_MAP:
         return []
 
-    date_trunc = func.date_trunc("day", model.created_at)
-
-    query = (
-        select(date_trunc.label("day"), func.count(model.id).label("count"))
-        .where(model.created_at >= func.now() - text(f"interval '{days} days'"))
-        .group_by(date_trunc)
-        .order_by(date_trunc)
-    )
-
-    if project_id is not None and hasattr(model, "project_id"):
-        query = query.where(model.project_id == project_id)
-    elif user_id is not None and hasattr(model, "project_id"):
-        accessible_projects = select(ProjectMember.project_id).where(
-            ProjectMember.user_id == user_id
-        )
-        query = query.where(model.project_id.in_(accessible_projects))
+    if project_id is not None:
+        projects = [project_id]
+    elif user_id is not None:
+        projects = select(ProjectMember.project_id).where(ProjectMember.user_id == user_id)
+    else:
+        projects = select(Project.id)
 
-    result = await db.execute(query)
-    rows = result.all()
+    start_date = utcnow().date() - timedelta(days=days)
+    totals = await daily_totals(db, projects, [entity_type], start=start_date)
 
     return [
-        {"date": row.day.strftime("%Y-%m-%d"), "count": row.count}
-        for row in rows
+        {"date": day.strftime("%Y-%m-%d"), "count": count}
+        for day, count in totals[entity_type].items()
     ]
 
 
@@ -176,43 +239,27 @@ async def get_project_benchmarks(db: AsyncSession, user: User) -> list[dict]:
         select(ProjectMember.project_id)
         .where(ProjectMember.user_id == user.id)
     )
-    if user.is_super_admin:
-        project_query = select(Project.id, Project.name)
-    else:
-        project_query = (
-            select(Project.id, Project.name)
-            .where(Project.id.in_(membership_query))
-        )
-
-    projects_result = await db.execute(project_query)
+    accessible = select(Project.id) if user.is_super_admin else membership_query
+    projects_result = await db.execute(
+        select(Project.id, Project.name).where(Project.id.in_(accessible))
+    )
     projects = projects_result.all()
 
     if not projects:
         return []
 
-    project_ids = [p.id for p in projects]
-    project_name_map = {p.id: p.name for p in projects}
-
-    metrics_map = {pid: {} for pid in project_ids}
-    for entity_type, model in ENTITY_MODEL_MAP.items():
-        if not hasattr(model, "project_id"):
-            continue
-        result = await db.execute(
-            select(model.project_id, func.count(model.id))
-            .where(model.project_id.in_(project_ids))
-            .group_by(model.project_id)
-        )
-        for row in result.all():
-            metrics_map[row[0]][f"{entity_type}_count"] = float(row[1])
+    totals = await project_totals(db, accessible, list(ENTITY_MODEL_MAP))
 
     benchmarks = []
-    for pid in project_ids:
-        metrics = {}
-        for entity_type in ENTITY_MODEL_MAP:
-            metrics[f"{entity_type}_count"] = metrics_map.get(pid, {}).get(f"{entity_type}_count", 0.0)
+    for project in projects:
+        counts = totals.get(project.id, {})
+        metrics = {
+            f"{entity_type}_count": float(counts.get(entity_type, 0))
+            for entity_type in ENTITY_MODEL_MAP
+        }
         benchmarks.append({
-            "project_id": pid,
-            "project_name": project_name_map[pid],
+            "project_id": project.id,
+            "project_name": project.name,
             "metrics": metrics,
         })
 
@@ -14,11 +14,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import Settings
 from app.models.bim import AutodeskConnection
+from app.services.integration_http import Upstream, get_http_client
 from app.utils import utcnow
 
 logger = logging.getLogger(__name__)
 
 APS_BASE_URL = "https://developer.api.autodesk.com"
+APS_UPSTREAM = Upstream("aps", APS_BASE_URL)
 
 
 class APSService:
@@ -42,18 +44,20 @@ class APSService:
             if APSService.cached_token and time.time() < APSService.token_expires_at:
                 return APSService.cached_token
 
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(
-                    f"{APS_BASE_URL}/authentication/v2/token",
-                    data={
-                        "grant_type": "client_credentials",
-                        "scope": "data:read data:write data:create bucket:read bucket:create",
-                    },
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    auth=(self.client_id, self.client_secret),
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            client = get_http_client(APS_UPSTREAM)
+            resp = await client.post(
+                f"{APS_BASE_URL}/authentication/v2/token",
+                data={
+                    "grant_type": "client_credentials",
+                    "scope": "data:read data:write data:create bucket:read bucket:create",
+                },
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                auth=(self.client_id, self.client_secret),
+                # A client-credentials grant is safe to repeat
+                retry=True,
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             APSService.cached_token = data["access_token"]
             APSService.token_expires_at = time.time() + data.get("expires_in", 3600) - 60
@@ -62,19 +66,21 @@ class APSService:
     async def ensure_bucket(self, bucket_key: str) -> dict[str, Any]:
         """Ensure OSS bucket exists, create if needed."""
         token = await self.get_2legged_token()
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{APS_BASE_URL}/oss/v2/buckets",
-                json={
-                    "bucketKey": bucket_key,
-                    "policyKey": "persistent",
-                },
-                headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
-            )
-            if resp.status_code == 409:
-                return {"bucketKey": bucket_key}
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.post(
+            f"{APS_BASE_URL}/oss/v2/buckets",
+            json={
+                "bucketKey": bucket_key,
+                "policyKey": "persistent",
+            },
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+            # Repeating a create that went through just answers 409
+            retry=True,
+        )
+        if resp.status_code == 409:
+            return {"bucketKey": bucket_key}
+        resp.raise_for_status()
+        return resp.json()
 
     async def upload_object(
         self,
@@ -85,57 +91,58 @@ class APSService:
     ) -> dict[str, Any]:
         """Upload object to OSS bucket."""
         token = await self.get_2legged_token()
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            resp = await client.put(
-                f"{APS_BASE_URL}/oss/v2/buckets/{bucket_key}/objects/{urllib.parse.quote(object_key, safe='')}",
-                content=content,
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": content_type,
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.put(
+            f"{APS_BASE_URL}/oss/v2/buckets/{bucket_key}/objects/{urllib.parse.quote(object_key, safe='')}",
+            content=content,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": content_type,
+            },
+            timeout=300.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def translate_model(self, urn: str) -> dict[str, Any]:
         """Request model translation to SVF2 format."""
         token = await self.get_2legged_token()
         encoded_urn = base64.urlsafe_b64encode(urn.encode()).decode().rstrip("=")
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{APS_BASE_URL}/modelderivative/v2/designdata/job",
-                json={
-                    "input": {"urn": encoded_urn},
-                    "output": {
-                        "formats": [
-                            {
-                                "type": "svf2",
-                                "views": ["2d", "3d"],
-                                "advanced": {"generateMasterViews": True},
-                            }
-                        ]
-                    },
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.post(
+            f"{APS_BASE_URL}/modelderivative/v2/designdata/job",
+            json={
+                "input": {"urn": encoded_urn},
+                "output": {
+                    "formats": [
+                        {
+                            "type": "svf2",
+                            "views": ["2d", "3d"],
+                            "advanced": {"generateMasterViews": True},
+                        }
+                    ]
                 },
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                    "x-ads-force": "true",
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+            },
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "x-ads-force": "true",
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_translation_status(self, urn: str) -> dict[str, Any]:
         """Get model translation status and progress."""
         token = await self.get_2legged_token()
         encoded_urn = base64.urlsafe_b64encode(urn.encode()).decode().rstrip("=")
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/manifest",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.get(
+            f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/manifest",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         status = data.get("status", "pending")
         progress_str = data.get("progress", "0%")
@@ -169,34 +176,34 @@ class APSService:
 
     async def exchange_code(self, code: str) -> dict[str, Any]:
         """Exchange OAuth authorization code for tokens."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{APS_BASE_URL}/authentication/v2/token",
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "redirect_uri": self.callback_url,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                auth=(self.client_id, self.client_secret),
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.post(
+            f"{APS_BASE_URL}/authentication/v2/token",
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": self.callback_url,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            auth=(self.client_id, self.client_secret),
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def refresh_token(self, refresh_token_value: str) -> dict[str, Any]:
         """Refresh OAuth access token."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{APS_BASE_URL}/authentication/v2/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token_value,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                auth=(self.client_id, self.client_secret),
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.post(
+            f"{APS_BASE_URL}/authentication/v2/token",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token_value,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            auth=(self.client_id, self.client_secret),
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_user_token(self, db: AsyncSession, user_id: UUID) -> str:
         """Get user's 3-legged OAuth token, refreshing if expired."""
@@ -243,36 +250,38 @@ class APSService:
         """Get available views/viewables from translated model."""
         token = await self.get_2legged_token()
         encoded_urn = base64.urlsafe_b64encode(urn.encode()).decode().rstrip("=")
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/metadata",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.get(
+            f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/metadata",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp.raise_for_status()
+        data = resp.json()
         return data.get("data", {}).get("metadata", [])
 
     async def get_object_tree(self, urn: str, guid: str) -> dict[str, Any]:
         """Get model object tree for specific view."""
         token = await self.get_2legged_token()
         encoded_urn = base64.urlsafe_b64encode(urn.encode()).decode().rstrip("=")
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            resp = await client.get(
-                f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/metadata/{guid}",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.get(
+            f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/metadata/{guid}",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=180.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def get_object_properties(self, urn: str, guid: str) -> list[dict[str, Any]]:
         """Get properties for all objects in model view."""
         token = await self.get_2legged_token()
         encoded_urn = base64.urlsafe_b64encode(urn.encode()).decode().rstrip("=")
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            resp = await client.get(
-                f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/metadata/{guid}/properties",
-                headers={"Authorization": f"Bearer {token}"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        client = get_http_client(APS_UPSTREAM)
+        resp = await client.get(
+            f"{APS_BASE_URL}/modelderivative/v2/designdata/{encoded_urn}/metadata/{guid}/properties",
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=180.0,
+        )
+        resp.raise_for_status()
+        data = resp.json()
         return data.get("data", {}).get("collection", [])
@@ -0,0 +1,200 @@
+"""
+Streaming, resumable ZIP exports.
+
+The archive is written as a sequence of segments, each streamed straight into its own
+storage upload (multipart on S3, a resumable session on GCS) without holding the archive
+in memory. Small files are downloaded ahead with bounded concurrency; large ones are
+streamed from storage when their turn comes. Already-compressed media is STOREd.
+
+Whenever a segment is sealed, the writer state (byte offset, zip entry records, which
+sources are done) is checkpointed on the ``ExportJob``, so a failed or interrupted export
+resumes from the last sealed segment instead of starting over. The final segment carries
+the trailing entries and central directory; the segments are then joined server-side into
+the export object.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.export_job import ExportJob
+from app.services.storage_service import StorageBackend
+from app.utils.zip_stream import StreamingZipWriter, ZipEntryRecord
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+# (source key, archive name) for written entries, plus the skipped sources
+Trailer = Callable[[list[list[str]], list[dict]], list[tuple[str, bytes]]]
+
+
+@dataclass
+class ArchiveSource:
+    """One archive entry.
+
+    ``open`` returns the entry's chunks. Prefetched sources are opened ahead of time,
+    several at once (so ``open`` should load small content fully); the others are opened
+    only when their turn comes, so ``open`` can hand back a lazy storage stream.
+    """
+
+    key: str
+    name: str
+    open: Callable[[], Awaitable[AsyncIterable[bytes]]]
+    prefetch: bool = False
+    compress: bool = True
+    size: Optional[int] = None
+    modified: Optional[datetime] = None
+    label: Optional[str] = None
+
+
+async def iter_bytes(content: bytes) -> AsyncIterator[bytes]:
+    yield content
+
+
+class ArchiveExport:
+    def __init__(
+        self,
+        db: AsyncSession,
+        job: ExportJob,
+        storage: StorageBackend,
+        storage_path: str,
+        skip_failed: bool = True,
+    ):
+        settings = get_settings()
+        self.db = db
+        self.job = job
+        self.storage = storage
+        self.storage_path = storage_path
+        self.skip_failed = skip_failed
+        self.segment_bytes = settings.export_segment_bytes
+        self.concurrency = max(1, settings.export_fetch_concurrency)
+        self._last_report = 0.0
+
+    def segment_path(self, index: int) -> str:
+        return f"{self.storage_path}.parts/{index:05d}"
+
+    async def run(self, sources: list[ArchiveSource], trailer: Optional[Trailer] = None) -> int:
+        """Write (or finish writing) the archive and return its size."""
+        state = self.job.checkpoint or {"segments": [], "offset": 0, "entries": [], "written": [], "skipped": []}
+        writer = StreamingZipWriter(state["offset"], [ZipEntryRecord(**e) for e in state["entries"]])
+        done = {key for key, _ in state["written"]} | {s["id"] for s in state["skipped"]}
+        pending = [source for source in sources if source.key not in done]
+        if done:
+            logger.info("Resuming export %s after %d of %d entries", self.job.id, len(done), len(sources))
+
+        self.job.files_total = len(sources)
+        self.job.files_processed = len(done)
+        self.job.bytes_written = writer.offset
+        await self.db.commit()
+
+        ready = self._ready(pending)
+        finished = False
+        try:
+            while not finished:
+                written: list[list[str]] = []
+                skipped: list[dict] = []
+
+                async def segment() -> AsyncIterator[bytes]:
+                    nonlocal finished
+                    start = writer.offset
+                    while writer.offset - start < self.segment_bytes:
+                        item = await anext(ready, None)
+                        if item is None:
+                            closing = trailer(state["written"] + written, state["skipped"] + skipped) if trailer else []
+                            for name, content in closing:
+                                async for data in writer.write_bytes(name, content):
+                                    yield data
+                            yield writer.finish()
+                            finished = True
+                            return
+
+                        source, content = item
+                        if isinstance(content, Exception):
+                            if not self.skip_failed:
+                                raise content
+                            logger.warning("Skipping %s in export %s: %s", source.name, self.job.id, content)
+                            skipped.append({
+                                "id": source.key,
+                                "filename": source.label or source.name,
+                                "reason": f"Failed to retrieve: {content}",
+                            })
+                        else:
+                            async for data in writer.write_entry(
+                                source.name, content, source.compress, source.size, source.modified,
+                            ):
+                                yield data
+                            written.append([source.key, source.name])
+                        self.job.files_processed += 1
+                        self.job.bytes_written = writer.offset
+                        await self._report_progress()
+
+                index = len(state["segments"])
+                size = await self.storage.save_stream(segment(), self.segment_path(index), "application/zip")
+                state = {
+                    "segments": [*state["segments"], {"path": self.segment_path(index), "size": size}],
+                    "offset": writer.offset,
+                    "entries": [entry.to_dict() for entry in writer.entries],
+                    "written": state["written"] + written,
+                    "skipped": state["skipped"] + skipped,
+                }
+                self.job.checkpoint = state
+                self.job.bytes_written = writer.offset
+                await self.db.commit()
+        finally:
+            await ready.aclose()
+
+        part_paths = [segment["path"] for segment in state["segments"]]
+        file_size = await self.storage.concatenate(part_paths, self.storage_path, "application/zip")
+        for part_path in part_paths:
+            try:
+                await self.storage.delete_file(part_path)
+            except Exception as e:
+                logger.warning("Failed to delete export segment %s: %s", part_path, e)
+        self.job.checkpoint = None
+        return file_size
+
+    async def _ready(
+        self, sources: list[ArchiveSource],
+    ) -> AsyncIterator[tuple[ArchiveSource, Union[AsyncIterable[bytes], Exception]]]:
+        """Yield sources in order, keeping up to ``concurrency`` fetches in flight ahead."""
+        remaining = iter(sources)
+        window: deque[tuple[ArchiveSource, asyncio.Task]] = deque()
+
+        def schedule() -> None:
+            while len(window) < self.concurrency:
+                source = next(remaining, None)
+                if source is None:
+                    return
+                task = asyncio.create_task(source.open()) if source.prefetch else None
+                window.append((source, task))
+
+        try:
+            schedule()
+            while window:
+                source, task = window.popleft()
+                schedule()
+                try:
+                    content = await (task if task is not None else source.open())
+                except Exception as e:
+                    content = e
+                yield source, content
+        finally:
+            for _, task in window:
+                if task is not None:
+                    task.cancel()
+
+    async def _report_progress(self) -> None:
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_report = now
+        await self.db.commit()
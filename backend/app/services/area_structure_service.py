@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import func, select
+from sqlalchemy import distinct, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.area import AreaChecklistAssignment, ConstructionArea
 from app.models.checklist import ChecklistInstance, ChecklistItemResponse
@@ -133,51 +134,74 @@ async def create_checklists_for_area(
     return count
 
 
-async def compute_area_checklist_progress(
-    db: AsyncSession, area_id: uuid.UUID
-) -> dict:
-    """Compute checklist completion stats for an area and its children."""
-    area_ids = await collect_descendant_ids(db, area_id)
-    area_ids.append(area_id)
-
-    instance_result = await db.execute(
-        select(
-            func.count(ChecklistInstance.id),
-            func.count(ChecklistInstance.id).filter(ChecklistInstance.status == "completed"),
-        ).where(ChecklistInstance.area_id.in_(area_ids))
+def area_closure(project_id: uuid.UUID, root_ids: list[uuid.UUID] | None = None):
+    """Recursive CTE pairing each root area with itself and every area beneath it.
+
+    ``UNION`` (not ``UNION ALL``) drops repeated pairs, so a parent cycle ends the
+    recursion instead of looping.
+    """
+    anchor = select(
+        ConstructionArea.id.label("root_id"), ConstructionArea.id.label("area_id")
+    ).where(ConstructionArea.project_id == project_id)
+    if root_ids is not None:
+        anchor = anchor.where(ConstructionArea.id.in_(root_ids))
+    closure = anchor.cte("area_closure", recursive=True)
+    child = aliased(ConstructionArea)
+    return closure.union(
+        select(closure.c.root_id, child.id).join(child, child.parent_id == closure.c.area_id)
     )
-    row = instance_result.one()
-    total_instances = row[0]
-    completed_instances = row[1]
 
-    response_result = await db.execute(
+
+async def compute_areas_checklist_progress(
+    db: AsyncSession, project_id: uuid.UUID, area_ids: list[uuid.UUID] | None = None
+) -> dict[uuid.UUID, dict]:
+    """Checklist completion stats for each area (all of the project's by default), including its subtree."""
+    closure = area_closure(project_id, area_ids)
+    result = await db.execute(
         select(
+            closure.c.root_id,
+            func.count(distinct(ChecklistInstance.id)),
+            func.count(distinct(ChecklistInstance.id)).filter(ChecklistInstance.status == "completed"),
             func.count(ChecklistItemResponse.id),
             func.count(ChecklistItemResponse.id).filter(
                 ChecklistItemResponse.status.in_(["approved", "not_applicable"])
             ),
         )
-        .join(ChecklistInstance, ChecklistItemResponse.instance_id == ChecklistInstance.id)
-        .where(ChecklistInstance.area_id.in_(area_ids))
+        .select_from(closure)
+        .outerjoin(ChecklistInstance, ChecklistInstance.area_id == closure.c.area_id)
+        .outerjoin(ChecklistItemResponse, ChecklistItemResponse.instance_id == ChecklistInstance.id)
+        .group_by(closure.c.root_id)
     )
-    resp_row = response_result.one()
-
     return {
-        "total_instances": total_instances,
-        "completed_instances": completed_instances,
-        "total_items": resp_row[0],
-        "completed_items": resp_row[1],
-        "completion_percentage": round(resp_row[1] / resp_row[0] * 100, 1) if resp_row[0] > 0 else 0,
+        root_id: {
+            "total_instances": total_instances,
+            "completed_instances": completed_instances,
+            "total_items": total_items,
+            "completed_items": completed_items,
+            "completion_percentage": round(completed_items / total_items * 100, 1) if total_items > 0 else 0,
+        }
+        for root_id, total_instances, completed_instances, total_items, completed_items in result.all()
     }
 
 
-async def collect_descendant_ids(db: AsyncSession, parent_id: uuid.UUID) -> list[uuid.UUID]:
-    """Collect all descendant area IDs recursively."""
-    result = await db.execute(
-        select(ConstructionArea.id).where(ConstructionArea.parent_id == parent_id)
-    )
-    child_ids = list(result.scalars().all())
-    all_ids = list(child_ids)
-    for child_id in child_ids:
-        all_ids.extend(await collect_descendant_ids(db, child_id))
-    return all_ids
+async def compute_area_checklist_progress(
+    db: AsyncSession, project_id: uuid.UUID, area_id: uuid.UUID
+) -> dict:
+    """Compute checklist completion stats for an area and its children."""
+    progress = await compute_areas_checklist_progress(db, project_id, [area_id])
+    return progress.get(area_id) or {
+        "total_instances": 0,
+        "completed_instances": 0,
+        "total_items": 0,
+        "completed_items": 0,
+        "completion_percentage": 0,
+    }
+
+
+async def collect_descendant_ids(
+    db: AsyncSession, project_id: uuid.UUID, parent_id: uuid.UUID
+) -> list[uuid.UUID]:
+    """Collect all descendant area IDs in one recursive query."""
+    closure = area_closure(project_id, [parent_id])
+    result = await db.execute(select(closure.c.area_id).where(closure.c.area_id != parent_id))
+    return list(result.scalars().all())
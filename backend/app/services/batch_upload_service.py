@@ -0,0 +1,240 @@
+"""
+Resumable batch uploads.
+
+Clients create an upload session listing the files, then PATCH each file in chunks
+(tus-style ``Upload-Offset`` and optional ``Upload-Checksum: sha256 <base64>``). Every
+chunk is written straight to storage as its own object, so nothing is held in memory
+and any instance can accept the next chunk. Once all files are complete a Celery job
+stitches the chunks into the final objects with bounded parallelism and creates the
+``File`` records.
+"""
+
+import asyncio
+import base64
+import binascii
+import logging
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.batch_upload import BatchUpload, BatchUploadFile
+from app.models.file import File
+from app.services.storage_service import ChecksumStream, StorageBackend, _create_storage_backend
+from app.services.websocket_manager import manager as ws_manager
+from app.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+CHUNK_PREFIX = "uploads"
+
+
+class UploadChunkError(ValueError):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def chunk_storage_path(upload: BatchUploadFile, offset: int) -> str:
+    return f"{CHUNK_PREFIX}/{upload.batch_upload_id}/{upload.id}/{offset:012d}.part"
+
+
+def chunk_offsets(upload: BatchUploadFile) -> list[int]:
+    offsets, offset = [], 0
+    for size in upload.chunk_sizes or []:
+        offsets.append(offset)
+        offset += size
+    return offsets
+
+
+def parse_checksum_header(header: str) -> str:
+    """Turn ``sha256 <base64 digest>`` into a hex digest."""
+    algorithm, _, encoded = header.strip().partition(" ")
+    if algorithm.lower() != "sha256" or not encoded:
+        raise UploadChunkError("Only sha256 Upload-Checksum values are supported", 400)
+    try:
+        return base64.b64decode(encoded, validate=True).hex()
+    except (binascii.Error, ValueError):
+        raise UploadChunkError("Malformed Upload-Checksum header", 400)
+
+
+async def _limited(chunks: AsyncIterable[bytes], limit: int) -> AsyncIterator[bytes]:
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > limit:
+            raise UploadChunkError("Chunk exceeds the declared file size or chunk limit", 413)
+        yield chunk
+
+
+async def store_chunk(
+    storage: StorageBackend,
+    upload: BatchUploadFile,
+    offset: int,
+    chunks: AsyncIterable[bytes],
+    checksum_header: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+) -> int:
+    """Write one chunk at ``offset`` and advance the upload; returns the new offset."""
+    if upload.status not in ("pending", "uploading"):
+        raise UploadChunkError("Upload is already complete", 409)
+    if offset != upload.received_bytes:
+        raise UploadChunkError(f"Upload-Offset must be {upload.received_bytes}", 409)
+    expected = parse_checksum_header(checksum_header) if checksum_header else None
+
+    limit = upload.size - offset
+    if max_bytes is not None:
+        limit = min(limit, max_bytes)
+    path = chunk_storage_path(upload, offset)
+    stream = ChecksumStream(_limited(chunks, limit))
+    written = await storage.save_stream(stream, path)
+    if expected is not None and stream.hexdigest != expected:
+        await storage.delete_file(path)
+        raise UploadChunkError("Chunk checksum mismatch", 460)
+
+    upload.chunk_sizes = [*(upload.chunk_sizes or []), written]
+    upload.received_bytes = offset + written
+    upload.status = "uploaded" if upload.received_bytes == upload.size else "uploading"
+    return upload.received_bytes
+
+
+async def iter_upload_content(storage: StorageBackend, upload: BatchUploadFile) -> AsyncIterator[bytes]:
+    for offset in chunk_offsets(upload):
+        async for data in storage.open_read(chunk_storage_path(upload, offset)):
+            yield data
+
+
+async def broadcast_batch_progress(batch: BatchUpload, **extra) -> None:
+    """Push the batch counters to the project's WebSocket channel so clients need not poll."""
+    try:
+        await ws_manager.broadcast_to_project(
+            str(batch.project_id),
+            {
+                "type": "batch_upload_progress",
+                "batch_id": str(batch.id),
+                "status": batch.status,
+                "total_files": batch.total_files,
+                "processed_files": batch.processed_files,
+                "failed_files": batch.failed_files,
+                "total_tasks": batch.total_tasks,
+                "completed_tasks": batch.completed_tasks,
+                "failed_tasks": batch.failed_tasks,
+                **extra,
+            },
+        )
+    except Exception as e:
+        logger.warning("Failed to broadcast progress for batch %s: %s", batch.id, e)
+
+
+async def _assemble(storage: StorageBackend, upload: BatchUploadFile, semaphore: asyncio.Semaphore) -> tuple[int, str]:
+    async with semaphore:
+        stream = ChecksumStream(iter_upload_content(storage, upload))
+        size = await storage.save_stream(stream, upload.storage_path, upload.content_type)
+        if upload.sha256 and stream.hexdigest != upload.sha256.lower():
+            await storage.delete_file(upload.storage_path)
+            raise ValueError("File checksum does not match the declared sha256")
+        if size != upload.size:
+            await storage.delete_file(upload.storage_path)
+            raise ValueError(f"Expected {upload.size} bytes, assembled {size}")
+        return size, stream.hexdigest
+
+
+async def _delete_chunks(storage: StorageBackend, upload: BatchUploadFile) -> None:
+    for offset in chunk_offsets(upload):
+        try:
+            await storage.delete_file(chunk_storage_path(upload, offset))
+        except Exception as e:
+            logger.warning("Failed to delete upload chunk %s: %s", chunk_storage_path(upload, offset), e)
+
+
+async def finalize_batch_upload(
+    batch_id: UUID,
+    session_factory=AsyncSessionLocal,
+    storage: Optional[StorageBackend] = None,
+) -> dict:
+    """Assemble every fully uploaded file of a batch. Safe to re-run after a crash:
+    nothing is committed until every file is handled, and final paths are fixed per file.
+
+    The batch row stays locked until then, so a second job for the same batch (a
+    redelivery, or another POST .../complete) waits and then finds it already finished."""
+    settings = get_settings()
+    storage = storage or _create_storage_backend(settings)
+
+    async with session_factory() as db:
+        batch = await db.scalar(
+            select(BatchUpload)
+            .where(BatchUpload.id == batch_id)
+            .options(selectinload(BatchUpload.upload_files))
+            .with_for_update()
+        )
+        if batch is None:
+            logger.error("Batch %s not found", batch_id)
+            return {"error": f"BatchUpload {batch_id} not found"}
+        if batch.status not in ("uploading", "pending"):
+            logger.info("Batch %s is already %s", batch_id, batch.status)
+            return {
+                "batch_id": str(batch_id),
+                "processed": batch.processed_files,
+                "failed": batch.failed_files,
+                "skipped": True,
+            }
+
+        batch.status = "processing"
+        await broadcast_batch_progress(batch)
+
+        pending = [u for u in batch.upload_files if u.status == "uploaded"]
+        semaphore = asyncio.Semaphore(max(1, settings.batch_upload_parallelism))
+        results = await asyncio.gather(
+            *(_assemble(storage, upload, semaphore) for upload in pending),
+            return_exceptions=True,
+        )
+
+        for upload, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.error("Failed to store %s for batch %s: %s", upload.filename, batch_id, result)
+                upload.status = "failed"
+                upload.error = str(result)
+                continue
+            size, checksum = result
+            db.add(File(
+                project_id=batch.project_id,
+                entity_type=batch.entity_type or "project",
+                entity_id=batch.entity_id or batch.project_id,
+                filename=upload.filename,
+                file_type=upload.content_type,
+                file_size=size,
+                storage_path=upload.storage_path,
+                checksum=checksum,
+                uploaded_by_id=batch.uploaded_by,
+                batch_upload_id=batch.id,
+            ))
+            upload.status = "stored"
+
+        # Files that never finished uploading count as failed
+        for upload in batch.upload_files:
+            if upload.status in ("pending", "uploading"):
+                upload.status = "failed"
+                upload.error = "Upload was not completed"
+
+        # Counted from the file states, which include files that failed before finalization
+        batch.processed_files = sum(1 for u in batch.upload_files if u.status == "stored")
+        batch.failed_files = sum(1 for u in batch.upload_files if u.status == "failed")
+        batch.status = "completed" if batch.failed_files == 0 else "failed"
+        batch.completed_at = utcnow()
+        await db.commit()
+    await broadcast_batch_progress(batch)
+
+    # Chunks of failed files are kept so the assembly can be inspected or retried
+    for upload in pending:
+        if upload.status == "stored":
+            await _delete_chunks(storage, upload)
+
+    return {
+        "batch_id": str(batch_id),
+        "processed": batch.processed_files,
+        "failed": batch.failed_files,
+    }
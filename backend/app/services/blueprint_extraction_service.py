@@ -13,7 +13,7 @@ from app.models.area import ConstructionArea
 from app.models.blueprint_extraction import BlueprintExtraction
 from app.models.equipment import Equipment
 from app.models.material import Material
-from app.services.quantity_extraction_service import extract_quantities
+from app.services.quantity_extraction_service import extract_quantities_cached
 from app.services.rasterscan_service import extract_with_rasterscan, is_rasterscan_available
 
 logger = logging.getLogger(__name__)
@@ -102,11 +102,7 @@ async def run_pdf_extraction(
         extraction.status = "processing"
         await db.commit()
 
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
-            partial(extract_quantities, file_content=file_content, file_type="application/pdf", language=language),
-        )
+        result = await extract_quantities_cached(file_content, "application/pdf", language)
 
         extraction.extracted_data = normalize_pdf_result(result)
         extraction.summary = build_summary_from_pdf(result)
@@ -1,13 +1,37 @@
+"""
+Report and dashboard charts.
+
+Charts are drawn with matplotlib's object-oriented ``Figure`` API, never the pyplot state
+machine, so concurrent renders don't share a current figure. The Hebrew-capable font is
+looked up once per process.
+
+``render_chart_uri`` is the entry point for async code: it renders in a pool of warm worker
+processes and memoizes the result by (chart type, hash of the data, language, format), in
+process and optionally in Redis, so a dashboard and a report built from the same numbers
+share one render. The ``generate_*`` functions render synchronously to base64 PNG.
+"""
+
 import base64
+import functools
+import hashlib
 import io
-from typing import Any
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Optional
 
 import matplotlib
-import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
+from matplotlib.figure import Figure
 
-matplotlib.use("Agg")
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis_clients import get_cache_redis
+from app.core.worker_pools import InflightCalls, WorkerPool
 
+logger = logging.getLogger(__name__)
 
 COLORS = {
     "primary": "#1976d2",
@@ -26,6 +50,49 @@ COLORS = {
     "closed": "#757575",
 }
 
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+STRINGS = {
+    "en": {
+        "completed": "Completed",
+        "pending": "Pending",
+        "progress_title": "Progress Overview",
+        "count": "Count",
+        "status": "Status",
+        "inspection_title": "Inspection Statistics",
+        "approved": "Approved",
+        "rejected": "Rejected",
+        "in_review": "In Review",
+        "date": "Date",
+        "approval_title": "Approval Trends Over Time",
+        "age_range": "Age Range",
+        "rfi_aging_title": "RFI Aging Distribution",
+        "status_title": "Status Distribution",
+        "no_data": "No data available",
+        "no_approval_data": "No approval data available",
+        "no_status_data": "No status data available",
+    },
+    "he": {
+        "completed": "הושלם",
+        "pending": "ממתין",
+        "progress_title": "סקירת התקדמות",
+        "count": "כמות",
+        "status": "סטטוס",
+        "inspection_title": "סטטיסטיקת בדיקות",
+        "approved": "אושר",
+        "rejected": "נדחה",
+        "in_review": "בבדיקה",
+        "date": "תאריך",
+        "approval_title": "מגמת אישורים לאורך זמן",
+        "age_range": "טווח גיל",
+        "rfi_aging_title": "התפלגות גיל בקשות מידע",
+        "status_title": "התפלגות סטטוסים",
+        "no_data": "אין נתונים",
+        "no_approval_data": "אין נתוני אישורים",
+        "no_status_data": "אין נתוני סטטוס",
+    },
+}
+
 
 def _get_font_path() -> str | None:
     """Get path to a font that supports Hebrew characters."""
@@ -40,53 +107,36 @@ def _get_font_path() -> str | None:
     return None
 
 
-def _setup_rtl_support():
-    """Configure matplotlib for RTL (Hebrew) text support."""
+@functools.lru_cache(maxsize=1)
+def _load_fonts() -> None:
+    """Select the Hebrew-capable font for every figure in this process, once."""
     font_path = _get_font_path()
     if font_path:
-        plt.rcParams["font.family"] = fm.FontProperties(fname=font_path).get_name()
-    plt.rcParams["axes.unicode_minus"] = False
-
+        fm.fontManager.addfont(font_path)
+        matplotlib.rcParams["font.family"] = fm.FontProperties(fname=font_path).get_name()
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    # Text as glyph outlines, so SVG charts don't depend on the viewer's fonts
+    matplotlib.rcParams["svg.fonttype"] = "path"
 
-def _fig_to_base64(fig: plt.Figure) -> str:
-    """Convert matplotlib figure to base64-encoded PNG string."""
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight", dpi=150)
-    buf.seek(0)
-    img_base64 = base64.b64encode(buf.read()).decode("utf-8")
-    buf.close()
-    plt.close(fig)
-    return img_base64
 
+def _label(strings: dict, key: str, language: str) -> str:
+    text = strings[key]
+    # matplotlib lays text out left to right; fixed Hebrew labels are reversed into visual order
+    return text[::-1] if language == "he" else text
 
-def generate_progress_chart(data: dict[str, int | float]) -> str:
-    """
-    Generate a progress pie chart showing completed vs pending items.
-
-    Args:
-        data: Dictionary with 'completed' and 'pending' keys
-
-    Returns:
-        Base64-encoded PNG image string
-    """
-    _setup_rtl_support()
 
+def _draw_progress(fig: Figure, data: dict[str, int | float], t: Callable[[str], str]) -> None:
     completed = data.get("completed", 0)
     pending = data.get("pending", 0)
 
     if completed == 0 and pending == 0:
         completed = 1
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-
-    sizes = [completed, pending]
-    labels = ["Completed", "Pending"]
-    colors = [COLORS["completed"], COLORS["pending"]]
-
+    ax = fig.subplots()
     wedges, texts, autotexts = ax.pie(
-        sizes,
-        labels=labels,
-        colors=colors,
+        [completed, pending],
+        labels=[t("completed"), t("pending")],
+        colors=[COLORS["completed"], COLORS["pending"]],
         autopct="%1.1f%%",
         startangle=90,
         textprops={"fontsize": 12, "weight": "bold"},
@@ -96,24 +146,11 @@ def generate_progress_chart(data: dict[str, int | float]) -> str:
         autotext.set_color("white")
 
     ax.axis("equal")
-    plt.title("Progress Overview", fontsize=16, weight="bold", pad=20)
+    ax.set_title(t("progress_title"), fontsize=16, weight="bold", pad=20)
 
-    return _fig_to_base64(fig)
 
-
-def generate_inspection_chart(data: dict[str, Any]) -> str:
-    """
-    Generate inspection statistics bar chart.
-
-    Args:
-        data: Dictionary with inspection status counts
-
-    Returns:
-        Base64-encoded PNG image string
-    """
-    _setup_rtl_support()
-
-    fig, ax = plt.subplots(figsize=(10, 6))
+def _draw_inspection(fig: Figure, data: dict[str, Any], t: Callable[[str], str]) -> None:
+    ax = fig.subplots()
 
     statuses = list(data.keys())
     counts = list(data.values())
@@ -133,71 +170,41 @@ def generate_inspection_chart(data: dict[str, Any]) -> str:
             weight="bold",
         )
 
-    ax.set_ylabel("Count", fontsize=12, weight="bold")
-    ax.set_xlabel("Status", fontsize=12, weight="bold")
-    ax.set_title("Inspection Statistics", fontsize=16, weight="bold", pad=20)
+    ax.set_ylabel(t("count"), fontsize=12, weight="bold")
+    ax.set_xlabel(t("status"), fontsize=12, weight="bold")
+    ax.set_title(t("inspection_title"), fontsize=16, weight="bold", pad=20)
     ax.grid(axis="y", alpha=0.3, linestyle="--")
     ax.set_axisbelow(True)
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
 
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-
-    return _fig_to_base64(fig)
-
-
-def generate_approval_trend_chart(data: list[dict[str, Any]]) -> str:
-    """
-    Generate approval trend line chart over time.
-
-    Args:
-        data: List of dicts with 'date' and status counts
-
-    Returns:
-        Base64-encoded PNG image string
-    """
-    _setup_rtl_support()
 
-    if not data:
-        return generate_empty_chart("No approval data available")
-
-    fig, ax = plt.subplots(figsize=(12, 6))
+def _draw_approval_trend(fig: Figure, data: list[dict[str, Any]], t: Callable[[str], str]) -> None:
+    ax = fig.subplots()
 
     dates = [item["date"] for item in data]
     approved = [item.get("approved", 0) for item in data]
     rejected = [item.get("rejected", 0) for item in data]
     in_review = [item.get("in_review", 0) for item in data]
 
-    ax.plot(dates, approved, marker="o", color=COLORS["approved"], linewidth=2, label="Approved")
-    ax.plot(dates, rejected, marker="s", color=COLORS["rejected"], linewidth=2, label="Rejected")
-    ax.plot(dates, in_review, marker="^", color=COLORS["in_review"], linewidth=2, label="In Review")
+    ax.plot(dates, approved, marker="o", color=COLORS["approved"], linewidth=2, label=t("approved"))
+    ax.plot(dates, rejected, marker="s", color=COLORS["rejected"], linewidth=2, label=t("rejected"))
+    ax.plot(dates, in_review, marker="^", color=COLORS["in_review"], linewidth=2, label=t("in_review"))
 
-    ax.set_ylabel("Count", fontsize=12, weight="bold")
-    ax.set_xlabel("Date", fontsize=12, weight="bold")
-    ax.set_title("Approval Trends Over Time", fontsize=16, weight="bold", pad=20)
+    ax.set_ylabel(t("count"), fontsize=12, weight="bold")
+    ax.set_xlabel(t("date"), fontsize=12, weight="bold")
+    ax.set_title(t("approval_title"), fontsize=16, weight="bold", pad=20)
     ax.legend(loc="upper left", frameon=True, shadow=True)
     ax.grid(True, alpha=0.3, linestyle="--")
     ax.set_axisbelow(True)
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
 
-    plt.xticks(rotation=45, ha="right")
-    plt.tight_layout()
-
-    return _fig_to_base64(fig)
-
-
-def generate_rfi_aging_chart(data: dict[str, int]) -> str:
-    """
-    Generate RFI aging horizontal bar chart.
-
-    Args:
-        data: Dictionary with age ranges as keys and counts as values
-              e.g., {"0-7 days": 5, "8-14 days": 3, "15-30 days": 2, "30+ days": 1}
-
-    Returns:
-        Base64-encoded PNG image string
-    """
-    _setup_rtl_support()
 
-    fig, ax = plt.subplots(figsize=(10, 6))
+def _draw_rfi_aging(fig: Figure, data: dict[str, int], t: Callable[[str], str]) -> None:
+    ax = fig.subplots()
 
     age_ranges = list(data.keys())
     counts = list(data.values())
@@ -232,30 +239,15 @@ def generate_rfi_aging_chart(data: dict[str, int]) -> str:
             weight="bold",
         )
 
-    ax.set_xlabel("Count", fontsize=12, weight="bold")
-    ax.set_ylabel("Age Range", fontsize=12, weight="bold")
-    ax.set_title("RFI Aging Distribution", fontsize=16, weight="bold", pad=20)
+    ax.set_xlabel(t("count"), fontsize=12, weight="bold")
+    ax.set_ylabel(t("age_range"), fontsize=12, weight="bold")
+    ax.set_title(t("rfi_aging_title"), fontsize=16, weight="bold", pad=20)
     ax.grid(axis="x", alpha=0.3, linestyle="--")
     ax.set_axisbelow(True)
 
-    plt.tight_layout()
-
-    return _fig_to_base64(fig)
-
-
-def generate_empty_chart(message: str = "No data available") -> str:
-    """
-    Generate an empty chart with a message.
-
-    Args:
-        message: Message to display on the chart
-
-    Returns:
-        Base64-encoded PNG image string
-    """
-    _setup_rtl_support()
 
-    fig, ax = plt.subplots(figsize=(8, 6))
+def _draw_empty(fig: Figure, message: str, t: Callable[[str], str]) -> None:
+    ax = fig.subplots()
     ax.text(
         0.5,
         0.5,
@@ -270,7 +262,139 @@ def generate_empty_chart(message: str = "No data available") -> str:
     ax.set_ylim(0, 1)
     ax.axis("off")
 
-    return _fig_to_base64(fig)
+
+def _draw_status_distribution(fig: Figure, data: dict[str, Any], t: Callable[[str], str]) -> None:
+    counts = data["counts"]
+    ax = fig.subplots()
+
+    labels = list(counts.keys())
+    colors_list = [COLORS.get(label.lower(), COLORS["primary"]) for label in labels]
+
+    wedges, texts, autotexts = ax.pie(
+        list(counts.values()),
+        labels=labels,
+        colors=colors_list,
+        autopct="%1.1f%%",
+        startangle=90,
+        textprops={"fontsize": 11, "weight": "bold"},
+    )
+
+    for autotext in autotexts:
+        autotext.set_color("white")
+
+    ax.axis("equal")
+    ax.set_title(data.get("title") or t("status_title"), fontsize=16, weight="bold", pad=20)
+
+
+# Chart type -> (drawing function, figure size in inches)
+CHARTS: dict[str, tuple[Callable[[Figure, Any, Callable[[str], str]], None], tuple[int, int]]] = {
+    "progress": (_draw_progress, (8, 6)),
+    "inspection": (_draw_inspection, (10, 6)),
+    "approval_trend": (_draw_approval_trend, (12, 6)),
+    "rfi_aging": (_draw_rfi_aging, (10, 6)),
+    "empty": (_draw_empty, (8, 6)),
+    "status_distribution": (_draw_status_distribution, (8, 6)),
+}
+
+
+def _empty_message(chart_type: str, data: Any) -> Optional[str]:
+    """The empty-chart message key a chart falls back to for its data, if any."""
+    if chart_type == "approval_trend" and not data:
+        return "no_approval_data"
+    if chart_type == "status_distribution" and not sum(data["counts"].values()):
+        return "no_status_data"
+    return None
+
+
+def render_chart(chart_type: str, data: Any, language: str = "en", fmt: str = "png") -> bytes:
+    """Draw a chart and encode it as PNG or SVG."""
+    _load_fonts()
+    strings = STRINGS.get(language, STRINGS["en"])
+
+    def t(key: str) -> str:
+        return _label(strings, key, language)
+
+    message_key = _empty_message(chart_type, data)
+    if message_key:
+        chart_type, data = "empty", t(message_key)
+
+    draw, figsize = CHARTS[chart_type]
+    fig = Figure(figsize=figsize, layout="tight")
+    draw(fig, data, t)
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, bbox_inches="tight", dpi=150)
+    return buf.getvalue()
+
+
+def _render_base64(chart_type: str, data: Any) -> str:
+    return base64.b64encode(render_chart(chart_type, data)).decode("utf-8")
+
+
+def generate_progress_chart(data: dict[str, int | float]) -> str:
+    """
+    Generate a progress pie chart showing completed vs pending items.
+
+    Args:
+        data: Dictionary with 'completed' and 'pending' keys
+
+    Returns:
+        Base64-encoded PNG image string
+    """
+    return _render_base64("progress", data)
+
+
+def generate_inspection_chart(data: dict[str, Any]) -> str:
+    """
+    Generate inspection statistics bar chart.
+
+    Args:
+        data: Dictionary with inspection status counts
+
+    Returns:
+        Base64-encoded PNG image string
+    """
+    return _render_base64("inspection", data)
+
+
+def generate_approval_trend_chart(data: list[dict[str, Any]]) -> str:
+    """
+    Generate approval trend line chart over time.
+
+    Args:
+        data: List of dicts with 'date' and status counts
+
+    Returns:
+        Base64-encoded PNG image string
+    """
+    return _render_base64("approval_trend", data)
+
+
+def generate_rfi_aging_chart(data: dict[str, int]) -> str:
+    """
+    Generate RFI aging horizontal bar chart.
+
+    Args:
+        data: Dictionary with age ranges as keys and counts as values
+              e.g., {"0-7 days": 5, "8-14 days": 3, "15-30 days": 2, "30+ days": 1}
+
+    Returns:
+        Base64-encoded PNG image string
+    """
+    return _render_base64("rfi_aging", data)
+
+
+def generate_empty_chart(message: str = "No data available") -> str:
+    """
+    Generate an empty chart with a message.
+
+    Args:
+        message: Message to display on the chart
+
+    Returns:
+        Base64-encoded PNG image string
+    """
+    return _render_base64("empty", message)
 
 
 def generate_status_distribution_chart(data: dict[str, int], title: str = "Status Distribution") -> str:
@@ -284,30 +408,94 @@ def generate_status_distribution_chart(data: dict[str, int], title: str = "Statu
     Returns:
         Base64-encoded PNG image string
     """
-    _setup_rtl_support()
+    return _render_base64("status_distribution", {"counts": data or {}, "title": title})
 
-    if not data or sum(data.values()) == 0:
-        return generate_empty_chart("No status data available")
 
-    fig, ax = plt.subplots(figsize=(8, 6))
+def chart_key(chart_type: str, data: Any, language: str, fmt: str) -> str:
+    raw = json.dumps([chart_type, data, language, fmt], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
 
-    labels = list(data.keys())
-    sizes = list(data.values())
-    colors_list = [COLORS.get(label.lower(), COLORS["primary"]) for label in labels]
 
-    wedges, texts, autotexts = ax.pie(
-        sizes,
-        labels=labels,
-        colors=colors_list,
-        autopct="%1.1f%%",
-        startangle=90,
-        textprops={"fontsize": 11, "weight": "bold"},
-    )
+chart_pool = WorkerPool("chart_render_workers", initializer=_load_fonts)
 
-    for autotext in autotexts:
-        autotext.set_color("white")
 
-    ax.axis("equal")
-    plt.title(title, fontsize=16, weight="bold", pad=20)
+class ChartCache:
+    """Rendered charts, in process and optionally shared through Redis.
+
+    Redis failures are logged and treated as a miss, so charts still render without it.
+    """
 
-    return _fig_to_base64(fig)
+    def __init__(self, max_entries: int, ttl_seconds: int, redis_url: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self.redis_url = redis_url
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if not self.redis_url:
+            return None
+        try:
+            chart = await get_cache_redis(self.redis_url).get(f"chart:{key}")
+        except Exception as e:
+            logger.warning("Chart cache read failed: %s", e)
+            return None
+        if chart is not None:
+            self._remember(key, chart)
+        return chart
+
+    async def set(self, key: str, chart: bytes) -> None:
+        self._remember(key, chart)
+        if not self.redis_url:
+            return
+        try:
+            await get_cache_redis(self.redis_url).set(f"chart:{key}", chart, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning("Chart cache write failed: %s", e)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _remember(self, key: str, chart: bytes) -> None:
+        self._entries[key] = chart
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_settings = get_settings()
+chart_cache = ChartCache(
+    _settings.chart_cache_max_entries,
+    _settings.chart_cache_ttl_seconds,
+    _settings.redis_url if _settings.chart_cache_backend == "redis" else None,
+)
+_inflight = InflightCalls()
+
+
+async def render_chart_async(chart_type: str, data: Any, language: str = "en", fmt: Optional[str] = None) -> bytes:
+    """Render a chart in the worker pool, reusing any identical chart rendered before."""
+    fmt = fmt or get_settings().chart_format
+    key = chart_key(chart_type, data, language, fmt)
+    cached = await chart_cache.get(key)
+    if cached is not None:
+        metrics.inc("chart_cache_hits_total")
+        return cached
+
+    async def render() -> bytes:
+        metrics.inc("chart_cache_misses_total")
+        started = time.monotonic()
+        chart = await chart_pool.run(render_chart, chart_type, data, language, fmt)
+        metrics.observe("chart_render_seconds", time.monotonic() - started)
+        await chart_cache.set(key, chart)
+        return chart
+
+    return await _inflight.run(key, render)
+
+
+async def render_chart_uri(chart_type: str, data: Any, language: str = "en", fmt: Optional[str] = None) -> str:
+    """Render a chart as a ``data:`` URI for an ``<img src>``."""
+    fmt = fmt or get_settings().chart_format
+    chart = await render_chart_async(chart_type, data, language, fmt)
+    return f"data:{MEDIA_TYPES[fmt]};base64,{base64.b64encode(chart).decode()}"
@@ -0,0 +1,270 @@
+"""
+Collaborative-document rooms shared across app instances.
+
+Each instance keeps the sockets it owns in a local room and relays messages to the
+other instances through the pub/sub broker. Yjs updates are buffered in memory and
+appended to ``collaborative_document_updates`` on a debounce timer; once enough
+deltas pile up they are merged into the document's ``yjs_state`` snapshot.
+Late joiners receive the snapshot merged with every pending delta.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import uuid
+from typing import Optional
+from uuid import UUID
+
+from fastapi import WebSocket
+from sqlalchemy import delete, select
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.models.collaborative_document import CollaborativeDocument, CollaborativeDocumentUpdate
+from app.services.pubsub_broker import PubSubBroker, get_broker
+from app.utils import utcnow
+
+try:
+    from pycrdt import merge_updates as _crdt_merge_updates
+except ImportError:
+    _crdt_merge_updates = None
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "collab:"
+
+
+def merge_updates(updates: list[bytes]) -> bytes:
+    """Merge Yjs updates into one. Without pycrdt the newest update wins, which holds
+    while clients send the full encoded document state with every type-2 message."""
+    if len(updates) == 1:
+        return updates[0]
+    if _crdt_merge_updates is not None:
+        return _crdt_merge_updates(*updates)
+    return updates[-1]
+
+
+class CollabRoom:
+    def __init__(self, document_id: str):
+        self.document_id = document_id
+        self.doc_uuid = UUID(document_id)
+        self.connections: dict[str, WebSocket] = {}
+        self.user_names: dict[str, str] = {}
+        self.remote_presence: dict[str, list[dict]] = {}
+        self.pending_updates: list[bytes] = []
+        self.persisted_deltas = 0
+        self.flush_task: Optional[asyncio.Task] = None
+        self.persist_lock = asyncio.Lock()
+
+    def add(self, user_id: str, ws: WebSocket, user_name: str):
+        self.connections[user_id] = ws
+        self.user_names[user_id] = user_name
+
+    def remove(self, user_id: str):
+        self.connections.pop(user_id, None)
+        self.user_names.pop(user_id, None)
+
+    def is_empty(self) -> bool:
+        return len(self.connections) == 0
+
+    def get_local_presence(self) -> list[dict]:
+        return [
+            {"userId": uid, "name": name}
+            for uid, name in self.user_names.items()
+        ]
+
+    def get_presence(self) -> list[dict]:
+        users = {u["userId"]: u for users in self.remote_presence.values() for u in users}
+        users.update({u["userId"]: u for u in self.get_local_presence()})
+        return list(users.values())
+
+
+class CollabRoomService:
+    def __init__(self, broker: Optional[PubSubBroker] = None, session_factory=AsyncSessionLocal):
+        self.rooms: dict[str, CollabRoom] = {}
+        self.instance_id = uuid.uuid4().hex
+        self.session_factory = session_factory
+        self._broker = broker
+
+    @property
+    def broker(self) -> PubSubBroker:
+        if self._broker is None:
+            self._broker = get_broker()
+        return self._broker
+
+    async def join(self, document_id: str, user_id: str, ws: WebSocket, user_name: str) -> CollabRoom:
+        room = self.rooms.get(document_id)
+        if room is None:
+            room = self.rooms[document_id] = CollabRoom(document_id)
+            await self.broker.subscribe(CHANNEL_PREFIX + document_id, self._on_message)
+            await self._publish(document_id, {"kind": "presence_query"})
+        room.add(user_id, ws, user_name)
+        return room
+
+    async def leave(self, room: CollabRoom, user_id: str) -> None:
+        room.remove(user_id)
+        if not room.is_empty():
+            await self.broadcast_presence(room)
+            return
+        if room.flush_task is not None:
+            room.flush_task.cancel()
+        await self.flush(room, compact=True)
+        # Someone may have joined while the last updates were being written
+        if room.is_empty() and self.rooms.get(room.document_id) is room:
+            del self.rooms[room.document_id]
+            await self.broker.unsubscribe(CHANNEL_PREFIX + room.document_id, self._on_message)
+            await self._publish(room.document_id, {"kind": "presence", "users": []})
+
+    async def load_state(self, room: CollabRoom) -> Optional[bytes]:
+        """Snapshot plus persisted and buffered deltas, merged for a joining client."""
+        async with self.session_factory() as db:
+            snapshot = await db.scalar(
+                select(CollaborativeDocument.yjs_state).where(CollaborativeDocument.id == room.doc_uuid)
+            )
+            result = await db.execute(
+                select(CollaborativeDocumentUpdate.update)
+                .where(CollaborativeDocumentUpdate.document_id == room.doc_uuid)
+                .order_by(CollaborativeDocumentUpdate.id)
+            )
+            deltas = list(result.scalars().all())
+        room.persisted_deltas = len(deltas)
+        updates = ([snapshot] if snapshot else []) + deltas + room.pending_updates
+        return merge_updates(updates) if updates else None
+
+    async def relay(self, room: CollabRoom, message: bytes | str, exclude_user: Optional[str] = None) -> None:
+        await broadcast_to_room(room, message, exclude_user)
+        if isinstance(message, bytes):
+            payload = {"kind": "bytes", "data": base64.b64encode(message).decode()}
+        else:
+            payload = {"kind": "text", "data": message}
+        await self._publish(room.document_id, {**payload, "exclude": exclude_user})
+
+    async def apply_update(self, room: CollabRoom, raw: bytes, user_id: str) -> None:
+        await self.relay(room, raw, exclude_user=user_id)
+        room.pending_updates.append(raw[1:])
+        settings = get_settings()
+        if len(room.pending_updates) >= settings.collab_flush_max_updates:
+            await self.flush(room)
+        elif room.flush_task is None or room.flush_task.done():
+            room.flush_task = asyncio.create_task(self._flush_later(room, settings.collab_flush_interval_seconds))
+
+    async def broadcast_presence(self, room: CollabRoom) -> None:
+        await self._publish(room.document_id, {"kind": "presence", "users": room.get_local_presence()})
+        await broadcast_to_room(room, json.dumps({
+            "type": "presence",
+            "documentId": room.document_id,
+            "users": room.get_presence(),
+        }))
+
+    async def _flush_later(self, room: CollabRoom, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self.flush(room)
+        except Exception:
+            logger.exception("Failed to persist collab updates for document %s", room.document_id)
+
+    async def flush(self, room: CollabRoom, compact: bool = False) -> None:
+        async with room.persist_lock:
+            updates, room.pending_updates = room.pending_updates, []
+            if updates:
+                try:
+                    async with self.session_factory() as db:
+                        db.add_all([
+                            CollaborativeDocumentUpdate(document_id=room.doc_uuid, update=update)
+                            for update in updates
+                        ])
+                        await db.commit()
+                except Exception:
+                    room.pending_updates = updates + room.pending_updates
+                    raise
+                room.persisted_deltas += len(updates)
+            if room.persisted_deltas and (compact or room.persisted_deltas >= get_settings().collab_compact_after_updates):
+                await self.compact(room.doc_uuid)
+                room.persisted_deltas = 0
+
+    async def compact(self, doc_uuid: UUID) -> None:
+        async with self.session_factory() as db:
+            doc = await db.scalar(
+                select(CollaborativeDocument).where(CollaborativeDocument.id == doc_uuid).with_for_update()
+            )
+            if doc is None:
+                return
+            rows = (await db.execute(
+                select(CollaborativeDocumentUpdate.id, CollaborativeDocumentUpdate.update)
+                .where(CollaborativeDocumentUpdate.document_id == doc_uuid)
+                .order_by(CollaborativeDocumentUpdate.id)
+            )).all()
+            if not rows:
+                return
+            updates = ([doc.yjs_state] if doc.yjs_state else []) + [row.update for row in rows]
+            doc.yjs_state = merge_updates(updates)
+            doc.updated_at = utcnow()
+            # By id, not up to the highest one: a delta committed concurrently can carry a
+            # lower id without having been read above
+            await db.execute(
+                delete(CollaborativeDocumentUpdate).where(
+                    CollaborativeDocumentUpdate.id.in_([row.id for row in rows])
+                )
+            )
+            await db.commit()
+
+    async def _publish(self, document_id: str, payload: dict) -> None:
+        try:
+            await self.broker.publish(
+                CHANNEL_PREFIX + document_id,
+                json.dumps({**payload, "origin": self.instance_id}),
+            )
+        except Exception as e:
+            logger.warning("Collab relay publish failed for document %s: %s", document_id, e)
+
+    async def _on_message(self, channel: str, raw: str) -> None:
+        envelope = json.loads(raw)
+        origin = envelope.get("origin")
+        if origin == self.instance_id:
+            return
+        room = self.rooms.get(channel[len(CHANNEL_PREFIX):])
+        if room is None:
+            return
+        kind = envelope.get("kind")
+        if kind == "bytes":
+            await broadcast_to_room(room, base64.b64decode(envelope["data"]), envelope.get("exclude"))
+        elif kind == "text":
+            await broadcast_to_room(room, envelope["data"], envelope.get("exclude"))
+        elif kind == "presence":
+            if envelope.get("users"):
+                room.remote_presence[origin] = envelope["users"]
+            else:
+                room.remote_presence.pop(origin, None)
+            await broadcast_to_room(room, json.dumps({
+                "type": "presence",
+                "documentId": room.document_id,
+                "users": room.get_presence(),
+            }))
+        elif kind == "presence_query" and not room.is_empty():
+            await self._publish(room.document_id, {"kind": "presence", "users": room.get_local_presence()})
+
+    async def shutdown(self) -> None:
+        for room in list(self.rooms.values()):
+            if room.flush_task is not None:
+                room.flush_task.cancel()
+            try:
+                await self.flush(room, compact=True)
+            except Exception:
+                logger.exception("Failed to persist collab updates for document %s", room.document_id)
+
+
+async def broadcast_to_room(room: CollabRoom, message: bytes | str, exclude_user: Optional[str] = None):
+    targets = [(uid, ws) for uid, ws in room.connections.items() if uid != exclude_user]
+    if not targets:
+        return
+    results = await asyncio.gather(
+        *(ws.send_bytes(message) if isinstance(message, bytes) else ws.send_text(message) for _, ws in targets),
+        return_exceptions=True,
+    )
+    for (uid, _), result in zip(targets, results):
+        if isinstance(result, Exception):
+            room.remove(uid)
+
+
+collab_service = CollabRoomService()
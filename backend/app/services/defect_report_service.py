@@ -1,15 +1,17 @@
-import base64
 import logging
 from uuid import UUID
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from weasyprint import HTML
+from sqlalchemy.orm import selectinload
 
-from app.models.defect import Defect
+from app.models.checklist import ChecklistInstance
+from app.models.defect import Defect, DefectAssignee
 from app.models.file import File
 from app.models.project import Project
+from app.services.image_derivative_service import load_report_photos
+from app.services.pdf_render_service import render_pdf
 from app.services.storage_service import StorageBackend
 from app.utils import utcnow
 
@@ -193,24 +195,7 @@ async def load_defect_photos(
         .where(File.entity_type == "defect", File.entity_id.in_(defect_ids))
         .order_by(File.uploaded_at)
     )
-    files = result.scalars().all()
-
-    photos_by_defect: dict[UUID, list[str]] = {}
-    for f in files:
-        if not f.file_type or not f.file_type.startswith("image/"):
-            continue
-        defect_photos = photos_by_defect.setdefault(f.entity_id, [])
-        if len(defect_photos) >= max_per_defect:
-            continue
-        try:
-            content = await storage.get_file_content(f.storage_path)
-            mime = f.file_type or "image/jpeg"
-            b64 = base64.b64encode(content).decode()
-            defect_photos.append(f"data:{mime};base64,{b64}")
-        except Exception:
-            logger.warning("Failed to load photo %s for defect %s", f.id, f.entity_id)
-
-    return photos_by_defect
+    return await load_report_photos(storage, list(result.scalars().all()), max_per_defect)
 
 
 def format_contact(contact) -> str:
@@ -262,13 +247,13 @@ def build_defect_context(defect: Defect, strings: dict, photos: list[str]) -> di
     }
 
 
-async def generate_defects_report_pdf(
+async def generate_defects_report_html(
     db: AsyncSession,
     defects: list[Defect],
     project: Project,
     storage: StorageBackend,
     language: str = "he",
-) -> bytes:
+) -> str:
     s = STRINGS.get(language, STRINGS["he"])
     direction = "rtl" if language == "he" else "ltr"
     align = "right" if language == "he" else "left"
@@ -293,6 +278,43 @@ async def generate_defects_report_pdf(
         total_count=len(defects),
         defects=defect_items,
     )
+    return html_content
+
+
+# Relations read by build_defect_context
+REPORT_LOAD_OPTIONS = [
+    selectinload(Defect.area),
+    selectinload(Defect.reporter),
+    selectinload(Defect.assigned_contact),
+    selectinload(Defect.followup_contact),
+    selectinload(Defect.assignees).selectinload(DefectAssignee.contact),
+    selectinload(Defect.checklist_instance).selectinload(ChecklistInstance.template),
+]
+
+
+async def generate_defects_report_html_for_ids(
+    db: AsyncSession,
+    defect_ids: list[UUID],
+    project: Project,
+    storage: StorageBackend,
+    language: str = "he",
+) -> str:
+    """Rebuild a queued report from its defect ids, in the order the export endpoint lists them."""
+    result = await db.execute(
+        select(Defect)
+        .options(*REPORT_LOAD_OPTIONS)
+        .where(Defect.id.in_(defect_ids))
+        .order_by(Defect.defect_number.desc())
+    )
+    return await generate_defects_report_html(db, list(result.scalars().all()), project, storage, language)
 
-    pdf_bytes = HTML(string=html_content, base_url=TEMPLATES_DIR).write_pdf()
-    return pdf_bytes
+
+async def generate_defects_report_pdf(
+    db: AsyncSession,
+    defects: list[Defect],
+    project: Project,
+    storage: StorageBackend,
+    language: str = "he",
+) -> bytes:
+    html_content = await generate_defects_report_html(db, defects, project, storage, language)
+    return await render_pdf(html_content, base_url=TEMPLATES_DIR)
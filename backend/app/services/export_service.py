@@ -1,7 +1,8 @@
 import io
 import csv
 import json
-import zipfile
+from collections.abc import AsyncIterable
+from functools import partial
 from typing import Any
 from uuid import UUID
 
@@ -9,11 +10,13 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
 from app.models.area import ConstructionArea
 from app.models.budget import BudgetLineItem
 from app.models.contact import Contact
 from app.models.defect import Defect
 from app.models.equipment_submission import EquipmentSubmission
+from app.models.export_job import ExportJob
 from app.models.file import File
 from app.models.inspection import Inspection
 from app.models.material_template import MaterialApprovalSubmission
@@ -21,7 +24,18 @@ from app.models.meeting import Meeting
 from app.models.project import Project
 from app.models.rfi import RFI
 from app.models.task import Task
+from app.services.archive_export_service import ArchiveExport, ArchiveSource, iter_bytes
+from app.services.storage_service import StorageBackend
 from app.utils import utcnow
+from app.utils.zip_stream import is_precompressed
+
+
+async def _open_stored_file(storage: StorageBackend, storage_path: str, load: bool) -> AsyncIterable[bytes]:
+    if load:
+        return iter_bytes(await storage.get_file_content(storage_path))
+    # Fail now, so a missing file is skipped rather than breaking the archive mid-entry
+    await storage.get_file_size(storage_path)
+    return storage.open_read(storage_path)
 
 
 class ExportService:
@@ -205,102 +219,113 @@ class ExportService:
 
         return self._generate_csv(flat_data)
 
-    async def create_export_archive(self, project_id: UUID, storage_path: str) -> int:
-        """Create ZIP archive with all project files organized by entity type."""
-        from app.services.storage_service import get_storage_backend
-
-        storage = get_storage_backend()
-
-        # Create in-memory ZIP file
-        zip_buffer = io.BytesIO()
-        manifest_entries = []
-        skipped_files = []
+    async def create_export_archive(self, job: ExportJob, storage: StorageBackend, storage_path: str) -> int:
+        """Stream a ZIP of all project files, organized by entity type, with a manifest.
 
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Get all project files
-            result = await self.db.execute(
-                select(File)
-                .where(File.project_id == project_id)
-                .order_by(File.entity_type, File.uploaded_at)
-            )
-            files = result.scalars().all()
-
-            # Track filenames to handle duplicates
-            filename_counter = {}
-
-            for file_obj in files:
-                if not file_obj.storage_path:
-                    skipped_files.append({
-                        "id": str(file_obj.id),
-                        "filename": file_obj.filename,
-                        "reason": "No storage path"
-                    })
-                    continue
+        Resumes from ``job.checkpoint`` when a previous attempt was interrupted.
+        """
+        prefetch_max_bytes = get_settings().export_prefetch_max_bytes
+        result = await self.db.execute(
+            select(File)
+            .where(File.project_id == job.project_id)
+            .order_by(File.entity_type, File.uploaded_at, File.id)
+        )
+        files = result.scalars().all()
 
-                try:
-                    # Download file content from storage
-                    file_content = await storage.get_file_content(file_obj.storage_path)
-
-                    # Organize files by entity type
-                    base_filename = file_obj.filename
-                    entity_folder = file_obj.entity_type or "other"
-
-                    # Handle duplicate filenames
-                    filename_key = f"{entity_folder}/{base_filename}"
-                    if filename_key in filename_counter:
-                        filename_counter[filename_key] += 1
-                        name_parts = base_filename.rsplit(".", 1)
-                        if len(name_parts) == 2:
-                            base_filename = f"{name_parts[0]}_{filename_counter[filename_key]}.{name_parts[1]}"
-                        else:
-                            base_filename = f"{base_filename}_{filename_counter[filename_key]}"
-                    else:
-                        filename_counter[filename_key] = 0
-
-                    # Create archive path
-                    archive_path = f"files/{entity_folder}/{base_filename}"
-                    zip_file.writestr(archive_path, file_content)
-
-                    # Add to manifest
-                    manifest_entries.append({
-                        "id": str(file_obj.id),
-                        "filename": file_obj.filename,
-                        "archive_path": archive_path,
-                        "entity_type": file_obj.entity_type,
-                        "entity_id": str(file_obj.entity_id),
-                        "file_type": file_obj.file_type,
-                        "file_size": file_obj.file_size,
-                        "uploaded_at": file_obj.uploaded_at.isoformat() if file_obj.uploaded_at else None,
-                    })
-
-                except Exception as e:
-                    # Track files that couldn't be retrieved
-                    skipped_files.append({
-                        "id": str(file_obj.id),
-                        "filename": file_obj.filename,
-                        "reason": f"Failed to retrieve: {str(e)}"
-                    })
+        sources: list[ArchiveSource] = []
+        files_by_id: dict[str, File] = {}
+        missing = []
+        # Track filenames to handle duplicates
+        filename_counter = {}
+
+        for file_obj in files:
+            if not file_obj.storage_path:
+                missing.append({
+                    "id": str(file_obj.id),
+                    "filename": file_obj.filename,
+                    "reason": "No storage path"
+                })
+                continue
+
+            # Organize files by entity type
+            base_filename = file_obj.filename
+            entity_folder = file_obj.entity_type or "other"
+
+            # Handle duplicate filenames
+            filename_key = f"{entity_folder}/{base_filename}"
+            if filename_key in filename_counter:
+                filename_counter[filename_key] += 1
+                name_parts = base_filename.rsplit(".", 1)
+                if len(name_parts) == 2:
+                    base_filename = f"{name_parts[0]}_{filename_counter[filename_key]}.{name_parts[1]}"
+                else:
+                    base_filename = f"{base_filename}_{filename_counter[filename_key]}"
+            else:
+                filename_counter[filename_key] = 0
+
+            # Small files are downloaded ahead in parallel; large ones stream from storage in turn
+            prefetch = file_obj.file_size is not None and file_obj.file_size <= prefetch_max_bytes
+            sources.append(ArchiveSource(
+                key=str(file_obj.id),
+                name=f"files/{entity_folder}/{base_filename}",
+                open=partial(_open_stored_file, storage, file_obj.storage_path, prefetch),
+                prefetch=prefetch,
+                compress=not is_precompressed(file_obj.filename, file_obj.file_type),
+                size=file_obj.file_size,
+                modified=file_obj.uploaded_at,
+                label=file_obj.filename,
+            ))
+            files_by_id[str(file_obj.id)] = file_obj
+
+        def manifest(written: list[list[str]], skipped: list[dict]) -> list[tuple[str, bytes]]:
+            manifest_entries = []
+            for file_id, archive_path in written:
+                file_obj = files_by_id.get(file_id)
+                if file_obj is None:
                     continue
-
-            # Add manifest file to archive
+                manifest_entries.append({
+                    "id": file_id,
+                    "filename": file_obj.filename,
+                    "archive_path": archive_path,
+                    "entity_type": file_obj.entity_type,
+                    "entity_id": str(file_obj.entity_id),
+                    "file_type": file_obj.file_type,
+                    "file_size": file_obj.file_size,
+                    "uploaded_at": file_obj.uploaded_at.isoformat() if file_obj.uploaded_at else None,
+                })
+            errors = missing + skipped
             manifest_data = {
                 "export_date": utcnow().isoformat(),
-                "project_id": str(project_id),
+                "project_id": str(job.project_id),
                 "total_files": len(manifest_entries),
-                "skipped_files": len(skipped_files),
+                "skipped_files": len(errors),
                 "files": manifest_entries,
-                "errors": skipped_files if skipped_files else []
+                "errors": errors
             }
-            manifest_json = json.dumps(manifest_data, indent=2, ensure_ascii=False)
-            zip_file.writestr("manifest.json", manifest_json)
+            return [("manifest.json", json.dumps(manifest_data, indent=2, ensure_ascii=False).encode("utf-8"))]
 
-        zip_buffer.seek(0)
-        zip_bytes = zip_buffer.read()
+        return await ArchiveExport(self.db, job, storage, storage_path).run(sources, manifest)
 
-        # Save ZIP to storage
-        file_size = await storage.save_bytes(zip_bytes, storage_path, "application/zip")
+    async def create_projects_archive(
+        self, job: ExportJob, storage: StorageBackend, storage_path: str, projects: list[Project],
+    ) -> int:
+        """Stream a ZIP holding each project's JSON export under ``<project_id>/``."""
 
-        return file_size
+        async def open_project(project_id: UUID) -> AsyncIterable[bytes]:
+            project_data = await self.export_project_json(project_id)
+            return iter_bytes(json.dumps(project_data, indent=2, default=str).encode("utf-8"))
+
+        sources = [
+            ArchiveSource(
+                key=str(project.id),
+                name=f"{project.id}/project_data.json",
+                open=partial(open_project, project.id),
+                label=project.name,
+            )
+            for project in projects
+        ]
+        # A project missing from an organization export is an error, not a skipped file
+        return await ArchiveExport(self.db, job, storage, storage_path, skip_failed=False).run(sources)
 
     # Helper methods for data aggregation
 
@@ -0,0 +1,222 @@
+"""
+Downscaled image renditions for reports and previews.
+
+Phone photos are 3-12 MB originals; reports only need a page-width JPEG. Each uploaded
+image gets a ``report`` and a ``thumb`` rendition stored next to the original (generated by
+a worker task after upload, or on first use for images uploaded before renditions existed).
+
+Report photos are fetched concurrently into a host-local on-disk cache and referenced from
+the report HTML by ``file://`` URL, so the HTML carries paths instead of base64 payloads
+and the render workers read each rendition from disk. The cache evicts least-recently-used
+entries beyond its size budget, but never ones touched recently enough that a pending
+render may still need them. Storage reads and cache writes run off the event loop.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from PIL import Image, ImageOps
+
+from app.config import get_settings
+from app.models.file import File
+from app.services.storage_service import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels per rendition
+RENDITIONS = {
+    "report": 1280,
+    "thumb": 320,
+}
+
+# Least time between two scans of the report image cache directory
+EVICT_INTERVAL_SECONDS = 10
+
+
+def is_image(file_type: Optional[str]) -> bool:
+    return bool(file_type) and file_type.startswith("image/")
+
+
+def derivative_path(storage_path: str, rendition: str) -> str:
+    return f"{storage_path}_{rendition}.jpg"
+
+
+def make_derivative(content: bytes, rendition: str) -> bytes:
+    """Downscale an image to a rendition's size as a JPEG."""
+    max_edge = RENDITIONS[rendition]
+    try:
+        image = Image.open(io.BytesIO(content))
+        # Lets the JPEG decoder skip straight to a reduced scale instead of decoding 12 MP
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=get_settings().report_image_quality, optimize=True)
+        return output.getvalue()
+    except Exception as e:
+        raise ValueError(f"Invalid image file: {str(e)}")
+
+
+async def generate_derivatives(storage: StorageBackend, storage_path: str, content: bytes) -> dict[str, bytes]:
+    """Create and store every rendition of an image; returns them by rendition name."""
+    derivatives = {}
+    for rendition in RENDITIONS:
+        derivatives[rendition] = await asyncio.to_thread(make_derivative, content, rendition)
+        await storage.save_bytes(derivatives[rendition], derivative_path(storage_path, rendition), "image/jpeg")
+    return derivatives
+
+
+async def delete_derivatives(storage: StorageBackend, storage_path: str) -> None:
+    for rendition in RENDITIONS:
+        try:
+            await storage.delete_file(derivative_path(storage_path, rendition))
+        except FileNotFoundError:
+            # Renditions are generated lazily, so most files lack some of them
+            continue
+        except Exception as exc:
+            logger.warning("Failed to delete %s rendition of %s: %s", rendition, storage_path, exc)
+
+
+def enqueue_image_derivatives(file: File) -> None:
+    if not is_image(file.file_type):
+        return
+    from app.worker.tasks.document_processing import generate_image_derivatives_task
+
+    try:
+        generate_image_derivatives_task.delay(str(file.id))
+    except Exception as exc:
+        # Reports generate missing renditions on first use
+        logger.error("Failed to enqueue image derivatives for file %s: %s", file.id, exc)
+
+
+async def _read_object(storage: StorageBackend, storage_path: str) -> bytes:
+    """Read a whole object through ``open_read``, which every backend serves off the event loop."""
+    return b"".join([chunk async for chunk in storage.open_read(storage_path)])
+
+
+class ReportImageCache:
+    """Host-local cache of report renditions, keyed by the original's storage path."""
+
+    def __init__(self, root: Path, max_bytes: int, min_age_seconds: float):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.min_age_seconds = min_age_seconds
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._evict_lock = threading.Lock()
+        self._evicted_at = float("-inf")
+
+    def _path(self, storage_path: str) -> Path:
+        return self.root / f"{hashlib.sha256(storage_path.encode()).hexdigest()}.jpg"
+
+    async def get(self, storage: StorageBackend, storage_path: str) -> Path:
+        """Return the local path of an image's report rendition, creating it if needed."""
+        path = self._path(storage_path)
+        lock = self._locks.setdefault(path.name, asyncio.Lock())
+        async with lock:
+            if path.exists():
+                os.utime(path)
+                return path
+
+            try:
+                content = await _read_object(storage, derivative_path(storage_path, "report"))
+            except Exception:
+                # Uploaded before renditions existed, or the worker hasn't got to it yet
+                original = await _read_object(storage, storage_path)
+                content = (await generate_derivatives(storage, storage_path, original))["report"]
+            await asyncio.to_thread(self._store, path, content)
+        self._locks.pop(path.name, None)
+        return path
+
+    def _store(self, path: Path, content: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        # Atomic, so a render worker never reads a partial entry
+        os.replace(tmp, path)
+        # Eviction stats the whole directory, so it runs at most once per interval
+        with self._evict_lock:
+            if time.monotonic() - self._evicted_at < EVICT_INTERVAL_SECONDS:
+                return
+            self._evicted_at = time.monotonic()
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.suffix == ".tmp":
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        protected_after = time.time() - self.min_age_seconds
+        for mtime, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes or mtime >= protected_after:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+_cache: Optional[ReportImageCache] = None
+
+
+def get_report_image_cache() -> ReportImageCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        root = Path(settings.report_image_cache_dir or Path(tempfile.gettempdir()) / "builder-report-images").resolve()
+        _cache = ReportImageCache(
+            root,
+            settings.report_image_cache_max_bytes,
+            # A queued report may sit for up to a render budget before its photos are read
+            settings.pdf_render_timeout_seconds * 2,
+        )
+    return _cache
+
+
+async def load_report_photos(
+    storage: StorageBackend, files: list[File], max_per_entity: int = 3,
+) -> dict[UUID, list[str]]:
+    """Fetch the first image renditions of each entity concurrently, as ``file://`` URLs."""
+    selected: dict[UUID, list[File]] = {}
+    for f in files:
+        if not is_image(f.file_type):
+            continue
+        entity_files = selected.setdefault(f.entity_id, [])
+        if len(entity_files) < max_per_entity:
+            entity_files.append(f)
+
+    cache = get_report_image_cache()
+    semaphore = asyncio.Semaphore(get_settings().report_image_fetch_concurrency)
+
+    async def fetch(f: File) -> Optional[str]:
+        async with semaphore:
+            try:
+                return (await cache.get(storage, f.storage_path)).as_uri()
+            except Exception:
+                logger.warning("Failed to load photo %s for %s %s", f.id, f.entity_type, f.entity_id)
+                return None
+
+    ordered = [f for entity_files in selected.values() for f in entity_files]
+    urls = await asyncio.gather(*(fetch(f) for f in ordered))
+
+    photos: dict[UUID, list[str]] = {entity_id: [] for entity_id in selected}
+    for f, url in zip(ordered, urls):
+        if url:
+            photos[f.entity_id].append(url)
+    return photos
@@ -1,17 +1,45 @@
 from __future__ import annotations
 
-import asyncio
-from datetime import date, datetime
-from typing import Optional
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Integer,
+    String,
+    Text,
+    and_,
+    case,
+    cast,
+    delete,
+    event,
+    exists,
+    func,
+    inspect,
+    literal,
+    null,
+    or_,
+    select,
+    type_coerce,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.config import get_settings
 from app.models.approval import ApprovalRequest, ApprovalStep
 from app.models.contact import Contact
 from app.models.defect import Defect, DefectAssignee
 from app.models.equipment import ApprovalStatus
+from app.models.inbox_count import UserInboxCount
 from app.models.meeting import Meeting, MeetingAttendee
 from app.models.project import Project, ProjectMember
 from app.models.rfi import RFI
@@ -26,278 +54,623 @@ from app.schemas.inbox import (
     InboxRFIItem,
     InboxTaskItem,
 )
+from app.utils import utcnow
+
+# Every source is projected onto these columns so the five sources can be UNION ALL-ed
+INBOX_COLUMNS = {
+    "entity_type": String(20),
+    "source_rank": Integer,
+    "id": PG_UUID(as_uuid=True),
+    "project_id": PG_UUID(as_uuid=True),
+    "project_name": String(255),
+    "title": Text,
+    "status": String(50),
+    "priority": String(50),
+    "number": String(50),
+    "severity": String(50),
+    "kind": String(100),
+    "entity_id": PG_UUID(as_uuid=True),
+    "due_date": Date,
+    "scheduled_date": DateTime,
+    "location": String(255),
+    "created_at": DateTime,
+    # Date the item is due or happens; drives the overdue/today/later grouping
+    "effective_date": Date,
+    # Within-source tie-breakers, one ascending and one descending, so keyset paging stays exact
+    "asc_ts": DateTime,
+    "desc_ts": DateTime,
+}
+
+FAR_FUTURE = date(9999, 12, 31)
+EPOCH = datetime(1970, 1, 1)
 
 
 def accessible_projects_subquery(user_id: UUID):
     return select(ProjectMember.project_id).where(ProjectMember.user_id == user_id)
 
 
-async def fetch_inbox_approvals(
-    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
-) -> list[InboxApprovalItem]:
-    accessible = accessible_projects_subquery(user_id)
-    my_contact_ids = select(Contact.id).where(Contact.user_id == user_id)
+def _inbox_columns(entity_type: str, source_rank: int, **values) -> list:
+    values.setdefault("asc_ts", literal(EPOCH, DateTime))
+    values.setdefault("desc_ts", func.coalesce(values["created_at"], literal(EPOCH, DateTime)))
+    columns = [literal(entity_type, String(20)).label("entity_type"), literal(source_rank, Integer).label("source_rank")]
+    for name, type_ in INBOX_COLUMNS.items():
+        if name in ("entity_type", "source_rank"):
+            continue
+        columns.append(type_coerce(values[name], type_).label(name) if name in values else cast(null(), type_).label(name))
+    return columns
 
+
+def inbox_approvals_select(user_id: UUID, project_id: Optional[UUID] = None):
+    my_contact_ids = select(Contact.id).where(Contact.user_id == user_id)
+    pending_for_me = exists().where(
+        ApprovalStep.approval_request_id == ApprovalRequest.id,
+        ApprovalStep.status == "pending",
+        ApprovalStep.contact_id.in_(my_contact_ids),
+    )
     query = (
-        select(
-            ApprovalRequest.id,
-            ApprovalRequest.project_id,
-            Project.name.label("project_name"),
-            ApprovalRequest.entity_type,
-            ApprovalRequest.entity_id,
-            ApprovalRequest.current_status,
-            ApprovalRequest.created_at,
-        )
-        .join(ApprovalStep, ApprovalStep.approval_request_id == ApprovalRequest.id)
+        select(*_inbox_columns(
+            "approval", 0,
+            id=ApprovalRequest.id,
+            project_id=ApprovalRequest.project_id,
+            project_name=Project.name,
+            status=ApprovalRequest.current_status,
+            kind=ApprovalRequest.entity_type,
+            entity_id=ApprovalRequest.entity_id,
+            created_at=ApprovalRequest.created_at,
+        ))
+        .select_from(ApprovalRequest)
         .join(Project, Project.id == ApprovalRequest.project_id)
         .where(
-            ApprovalRequest.project_id.in_(accessible),
-            ApprovalStep.status == "pending",
+            ApprovalRequest.project_id.in_(accessible_projects_subquery(user_id)),
             ApprovalRequest.current_status.in_([
                 ApprovalStatus.SUBMITTED.value,
                 ApprovalStatus.UNDER_REVIEW.value,
             ]),
-            ApprovalStep.contact_id.in_(my_contact_ids),
+            pending_for_me,
         )
     )
     if project_id:
         query = query.where(ApprovalRequest.project_id == project_id)
+    return query
 
-    query = query.order_by(ApprovalRequest.created_at.desc()).limit(limit)
-    result = await db.execute(query)
-    rows = result.unique().all()
-
-    return [
-        InboxApprovalItem(
-            id=r.id,
-            project_id=r.project_id,
-            project_name=r.project_name,
-            entity_kind=r.entity_type,
-            entity_id=r.entity_id,
-            current_status=r.current_status,
-            created_at=r.created_at,
-        )
-        for r in rows
-    ]
-
-
-async def fetch_inbox_tasks(
-    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
-) -> list[InboxTaskItem]:
-    accessible = accessible_projects_subquery(user_id)
 
+def inbox_tasks_select(user_id: UUID, project_id: Optional[UUID] = None):
     query = (
-        select(
-            Task.id,
-            Task.project_id,
-            Project.name.label("project_name"),
-            Task.title,
-            Task.status,
-            Task.priority,
-            Task.due_date,
-        )
+        select(*_inbox_columns(
+            "task", 1,
+            id=Task.id,
+            project_id=Task.project_id,
+            project_name=Project.name,
+            title=Task.title,
+            status=Task.status,
+            priority=Task.priority,
+            due_date=Task.due_date,
+            created_at=Task.created_at,
+            effective_date=Task.due_date,
+        ))
+        .select_from(Task)
         .join(Project, Project.id == Task.project_id)
         .where(
-            Task.project_id.in_(accessible),
+            Task.project_id.in_(accessible_projects_subquery(user_id)),
             Task.assignee_id == user_id,
             Task.status.notin_(["completed", "cancelled"]),
         )
     )
     if project_id:
         query = query.where(Task.project_id == project_id)
+    return query
 
-    query = query.order_by(Task.due_date.asc().nullslast(), Task.created_at.desc()).limit(limit)
-    result = await db.execute(query)
-
-    return [
-        InboxTaskItem(
-            id=r.id,
-            project_id=r.project_id,
-            project_name=r.project_name,
-            title=r.title,
-            status=r.status,
-            priority=r.priority,
-            due_date=r.due_date,
-        )
-        for r in result.all()
-    ]
-
-
-async def fetch_inbox_rfis(
-    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
-) -> list[InboxRFIItem]:
-    accessible = accessible_projects_subquery(user_id)
 
+def inbox_rfis_select(user_id: UUID, project_id: Optional[UUID] = None):
+    due_day = type_coerce(func.date(RFI.due_date), Date)
     query = (
-        select(
-            RFI.id,
-            RFI.project_id,
-            Project.name.label("project_name"),
-            RFI.subject,
-            RFI.rfi_number,
-            RFI.priority,
-            RFI.status,
-            RFI.due_date,
-        )
+        select(*_inbox_columns(
+            "rfi", 2,
+            id=RFI.id,
+            project_id=RFI.project_id,
+            project_name=Project.name,
+            title=RFI.subject,
+            number=RFI.rfi_number,
+            priority=RFI.priority,
+            status=RFI.status,
+            due_date=due_day,
+            created_at=RFI.created_at,
+            effective_date=due_day,
+        ))
+        .select_from(RFI)
         .join(Project, Project.id == RFI.project_id)
         .where(
-            RFI.project_id.in_(accessible),
+            RFI.project_id.in_(accessible_projects_subquery(user_id)),
             RFI.assigned_to_id == user_id,
             RFI.status.in_(["open", "waiting_response"]),
         )
     )
     if project_id:
         query = query.where(RFI.project_id == project_id)
-
-    query = query.order_by(RFI.due_date.asc().nullslast(), RFI.created_at.desc()).limit(limit)
-    result = await db.execute(query)
-
-    return [
-        InboxRFIItem(
-            id=r.id,
-            project_id=r.project_id,
-            project_name=r.project_name,
-            subject=r.subject,
-            rfi_number=r.rfi_number,
-            priority=r.priority,
-            status=r.status,
-            due_date=r.due_date,
-        )
-        for r in result.all()
-    ]
+    return query
 
 
-async def fetch_inbox_meetings(
-    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
-) -> list[InboxMeetingItem]:
-    accessible = accessible_projects_subquery(user_id)
-
+def inbox_meetings_select(user_id: UUID, project_id: Optional[UUID] = None):
     query = (
-        select(
-            Meeting.id,
-            Meeting.project_id,
-            Project.name.label("project_name"),
-            Meeting.title,
-            Meeting.scheduled_date,
-            Meeting.location,
-            Meeting.meeting_type,
-        )
+        select(*_inbox_columns(
+            "meeting", 3,
+            id=Meeting.id,
+            project_id=Meeting.project_id,
+            project_name=Project.name,
+            title=Meeting.title,
+            kind=Meeting.meeting_type,
+            scheduled_date=Meeting.scheduled_date,
+            location=Meeting.location,
+            created_at=Meeting.created_at,
+            effective_date=type_coerce(func.date(Meeting.scheduled_date), Date),
+            asc_ts=Meeting.scheduled_date,
+            desc_ts=literal(EPOCH, DateTime),
+        ))
+        .select_from(Meeting)
         .join(MeetingAttendee, MeetingAttendee.meeting_id == Meeting.id)
         .join(Project, Project.id == Meeting.project_id)
         .where(
-            Meeting.project_id.in_(accessible),
+            Meeting.project_id.in_(accessible_projects_subquery(user_id)),
             MeetingAttendee.user_id == user_id,
             MeetingAttendee.attendance_status == "pending",
-            Meeting.scheduled_date >= datetime.utcnow(),
+            Meeting.scheduled_date >= utcnow(),
         )
     )
     if project_id:
         query = query.where(Meeting.project_id == project_id)
+    return query
 
-    query = query.order_by(Meeting.scheduled_date.asc()).limit(limit)
-    result = await db.execute(query)
 
-    return [
-        InboxMeetingItem(
-            id=r.id,
-            project_id=r.project_id,
-            project_name=r.project_name,
-            title=r.title,
-            scheduled_date=r.scheduled_date,
-            location=r.location,
-            meeting_type=r.meeting_type,
-        )
-        for r in result.all()
-    ]
-
-
-async def fetch_inbox_defects(
-    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
-) -> list[InboxDefectItem]:
-    accessible = accessible_projects_subquery(user_id)
+def inbox_defects_select(user_id: UUID, project_id: Optional[UUID] = None):
     my_contact_ids = select(Contact.id).where(Contact.user_id == user_id)
-
+    assigned_to_me = exists().where(
+        DefectAssignee.defect_id == Defect.id,
+        DefectAssignee.contact_id.in_(my_contact_ids),
+    )
     query = (
-        select(
-            Defect.id,
-            Defect.project_id,
-            Project.name.label("project_name"),
-            Defect.description,
-            Defect.defect_number,
-            Defect.severity,
-            Defect.category,
-        )
-        .join(DefectAssignee, DefectAssignee.defect_id == Defect.id)
+        select(*_inbox_columns(
+            "defect", 4,
+            id=Defect.id,
+            project_id=Defect.project_id,
+            project_name=Project.name,
+            title=Defect.description,
+            number=cast(Defect.defect_number, String(50)),
+            severity=Defect.severity,
+            kind=Defect.category,
+            created_at=Defect.created_at,
+        ))
+        .select_from(Defect)
         .join(Project, Project.id == Defect.project_id)
         .where(
-            Defect.project_id.in_(accessible),
-            DefectAssignee.contact_id.in_(my_contact_ids),
+            Defect.project_id.in_(accessible_projects_subquery(user_id)),
+            assigned_to_me,
             Defect.status == "open",
         )
     )
     if project_id:
         query = query.where(Defect.project_id == project_id)
+    return query
 
-    query = query.order_by(Defect.created_at.desc()).limit(limit)
-    result = await db.execute(query)
 
-    return [
-        InboxDefectItem(
+def inbox_union(user_id: UUID, project_id: Optional[UUID] = None):
+    return union_all(
+        inbox_approvals_select(user_id, project_id),
+        inbox_tasks_select(user_id, project_id),
+        inbox_rfis_select(user_id, project_id),
+        inbox_meetings_select(user_id, project_id),
+        inbox_defects_select(user_id, project_id),
+    ).subquery("inbox")
+
+
+def inbox_row_to_item(r: Any) -> InboxItem:
+    if r.entity_type == "approval":
+        return InboxApprovalItem(
             id=r.id,
             project_id=r.project_id,
             project_name=r.project_name,
-            description=r.description,
-            defect_number=r.defect_number,
-            severity=r.severity,
-            category=r.category,
+            entity_kind=r.kind,
+            entity_id=r.entity_id,
+            current_status=r.status,
+            created_at=r.created_at,
         )
-        for r in result.all()
-    ]
+    if r.entity_type == "task":
+        return InboxTaskItem(
+            id=r.id,
+            project_id=r.project_id,
+            project_name=r.project_name,
+            title=r.title,
+            status=r.status,
+            priority=r.priority,
+            due_date=r.due_date,
+        )
+    if r.entity_type == "rfi":
+        return InboxRFIItem(
+            id=r.id,
+            project_id=r.project_id,
+            project_name=r.project_name,
+            subject=r.title,
+            rfi_number=r.number,
+            priority=r.priority,
+            status=r.status,
+            due_date=r.due_date,
+        )
+    if r.entity_type == "meeting":
+        return InboxMeetingItem(
+            id=r.id,
+            project_id=r.project_id,
+            project_name=r.project_name,
+            title=r.title,
+            scheduled_date=r.scheduled_date,
+            location=r.location,
+            meeting_type=r.kind,
+        )
+    return InboxDefectItem(
+        id=r.id,
+        project_id=r.project_id,
+        project_name=r.project_name,
+        description=r.title,
+        defect_number=int(r.number),
+        severity=r.severity,
+        category=r.kind,
+    )
 
 
-def sort_inbox_items(items: list[InboxItem]) -> list[InboxItem]:
-    today = date.today()
+async def _fetch_source(db: AsyncSession, source, order_by: Callable, limit: int) -> list[InboxItem]:
+    sub = source.subquery()
+    result = await db.execute(select(sub).order_by(*order_by(sub.c)).limit(limit))
+    return [inbox_row_to_item(r) for r in result.all()]
 
-    def sort_key(item: InboxItem) -> tuple:
-        item_date = None
-        if hasattr(item, "due_date") and item.due_date:
-            item_date = item.due_date if isinstance(item.due_date, date) else item.due_date
-        elif hasattr(item, "scheduled_date") and item.scheduled_date:
-            d = item.scheduled_date
-            item_date = d.date() if isinstance(d, datetime) else d
 
-        if item_date is None:
-            return (2, date.max)
-        if item_date < today:
-            return (0, item_date)
-        if item_date == today:
-            return (1, item_date)
-        return (2, item_date)
+async def fetch_inbox_approvals(
+    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
+) -> list[InboxApprovalItem]:
+    return await _fetch_source(
+        db, inbox_approvals_select(user_id, project_id),
+        lambda c: [c.created_at.desc()], limit,
+    )
 
-    return sorted(items, key=sort_key)
 
+async def fetch_inbox_tasks(
+    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
+) -> list[InboxTaskItem]:
+    return await _fetch_source(
+        db, inbox_tasks_select(user_id, project_id),
+        lambda c: [c.due_date.asc().nullslast(), c.created_at.desc()], limit,
+    )
 
-async def get_inbox(
+
+async def fetch_inbox_rfis(
     db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
-) -> InboxResponse:
-    approvals, tasks, rfis, meetings, defects = await asyncio.gather(
-        fetch_inbox_approvals(db, user_id, project_id, limit),
-        fetch_inbox_tasks(db, user_id, project_id, limit),
-        fetch_inbox_rfis(db, user_id, project_id, limit),
-        fetch_inbox_meetings(db, user_id, project_id, limit),
-        fetch_inbox_defects(db, user_id, project_id, limit),
+) -> list[InboxRFIItem]:
+    return await _fetch_source(
+        db, inbox_rfis_select(user_id, project_id),
+        lambda c: [c.due_date.asc().nullslast(), c.created_at.desc()], limit,
+    )
+
+
+async def fetch_inbox_meetings(
+    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
+) -> list[InboxMeetingItem]:
+    return await _fetch_source(
+        db, inbox_meetings_select(user_id, project_id),
+        lambda c: [c.scheduled_date.asc()], limit,
     )
 
-    all_items: list[InboxItem] = [*approvals, *tasks, *rfis, *meetings, *defects]
-    sorted_items = sort_inbox_items(all_items)
 
-    counts = InboxCountsResponse(
-        total=len(sorted_items),
-        approval_count=len(approvals),
-        task_count=len(tasks),
-        rfi_count=len(rfis),
-        meeting_count=len(meetings),
-        defect_count=len(defects),
+async def fetch_inbox_defects(
+    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, limit: int = 50
+) -> list[InboxDefectItem]:
+    return await _fetch_source(
+        db, inbox_defects_select(user_id, project_id),
+        lambda c: [c.created_at.desc()], limit,
     )
 
-    return InboxResponse(counts=counts, items=sorted_items[:limit])
+
+def _order_keys(inbox, today: date) -> list[tuple[Any, bool]]:
+    """(expression, ascending) pairs: overdue, due today, then everything else by date."""
+    effective = inbox.c.effective_date
+    bucket = case(
+        (effective.is_(None), 2),
+        (effective < today, 0),
+        (effective == today, 1),
+        else_=2,
+    )
+    return [
+        (bucket, True),
+        (func.coalesce(effective, literal(FAR_FUTURE, Date)), True),
+        (inbox.c.source_rank, True),
+        (inbox.c.asc_ts, True),
+        (inbox.c.desc_ts, False),
+        (inbox.c.id, True),
+    ]
+
+
+def _keyset_after(keys: list[tuple[Any, bool]], values: list) -> Any:
+    clauses = []
+    for i, (column, ascending) in enumerate(keys):
+        equal_prefix = [k == v for (k, _), v in zip(keys[:i], values[:i])]
+        clauses.append(and_(*equal_prefix, column > values[i] if ascending else column < values[i]))
+    return or_(*clauses)
+
+
+def encode_inbox_cursor(values: list) -> str:
+    bucket, sort_date, rank, asc_ts, desc_ts, item_id = values
+    raw = json.dumps([
+        bucket, sort_date.isoformat(), rank, asc_ts.isoformat(), desc_ts.isoformat(), str(item_id),
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_inbox_cursor(cursor: str) -> list:
+    """Raises ValueError for a malformed cursor."""
+    try:
+        bucket, sort_date, rank, asc_ts, desc_ts, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return [
+            int(bucket),
+            date.fromisoformat(sort_date),
+            int(rank),
+            datetime.fromisoformat(asc_ts),
+            datetime.fromisoformat(desc_ts),
+            UUID(item_id),
+        ]
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid inbox cursor") from e
+
+
+async def fetch_inbox_page(
+    db: AsyncSession,
+    user_id: UUID,
+    project_id: Optional[UUID] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> tuple[list[InboxItem], Optional[str]]:
+    inbox = inbox_union(user_id, project_id)
+    keys = _order_keys(inbox, utcnow().date())
+    query = select(inbox, *(key.label(f"k{i}") for i, (key, _) in enumerate(keys)))
+    if cursor:
+        query = query.where(_keyset_after(keys, decode_inbox_cursor(cursor)))
+    query = query.order_by(*(key.asc() if ascending else key.desc() for key, ascending in keys)).limit(limit + 1)
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_inbox_cursor([getattr(last, f"k{i}") for i in range(len(keys))])
+    return [inbox_row_to_item(r) for r in rows], next_cursor
+
+
+async def compute_inbox_counts(
+    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None
+) -> tuple[InboxCountsResponse, Optional[datetime]]:
+    """Per-source counts plus the time of the next upcoming meeting, when the counts go stale."""
+    inbox = inbox_union(user_id, project_id)
+    result = await db.execute(
+        select(inbox.c.entity_type, func.count(), func.min(inbox.c.scheduled_date))
+        .group_by(inbox.c.entity_type)
+    )
+    counts = {"approval": 0, "task": 0, "rfi": 0, "meeting": 0, "defect": 0}
+    next_meeting = None
+    for entity_type, count, first_scheduled in result.all():
+        counts[entity_type] = count
+        if entity_type == "meeting":
+            next_meeting = first_scheduled
+    return InboxCountsResponse(
+        total=sum(counts.values()),
+        approval_count=counts["approval"],
+        task_count=counts["task"],
+        rfi_count=counts["rfi"],
+        meeting_count=counts["meeting"],
+        defect_count=counts["defect"],
+    ), next_meeting
+
+
+async def get_inbox_counts(
+    db: AsyncSession, user_id: UUID, project_id: Optional[UUID] = None, store: bool = False
+) -> InboxCountsResponse:
+    """Badge counts from ``user_inbox_counts``, recomputed when missing or expired.
+
+    Only pass ``store=True`` with a primary-database session; read-replica callers
+    recompute without persisting.
+    """
+    if project_id is None:
+        row = await db.get(UserInboxCount, user_id)
+        if row is not None and row.valid_until > utcnow():
+            return InboxCountsResponse(
+                total=row.approval_count + row.task_count + row.rfi_count + row.meeting_count + row.defect_count,
+                approval_count=row.approval_count,
+                task_count=row.task_count,
+                rfi_count=row.rfi_count,
+                meeting_count=row.meeting_count,
+                defect_count=row.defect_count,
+            )
+
+    counts, next_meeting = await compute_inbox_counts(db, user_id, project_id)
+    if project_id is None and store:
+        valid_until = utcnow() + timedelta(seconds=get_settings().inbox_count_ttl_seconds)
+        if next_meeting is not None:
+            valid_until = min(valid_until, next_meeting)
+        values = {
+            "approval_count": counts.approval_count,
+            "task_count": counts.task_count,
+            "rfi_count": counts.rfi_count,
+            "meeting_count": counts.meeting_count,
+            "defect_count": counts.defect_count,
+            "valid_until": valid_until,
+            "updated_at": utcnow(),
+        }
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        await db.execute(
+            insert(UserInboxCount)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(index_elements=[UserInboxCount.user_id], set_=values)
+        )
+    return counts
+
+
+async def get_inbox(
+    db: AsyncSession,
+    user_id: UUID,
+    project_id: Optional[UUID] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> InboxResponse:
+    # One session serves one statement at a time, so the page and counts run sequentially
+    items, next_cursor = await fetch_inbox_page(db, user_id, project_id, limit, cursor)
+    counts = await get_inbox_counts(db, user_id, project_id)
+    return InboxResponse(counts=counts, items=items, next_cursor=next_cursor)
+
+
+@dataclass(frozen=True)
+class InboxTrigger:
+    # Columns whose change can move a row into or out of someone's inbox
+    fields: tuple[str, ...]
+    # Column naming whose inbox the row is in, directly or through ``users``
+    key: str
+    # Key values (a list or a subquery) -> a select of user ids; None when they are user ids
+    users: Optional[Callable[[Any], Any]] = None
+
+
+def _contact_users(contact_ids) -> Any:
+    return select(Contact.user_id).where(Contact.id.in_(contact_ids))
+
+
+INBOX_TRIGGERS: dict[type, InboxTrigger] = {
+    Task: InboxTrigger(("assignee_id", "status", "project_id"), "assignee_id"),
+    RFI: InboxTrigger(("assigned_to_id", "status", "project_id"), "assigned_to_id"),
+    Meeting: InboxTrigger(
+        ("scheduled_date", "project_id"), "id",
+        lambda ids: select(MeetingAttendee.user_id).where(MeetingAttendee.meeting_id.in_(ids)),
+    ),
+    MeetingAttendee: InboxTrigger(("user_id", "attendance_status", "meeting_id"), "user_id"),
+    Defect: InboxTrigger(
+        ("status", "project_id"), "id",
+        lambda ids: _contact_users(select(DefectAssignee.contact_id).where(DefectAssignee.defect_id.in_(ids))),
+    ),
+    DefectAssignee: InboxTrigger(("contact_id", "defect_id"), "contact_id", _contact_users),
+    ApprovalRequest: InboxTrigger(
+        ("current_status", "project_id"), "id",
+        lambda ids: _contact_users(select(ApprovalStep.contact_id).where(ApprovalStep.approval_request_id.in_(ids))),
+    ),
+    ApprovalStep: InboxTrigger(("status", "contact_id", "approval_request_id"), "contact_id", _contact_users),
+    ProjectMember: InboxTrigger(("user_id", "project_id"), "user_id"),
+    Contact: InboxTrigger(("user_id",), "user_id"),
+}
+INBOX_RECHECK_KEY = "inbox_count_recheck"
+
+
+def _inbox_users(model: type, keys) -> Any:
+    """Users whose inbox holds the ``model`` rows with these key values."""
+    trigger = INBOX_TRIGGERS[model]
+    return trigger.users(keys) if trigger.users else keys
+
+
+def _inbox_invalidation_targets(session: Session) -> list:
+    """User-id lists and selects covering every inbox the flushed changes can affect."""
+    keys: dict[type, set] = {}
+    unloaded: dict[type, set] = {}
+    project_ids = set()
+    for instances, dirty in ((session.new, False), (session.dirty, True), (session.deleted, False)):
+        for instance in instances:
+            model = type(instance)
+            trigger = INBOX_TRIGGERS.get(model)
+            if trigger is None:
+                continue
+            attrs = inspect(instance).attrs
+            if dirty and not any(attrs[field].history.has_changes() for field in trigger.fields):
+                continue
+            if trigger.key == "id" and instance in session.deleted:
+                # Its attendees/assignees/steps may already be gone with it
+                project_ids.add(instance.project_id)
+                continue
+            history = attrs[trigger.key].history
+            values = {*history.added, *history.unchanged, *history.deleted}
+            if values:
+                keys.setdefault(model, set()).update(values)
+                continue
+            # Key not loaded: read the current value back; if it was reassigned blind, the
+            # previous holder is unknown, so fall back to everyone on the project
+            unloaded.setdefault(model, set()).add(instance.id)
+            if history.has_changes() and hasattr(instance, "project_id"):
+                project_ids.add(instance.project_id)
+
+    targets = [_inbox_users(model, list(values - {None})) for model, values in keys.items() if values - {None}]
+    for model, ids in unloaded.items():
+        targets.append(_inbox_users(model, select(getattr(model, INBOX_TRIGGERS[model].key)).where(model.id.in_(ids))))
+    if project_ids - {None}:
+        targets.append(select(ProjectMember.user_id).where(ProjectMember.project_id.in_(project_ids - {None})))
+    return targets
+
+
+def _drop_inbox_counts(connection, targets: list) -> None:
+    if targets:
+        connection.execute(delete(UserInboxCount).where(or_(*(UserInboxCount.user_id.in_(t) for t in targets))))
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_inbox_counts(session: Session, flush_context) -> None:
+    # Same transaction as the write, so a rolled-back change keeps the old counts
+    _drop_inbox_counts(session.connection(), _inbox_invalidation_targets(session))
+
+
+def _invalidate_inbox_counts_on_bulk_insert(orm_execute_state, model: type, trigger: InboxTrigger) -> None:
+    """Bulk INSERTs (e.g. ``session.execute(insert(RFI), rows)``) never reach ``after_flush``."""
+    parameters = orm_execute_state.parameters
+    rows = [parameters] if isinstance(parameters, dict) else list(parameters or ())
+    keys = {row.get(trigger.key) for row in rows}
+    project_ids = {row.get("project_id") for row in rows}
+    upsert = getattr(orm_execute_state.statement, "_post_values_clause", None) is not None
+    connection = orm_execute_state.session.connection()
+    if rows and upsert and None not in project_ids:
+        # An upsert can take a row from whoever holds it now, who only the project knows
+        _drop_inbox_counts(connection, [select(ProjectMember.user_id).where(ProjectMember.project_id.in_(project_ids))])
+    elif rows and not upsert and trigger.key == "id":
+        # A new parent has no attendees, assignees or steps yet
+        return
+    elif rows and not upsert and None not in keys:
+        _drop_inbox_counts(connection, [_inbox_users(model, list(keys))])
+    else:
+        # Nothing in the rows says whose inbox they land in
+        connection.execute(delete(UserInboxCount))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_inbox_counts_on_bulk(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    trigger = INBOX_TRIGGERS.get(mapper.class_) if mapper is not None else None
+    if trigger is None:
+        return
+    model = mapper.class_
+    if orm_execute_state.is_insert:
+        _invalidate_inbox_counts_on_bulk_insert(orm_execute_state, model, trigger)
+        return
+    where = orm_execute_state.statement.whereclause
+    if where is None and isinstance(orm_execute_state.parameters, list):
+        # ORM bulk UPDATE by primary key
+        where = model.id.in_([row["id"] for row in orm_execute_state.parameters])
+    rows = select(model.id) if where is None else select(model.id).where(where)
+
+    # The statement hasn't run yet: clear the inboxes its rows are in now...
+    connection = orm_execute_state.session.connection()
+    _drop_inbox_counts(connection, [_inbox_users(model, select(getattr(model, trigger.key)).where(model.id.in_(rows)))])
+    if orm_execute_state.is_update and trigger.key != "id":
+        # ...and those an UPDATE may move them into, once it has run
+        ids = connection.execute(rows).scalars().all()
+        orm_execute_state.session.info.setdefault(INBOX_RECHECK_KEY, {}).setdefault(model, set()).update(ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _invalidate_inbox_counts_after_bulk(session: Session) -> None:
+    recheck = session.info.pop(INBOX_RECHECK_KEY, None)
+    if recheck:
+        _drop_inbox_counts(session.connection(), [
+            _inbox_users(model, select(getattr(model, INBOX_TRIGGERS[model].key)).where(model.id.in_(ids)))
+            for model, ids in recheck.items()
+        ])
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_inbox_recheck(session: Session) -> None:
+    session.info.pop(INBOX_RECHECK_KEY, None)
@@ -6,7 +6,6 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from weasyprint import HTML
 
 from app.models.approval import ApprovalRequest
 from app.models.equipment import Equipment
@@ -17,11 +16,9 @@ from app.services.ai_report_generator import (
     generate_inspection_summary_narrative,
     generate_weekly_progress_narrative,
 )
-from app.services.chart_service import (
-    generate_inspection_chart,
-    generate_progress_chart,
-)
+from app.services.chart_service import render_chart_uri
 from app.services.email_icons import ICON_DATA
+from app.services.pdf_render_service import render_pdf
 from app.utils import utcnow
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
@@ -146,7 +143,7 @@ def build_inspection_context(inspection: Inspection, strings: dict) -> dict:
     }
 
 
-def generate_inspections_report_pdf(inspections: list[Inspection], project, language: str = "he") -> bytes:
+def generate_inspections_report_html(inspections: list[Inspection], project, language: str = "he") -> str:
     s = STRINGS.get(language, STRINGS["he"])
     direction = "rtl" if language == "he" else "ltr"
     align = "right" if language == "he" else "left"
@@ -165,9 +162,29 @@ def generate_inspections_report_pdf(inspections: list[Inspection], project, lang
         total_count=len(inspections),
         inspections=inspection_items,
     )
+    return html_content
 
-    pdf_bytes = HTML(string=html_content, base_url=TEMPLATES_DIR).write_pdf()
-    return pdf_bytes
+
+async def generate_inspections_report_html_for_ids(
+    db: AsyncSession, inspection_ids: list[UUID], project, language: str = "he"
+) -> str:
+    """Rebuild a queued report from its inspection ids, in the order the export endpoint lists them."""
+    result = await db.execute(
+        select(Inspection)
+        .options(
+            selectinload(Inspection.created_by),
+            selectinload(Inspection.consultant_type),
+            selectinload(Inspection.findings),
+        )
+        .where(Inspection.id.in_(inspection_ids))
+        .order_by(Inspection.scheduled_date.desc())
+    )
+    return generate_inspections_report_html(list(result.scalars().all()), project, language)
+
+
+async def generate_inspections_report_pdf(inspections: list[Inspection], project, language: str = "he") -> bytes:
+    html_content = generate_inspections_report_html(inspections, project, language)
+    return await render_pdf(html_content, base_url=TEMPLATES_DIR)
 
 
 async def generate_ai_weekly_report_html(
@@ -208,10 +225,10 @@ async def generate_ai_weekly_report_html(
         select(func.count(RFI.id)).where(RFI.project_id == project_id)
     )
 
-    progress_chart = generate_progress_chart({
+    progress_chart = await render_chart_uri("progress", {
         "completed": equipment_count or 0,
         "pending": materials_count or 0,
-    })
+    }, language)
 
     inspection_stats = {}
     inspections = await db.scalars(
@@ -227,7 +244,9 @@ async def generate_ai_weekly_report_html(
         status = insp.status or "pending"
         inspection_stats[status] = inspection_stats.get(status, 0) + 1
 
-    inspection_chart = generate_inspection_chart(inspection_stats) if inspection_stats else None
+    inspection_chart = (
+        await render_chart_uri("inspection", inspection_stats, language) if inspection_stats else None
+    )
 
     photos = []
 
@@ -265,8 +284,7 @@ async def generate_ai_weekly_report_pdf(
     html_content = await generate_ai_weekly_report_html(
         db, project_id, project, date_from, date_to, language
     )
-    pdf_bytes = HTML(string=html_content, base_url=TEMPLATES_DIR).write_pdf()
-    return pdf_bytes
+    return await render_pdf(html_content, base_url=TEMPLATES_DIR)
 
 
 async def generate_ai_inspection_summary_pdf(
@@ -307,7 +325,9 @@ async def generate_ai_inspection_summary_pdf(
         status = insp.status or "pending"
         inspection_stats[status] = inspection_stats.get(status, 0) + 1
 
-    inspection_chart = generate_inspection_chart(inspection_stats) if inspection_stats else None
+    inspection_chart = (
+        await render_chart_uri("inspection", inspection_stats, language) if inspection_stats else None
+    )
 
     total_findings = sum(len(insp.findings or []) for insp in inspections_list)
     critical_findings = sum(
@@ -351,5 +371,4 @@ async def generate_ai_inspection_summary_pdf(
         language=language,
     )
 
-    pdf_bytes = HTML(string=html_content, base_url=TEMPLATES_DIR).write_pdf()
-    return pdf_bytes
+    return await render_pdf(html_content, base_url=TEMPLATES_DIR)
@@ -0,0 +1,301 @@
+"""
+Pooled HTTP clients for outbound integrations.
+
+Each upstream (Autodesk, PayPlus, RasterScan, ...) gets one long-lived client per event loop,
+so calls reuse keep-alive connections (HTTP/2 where the upstream speaks it) instead of paying
+a TCP and TLS handshake every time. Requests go through ``IntegrationClient.request``, which:
+
+- fails fast with ``CircuitOpenError`` while the upstream's circuit breaker is open, after
+  ``integration_breaker_failure_threshold`` consecutive transport errors or 429/5xx responses;
+- retries those failures with jittered exponential backoff, honouring ``Retry-After``, but only
+  for idempotent methods unless the caller passes ``retry=True``;
+- records per-upstream latency histograms and request/retry counters.
+
+Responses are returned as they are, so callers keep their own ``raise_for_status`` and status
+handling. Blocking callers (code running in executor threads) use ``get_sync_http_client``,
+which shares the same breakers. Clients are closed by ``close_http_clients`` from the app
+lifespan and on worker shutdown.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+from app.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Rate limited, or a transient upstream failure worth another attempt
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """An external service: clients, breakers and metrics are keyed by ``name``."""
+
+    name: str
+    base_url: str
+    http2: bool = True
+    timeout_seconds: Optional[float] = None
+    connect_timeout_seconds: float = 10.0
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while the upstream's breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker. Once open, one trial request is let through per
+    ``reset_seconds``; its success closes the breaker and its failure keeps it open.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_seconds:
+                return False
+            # Half-open: this request is the trial, later ones wait for the next window
+            self.opened_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if it opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is None and self.failures < self.failure_threshold:
+                return False
+            opened = self.opened_at is None
+            self.opened_at = time.monotonic()
+            return opened
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            settings = get_settings()
+            breaker = _breakers[name] = CircuitBreaker(
+                settings.integration_breaker_failure_threshold,
+                settings.integration_breaker_reset_seconds,
+            )
+        return breaker
+
+
+class _ClientBase:
+    def __init__(self, upstream: Upstream):
+        settings = get_settings()
+        self.upstream = upstream
+        self.breaker = get_breaker(upstream.name)
+        self.max_retries = settings.integration_http_max_retries
+        self.retry_backoff_seconds = settings.integration_http_retry_backoff_seconds
+
+    def _client_options(self) -> dict[str, Any]:
+        settings = get_settings()
+        return {
+            "base_url": self.upstream.base_url,
+            "http2": self.upstream.http2,
+            "limits": httpx.Limits(
+                max_connections=settings.integration_http_max_connections,
+                max_keepalive_connections=settings.integration_http_max_connections,
+            ),
+            "timeout": httpx.Timeout(
+                self.upstream.timeout_seconds or settings.integration_http_timeout_seconds,
+                connect=self.upstream.connect_timeout_seconds,
+            ),
+        }
+
+    def _check_breaker(self) -> None:
+        if not self.breaker.allow():
+            metrics.inc("integration_http_rejected_total", upstream=self.upstream.name)
+            raise CircuitOpenError(f"{self.upstream.name} is unavailable (circuit open)")
+
+    def _record(
+        self, method: str, start: float, response: Optional[httpx.Response], error: Optional[Exception]
+    ) -> bool:
+        """Record metrics and breaker state for one attempt; returns True if it failed."""
+        elapsed_ms = (time.monotonic() - start) * 1000
+        name = self.upstream.name
+        failed = error is not None or response.status_code in RETRY_STATUS_CODES
+        status = type(error).__name__ if error is not None else response.status_code
+        metrics.observe("integration_http_latency_ms", elapsed_ms, upstream=name, method=method)
+        metrics.inc("integration_http_requests_total", upstream=name, method=method, status=status)
+        if not failed:
+            self.breaker.record_success()
+        elif self.breaker.record_failure():
+            logger.error("Circuit opened for %s after %d consecutive failures", name, self.breaker.failures)
+        return failed
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass
+        backoff = self.retry_backoff_seconds * 2 ** attempt
+        return backoff + random.uniform(0, backoff)
+
+    def _next_delay(
+        self, method: str, url: str, attempt: int, response: Optional[httpx.Response]
+    ) -> float:
+        delay = self._retry_delay(attempt, response)
+        metrics.inc("integration_http_retries_total", upstream=self.upstream.name)
+        logger.warning(
+            "%s %s %s failed (%s), retrying in %.1fs",
+            self.upstream.name, method, url,
+            response.status_code if response is not None else "connection error", delay,
+        )
+        return delay
+
+
+class IntegrationClient(_ClientBase):
+    """Async client for one upstream; obtain it with ``get_http_client``."""
+
+    def __init__(self, upstream: Upstream, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(upstream)
+        self.http = httpx.AsyncClient(transport=transport, **self._client_options())
+
+    async def request(self, method: str, url: str, *, retry: Optional[bool] = None, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request. ``retry`` defaults to whether the method is idempotent; pass
+        ``retry=True`` for a POST that is safe to repeat (e.g. a token grant).
+        """
+        method = method.upper()
+        retry = method in IDEMPOTENT_METHODS if retry is None else retry
+        attempt = 0
+        while True:
+            self._check_breaker()
+            start = time.monotonic()
+            response = error = None
+            try:
+                response = await self.http.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            if not self._record(method, start, response, error) or not retry or attempt >= self.max_retries:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(self._next_delay(method, url, attempt, response))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+
+class SyncIntegrationClient(_ClientBase):
+    """Blocking twin of ``IntegrationClient`` for code that runs in executor threads."""
+
+    def __init__(self, upstream: Upstream, transport: Optional[httpx.BaseTransport] = None):
+        super().__init__(upstream)
+        self.http = httpx.Client(transport=transport, **self._client_options())
+
+    def request(self, method: str, url: str, *, retry: Optional[bool] = None, **kwargs: Any) -> httpx.Response:
+        method = method.upper()
+        retry = method in IDEMPOTENT_METHODS if retry is None else retry
+        attempt = 0
+        while True:
+            self._check_breaker()
+            start = time.monotonic()
+            response = error = None
+            try:
+                response = self.http.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            if not self._record(method, start, response, error) or not retry or attempt >= self.max_retries:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(self._next_delay(method, url, attempt, response))
+            attempt += 1
+
+    def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.http.close()
+
+
+# Async connections are bound to the loop that opened them, so keep one set of clients per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, IntegrationClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_sync_clients: dict[str, SyncIntegrationClient] = {}
+_sync_clients_lock = threading.Lock()
+
+
+def get_http_client(upstream: Upstream) -> IntegrationClient:
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(upstream.name)
+    if client is None:
+        client = clients[upstream.name] = IntegrationClient(upstream)
+    return client
+
+
+def get_sync_http_client(upstream: Upstream) -> SyncIntegrationClient:
+    with _sync_clients_lock:
+        client = _sync_clients.get(upstream.name)
+        if client is None:
+            client = _sync_clients[upstream.name] = SyncIntegrationClient(upstream)
+        return client
+
+
+async def close_http_clients() -> None:
+    """Close the running loop's clients and the shared blocking clients."""
+    for client in _async_clients.pop(asyncio.get_running_loop(), {}).values():
+        await client.aclose()
+    with _sync_clients_lock:
+        sync_clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in sync_clients:
+        client.close()
@@ -0,0 +1,300 @@
+"""
+Content-addressed cache for LLM analysis results.
+
+Results are keyed on (sha256 of the file bytes, analysis type, model, prompt
+version, language) so byte-identical re-uploads and repeated analyses are
+served without another Gemini call. Entries expire after a TTL and the least
+recently used entries are evicted once the cache grows past its size limit.
+Cache failures never fail an analysis: they are logged and treated as a miss.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.core.redis_clients import get_cache_redis
+from app.db.session import AsyncSessionLocal
+from app.models.llm_response_cache import LLMResponseCache
+from app.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "llmcache"
+REDIS_LRU_KEY = f"{REDIS_KEY_PREFIX}:lru"
+
+
+def file_sha256(file_content: bytes) -> str:
+    return hashlib.sha256(file_content).hexdigest()
+
+
+def prompt_version(*prompts: str) -> str:
+    """Short fingerprint of the prompt text, so editing a prompt invalidates old results."""
+    return hashlib.sha256("\x00".join(prompts).encode()).hexdigest()[:16]
+
+
+def build_cache_key(
+    file_hash: str,
+    analysis_type: str,
+    model: str,
+    prompt_ver: str,
+    language: Optional[str] = None,
+) -> str:
+    raw = "|".join([file_hash, analysis_type, model, prompt_ver, language or ""])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class LLMCacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str, file_hash: str, analysis_type: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: dict,
+        file_hash: str,
+        analysis_type: str,
+        model: str,
+        prompt_ver: str,
+        language: Optional[str] = None,
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def invalidate(self, file_hash: Optional[str] = None, analysis_type: Optional[str] = None) -> int:
+        pass
+
+
+class RedisLLMCache(LLMCacheBackend):
+    """Entries live under ``llmcache:{file_sha}:{analysis_type}:{key}`` with a native TTL.
+
+    A sorted set scored by last access time tracks recency for LRU eviction.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int, max_entries: int):
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @property
+    def redis(self):
+        return get_cache_redis(self.redis_url)
+
+    @staticmethod
+    def _entry_key(key: str, file_hash: str, analysis_type: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{file_hash}:{analysis_type}:{key}"
+
+    async def get(self, key: str, file_hash: str, analysis_type: str) -> Optional[dict]:
+        entry_key = self._entry_key(key, file_hash, analysis_type)
+        raw = await self.redis.get(entry_key)
+        if raw is None:
+            await self.redis.zrem(REDIS_LRU_KEY, entry_key)
+            return None
+        await self.redis.zadd(REDIS_LRU_KEY, {entry_key: time.time()})
+        return json.loads(raw)
+
+    async def set(
+        self,
+        key: str,
+        value: dict,
+        file_hash: str,
+        analysis_type: str,
+        model: str,
+        prompt_ver: str,
+        language: Optional[str] = None,
+    ) -> None:
+        entry_key = self._entry_key(key, file_hash, analysis_type)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(entry_key, json.dumps(value), ex=self.ttl_seconds)
+            pipe.zadd(REDIS_LRU_KEY, {entry_key: time.time()})
+            pipe.zcard(REDIS_LRU_KEY)
+            results = await pipe.execute()
+        overflow = results[-1] - self.max_entries
+        if overflow > 0:
+            await self._evict(overflow)
+
+    async def _evict(self, count: int) -> None:
+        oldest = await self.redis.zpopmin(REDIS_LRU_KEY, count)
+        if not oldest:
+            return
+        entry_keys = [k.decode() if isinstance(k, bytes) else k for k, _ in oldest]
+        await self.redis.delete(*entry_keys)
+
+    async def invalidate(self, file_hash: Optional[str] = None, analysis_type: Optional[str] = None) -> int:
+        pattern = f"{REDIS_KEY_PREFIX}:{file_hash or '*'}:{analysis_type or '*'}:*"
+        entry_keys = []
+        async for entry_key in self.redis.scan_iter(match=pattern, count=500):
+            entry_key = entry_key.decode() if isinstance(entry_key, bytes) else entry_key
+            if entry_key == REDIS_LRU_KEY:
+                continue
+            entry_keys.append(entry_key)
+        if not entry_keys:
+            return 0
+        deleted = await self.redis.delete(*entry_keys)
+        await self.redis.zrem(REDIS_LRU_KEY, *entry_keys)
+        return deleted
+
+
+class PostgresLLMCache(LLMCacheBackend):
+    """Entries are rows in ``llm_response_cache``, evicted by ``last_accessed_at``.
+
+    Uses its own short-lived sessions so cache writes never join the caller's transaction.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int, session_factory=AsyncSessionLocal):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.session_factory = session_factory
+
+    async def get(self, key: str, file_hash: str, analysis_type: str) -> Optional[dict]:
+        now = utcnow()
+        async with self.session_factory() as session:
+            entry = await session.get(LLMResponseCache, key)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                await session.delete(entry)
+                await session.commit()
+                return None
+            value = entry.response
+            await session.execute(
+                update(LLMResponseCache)
+                .where(LLMResponseCache.cache_key == key)
+                .values(last_accessed_at=now, hit_count=LLMResponseCache.hit_count + 1)
+            )
+            await session.commit()
+            return value
+
+    async def set(
+        self,
+        key: str,
+        value: dict,
+        file_hash: str,
+        analysis_type: str,
+        model: str,
+        prompt_ver: str,
+        language: Optional[str] = None,
+    ) -> None:
+        now = utcnow()
+        async with self.session_factory() as session:
+            entry = await session.get(LLMResponseCache, key)
+            if entry is None:
+                entry = LLMResponseCache(
+                    cache_key=key,
+                    file_sha256=file_hash,
+                    analysis_type=analysis_type,
+                    model=model,
+                    prompt_version=prompt_ver,
+                    language=language,
+                    hit_count=0,
+                )
+                session.add(entry)
+            entry.response = value
+            entry.created_at = now
+            entry.last_accessed_at = now
+            entry.expires_at = now + timedelta(seconds=self.ttl_seconds)
+            await session.flush()
+            await self._evict(session)
+            await session.commit()
+
+    async def _evict(self, session) -> None:
+        await session.execute(delete(LLMResponseCache).where(LLMResponseCache.expires_at <= utcnow()))
+        # Walk the last_accessed_at index to the Nth most recent entry and drop everything older
+        cutoff = await session.scalar(
+            select(LLMResponseCache.last_accessed_at)
+            .order_by(LLMResponseCache.last_accessed_at.desc())
+            .offset(self.max_entries)
+            .limit(1)
+        )
+        if cutoff is not None:
+            await session.execute(delete(LLMResponseCache).where(LLMResponseCache.last_accessed_at <= cutoff))
+
+    async def invalidate(self, file_hash: Optional[str] = None, analysis_type: Optional[str] = None) -> int:
+        stmt = delete(LLMResponseCache)
+        if file_hash:
+            stmt = stmt.where(LLMResponseCache.file_sha256 == file_hash)
+        if analysis_type:
+            stmt = stmt.where(LLMResponseCache.analysis_type == analysis_type)
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.rowcount or 0
+
+
+_cache_backend: Optional[LLMCacheBackend] = None
+
+
+def get_llm_cache() -> Optional[LLMCacheBackend]:
+    global _cache_backend
+    settings = get_settings()
+    backend = settings.llm_cache_backend.lower()
+    if backend == "none":
+        return None
+    if _cache_backend is None:
+        if backend == "redis":
+            _cache_backend = RedisLLMCache(
+                settings.redis_url,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+                max_entries=settings.llm_cache_max_entries,
+            )
+        elif backend == "postgres":
+            _cache_backend = PostgresLLMCache(
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+                max_entries=settings.llm_cache_max_entries,
+            )
+        else:
+            raise ValueError(f"Unsupported LLM cache backend: {settings.llm_cache_backend}")
+    return _cache_backend
+
+
+async def get_or_compute(
+    file_content: bytes,
+    analysis_type: str,
+    model: str,
+    prompt_ver: str,
+    compute: Callable[[], Awaitable[dict]],
+    language: Optional[str] = None,
+    should_cache: Callable[[dict], bool] = lambda result: True,
+) -> dict:
+    """Return a cached result for identical input, or run ``compute`` and store its result.
+
+    On a hit ``processing_time_ms`` reflects the cache lookup, not the original LLM call.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return await compute()
+
+    file_hash = file_sha256(file_content)
+    key = build_cache_key(file_hash, analysis_type, model, prompt_ver, language)
+
+    start = time.monotonic()
+    try:
+        cached = await cache.get(key, file_hash, analysis_type)
+    except Exception as e:
+        logger.warning("LLM cache lookup failed for %s: %s", analysis_type, e)
+        cached = None
+
+    if cached is not None:
+        metrics.inc("llm_cache_hits_total", analysis_type=analysis_type)
+        result = dict(cached)
+        result["processing_time_ms"] = int((time.monotonic() - start) * 1000)
+        return result
+
+    metrics.inc("llm_cache_misses_total", analysis_type=analysis_type)
+    result = await compute()
+    if should_cache(result):
+        try:
+            await cache.set(key, result, file_hash, analysis_type, model, prompt_ver, language)
+        except Exception as e:
+            logger.warning("LLM cache store failed for %s: %s", analysis_type, e)
+    return result
@@ -0,0 +1,137 @@
+"""
+Shared async gateway for Gemini calls.
+
+All services go through one pooled ``genai.Client`` using the async API so an
+LLM call never blocks the event loop. The gateway bounds concurrent calls,
+applies a per-attempt timeout, retries transient failures with jittered
+exponential backoff and records latency/token metrics per operation.
+"""
+
+import asyncio
+import logging
+import random
+import time
+import weakref
+from typing import Any, Optional
+
+import httpx
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from app.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, ConnectionError)):
+        return True
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code in RETRYABLE_STATUS_CODES
+    return False
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 8,
+        timeout_seconds: float = 120.0,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 1.0,
+    ):
+        self.client = genai.Client(api_key=api_key)
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def generate_content(
+        self,
+        contents: Any,
+        model: Optional[str] = None,
+        config: Optional[types.GenerateContentConfig] = None,
+        operation: str = "generate_content",
+    ) -> types.GenerateContentResponse:
+        model_name = model or get_settings().gemini_model
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                async with self._semaphore:
+                    response = await asyncio.wait_for(
+                        self.client.aio.models.generate_content(model=model_name, contents=contents, config=config),
+                        timeout=self.timeout_seconds,
+                    )
+            except Exception as exc:
+                elapsed_ms = (time.monotonic() - start) * 1000
+                retryable = _is_retryable(exc)
+                metrics.inc("llm_errors_total", operation=operation, model=model_name, error=type(exc).__name__)
+                if not retryable or attempt >= self.max_retries:
+                    logger.warning(
+                        "LLM call %s failed after %d attempt(s): %s", operation, attempt + 1, exc,
+                        extra={"llm_operation": operation, "llm_model": model_name, "latency_ms": round(elapsed_ms)},
+                    )
+                    raise
+                delay = self.retry_backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.5)
+                metrics.inc("llm_retries_total", operation=operation, model=model_name)
+                logger.info("Retrying LLM call %s in %.1fs (attempt %d): %s", operation, delay, attempt + 1, exc)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            elapsed_ms = (time.monotonic() - start) * 1000
+            self._record_success(operation, model_name, elapsed_ms, response)
+            return response
+
+    def _record_success(
+        self,
+        operation: str,
+        model_name: str,
+        elapsed_ms: float,
+        response: types.GenerateContentResponse,
+    ) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+        output_tokens = getattr(usage, "candidates_token_count", None) or 0
+        metrics.inc("llm_calls_total", operation=operation, model=model_name)
+        metrics.observe("llm_latency_ms", elapsed_ms, operation=operation, model=model_name)
+        metrics.inc("llm_prompt_tokens_total", prompt_tokens, operation=operation, model=model_name)
+        metrics.inc("llm_output_tokens_total", output_tokens, operation=operation, model=model_name)
+        logger.info(
+            "LLM call %s took %dms", operation, elapsed_ms,
+            extra={
+                "llm_operation": operation,
+                "llm_model": model_name,
+                "latency_ms": round(elapsed_ms),
+                "prompt_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+            },
+        )
+
+
+# The async genai client and the semaphore are bound to the loop that first uses them,
+# and Celery tasks run each job in a fresh loop, so keep one gateway per event loop.
+_gateways: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMGateway]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_gateway() -> LLMGateway:
+    settings = get_settings()
+    if not settings.gemini_api_key:
+        raise ValueError("GEMINI_API_KEY is not configured")
+    loop = asyncio.get_running_loop()
+    gateway = _gateways.get(loop)
+    if gateway is None:
+        gateway = LLMGateway(
+            api_key=settings.gemini_api_key,
+            max_concurrency=settings.llm_max_concurrency,
+            timeout_seconds=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+            retry_backoff_seconds=settings.llm_retry_backoff_seconds,
+        )
+        _gateways[loop] = gateway
+    return gateway
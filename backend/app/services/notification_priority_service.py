@@ -2,7 +2,7 @@ import logging
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import case, func, select
+from sqlalchemy import Select, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.notification import NotificationCategory, UrgencyLevel
@@ -57,6 +57,51 @@ async def calculate_notification_urgency(
         return UrgencyLevel.MEDIUM.value
 
 
+async def calculate_notification_urgencies(
+    db: AsyncSession,
+    category: str,
+    user_ids: list[UUID],
+    entity_type: Optional[str] = None,
+    context: Optional[dict] = None,
+) -> dict[UUID, str]:
+    """
+    Calculate the urgency of one notification for many recipients.
+
+    Same rules as calculate_notification_urgency, with every recipient's interaction
+    history read in a single grouped query.
+
+    Returns:
+        Urgency level per user ID
+    """
+    base_urgency = _get_base_urgency(category, entity_type, context or {})
+    urgencies = {user_id: base_urgency for user_id in user_ids}
+    if not user_ids or not entity_type:
+        return urgencies
+
+    try:
+        result = await db.execute(
+            _interaction_totals()
+            .add_columns(NotificationInteraction.user_id)
+            .where(NotificationInteraction.user_id.in_(user_ids))
+            .group_by(NotificationInteraction.user_id)
+        )
+        for row in result.all():
+            urgencies[row.user_id] = _apply_interaction_rates(base_urgency, row.total, row.acted_upon, row.dismissed)
+    except Exception as e:
+        error_type = type(e).__name__
+        error_message = str(e)
+
+        logger.error(
+            "Failed to adjust urgency by behavior - "
+            "Users: %d, Category: %s, Entity Type: %s, "
+            "Error Type: %s, Message: %s",
+            len(user_ids), category, entity_type,
+            error_type, error_message,
+            exc_info=True
+        )
+    return urgencies
+
+
 def _get_base_urgency(category: str, entity_type: Optional[str], context: dict) -> str:
     """Determine base urgency from category, entity type, and context."""
     is_overdue = context.get("is_overdue", False)
@@ -98,6 +143,57 @@ def _get_base_urgency(category: str, entity_type: Optional[str], context: dict)
     return UrgencyLevel.MEDIUM.value
 
 
+def _interaction_totals() -> Select:
+    return (
+        select(
+            func.count(NotificationInteraction.id).label("total"),
+            func.sum(
+                case(
+                    (NotificationInteraction.interaction_type == InteractionType.ACTED_UPON.value, 1),
+                    else_=0,
+                )
+            ).label("acted_upon"),
+            func.sum(
+                case(
+                    (NotificationInteraction.interaction_type == InteractionType.DISMISSED.value, 1),
+                    else_=0,
+                )
+            ).label("dismissed"),
+        )
+        .select_from(NotificationInteraction)
+        .join(
+            NotificationInteraction.notification
+        )
+    )
+
+
+def _apply_interaction_rates(
+    base_urgency: str, total: int, acted_upon: Optional[int], dismissed: Optional[int]
+) -> str:
+    """Raise urgency for users who usually act on notifications, lower it for those who dismiss them."""
+    if total < 5:
+        return base_urgency
+
+    action_rate = (acted_upon or 0) / total
+    dismiss_rate = (dismissed or 0) / total
+
+    urgency_levels = [
+        UrgencyLevel.LOW.value,
+        UrgencyLevel.MEDIUM.value,
+        UrgencyLevel.HIGH.value,
+        UrgencyLevel.CRITICAL.value,
+    ]
+    current_index = urgency_levels.index(base_urgency)
+
+    if action_rate > 0.7 and current_index < len(urgency_levels) - 1:
+        return urgency_levels[current_index + 1]
+
+    if dismiss_rate > 0.7 and current_index > 0:
+        return urgency_levels[current_index - 1]
+
+    return base_urgency
+
+
 async def _adjust_urgency_by_behavior(
     db: AsyncSession,
     user_id: UUID,
@@ -113,56 +209,12 @@ async def _adjust_urgency_by_behavior(
     """
     try:
         result = await db.execute(
-            select(
-                func.count(NotificationInteraction.id).label("total"),
-                func.sum(
-                    case(
-                        (NotificationInteraction.interaction_type == InteractionType.ACTED_UPON.value, 1),
-                        else_=0,
-                    )
-                ).label("acted_upon"),
-                func.sum(
-                    case(
-                        (NotificationInteraction.interaction_type == InteractionType.DISMISSED.value, 1),
-                        else_=0,
-                    )
-                ).label("dismissed"),
-            )
-            .select_from(NotificationInteraction)
-            .join(
-                NotificationInteraction.notification
-            )
-            .where(
-                NotificationInteraction.user_id == user_id,
-            )
+            _interaction_totals().where(NotificationInteraction.user_id == user_id)
         )
         row = result.one_or_none()
-
-        if not row or row.total < 5:
+        if not row:
             return base_urgency
-
-        total = row.total
-        acted_upon = row.acted_upon or 0
-        dismissed = row.dismissed or 0
-
-        action_rate = acted_upon / total if total > 0 else 0
-        dismiss_rate = dismissed / total if total > 0 else 0
-
-        urgency_levels = [
-            UrgencyLevel.LOW.value,
-            UrgencyLevel.MEDIUM.value,
-            UrgencyLevel.HIGH.value,
-            UrgencyLevel.CRITICAL.value,
-        ]
-        current_index = urgency_levels.index(base_urgency)
-
-        if action_rate > 0.7 and current_index < len(urgency_levels) - 1:
-            return urgency_levels[current_index + 1]
-
-        if dismiss_rate > 0.7 and current_index > 0:
-            return urgency_levels[current_index - 1]
-
-        return base_urgency
+        return _apply_interaction_rates(base_urgency, row.total, row.acted_upon, row.dismissed)
     except Exception as e:
         error_type = type(e).__name__
         error_message = str(e)
@@ -1,23 +1,31 @@
 import logging
+import uuid
+from collections.abc import Sequence
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import event, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from app.models.contact import Contact
 from app.models.notification import Notification
 from app.models.notification_interaction import NotificationInteraction
 from app.models.project import ProjectMember, UserRole
 from app.models.user import User
-from app.services.email_renderer import render_notification_email
-from app.services.email_service import EmailService
-from app.services.notification_priority_service import calculate_notification_urgency
+from app.services.notification_priority_service import (
+    calculate_notification_urgencies,
+    calculate_notification_urgency,
+)
 from app.services.websocket_manager import manager as ws_manager
-from app.services.whatsapp_service import WhatsAppService
+from app.utils import utcnow
 
 logger = logging.getLogger(__name__)
 
+PENDING_DELIVERIES_KEY = "pending_notification_deliveries"
+# Rows per INSERT, keeping the bound parameters well under the driver limit
+NOTIFICATION_INSERT_CHUNK = 1000
+
 
 async def broadcast_notification(project_id: UUID, notification: Notification) -> None:
     try:
@@ -141,42 +149,138 @@ async def notify_user(
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
 
-    if user and user.whatsapp_number and user.whatsapp_verified:
-        try:
-            whatsapp_service = WhatsAppService()
-            if whatsapp_service.enabled:
-                formatted_message = whatsapp_service.format_notification_message(
-                    title=title,
-                    message=message,
-                    action_url=action_url if action_url else None,
-                    language=language
-                )
-                whatsapp_service.send_message(
-                    to_whatsapp=user.whatsapp_number,
-                    body=formatted_message
-                )
-        except Exception:
-            logger.exception("Failed to send WhatsApp notification to %s", user.whatsapp_number)
-
+    if user:
+        _queue_whatsapp(db, user, title, message, action_url, language)
     if email:
+        queue_email(db, email, title, message, action_url, project_name, language)
+
+
+async def notify_users(
+    db: AsyncSession,
+    users: Sequence[User],
+    category: str,
+    title: str,
+    message: str,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[UUID] = None,
+    action_url: str = "",
+    project_name: str = "",
+    project_id: Optional[UUID] = None,
+    context: Optional[dict] = None,
+) -> list[Notification]:
+    """
+    Send one notification to many users.
+
+    Urgencies come from one grouped query and the notifications from one multi-row
+    insert; email and WhatsApp deliveries are queued for the worker.
+
+    Returns:
+        The inserted notifications (not attached to the session)
+    """
+    if not users:
+        return []
+
+    urgencies = await calculate_notification_urgencies(
+        db, category, [user.id for user in users], entity_type=entity_type, context=context,
+    )
+    now = utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user.id,
+            "category": category,
+            "urgency": urgencies[user.id],
+            "title": title,
+            "message": message,
+            "related_entity_type": entity_type,
+            "related_entity_id": entity_id,
+            "is_read": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for user in users
+    ]
+    for start in range(0, len(rows), NOTIFICATION_INSERT_CHUNK):
+        await db.execute(insert(Notification).values(rows[start:start + NOTIFICATION_INSERT_CHUNK]))
+    notifications = [Notification(**row) for row in rows]
+
+    if project_id:
+        for notification in notifications:
+            await broadcast_notification(project_id, notification)
+    for user in users:
+        language = user.language or "en"
+        _queue_whatsapp(db, user, title, message, action_url, language)
+        if user.email:
+            queue_email(db, user.email, title, message, action_url, project_name, language)
+    return notifications
+
+
+def queue_email(
+    db: AsyncSession,
+    to_email: str,
+    title: str,
+    message: str,
+    action_url: str = "",
+    project_name: str = "",
+    language: str = "en",
+) -> None:
+    """Send a notification email from the worker once the session commits."""
+    db.info.setdefault(PENDING_DELIVERIES_KEY, []).append((
+        "email",
+        {
+            "to_email": to_email,
+            "title": title,
+            "message": message,
+            "action_url": action_url,
+            "project_name": project_name,
+            "language": language,
+        },
+    ))
+
+
+def _queue_whatsapp(
+    db: AsyncSession, user: User, title: str, message: str, action_url: str, language: str,
+) -> None:
+    if not (user.whatsapp_number and user.whatsapp_verified):
+        return
+    db.info.setdefault(PENDING_DELIVERIES_KEY, []).append((
+        "whatsapp",
+        {
+            "to_whatsapp": user.whatsapp_number,
+            "title": title,
+            "message": message,
+            "action_url": action_url,
+            "language": language,
+        },
+    ))
+
+
+def enqueue_deliveries(deliveries: list[tuple[str, dict]]) -> None:
+    from app.worker.tasks.notification_delivery import (
+        deliver_notification_email,
+        deliver_notification_whatsapp,
+    )
+
+    tasks = {"email": deliver_notification_email, "whatsapp": deliver_notification_whatsapp}
+    for channel, payload in deliveries:
         try:
-            service = EmailService()
-            if service.enabled:
-                subject, html = render_notification_email(title, message, action_url, project_name, language)
-                service.send_notification(to_email=email, subject=subject, body_html=html)
-        except Exception as e:
-            error_type = type(e).__name__
-            http_status = getattr(e, 'status_code', 'N/A')
-            error_message = str(e)
-
-            logger.error(
-                "Failed to send notification email - "
-                "Recipient: %s, Category: %s, Title: %s, Entity: %s/%s, Project: %s, "
-                "Error Type: %s, HTTP Status: %s, Message: %s",
-                email, category, title, entity_type or 'None', entity_id or 'None',
-                project_name or 'None', error_type, http_status, error_message,
-                exc_info=True
-            )
+            tasks[channel].delay(**payload)
+        except Exception as exc:
+            # The notification itself is committed; only the external copy is lost
+            logger.error("Failed to enqueue %s notification delivery: %s", channel, exc)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed_deliveries(session: Session) -> None:
+    deliveries = session.info.pop(PENDING_DELIVERIES_KEY, None)
+    if deliveries:
+        enqueue_deliveries(deliveries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deliveries(session: Session) -> None:
+    # Nothing was notified, so nothing is sent
+    session.info.pop(PENDING_DELIVERIES_KEY, None)
 
 
 async def notify_contact(
@@ -204,24 +308,7 @@ async def notify_contact(
             )
             return
     if contact.email:
-        try:
-            service = EmailService()
-            if service.enabled:
-                subject, html = render_notification_email(title, message, action_url, project_name)
-                service.send_notification(to_email=contact.email, subject=subject, body_html=html)
-        except Exception as e:
-            error_type = type(e).__name__
-            http_status = getattr(e, 'status_code', 'N/A')
-            error_message = str(e)
-
-            logger.error(
-                "Failed to send notification email to contact - "
-                "Recipient: %s, Contact ID: %s, Category: %s, Title: %s, Entity: %s/%s, Project: %s, "
-                "Error Type: %s, HTTP Status: %s, Message: %s",
-                contact.email, contact.id, category, title, entity_type or 'None', entity_id or 'None',
-                project_name or 'None', error_type, http_status, error_message,
-                exc_info=True
-            )
+        queue_email(db, contact.email, title, message, action_url, project_name)
 
 
 async def notify_project_admins(
@@ -245,14 +332,11 @@ async def notify_project_admins(
         )
     )
     admins = result.scalars().all()
-    for admin in admins:
-        await notify_user(
-            db, admin.id, category, title, message,
-            entity_type, entity_id,
-            email=admin.email, action_url=action_url,
-            project_name=project_name, language=admin.language or "en",
-            project_id=project_id,
-        )
+    await notify_users(
+        db, admins, category, title, message,
+        entity_type, entity_id,
+        action_url=action_url, project_name=project_name, project_id=project_id,
+    )
 
 
 async def track_notification_interaction(
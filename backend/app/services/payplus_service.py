@@ -5,14 +5,18 @@ from typing import Any, Optional
 import httpx
 
 from app.config import get_settings
+from app.services.integration_http import Upstream, get_http_client
 
 logger = logging.getLogger(__name__)
 
+PAYPLUS_BASE_URL = "https://restapi.payplus.co.il"
+PAYPLUS_UPSTREAM = Upstream("payplus", PAYPLUS_BASE_URL)
+
 
 class PayPlusService:
     def __init__(self):
         self.settings = get_settings()
-        self.base_url = "https://restapi.payplus.co.il"
+        self.base_url = PAYPLUS_BASE_URL
         self.api_key = self.settings.payplus_api_key
         self.secret_key = self.settings.payplus_secret_key
 
@@ -38,27 +42,22 @@ class PayPlusService:
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers()
 
-        async with httpx.AsyncClient() as client:
-            try:
-                if method == "GET":
-                    response = await client.get(url, headers=headers)
-                elif method == "POST":
-                    response = await client.post(url, headers=headers, json=data)
-                elif method == "PUT":
-                    response = await client.put(url, headers=headers, json=data)
-                elif method == "DELETE":
-                    response = await client.delete(url, headers=headers)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"PayPlus API error: {e.response.status_code} - {e.response.text}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"PayPlus request failed: {e}")
-                raise
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        try:
+            # Only GETs are retried: PayPlus writes carry no idempotency key
+            response = await get_http_client(PAYPLUS_UPSTREAM).request(
+                method, url, headers=headers, json=data if method in ("POST", "PUT") else None, retry=method == "GET"
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"PayPlus API error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"PayPlus request failed: {e}")
+            raise
 
     async def create_customer(
         self,
@@ -0,0 +1,303 @@
+"""
+PDF rendering off the event loop.
+
+WeasyPrint layout is CPU-bound and a large report takes seconds, so HTML is rendered in a
+pool of spawned worker processes. Each worker imports WeasyPrint and loads the bundled
+fonts and the shared font stylesheet once at start-up, so a render only pays for layout.
+
+Renders are budgeted: HTML over ``pdf_render_max_html_bytes`` is refused, the worker
+aborts a render that runs past ``pdf_render_timeout_seconds`` (staying warm for the next
+one) and exits if the render is stuck where it cannot be interrupted, and a PDF over ``pdf_render_max_pdf_bytes`` is discarded. Finished PDFs are cached
+per process keyed by the sha256 of the rendered HTML, which is a pure function of the
+template context, and identical concurrent renders share one worker call.
+
+Reports too large to render within a request are queued as ``ExportJob`` rows instead and
+rebuilt from their row ids by a Celery task: the client polls ``/projects/{id}/exports/{job_id}``
+and downloads from its ``/download``.
+"""
+
+import asyncio
+import faulthandler
+import hashlib
+import logging
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.core.worker_pools import InflightCalls, WorkerPool
+from app.db.session import AsyncSessionLocal
+from app.models.export_job import ExportFormat, ExportJob, ExportStatus, ExportType
+from app.models.project import Project
+from app.schemas.export import ExportJobResponse
+from app.services.storage_service import StorageBackend, _create_storage_backend
+from app.utils import utcnow
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+# Loaded once per worker and applied to every render
+FONT_FACES_CSS = """
+@font-face {
+  font-family: "NotoHebrew";
+  src: url("fonts/NotoSansHebrew-Regular.ttf") format("truetype");
+  font-weight: 400;
+}
+@font-face {
+  font-family: "NotoHebrew";
+  src: url("fonts/NotoSansHebrew-Bold.ttf") format("truetype");
+  font-weight: 700;
+}
+"""
+
+
+WORKER_EXIT_GRACE_SECONDS = 5
+
+
+class PdfRenderError(Exception):
+    pass
+
+
+class PdfTooLargeError(PdfRenderError):
+    pass
+
+
+class PdfRenderTimeout(PdfRenderError):
+    pass
+
+
+_font_config = None
+_stylesheets: list = []
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import WeasyPrint, load the fonts and lay out a page once."""
+    global _font_config, _stylesheets
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    _stylesheets = [CSS(string=FONT_FACES_CSS, base_url=TEMPLATES_DIR, font_config=_font_config)]
+    HTML(string='<p style="font-family: NotoHebrew">שלום</p>').write_pdf(
+        stylesheets=_stylesheets, font_config=_font_config,
+    )
+
+
+def _expire(signum, frame) -> None:
+    raise PdfRenderTimeout("PDF render exceeded its time budget")
+
+
+def _render_in_worker(html: str, base_url: str, timeout_seconds: float) -> bytes:
+    from weasyprint import HTML
+
+    # Tasks run on the worker's main thread, so an interval timer can interrupt the layout
+    previous = signal.signal(signal.SIGALRM, _expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    # A layout stuck in C code never sees the signal; faulthandler's watchdog thread then
+    # exits this worker alone, and the pool is replaced on the next call
+    faulthandler.dump_traceback_later(timeout_seconds + WORKER_EXIT_GRACE_SECONDS, exit=True)
+    try:
+        return HTML(string=html, base_url=base_url).write_pdf(stylesheets=_stylesheets, font_config=_font_config)
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+render_pool = WorkerPool("pdf_render_workers", initializer=_warm_worker)
+
+
+class RenderedPdfCache:
+    """Recently rendered PDFs, bounded by total size and age."""
+
+    def __init__(self, ttl_seconds: float, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl_seconds:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, pdf: bytes) -> None:
+        if self.ttl_seconds <= 0 or len(pdf) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (time.monotonic(), pdf)
+            self._size += len(pdf)
+            while self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        _, pdf = self._entries.pop(key)
+        self._size -= len(pdf)
+
+
+rendered_pdfs = RenderedPdfCache(
+    get_settings().pdf_render_cache_ttl_seconds,
+    get_settings().pdf_render_cache_max_bytes,
+)
+_inflight = InflightCalls()
+
+
+def render_key(html: str, base_url: str = TEMPLATES_DIR) -> str:
+    return hashlib.sha256(f"{base_url}\x00{html}".encode()).hexdigest()
+
+
+async def render_pdf(html: str, base_url: str = TEMPLATES_DIR) -> bytes:
+    """Render HTML to PDF in the worker pool, within the configured size and time budget."""
+    settings = get_settings()
+    if len(html.encode()) > settings.pdf_render_max_html_bytes:
+        raise PdfTooLargeError("Report content exceeds the PDF render size limit")
+
+    key = render_key(html, base_url)
+    cached = rendered_pdfs.get(key)
+    if cached is not None:
+        metrics.inc("pdf_render_cache_hits_total")
+        return cached
+
+    async def render() -> bytes:
+        metrics.inc("pdf_render_cache_misses_total")
+        pdf = await _render(html, base_url, settings.pdf_render_timeout_seconds)
+        if len(pdf) > settings.pdf_render_max_pdf_bytes:
+            raise PdfTooLargeError("Rendered PDF exceeds the size limit")
+        rendered_pdfs.put(key, pdf)
+        return pdf
+
+    return await _inflight.run(key, render)
+
+
+async def _render(html: str, base_url: str, timeout_seconds: float) -> bytes:
+    started = time.monotonic()
+    try:
+        # The worker enforces the budget itself and exits if it hangs, so the pool is left
+        # alone here: shutting it down would cancel every other caller's render
+        pdf = await asyncio.wait_for(
+            render_pool.run(_render_in_worker, html, base_url, timeout_seconds),
+            timeout_seconds + 2 * WORKER_EXIT_GRACE_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        raise PdfRenderTimeout("PDF render exceeded its time budget")
+    except BrokenProcessPool:
+        # Also what renders sharing the pool with a worker that exited see
+        raise PdfRenderError("PDF render worker crashed")
+    metrics.observe("pdf_render_seconds", time.monotonic() - started)
+    return pdf
+
+
+async def submit_pdf_job(
+    db: AsyncSession,
+    project_id: UUID,
+    requested_by_id: UUID,
+    report: str,
+    entity_ids: list[UUID],
+    filename: str,
+    language: str,
+) -> ExportJob:
+    """Queue a report render on the worker; the PDF is fetched later through the project's export endpoints."""
+    from app.worker.tasks.pdf_reports import render_report_pdf_task
+
+    job = ExportJob(
+        project_id=project_id,
+        export_format=ExportFormat.PDF,
+        export_type=ExportType.REPORT,
+        status=ExportStatus.PENDING,
+        requested_by_id=requested_by_id,
+    )
+    db.add(job)
+    # Committed first so the worker can find the job
+    await db.commit()
+    try:
+        render_report_pdf_task.delay(str(job.id), report, [str(i) for i in entity_ids], language, filename)
+    except Exception as exc:
+        logger.error("Failed to enqueue PDF job %s: %s", job.id, exc)
+        job.status = ExportStatus.FAILED
+        job.error_message = "Could not queue the report for rendering"
+        await db.commit()
+    return job
+
+
+async def pdf_job_accepted(db: AsyncSession, job: ExportJob) -> JSONResponse:
+    """Answer 202 with a queued PDF job, for the client to poll."""
+    await db.refresh(job, ["requested_by"])
+    return JSONResponse(
+        status_code=202,
+        content=ExportJobResponse.model_validate(job).model_dump(mode="json", by_alias=True),
+    )
+
+
+async def _report_html(
+    db: AsyncSession, report: str, project: Project, entity_ids: list[UUID], language: str, storage: StorageBackend
+) -> str:
+    # The report services render through this module, so they are imported on use
+    if report == "defects":
+        from app.services.defect_report_service import generate_defects_report_html_for_ids
+
+        return await generate_defects_report_html_for_ids(db, entity_ids, project, storage, language)
+    if report == "inspections":
+        from app.services.inspection_report_service import generate_inspections_report_html_for_ids
+
+        return await generate_inspections_report_html_for_ids(db, entity_ids, project, language)
+    raise PdfRenderError(f"Unknown report: {report}")
+
+
+async def run_pdf_job(
+    job_id: UUID,
+    report: str,
+    entity_ids: list[UUID],
+    language: str,
+    filename: str,
+    session_factory=AsyncSessionLocal,
+    storage: Optional[StorageBackend] = None,
+) -> None:
+    """Rebuild a queued report from its rows and render it into the export storage."""
+    storage = storage or _create_storage_backend(get_settings())
+    async with session_factory() as db:
+        job = await db.get(ExportJob, job_id)
+        if not job:
+            logger.error("PDF job %s not found", job_id)
+            return
+        job.status = ExportStatus.PROCESSING
+        await db.commit()
+
+        try:
+            project = await db.get(Project, job.project_id)
+            html = await _report_html(db, report, project, entity_ids, language, storage)
+            pdf = await render_pdf(html)
+            storage_path = f"exports/{job_id}/{filename}"
+            job.file_size = await storage.save_bytes(pdf, storage_path, content_type="application/pdf")
+            job.file_path = storage_path
+            job.bytes_written = job.file_size
+            job.status = ExportStatus.COMPLETED
+            job.completed_at = utcnow()
+        except Exception as e:
+            logger.exception("PDF job %s failed", job_id)
+            job.status = ExportStatus.FAILED
+            job.error_message = str(e) if isinstance(e, PdfRenderError) else "PDF rendering failed"
+        await db.commit()
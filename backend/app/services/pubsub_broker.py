@@ -0,0 +1,172 @@
+"""
+Pub/sub brokers for fanning real-time messages out across app instances.
+
+The in-memory broker delivers within the current process and is used in tests
+and single-worker development. The Redis broker relays messages through Redis
+pub/sub so every instance subscribed to a channel receives them.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, str], Awaitable[None]]
+
+
+class PubSubBroker(ABC):
+    def __init__(self):
+        self._handlers: dict[str, list[MessageHandler]] = {}
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str) -> None:
+        pass
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    async def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+        handlers = self._handlers.get(channel)
+        if not handlers:
+            return
+        self._handlers[channel] = [h for h in handlers if h != handler]
+        if not self._handlers[channel]:
+            del self._handlers[channel]
+
+    async def close(self) -> None:
+        self._handlers.clear()
+
+    async def _dispatch(self, channel: str, message: str) -> None:
+        for handler in list(self._handlers.get(channel, [])):
+            try:
+                await handler(channel, message)
+            except Exception as e:
+                logger.warning("Pub/sub handler for %s failed: %s", channel, e)
+
+
+class InMemoryBroker(PubSubBroker):
+    async def publish(self, channel: str, message: str) -> None:
+        await self._dispatch(channel, message)
+
+
+class RedisBroker(PubSubBroker):
+    """Relays messages over Redis pub/sub with one reader task per instance.
+
+    The reader reconnects with backoff and re-subscribes every active channel, so a
+    Redis restart only drops the messages published while it was down.
+    """
+
+    def __init__(self, redis_url: str, reconnect_delay_seconds: float = 1.0):
+        super().__init__()
+        import redis.asyncio as aioredis
+
+        self.redis = aioredis.from_url(redis_url)
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self.redis.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: MessageHandler) -> None:
+        first = channel not in self._handlers
+        await super().subscribe(channel, handler)
+        if first:
+            async with self._lock:
+                await self._ensure_reader()
+                await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel: str, handler: MessageHandler) -> None:
+        await super().unsubscribe(channel, handler)
+        if channel not in self._handlers and self._pubsub is not None:
+            async with self._lock:
+                try:
+                    await self._pubsub.unsubscribe(channel)
+                except Exception as e:
+                    logger.warning("Redis unsubscribe from %s failed: %s", channel, e)
+
+    async def _ensure_reader(self) -> None:
+        if self._pubsub is None:
+            self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(0.1)
+                    continue
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is None or message.get("type") != "message":
+                    continue
+                channel = message["channel"]
+                data = message["data"]
+                await self._dispatch(
+                    channel.decode() if isinstance(channel, bytes) else channel,
+                    data.decode() if isinstance(data, bytes) else data,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Redis pub/sub reader error, reconnecting: %s", e)
+                await asyncio.sleep(self.reconnect_delay_seconds)
+                await self._resubscribe()
+
+    async def _resubscribe(self) -> None:
+        async with self._lock:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            channels = list(self._handlers)
+            if channels:
+                try:
+                    await self._pubsub.subscribe(*channels)
+                except Exception as e:
+                    logger.warning("Redis re-subscribe failed: %s", e)
+
+    async def close(self) -> None:
+        await super().close()
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.redis.aclose()
+
+
+_broker: Optional[PubSubBroker] = None
+
+
+def get_broker() -> PubSubBroker:
+    global _broker
+    if _broker is None:
+        settings = get_settings()
+        backend = settings.realtime_broker.lower()
+        if backend == "redis":
+            _broker = RedisBroker(settings.redis_url)
+        elif backend == "memory":
+            _broker = InMemoryBroker()
+        else:
+            raise ValueError(f"Unsupported realtime broker: {settings.realtime_broker}")
+    return _broker
+
+
+async def close_broker() -> None:
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
@@ -9,13 +9,13 @@ import qrcode.image.svg
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from weasyprint import HTML
 
 from app.config import get_settings
 from app.models.area import ConstructionArea
 from app.models.equipment import Equipment
 from app.models.material import Material
 from app.schemas.qr_code import BulkQRCodeItem
+from app.services.pdf_render_service import render_pdf
 from app.utils import utcnow
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
@@ -173,8 +173,7 @@ class QRCodeService:
             labels=labels,
         )
 
-        pdf_bytes = HTML(string=html_content, base_url=TEMPLATES_DIR).write_pdf()
-        return pdf_bytes
+        return await render_pdf(html_content, base_url=TEMPLATES_DIR)
 
     async def fetch_entity(self, entity_type: str, entity_id: UUID):
         """Fetch entity from database by type and ID."""
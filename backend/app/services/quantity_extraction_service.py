@@ -1,3 +1,4 @@
+import asyncio
 import io
 import json
 import logging
@@ -10,6 +11,7 @@ from google import genai
 from google.genai import types
 
 from app.config import get_settings
+from app.services.llm_cache_service import get_or_compute, prompt_version
 from app.services.quantity_docai_service import parse_docai_tables, process_with_document_ai
 from app.services.quantity_gemini_mapper import map_semantics_with_gemini, merge_semantic_mappings
 from app.services.quantity_pdf_parser import (
@@ -127,6 +129,8 @@ def repair_truncated_json(text: str) -> str:
     return text
 
 
+QUANTITY_MODEL = "gemini-2.5-flash"
+
 GEMINI_EXTRACTION_PROMPT = """Analyze these tile images from a wide Israeli garmoshka (גרמושקה) architectural drawing sheet.
 Images are tiles LEFT-TO-RIGHT, TOP-TO-BOTTOM from ONE wide sheet with MULTIPLE floor plan drawings side by side.
 
@@ -284,6 +288,20 @@ def extract_quantities(file_content: bytes, file_type: str, language: str = "he"
     }
 
 
+async def extract_quantities_cached(file_content: bytes, file_type: str, language: str = "he") -> dict:
+    """Run extract_quantities in an executor, reusing the result for byte-identical files."""
+    loop = asyncio.get_running_loop()
+    return await get_or_compute(
+        file_content,
+        "quantities",
+        QUANTITY_MODEL,
+        prompt_version(GEMINI_EXTRACTION_PROMPT, PER_FLOOR_PROMPT),
+        lambda: loop.run_in_executor(None, extract_quantities, file_content, file_type, language),
+        language=language,
+        should_cache=lambda result: bool(result.get("result")),
+    )
+
+
 def resolve_floor_for_table(table: dict, markers: list[dict], current_floor: int, next_seq: int) -> int:
     table_top = table.get("bbox_top")
     if not markers:
@@ -495,7 +513,7 @@ def extract_floor_from_image(client, image_bytes: bytes, floor_index: int, total
     )
 
     response = client.models.generate_content(
-        model="gemini-2.5-flash",
+        model=QUANTITY_MODEL,
         contents=[image_part, prompt],
         config=config,
     )
@@ -618,7 +636,7 @@ def extract_tiled_gemini(client, file_content: bytes, mime_type: str, language:
 
     for attempt in range(2):
         response = client.models.generate_content(
-            model="gemini-2.5-flash", contents=contents, config=config,
+            model=QUANTITY_MODEL, contents=contents, config=config,
         )
         if not response.text:
             continue
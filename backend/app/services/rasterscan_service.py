@@ -1,16 +1,18 @@
 import logging
 import time
 
-import httpx
+from app.services.integration_http import Upstream, get_sync_http_client
 
 logger = logging.getLogger(__name__)
 
 FLOORPLAN_SERVICE_URL = "http://localhost:5555"
+# Plain-HTTP sidecar, called from executor threads
+FLOORPLAN_UPSTREAM = Upstream("rasterscan", FLOORPLAN_SERVICE_URL, http2=False, timeout_seconds=120.0)
 
 
 def is_rasterscan_available() -> bool:
     try:
-        r = httpx.get(f"{FLOORPLAN_SERVICE_URL}/health", timeout=5.0)
+        r = get_sync_http_client(FLOORPLAN_UPSTREAM).get("/health", timeout=5.0, retry=False)
         return r.status_code == 200 and r.json().get("model_loaded", False)
     except Exception:
         return False
@@ -19,10 +21,9 @@ def is_rasterscan_available() -> bool:
 def recognize_floor_plan(image_bytes: bytes) -> dict:
     start = time.time()
 
-    response = httpx.post(
-        f"{FLOORPLAN_SERVICE_URL}/analyze",
+    response = get_sync_http_client(FLOORPLAN_UPSTREAM).post(
+        "/analyze",
         files={"file": ("floor_plan.png", image_bytes, "image/png")},
-        timeout=120.0,
     )
     response.raise_for_status()
     elapsed_ms = int((time.time() - start) * 1000)
@@ -4,7 +4,6 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import UUID
 
-from google import genai
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,6 +12,7 @@ from app.models.area import ConstructionArea
 from app.models.defect import Defect
 from app.models.inspection import Inspection
 from app.models.risk_score import RiskLevel
+from app.services.llm_gateway import get_llm_gateway
 from app.utils import utcnow
 
 SEVERITY_WEIGHTS = {
@@ -205,7 +205,7 @@ def prepare_defect_summary(defects: list[Defect]) -> str:
     return "\n".join(summary_parts)
 
 
-def predict_defect_patterns(
+async def predict_defect_patterns(
     defects: list[Defect],
     model: str | None = None,
 ) -> dict:
@@ -231,13 +231,11 @@ def predict_defect_patterns(
     defect_summary = prepare_defect_summary(defects)
     prompt = DEFECT_PREDICTION_PROMPT.format(defect_summary=defect_summary)
 
-    client = genai.Client(api_key=api_key)
     model_name = model or settings.gemini_model
 
     start = time.time()
-    response = client.models.generate_content(
-        model=model_name,
-        contents=[prompt],
+    response = await get_llm_gateway().generate_content(
+        [prompt], model=model_name, operation="predict_defect_patterns"
     )
     elapsed_ms = int((time.time() - start) * 1000)
 
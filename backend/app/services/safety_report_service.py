@@ -1,17 +1,17 @@
-import base64
 import logging
 from uuid import UUID
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from weasyprint import HTML
 
 from app.models.file import File
 from app.models.near_miss import NearMiss
 from app.models.project import Project
 from app.models.safety_incident import SafetyIncident
 from app.models.safety_training import SafetyTraining
+from app.services.image_derivative_service import load_report_photos
+from app.services.pdf_render_service import render_pdf
 from app.services.storage_service import StorageBackend
 from app.utils import utcnow
 
@@ -141,26 +141,7 @@ async def load_incident_photos(
         .where(File.entity_type == "safety_incident", File.entity_id.in_(incident_ids))
         .order_by(File.uploaded_at)
     )
-    files = result.scalars().all()
-
-    photos_by_incident: dict[UUID, list[str]] = {}
-    for f in files:
-        if not f.file_type or not f.file_type.startswith("image/"):
-            continue
-        if f.entity_id not in photos_by_incident:
-            photos_by_incident[f.entity_id] = []
-        if len(photos_by_incident[f.entity_id]) >= max_per_incident:
-            continue
-
-        try:
-            content = await storage.get_file(f.storage_path)
-            base64_data = base64.b64encode(content).decode("utf-8")
-            data_uri = f"data:{f.file_type};base64,{base64_data}"
-            photos_by_incident[f.entity_id].append(data_uri)
-        except Exception as e:
-            logger.warning(f"Failed to load photo {f.id}: {e}")
-
-    return photos_by_incident
+    return await load_report_photos(storage, list(result.scalars().all()), max_per_incident)
 
 
 async def generate_safety_compliance_report(
@@ -265,5 +246,4 @@ async def generate_safety_compliance_report(
         trainings=trainings_data,
     )
 
-    pdf_bytes = HTML(string=html_content, base_url=TEMPLATES_DIR).write_pdf()
-    return pdf_bytes
+    return await render_pdf(html_content, base_url=TEMPLATES_DIR)
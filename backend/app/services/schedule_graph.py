@@ -0,0 +1,500 @@
+"""
+Cached schedule graphs for critical path analysis.
+
+A project's tasks are indexed 0..n-1 and their dependencies stored as CSR adjacency
+(int offset/target arrays for predecessors and successors), together with a topological
+order and every task's ES/EF/LS/LF. Graphs are kept per process and patched in place when
+a task's duration or a dependency changes: the forward pass is re-run only from the
+changed task along its successors, and the backward pass only along its predecessors
+unless the project end moved. A full re-sort happens only when an edge contradicts the
+cached order or the schedule has cycles.
+
+Changes are collected from ORM flush events and applied after commit. Other instances
+are told through the realtime broker and drop their copy of the affected graph (see
+``app.core.commit_cache``).
+"""
+
+import copy
+import heapq
+import logging
+from array import array
+from collections import deque
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from itertools import accumulate
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.commit_cache import CommitInvalidatedCache
+from app.models.task import Task, TaskDependency
+
+logger = logging.getLogger(__name__)
+
+CRITICAL_SLACK_DAYS = 0.01
+HOURS_PER_DAY = 8.0
+DURATION_FIELDS = ("start_date", "due_date", "estimated_hours", "assignee_id")
+
+
+def task_duration(start_date: Optional[date], due_date: Optional[date], estimated_hours: Optional[float]) -> float:
+    """Planned duration in days: the date span, else estimated hours over an 8-hour day, else one day."""
+    if start_date and due_date:
+        return max(1.0, float((due_date - start_date).days))
+    if estimated_hours:
+        return max(1.0, estimated_hours / HOURS_PER_DAY)
+    return 1.0
+
+
+def _csr(size: int, pairs: Iterable[tuple[int, int]]) -> tuple[array, array]:
+    pairs = sorted(pairs)
+    counts = [0] * (size + 1)
+    for source, _ in pairs:
+        counts[source + 1] += 1
+    return array("i", accumulate(counts)), array("i", [target for _, target in pairs])
+
+
+def _positions(order: Sequence[int], size: int) -> array:
+    position = array("i", [size]) * size
+    for index, node in enumerate(order):
+        position[node] = index
+    return position
+
+
+@dataclass
+class Schedule:
+    earliest_start: array
+    earliest_finish: array
+    latest_start: array
+    latest_finish: array
+    total_duration: float
+
+    def slack(self, node: int) -> float:
+        return self.latest_start[node] - self.earliest_start[node]
+
+    def copy(self) -> "Schedule":
+        return Schedule(
+            array("d", self.earliest_start), array("d", self.earliest_finish),
+            array("d", self.latest_start), array("d", self.latest_finish), self.total_duration,
+        )
+
+
+class ScheduleGraph:
+    """Dependency graph of one project's tasks with its computed schedule.
+
+    Only edges that run forward in the topological order are followed. That is every
+    edge of an acyclic schedule; inside a cycle the edges back to a task placed earlier
+    are ignored, which is what the passes did when such a predecessor had no finish yet.
+    """
+
+    def __init__(
+        self,
+        task_ids: Sequence[UUID],
+        durations: Sequence[float],
+        assignees: Sequence[Optional[UUID]],
+        edges: Iterable[tuple[UUID, UUID]],
+    ):
+        """``edges`` are (depends_on_id, task_id) pairs; pairs leaving the project are ignored."""
+        self.task_ids = list(task_ids)
+        self.index = {task_id: node for node, task_id in enumerate(self.task_ids)}
+        self.durations = array("d", durations)
+        self.assignees = list(assignees)
+        self.edges = {
+            (self.index[source], self.index[target])
+            for source, target in edges
+            if source in self.index and target in self.index
+        }
+        self._index_edges()
+        self._sort()
+        self.schedule = self.evaluate()
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    def _index_edges(self) -> None:
+        size = len(self.task_ids)
+        self.succ_offsets, self.succ_targets = _csr(size, self.edges)
+        self.pred_offsets, self.pred_targets = _csr(size, ((target, source) for source, target in self.edges))
+
+    def _link(self, source: int, target: int) -> None:
+        for offsets, targets, row, value in (
+            (self.succ_offsets, self.succ_targets, source, target),
+            (self.pred_offsets, self.pred_targets, target, source),
+        ):
+            targets.insert(offsets[row + 1], value)
+            for later in range(row + 1, len(offsets)):
+                offsets[later] += 1
+
+    def _unlink(self, source: int, target: int) -> None:
+        for offsets, targets, row, value in (
+            (self.succ_offsets, self.succ_targets, source, target),
+            (self.pred_offsets, self.pred_targets, target, source),
+        ):
+            del targets[targets.index(value, offsets[row], offsets[row + 1])]
+            for later in range(row + 1, len(offsets)):
+                offsets[later] -= 1
+
+    def _sort(self) -> None:
+        self.order, self.acyclic = self._topological_order()
+        self.position = _positions(self.order, len(self))
+
+    def _topological_order(self, active: Optional[bytearray] = None) -> tuple[array, bool]:
+        """Kahn's algorithm; tasks left over by a cycle are appended in index order."""
+        size = len(self)
+        nodes = range(size) if active is None else [node for node in range(size) if active[node]]
+        offsets, preds, succ_offsets, succs = self.pred_offsets, self.pred_targets, self.succ_offsets, self.succ_targets
+        in_degree = array("i", [0]) * size
+        for node in nodes:
+            in_degree[node] = sum(
+                1 for k in range(offsets[node], offsets[node + 1]) if active is None or active[preds[k]]
+            )
+
+        queue = deque(node for node in nodes if in_degree[node] == 0)
+        order = array("i")
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for k in range(succ_offsets[node], succ_offsets[node + 1]):
+                succ = succs[k]
+                if active is None or active[succ]:
+                    in_degree[succ] -= 1
+                    if in_degree[succ] == 0:
+                        queue.append(succ)
+
+        complete = len(order) == len(nodes)
+        if not complete:
+            placed = bytearray(size)
+            for node in order:
+                placed[node] = 1
+            order.extend(node for node in nodes if not placed[node])
+        return order, complete
+
+    def evaluate(
+        self,
+        durations: Optional[Sequence[float]] = None,
+        active: Optional[bytearray] = None,
+    ) -> Schedule:
+        """Full forward and backward pass, optionally with other durations or only the ``active`` tasks."""
+        durations = self.durations if durations is None else durations
+        order, position = self.order, self.position
+        if active is not None and not self.acyclic:
+            # Dropping tasks can break a cycle, so the subgraph needs its own order
+            order, _ = self._topological_order(active)
+            position = _positions(order, len(self))
+        if active is not None:
+            order = [node for node in order if active[node]]
+
+        size = len(self)
+        pred_offsets, preds = self.pred_offsets, self.pred_targets
+        es = array("d", [0.0]) * size
+        ef = array("d", [0.0]) * size
+        for node in order:
+            start = 0.0
+            for k in range(pred_offsets[node], pred_offsets[node + 1]):
+                pred = preds[k]
+                if position[pred] < position[node] and ef[pred] > start and (active is None or active[pred]):
+                    start = ef[pred]
+            es[node] = start
+            ef[node] = start + durations[node]
+
+        schedule = Schedule(es, ef, array("d", [0.0]) * size, array("d", [0.0]) * size, max(ef, default=0.0))
+        self._backward_pass(schedule, durations, order, position, active)
+        return schedule
+
+    def _backward_pass(
+        self,
+        schedule: Schedule,
+        durations: Sequence[float],
+        order: Sequence[int],
+        position: Sequence[int],
+        active: Optional[bytearray] = None,
+    ) -> None:
+        succ_offsets, succs = self.succ_offsets, self.succ_targets
+        ls, lf, total = schedule.latest_start, schedule.latest_finish, schedule.total_duration
+        for node in reversed(order):
+            finish = total
+            for k in range(succ_offsets[node], succ_offsets[node + 1]):
+                succ = succs[k]
+                if position[succ] > position[node] and ls[succ] < finish and (active is None or active[succ]):
+                    finish = ls[succ]
+            lf[node] = finish
+            ls[node] = finish - durations[node]
+
+    def critical_path(self, schedule: Optional[Schedule] = None, active: Optional[bytearray] = None) -> list[int]:
+        """Tasks with (near) zero slack, ordered by earliest start."""
+        schedule = schedule or self.schedule
+        nodes = [
+            node for node in range(len(self))
+            if (active is None or active[node]) and abs(schedule.slack(node)) < CRITICAL_SLACK_DAYS
+        ]
+        nodes.sort(key=lambda node: schedule.earliest_start[node])
+        return nodes
+
+    def with_durations(self, changes: dict[int, float]) -> Schedule:
+        """The schedule after changing some durations, without touching this graph."""
+        scenario = copy.copy(self)
+        scenario.durations = array("d", self.durations)
+        scenario.schedule = self.schedule.copy()
+        for node, duration in changes.items():
+            scenario.durations[node] = duration
+        scenario._propagate_forward(changes)
+        scenario._settle(changes)
+        return scenario.schedule
+
+    # Incremental updates
+
+    def set_task(self, task_id: UUID, duration: float, assignee_id: Optional[UUID]) -> None:
+        node = self.index.get(task_id)
+        if node is None:
+            self._add_task(task_id, duration, assignee_id)
+            return
+        self.assignees[node] = assignee_id
+        if self.durations[node] == duration:
+            return
+        self.durations[node] = duration
+        self._propagate_forward([node])
+        self._settle([node])
+
+    def _add_task(self, task_id: UUID, duration: float, assignee_id: Optional[UUID]) -> None:
+        node = len(self.task_ids)
+        self.task_ids.append(task_id)
+        self.index[task_id] = node
+        self.durations.append(duration)
+        self.assignees.append(assignee_id)
+        self.succ_offsets.append(self.succ_offsets[-1])
+        self.pred_offsets.append(self.pred_offsets[-1])
+        # A task without dependencies can go last in any topological order
+        self.order.append(node)
+        self.position.append(node)
+        schedule = self.schedule
+        schedule.earliest_start.append(0.0)
+        schedule.earliest_finish.append(duration)
+        schedule.latest_start.append(0.0)
+        schedule.latest_finish.append(0.0)
+        self._settle([node])
+
+    def add_dependency(self, task_id: UUID, depends_on_id: UUID) -> None:
+        source, target = self.index.get(depends_on_id), self.index.get(task_id)
+        if source is None or target is None or (source, target) in self.edges:
+            return
+        self.edges.add((source, target))
+        self._link(source, target)
+        if self.acyclic and self.position[source] < self.position[target]:
+            self._propagate_forward([target])
+            self._settle([source])
+        else:
+            self._sort()
+            self.schedule = self.evaluate()
+
+    def remove_dependency(self, task_id: UUID, depends_on_id: UUID) -> None:
+        source, target = self.index.get(depends_on_id), self.index.get(task_id)
+        if (source, target) not in self.edges:
+            return
+        self.edges.discard((source, target))
+        self._unlink(source, target)
+        if self.acyclic:
+            self._propagate_forward([target])
+            self._settle([source])
+        else:
+            self._sort()
+            self.schedule = self.evaluate()
+
+    def _propagate_forward(self, seeds: Iterable[int]) -> None:
+        """Recompute ES/EF from ``seeds`` on, following successors whose start may move."""
+        position, durations = self.position, self.durations
+        pred_offsets, preds = self.pred_offsets, self.pred_targets
+        succ_offsets, succs = self.succ_offsets, self.succ_targets
+        es, ef = self.schedule.earliest_start, self.schedule.earliest_finish
+        queued = set(seeds)
+        heap = [(position[node], node) for node in queued]
+        heapq.heapify(heap)
+        while heap:
+            here, node = heapq.heappop(heap)
+            start = 0.0
+            for k in range(pred_offsets[node], pred_offsets[node + 1]):
+                pred = preds[k]
+                if position[pred] < here and ef[pred] > start:
+                    start = ef[pred]
+            es[node] = start
+            finish = start + durations[node]
+            if finish == ef[node]:
+                continue
+            ef[node] = finish
+            for k in range(succ_offsets[node], succ_offsets[node + 1]):
+                succ = succs[k]
+                if position[succ] > here and succ not in queued:
+                    queued.add(succ)
+                    heapq.heappush(heap, (position[succ], succ))
+
+    def _settle(self, seeds: Iterable[int]) -> None:
+        """Bring LS/LF up to date after a forward update: fully if the project end moved."""
+        schedule = self.schedule
+        total = max(schedule.earliest_finish, default=0.0)
+        if total != schedule.total_duration:
+            # Every task's latest finish hangs off the project end
+            schedule.total_duration = total
+            self._backward_pass(schedule, self.durations, self.order, self.position)
+            return
+
+        position, durations = self.position, self.durations
+        pred_offsets, preds = self.pred_offsets, self.pred_targets
+        succ_offsets, succs = self.succ_offsets, self.succ_targets
+        ls, lf = schedule.latest_start, schedule.latest_finish
+        queued = set(seeds)
+        heap = [(-position[node], node) for node in queued]
+        heapq.heapify(heap)
+        while heap:
+            here, node = heapq.heappop(heap)
+            here = -here
+            finish = total
+            for k in range(succ_offsets[node], succ_offsets[node + 1]):
+                succ = succs[k]
+                if position[succ] > here and ls[succ] < finish:
+                    finish = ls[succ]
+            lf[node] = finish
+            start = finish - durations[node]
+            if start == ls[node]:
+                continue
+            ls[node] = start
+            for k in range(pred_offsets[node], pred_offsets[node + 1]):
+                pred = preds[k]
+                if position[pred] < here and pred not in queued:
+                    queued.add(pred)
+                    heapq.heappush(heap, (-position[pred], pred))
+
+
+async def load_schedule_graph(db: AsyncSession, project_id: UUID) -> ScheduleGraph:
+    tasks = (await db.execute(
+        select(Task.id, Task.start_date, Task.due_date, Task.estimated_hours, Task.assignee_id)
+        .where(Task.project_id == project_id)
+    )).all()
+    edges = (await db.execute(
+        select(TaskDependency.depends_on_id, TaskDependency.task_id)
+        .join(Task, Task.id == TaskDependency.task_id)
+        .where(Task.project_id == project_id)
+    )).all()
+    return ScheduleGraph(
+        [task.id for task in tasks],
+        [task_duration(task.start_date, task.due_date, task.estimated_hours) for task in tasks],
+        [task.assignee_id for task in tasks],
+        edges,
+    )
+
+
+class ScheduleGraphCache(CommitInvalidatedCache):
+    """Graphs by project id, patched in place by this instance's committed changes."""
+
+    async def get(self, db: AsyncSession, project_id: UUID) -> ScheduleGraph:
+        """The project's graph as of the last commit; callers must not modify it."""
+        return await self.get_or_load(db, project_id, lambda: load_schedule_graph(db, project_id))
+
+    def _projects_with_task(self, task_id: UUID) -> list[UUID]:
+        return [project_id for project_id, (_, graph) in self._entries.items() if task_id in graph.index]
+
+    def apply(self, change: dict) -> None:
+        """Patch the cached graphs with a committed change."""
+        kind = change.get("kind")
+        if kind not in ("task", "dependency"):
+            self.invalidate(change)
+            return
+        with self._lock:
+            self._generation += 1
+            if kind == "task":
+                targets = [UUID(change["project_id"])]
+            else:
+                targets = self._projects_with_task(UUID(change["task_id"]))
+            for project_id in targets:
+                entry = self._entries.get(project_id)
+                if entry is None:
+                    continue
+                graph = entry[1]
+                try:
+                    if kind == "task":
+                        graph.set_task(
+                            UUID(change["task_id"]), change["duration"],
+                            UUID(change["assignee_id"]) if change.get("assignee_id") else None,
+                        )
+                    elif change["added"]:
+                        graph.add_dependency(UUID(change["task_id"]), UUID(change["depends_on_id"]))
+                    else:
+                        graph.remove_dependency(UUID(change["task_id"]), UUID(change["depends_on_id"]))
+                except Exception as e:
+                    logger.warning("Dropping schedule graph of project %s after a failed update: %s", project_id, e)
+                    self._entries.pop(project_id, None)
+
+    def _invalidate(self, change: dict) -> None:
+        if change.get("project_id"):
+            self._entries.pop(UUID(change["project_id"]), None)
+        elif change.get("task_id"):
+            for project_id in self._projects_with_task(UUID(change["task_id"])):
+                self._entries.pop(project_id, None)
+        else:
+            self._entries.clear()
+
+    def watches(self, model: type) -> bool:
+        return issubclass(model, (Task, TaskDependency))
+
+    def collect(self, session: Session) -> list[dict]:
+        changes = []
+        for instance in session.new:
+            if isinstance(instance, Task):
+                changes.append(_task_change(instance, new=True))
+        for instance in session.dirty:
+            if isinstance(instance, Task) and _modified(instance, DURATION_FIELDS):
+                changes.append(_task_change(instance))
+            elif isinstance(instance, TaskDependency) and _modified(instance, ("task_id", "depends_on_id")):
+                changes.append({"kind": "all"})
+        for instance in session.new:
+            if isinstance(instance, TaskDependency):
+                changes.append(_dependency_change(instance, added=True))
+        for instance in session.deleted:
+            if isinstance(instance, Task):
+                project_id = inspect(instance).dict.get("project_id")
+                changes.append({"kind": "project", "project_id": str(project_id)} if project_id else {"kind": "all"})
+            elif isinstance(instance, TaskDependency):
+                changes.append(_dependency_change(instance, added=False))
+        return changes
+
+
+schedule_graphs = ScheduleGraphCache(
+    "schedule_graph",
+    get_settings().schedule_graph_cache_ttl_seconds,
+    get_settings().schedule_graph_cache_max_projects,
+)
+
+
+def _modified(instance: Any, fields: Iterable[str]) -> bool:
+    attrs = inspect(instance).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+def _task_change(task: Task, new: bool = False) -> dict:
+    values = inspect(task).dict
+    if not values.get("project_id"):
+        return {"kind": "all"}
+    if new:
+        # Columns never set on a new task were inserted as NULL
+        values = {field: None for field in DURATION_FIELDS} | values
+    if "id" not in values or any(field not in values for field in DURATION_FIELDS):
+        # Never lazy-load inside a flush; rebuild the project's graph instead
+        return {"kind": "project", "project_id": str(values["project_id"])}
+    return {
+        "kind": "task",
+        "project_id": str(values["project_id"]),
+        "task_id": str(values["id"]),
+        "duration": task_duration(values["start_date"], values["due_date"], values["estimated_hours"]),
+        "assignee_id": str(values["assignee_id"]) if values["assignee_id"] else None,
+    }
+
+
+def _dependency_change(dependency: TaskDependency, added: bool) -> dict:
+    return {
+        "kind": "dependency",
+        "task_id": str(dependency.task_id),
+        "depends_on_id": str(dependency.depends_on_id),
+        "added": added,
+    }
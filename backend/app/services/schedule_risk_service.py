@@ -1,182 +1,101 @@
+import asyncio
 import json
+import math
+import statistics
 import time
-from collections import defaultdict, deque
+from array import array
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Optional
 from uuid import UUID
 
-from google import genai
-from sqlalchemy import func, select
+import numpy as np
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.config import get_settings
-from app.models.task import Task, TaskDependency
+from app.core.worker_pools import WorkerPool
+from app.models.task import Task
+from app.services.llm_gateway import get_llm_gateway
+from app.services.schedule_graph import schedule_graphs
+from app.services.schedule_simulation import build_plan, simulate
+from app.utils import utcnow
+
+
+async def _task_details(db: AsyncSession, task_ids: list[UUID]) -> dict[UUID, Row]:
+    if not task_ids:
+        return {}
+    result = await db.execute(
+        select(Task.id, Task.title, Task.start_date, Task.due_date).where(Task.id.in_(task_ids))
+    )
+    return {row.id: row for row in result.all()}
 
 
 async def calculate_critical_path(db: AsyncSession, project_id: UUID) -> dict:
     """
     Calculate the critical path for a project using network analysis.
 
+    The schedule comes from the project's cached schedule graph, which is kept up to
+    date as tasks and dependencies change; only the critical tasks' details are loaded.
+
     Returns:
         dict with:
         - task_ids: list of UUID for tasks on critical path
         - total_duration: float total project duration in days
         - critical_tasks: list of dicts with full task info
     """
-    # Fetch all tasks for the project with dependencies
-    query = (
-        select(Task)
-        .where(Task.project_id == project_id)
-        .options(selectinload(Task.dependencies))
-    )
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-
-    if not tasks:
-        return {
-            "task_ids": [],
-            "total_duration": 0.0,
-            "critical_tasks": [],
-        }
-
-    # Build task map and dependency graph
-    task_map = {task.id: task for task in tasks}
-    task_ids = list(task_map.keys())
-
-    # Fetch all dependencies for these tasks
-    dep_query = select(TaskDependency).where(
-        TaskDependency.task_id.in_(task_ids)
-    )
-    dep_result = await db.execute(dep_query)
-    dependencies = dep_result.scalars().all()
-
-    # Build adjacency lists
-    # predecessors[task] = list of tasks that must finish before this task starts
-    # successors[task] = list of tasks that depend on this task
-    predecessors = defaultdict(list)
-    successors = defaultdict(list)
-
-    for dep in dependencies:
-        if dep.task_id in task_map and dep.depends_on_id in task_map:
-            predecessors[dep.task_id].append(dep.depends_on_id)
-            successors[dep.depends_on_id].append(dep.task_id)
-
-    # Calculate duration for each task (in days)
-    def get_task_duration(task: Task) -> float:
-        if task.start_date and task.due_date:
-            delta = task.due_date - task.start_date
-            return max(1.0, float(delta.days))
-        elif task.estimated_hours:
-            # Assume 8-hour workday
-            return max(1.0, task.estimated_hours / 8.0)
-        else:
-            return 1.0  # Default 1 day
-
-    durations = {task.id: get_task_duration(task) for task in tasks}
-
-    # Forward pass: calculate earliest start (ES) and earliest finish (EF)
-    earliest_start = {}
-    earliest_finish = {}
-
-    # Find starting tasks (no predecessors)
-    start_tasks = [tid for tid in task_ids if not predecessors[tid]]
-    if not start_tasks:
-        # Handle circular dependencies - pick tasks arbitrarily
-        start_tasks = task_ids[:1]
-
-    # Topological sort using Kahn's algorithm
-    in_degree = {tid: len(predecessors[tid]) for tid in task_ids}
-    queue = deque([tid for tid in task_ids if in_degree[tid] == 0])
-    topo_order = []
-
-    while queue:
-        tid = queue.popleft()
-        topo_order.append(tid)
-        for successor_id in successors[tid]:
-            in_degree[successor_id] -= 1
-            if in_degree[successor_id] == 0:
-                queue.append(successor_id)
-
-    # If we didn't process all tasks, there's a cycle - add remaining tasks
-    if len(topo_order) < len(task_ids):
-        for tid in task_ids:
-            if tid not in topo_order:
-                topo_order.append(tid)
-
-    # Forward pass
-    for tid in topo_order:
-        if not predecessors[tid]:
-            earliest_start[tid] = 0.0
-        else:
-            # ES = max(EF of all predecessors)
-            earliest_start[tid] = max(
-                earliest_finish.get(pred_id, 0.0)
-                for pred_id in predecessors[tid]
-            )
-        earliest_finish[tid] = earliest_start[tid] + durations[tid]
-
-    # Find project end time
-    project_duration = max(earliest_finish.values()) if earliest_finish else 0.0
-
-    # Backward pass: calculate latest start (LS) and latest finish (LF)
-    latest_start = {}
-    latest_finish = {}
-
-    # Find ending tasks (no successors)
-    end_tasks = [tid for tid in task_ids if not successors[tid]]
-
-    # Initialize ending tasks
-    for tid in end_tasks:
-        latest_finish[tid] = project_duration
-
-    # Backward pass through reverse topological order
-    for tid in reversed(topo_order):
-        if not successors[tid]:
-            latest_finish[tid] = project_duration
-        else:
-            # LF = min(LS of all successors)
-            latest_finish[tid] = min(
-                latest_start.get(succ_id, project_duration)
-                for succ_id in successors[tid]
-            )
-        latest_start[tid] = latest_finish[tid] - durations[tid]
-
-    # Calculate slack and identify critical path
-    slack = {
-        tid: latest_start[tid] - earliest_start[tid]
-        for tid in task_ids
-    }
-
-    # Critical path tasks have zero (or near-zero) slack
-    critical_task_ids = [
-        tid for tid in task_ids
-        if abs(slack[tid]) < 0.01  # Allow for floating point errors
+    graph = await schedule_graphs.get(db, project_id)
+    schedule = graph.schedule
+    critical = [
+        (
+            graph.task_ids[node],
+            graph.durations[node],
+            schedule.slack(node),
+            schedule.earliest_start[node],
+            schedule.earliest_finish[node],
+        )
+        for node in graph.critical_path()
     ]
+    total_duration = schedule.total_duration
 
-    # Sort critical tasks by earliest start time
-    critical_task_ids.sort(key=lambda tid: earliest_start[tid])
+    critical_task_ids = [task_id for task_id, *_ in critical]
+    details = await _task_details(db, critical_task_ids)
 
-    # Build detailed critical task info
     critical_tasks = []
-    for tid in critical_task_ids:
-        task = task_map[tid]
+    for task_id, duration, slack, earliest_start, earliest_finish in critical:
+        task = details.get(task_id)
+        if task is None:
+            continue
         critical_tasks.append({
-            "task_id": tid,
+            "task_id": task_id,
             "task_title": task.title,
             "start_date": task.start_date,
             "due_date": task.due_date,
-            "duration_days": durations[tid],
-            "slack_days": slack[tid],
-            "earliest_start": earliest_start[tid],
-            "earliest_finish": earliest_finish[tid],
+            "duration_days": duration,
+            "slack_days": slack,
+            "earliest_start": earliest_start,
+            "earliest_finish": earliest_finish,
         })
 
     return {
         "task_ids": critical_task_ids,
-        "total_duration": project_duration,
+        "total_duration": total_duration,
         "critical_tasks": critical_tasks,
     }
 
 
+def _lognormal_fit(delay_factors: list[float]) -> dict:
+    """Mean and standard deviation of the log delay factor (a lognormal fit)."""
+    logs = [math.log(factor) for factor in delay_factors if factor > 0]
+    if not logs:
+        return {"mu": 0.0, "sigma": 0.0, "samples": 0}
+    return {
+        "mu": statistics.fmean(logs),
+        "sigma": statistics.pstdev(logs) if len(logs) > 1 else 0.0,
+        "samples": len(logs),
+    }
+
+
 async def calculate_historical_variance(db: AsyncSession, project_id: UUID) -> dict:
     """
     Analyze completed tasks to calculate historical variance and delay factors.
@@ -189,6 +108,8 @@ async def calculate_historical_variance(db: AsyncSession, project_id: UUID) -> d
         - variance_by_milestone: dict with milestone vs regular task variance
         - total_completed_tasks: int
         - tasks_with_variance_data: int
+        - duration_distributions: lognormal fit (mu, sigma of log delay factor, samples)
+          overall and by assignee, priority and milestone, for Monte Carlo sampling
     """
     # Query completed tasks with both estimated and actual hours
     query = (
@@ -212,6 +133,12 @@ async def calculate_historical_variance(db: AsyncSession, project_id: UUID) -> d
             "variance_by_milestone": {"milestone": 1.0, "regular": 1.0},
             "total_completed_tasks": 0,
             "tasks_with_variance_data": 0,
+            "duration_distributions": {
+                "overall": _lognormal_fit([]),
+                "by_assignee": {},
+                "by_priority": {},
+                "by_milestone": {"milestone": _lognormal_fit([]), "regular": _lognormal_fit([])},
+            },
         }
 
     # Calculate variance for each task
@@ -285,6 +212,12 @@ async def calculate_historical_variance(db: AsyncSession, project_id: UUID) -> d
         "variance_by_milestone": variance_by_milestone,
         "total_completed_tasks": total_completed,
         "tasks_with_variance_data": len(tasks),
+        "duration_distributions": {
+            "overall": _lognormal_fit(task_variances),
+            "by_assignee": {key: _lognormal_fit(values) for key, values in assignee_variances.items()},
+            "by_priority": {key: _lognormal_fit(values) for key, values in priority_variances.items()},
+            "by_milestone": {key: _lognormal_fit(values) for key, values in milestone_variances.items()},
+        },
     }
 
 
@@ -517,7 +450,7 @@ def parse_mitigation_response(text: str) -> list[dict]:
     }]
 
 
-def generate_mitigation_suggestions(
+async def generate_mitigation_suggestions(
     critical_path: dict,
     variance_data: dict,
     confidence_data: dict,
@@ -572,7 +505,6 @@ def generate_mitigation_suggestions(
         language=lang_name,
     )
 
-    client = genai.Client(api_key=api_key)
     model_name = settings.gemini_model
 
     contents = [
@@ -580,7 +512,9 @@ def generate_mitigation_suggestions(
     ]
 
     start = time.time()
-    response = client.models.generate_content(model=model_name, contents=contents)
+    response = await get_llm_gateway().generate_content(
+        contents, model=model_name, operation="generate_mitigation_suggestions"
+    )
     elapsed_ms = int((time.time() - start) * 1000)
 
     if not response.text:
@@ -634,16 +568,9 @@ async def simulate_scenario(
         - impacted_tasks: list of dicts with task changes
         - recommendations: list of insights based on simulation
     """
-    # Fetch all tasks for the project with dependencies
-    query = (
-        select(Task)
-        .where(Task.project_id == project_id)
-        .options(selectinload(Task.dependencies))
-    )
-    result = await db.execute(query)
-    all_tasks = result.scalars().all()
+    graph = await schedule_graphs.get(db, project_id)
 
-    if not all_tasks:
+    if not len(graph):
         return {
             "baseline": {"total_duration": 0.0, "critical_task_count": 0},
             "scenario": {"total_duration": 0.0, "critical_task_count": 0},
@@ -652,9 +579,9 @@ async def simulate_scenario(
             "recommendations": ["No tasks found in project"],
         }
 
-    # Calculate baseline critical path
-    baseline_cp = await calculate_critical_path(db, project_id)
-    baseline_critical_ids = set(baseline_cp["task_ids"])
+    # The cached graph already holds the baseline schedule
+    baseline_total = graph.schedule.total_duration
+    baseline_critical = set(graph.critical_path())
 
     # Extract scenario parameters
     duration_adjustments = scenario_changes.get("task_duration_adjustments", {})
@@ -662,166 +589,80 @@ async def simulate_scenario(
     buffer_percentage = scenario_changes.get("add_buffer_percentage", 0.0)
     resource_changes = scenario_changes.get("resource_changes", {})
 
-    # Build task map and dependency graph for simulation
-    task_map = {task.id: task for task in all_tasks if task.id not in remove_task_ids}
-    task_ids = list(task_map.keys())
-
-    # Fetch dependencies (excluding removed tasks)
-    dep_query = select(TaskDependency).where(
-        TaskDependency.task_id.in_(task_ids)
-    )
-    dep_result = await db.execute(dep_query)
-    dependencies = dep_result.scalars().all()
-
-    # Build adjacency lists
-    predecessors = defaultdict(list)
-    successors = defaultdict(list)
-
-    for dep in dependencies:
-        if (dep.task_id in task_map and
-            dep.depends_on_id in task_map and
-            dep.depends_on_id not in remove_task_ids):
-            predecessors[dep.task_id].append(dep.depends_on_id)
-            successors[dep.depends_on_id].append(dep.task_id)
+    active = None
+    removed = [graph.index[UUID(str(task_id))] for task_id in remove_task_ids if UUID(str(task_id)) in graph.index]
+    if removed:
+        active = bytearray(b"\x01") * len(graph)
+        for node in removed:
+            active[node] = 0
 
     # Calculate adjusted durations for simulation
-    def get_simulated_duration(task: Task) -> float:
-        # Base duration
-        if task.start_date and task.due_date:
-            delta = task.due_date - task.start_date
-            base_duration = max(1.0, float(delta.days))
-        elif task.estimated_hours:
-            base_duration = max(1.0, task.estimated_hours / 8.0)
-        else:
-            base_duration = 1.0
+    durations = array("d", graph.durations)
+    changes_by_node = {}
+    for node, task_id in enumerate(graph.task_ids):
+        changes = []
+        task_id_str = str(task_id)
 
         # Apply task-specific duration adjustment
-        task_id_str = str(task.id)
         if task_id_str in duration_adjustments:
-            base_duration *= duration_adjustments[task_id_str]
+            durations[node] *= duration_adjustments[task_id_str]
+            changes.append(f"duration adjusted by {duration_adjustments[task_id_str]}x")
 
         # Apply resource efficiency multiplier
-        if task.assignee_id:
-            assignee_id_str = str(task.assignee_id)
-            if assignee_id_str in resource_changes:
-                # Lower efficiency (e.g., 0.8) means tasks take longer (divide by efficiency)
-                efficiency = resource_changes[assignee_id_str]
-                if efficiency > 0:
-                    base_duration /= efficiency
+        assignee_id = graph.assignees[node]
+        if assignee_id and str(assignee_id) in resource_changes:
+            # Lower efficiency (e.g., 0.8) means tasks take longer (divide by efficiency)
+            efficiency = resource_changes[str(assignee_id)]
+            if efficiency > 0:
+                durations[node] /= efficiency
+            changes.append(f"resource efficiency: {efficiency}x")
 
         # Apply buffer to critical path tasks if requested
-        if buffer_percentage > 0 and task.id in baseline_critical_ids:
-            base_duration *= (1.0 + buffer_percentage)
-
-        return base_duration
-
-    durations = {task.id: get_simulated_duration(task) for task in task_map.values()}
-
-    # Perform critical path calculation with simulated durations
-    # Forward pass
-    earliest_start = {}
-    earliest_finish = {}
-
-    # Topological sort
-    in_degree = {tid: len(predecessors[tid]) for tid in task_ids}
-    queue = deque([tid for tid in task_ids if in_degree[tid] == 0])
-    topo_order = []
-
-    while queue:
-        tid = queue.popleft()
-        topo_order.append(tid)
-        for successor_id in successors[tid]:
-            in_degree[successor_id] -= 1
-            if in_degree[successor_id] == 0:
-                queue.append(successor_id)
-
-    # Handle cycles
-    if len(topo_order) < len(task_ids):
-        for tid in task_ids:
-            if tid not in topo_order:
-                topo_order.append(tid)
-
-    # Forward pass
-    for tid in topo_order:
-        if not predecessors[tid]:
-            earliest_start[tid] = 0.0
-        else:
-            earliest_start[tid] = max(
-                earliest_finish.get(pred_id, 0.0)
-                for pred_id in predecessors[tid]
-            )
-        earliest_finish[tid] = earliest_start[tid] + durations[tid]
-
-    # Calculate simulated project duration
-    simulated_duration = max(earliest_finish.values()) if earliest_finish else 0.0
-
-    # Backward pass
-    latest_start = {}
-    latest_finish = {}
-
-    for tid in reversed(topo_order):
-        if not successors[tid]:
-            latest_finish[tid] = simulated_duration
-        else:
-            latest_finish[tid] = min(
-                latest_start.get(succ_id, simulated_duration)
-                for succ_id in successors[tid]
-            )
-        latest_start[tid] = latest_finish[tid] - durations[tid]
-
-    # Calculate slack and identify new critical path
-    slack = {
-        tid: latest_start[tid] - earliest_start[tid]
-        for tid in task_ids
-    }
+        if buffer_percentage > 0 and node in baseline_critical:
+            durations[node] *= (1.0 + buffer_percentage)
+            changes.append(f"buffer added: {buffer_percentage * 100}%")
 
-    simulated_critical_ids = [
-        tid for tid in task_ids
-        if abs(slack[tid]) < 0.01
-    ]
+        changes_by_node[node] = changes
+
+    # Forward and backward pass over the cached order with simulated durations
+    scenario = graph.evaluate(durations, active)
+    simulated_duration = scenario.total_duration
+    simulated_critical = set(graph.critical_path(scenario, active))
 
     # Build impacted tasks list
+    impacted_nodes = [
+        node for node in range(len(graph))
+        if (active is None or active[node])
+        and (changes_by_node[node] or node in baseline_critical or node in simulated_critical)
+    ]
+    details = await _task_details(db, [graph.task_ids[node] for node in impacted_nodes])
     impacted_tasks = []
-    for task_id in task_ids:
-        task = task_map[task_id]
-        task_id_str = str(task_id)
-
-        # Determine what changed for this task
-        changes = []
-        if task_id_str in duration_adjustments:
-            changes.append(f"duration adjusted by {duration_adjustments[task_id_str]}x")
-        if task.assignee_id and str(task.assignee_id) in resource_changes:
-            changes.append(f"resource efficiency: {resource_changes[str(task.assignee_id)]}x")
-        if buffer_percentage > 0 and task_id in baseline_critical_ids:
-            changes.append(f"buffer added: {buffer_percentage * 100}%")
-
-        was_critical = task_id in baseline_critical_ids
-        is_critical = task_id in simulated_critical_ids
-
-        if changes or was_critical or is_critical:
-            impacted_tasks.append({
-                "task_id": task_id,
-                "task_title": task.title,
-                "baseline_critical": was_critical,
-                "scenario_critical": is_critical,
-                "baseline_duration": durations[task_id] / (1.0 + buffer_percentage) if buffer_percentage > 0 and was_critical else None,
-                "scenario_duration": durations[task_id],
-                "changes_applied": changes,
-            })
+    for node in impacted_nodes:
+        task_id = graph.task_ids[node]
+        was_critical = node in baseline_critical
+        impacted_tasks.append({
+            "task_id": task_id,
+            "task_title": details[task_id].title if task_id in details else "",
+            "baseline_critical": was_critical,
+            "scenario_critical": node in simulated_critical,
+            "baseline_duration": durations[node] / (1.0 + buffer_percentage) if buffer_percentage > 0 and was_critical else None,
+            "scenario_duration": durations[node],
+            "changes_applied": changes_by_node[node],
+        })
 
     # Calculate deltas
-    duration_change = simulated_duration - baseline_cp["total_duration"]
-    critical_path_change = len(simulated_critical_ids) - len(baseline_critical_ids)
+    duration_change = simulated_duration - baseline_total
+    critical_path_change = len(simulated_critical) - len(baseline_critical)
 
     # Generate recommendations
     recommendations = []
     if duration_change < 0:
         recommendations.append(
-            f"Scenario reduces project duration by {abs(duration_change):.1f} days ({abs(duration_change) / baseline_cp['total_duration'] * 100:.1f}%)"
+            f"Scenario reduces project duration by {abs(duration_change):.1f} days ({abs(duration_change) / baseline_total * 100:.1f}%)"
         )
     elif duration_change > 0:
         recommendations.append(
-            f"Scenario increases project duration by {duration_change:.1f} days ({duration_change / baseline_cp['total_duration'] * 100:.1f}%)"
+            f"Scenario increases project duration by {duration_change:.1f} days ({duration_change / baseline_total * 100:.1f}%)"
         )
     else:
         recommendations.append("Scenario has no impact on project duration")
@@ -841,29 +682,222 @@ async def simulate_scenario(
         )
 
     if buffer_percentage > 0:
-        buffer_days = baseline_cp["total_duration"] * buffer_percentage
+        buffer_days = baseline_total * buffer_percentage
         recommendations.append(
             f"Added {buffer_percentage * 100}% buffer ({buffer_days:.1f} days) to critical path tasks"
         )
 
     return {
         "baseline": {
-            "total_duration": baseline_cp["total_duration"],
-            "critical_task_count": len(baseline_critical_ids),
+            "total_duration": baseline_total,
+            "critical_task_count": len(baseline_critical),
         },
         "scenario": {
             "total_duration": simulated_duration,
-            "critical_task_count": len(simulated_critical_ids),
+            "critical_task_count": len(simulated_critical),
         },
         "delta": {
             "duration_change_days": duration_change,
             "critical_path_change": critical_path_change,
             "duration_change_percentage": (
-                (duration_change / baseline_cp["total_duration"] * 100)
-                if baseline_cp["total_duration"] > 0
+                (duration_change / baseline_total * 100)
+                if baseline_total > 0
                 else 0.0
             ),
         },
         "impacted_tasks": impacted_tasks,
         "recommendations": recommendations,
     }
+
+
+async def simulate_task_delay(
+    db: AsyncSession,
+    project_id: UUID,
+    task_id: UUID,
+    delay_days: float,
+) -> dict:
+    """
+    What-if impact of one task taking ``delay_days`` longer.
+
+    The delay is pushed forward from the task through the cached schedule graph, so only
+    its downstream tasks are recomputed.
+
+    Returns:
+        dict with:
+        - baseline: dict with total_duration and end_date (latest task due date)
+        - scenario: dict with total_duration, end_date and delay_days of the project end
+        - affected_tasks: list of dicts for tasks whose finish moves, with their due date shift
+    """
+    graph = await schedule_graphs.get(db, project_id)
+    node = graph.index.get(task_id)
+    if node is None:
+        raise ValueError("Task not found in project schedule")
+
+    baseline = graph.schedule
+    scenario = graph.with_durations({node: graph.durations[node] + delay_days})
+    shifts = {
+        graph.task_ids[other]: scenario.earliest_finish[other] - baseline.earliest_finish[other]
+        for other in range(len(graph))
+        if scenario.earliest_finish[other] != baseline.earliest_finish[other]
+    }
+    project_delay = scenario.total_duration - baseline.total_duration
+    baseline_total = baseline.total_duration
+
+    details = await _task_details(db, list(shifts))
+    end_result = await db.execute(select(func.max(Task.due_date)).where(Task.project_id == project_id))
+    end_date = end_result.scalar()
+
+    def shifted(value: Optional[date], days: float) -> Optional[datetime]:
+        return datetime.combine(value, datetime.min.time()) + timedelta(days=days) if value else None
+
+    affected_tasks = [
+        {
+            "task_id": affected_id,
+            "title": details[affected_id].title,
+            "original_due_date": shifted(details[affected_id].due_date, 0),
+            "new_due_date": shifted(details[affected_id].due_date, shift),
+            "delay_days": shift,
+        }
+        for affected_id, shift in sorted(shifts.items(), key=lambda item: -item[1])
+        if affected_id in details
+    ]
+
+    return {
+        "baseline": {
+            "total_duration": baseline_total,
+            "end_date": shifted(end_date, 0),
+        },
+        "scenario": {
+            "total_duration": baseline_total + project_delay,
+            "end_date": shifted(end_date, project_delay),
+            "delay_days": project_delay,
+        },
+        "affected_tasks": affected_tasks,
+    }
+
+
+# Delay factor spread assumed for tasks with too little history to fit one
+DEFAULT_DURATION_SIGMA = 0.25
+MIN_DISTRIBUTION_SAMPLES = 3
+CRITICALITY_TASK_LIMIT = 50
+
+simulation_pool = WorkerPool("monte_carlo_workers")
+
+
+def _task_distribution(
+    distributions: dict,
+    assignee_id: Optional[UUID],
+    priority: Optional[str],
+    is_milestone: bool,
+) -> tuple[float, float]:
+    """(mu, sigma) of the task's log delay factor, from the most specific group with enough history."""
+    candidates = (
+        distributions["by_assignee"].get(str(assignee_id)) if assignee_id else None,
+        distributions["by_priority"].get(priority) if priority else None,
+        distributions["by_milestone"].get("milestone" if is_milestone else "regular"),
+        distributions["overall"],
+    )
+    for fit in candidates:
+        if fit and fit["samples"] >= MIN_DISTRIBUTION_SAMPLES:
+            return fit["mu"], fit["sigma"]
+    return 0.0, DEFAULT_DURATION_SIGMA
+
+
+async def run_monte_carlo_simulation(
+    db: AsyncSession,
+    project_id: UUID,
+    iterations: int,
+    seed: Optional[int] = None,
+) -> dict:
+    """
+    Monte Carlo schedule risk analysis.
+
+    Every task's duration is drawn from a lognormal distribution: its planned duration
+    scaled by a delay factor whose log mean and spread come from the historical variance
+    of comparable completed tasks (same assignee, priority or milestone type). Completed
+    tasks keep their planned duration. Large projects are simulated in a process pool.
+
+    Returns:
+        dict with:
+        - iterations: int
+        - deterministic_duration: float planned critical path duration in days
+        - mean_duration / p50_duration / p80_duration / p95_duration: float days
+        - project_start_date: date the durations count from
+        - p50_completion_date / p80_completion_date / p95_completion_date: date
+        - task_criticality: list of dicts (task_id, task_title, criticality_index), the share
+          of iterations in which the task was on the critical path, highest first
+        - processing_time_ms: int
+    """
+    start = time.time()
+    graph = await schedule_graphs.get(db, project_id)
+    variance_data = await calculate_historical_variance(db, project_id)
+    distributions = variance_data["duration_distributions"]
+
+    attributes = {
+        row.id: row
+        for row in (await db.execute(
+            select(Task.id, Task.priority, Task.is_milestone, Task.status).where(Task.project_id == project_id)
+        )).all()
+    }
+    start_result = await db.execute(select(func.min(Task.start_date)).where(Task.project_id == project_id))
+    project_start = start_result.scalar() or utcnow().date()
+
+    size = len(graph)
+    median = np.empty(size)
+    sigma = np.empty(size)
+    for node, task_id in enumerate(graph.task_ids):
+        task = attributes.get(task_id)
+        if task is None or task.status == "completed":
+            median[node], sigma[node] = graph.durations[node], 0.0
+            continue
+        mu, spread = _task_distribution(distributions, graph.assignees[node], task.priority, task.is_milestone)
+        median[node], sigma[node] = graph.durations[node] * math.exp(mu), spread
+    plan = build_plan(graph.order, graph.position, graph.pred_offsets, graph.pred_targets)
+    deterministic_duration = graph.schedule.total_duration
+    task_ids = list(graph.task_ids)
+
+    # Everything the workers need is captured above; the cached graph may change from here on
+    settings = get_settings()
+    if size * iterations >= settings.monte_carlo_process_pool_threshold and settings.monte_carlo_workers > 1:
+        workers = settings.monte_carlo_workers
+        chunks = [iterations // workers + (1 if i < iterations % workers else 0) for i in range(workers)]
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        results = await asyncio.gather(*(
+            simulation_pool.run(simulate, plan, median, sigma, chunk, chunk_seed)
+            for chunk, chunk_seed in zip(chunks, seeds)
+            if chunk
+        ))
+        totals = np.concatenate([totals for totals, _ in results])
+        critical = sum(counts for _, counts in results)
+    else:
+        totals, critical = await asyncio.to_thread(
+            simulate, plan, median, sigma, iterations, np.random.SeedSequence(seed),
+        )
+
+    p50, p80, p95 = (float(value) for value in np.percentile(totals, [50, 80, 95])) if size else (0.0, 0.0, 0.0)
+    criticality = critical / iterations
+    top = [node for node in np.argsort(-criticality, kind="stable")[:CRITICALITY_TASK_LIMIT] if criticality[node] > 0]
+    details = await _task_details(db, [task_ids[node] for node in top])
+
+    return {
+        "iterations": iterations,
+        "deterministic_duration": deterministic_duration,
+        "mean_duration": float(totals.mean()) if size else 0.0,
+        "p50_duration": p50,
+        "p80_duration": p80,
+        "p95_duration": p95,
+        "project_start_date": project_start,
+        "p50_completion_date": project_start + timedelta(days=math.ceil(p50)),
+        "p80_completion_date": project_start + timedelta(days=math.ceil(p80)),
+        "p95_completion_date": project_start + timedelta(days=math.ceil(p95)),
+        "task_criticality": [
+            {
+                "task_id": task_ids[node],
+                "task_title": details[task_ids[node]].title,
+                "criticality_index": float(criticality[node]),
+            }
+            for node in top
+            if task_ids[node] in details
+        ],
+        "processing_time_ms": int((time.time() - start) * 1000),
+    }
@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
+import logging
 import uuid
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator
 from pathlib import Path
+from typing import Optional
 
 from fastapi import Depends, UploadFile
 
@@ -13,10 +18,49 @@ except ImportError:
     boto3 = None
 
 try:
+    from google.api_core.exceptions import NotFound as GCSNotFound
     from google.cloud import storage as gcs_storage
 except ImportError:
+    GCSNotFound = None
     gcs_storage = None
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024  # S3 requires >= 5 MB for all parts but the last
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+GCS_RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024  # must be a multiple of 256 KB
+GCS_COMPOSE_LIMIT = 32  # most source objects a single compose request accepts
+
+
+async def iter_upload_file(file: UploadFile, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def compute_checksum(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class ChecksumStream:
+    """Pass-through async chunk stream that accumulates a sha256 of everything consumed."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks
+        self._digest = hashlib.sha256()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._chunks:
+            self._digest.update(chunk)
+            yield chunk
+
+    @property
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
 
 class StorageBackend(ABC):
     @abstractmethod
@@ -39,6 +83,54 @@ class StorageBackend(ABC):
     async def get_file_content(self, storage_path: str) -> bytes:
         pass
 
+    async def get_file_size(self, storage_path: str) -> int:
+        """Return the stored object size, raising FileNotFoundError if it does not exist."""
+        return len(await self.get_file_content(storage_path))
+
+    async def open_read(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the object in chunks. ``start``/``end`` are inclusive byte offsets.
+
+        Backends override this to stream; the default falls back to a full read.
+        """
+        content = await self.get_file_content(storage_path)
+        stop = len(content) if end is None else min(end + 1, len(content))
+        for offset in range(start, stop, chunk_size):
+            yield content[offset:min(offset + chunk_size, stop)]
+
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Store an async stream of chunks, returning the total bytes written."""
+        content = b"".join([chunk async for chunk in chunks])
+        return await self.save_bytes(content, storage_path, content_type)
+
+    async def concatenate(
+        self,
+        part_paths: list[str],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Join stored objects, in order, into one object; returns its size.
+
+        The default streams the parts through this process; backends with a server-side
+        compose override it.
+        """
+        async def chained() -> AsyncIterator[bytes]:
+            for part_path in part_paths:
+                async for chunk in self.open_read(part_path):
+                    yield chunk
+
+        return await self.save_stream(chained(), storage_path, content_type)
+
 
 class LocalStorageBackend(StorageBackend):
     def __init__(self, base_path: str):
@@ -46,13 +138,31 @@ class LocalStorageBackend(StorageBackend):
         self.base_path.mkdir(parents=True, exist_ok=True)
 
     async def save_file(self, file: UploadFile, storage_path: str) -> int:
+        file_size = await self.save_stream(
+            iter_upload_file(file), storage_path, file.content_type or "application/octet-stream"
+        )
+        await file.seek(0)
+        return file_size
+
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
         full_path = self.base_path / storage_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
-        content = await file.read()
-        file_size = len(content)
-        with open(full_path, "wb") as f:
-            f.write(content)
-        await file.seek(0)
+        tmp_path = full_path.with_name(f".{full_path.name}.{uuid.uuid4().hex[:8]}.part")
+        file_size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    await asyncio.to_thread(f.write, chunk)
+                    file_size += len(chunk)
+            tmp_path.replace(full_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         return file_size
 
     async def save_bytes(self, content: bytes, storage_path: str, content_type: str = "application/octet-stream") -> int:
@@ -79,6 +189,37 @@ class LocalStorageBackend(StorageBackend):
         with open(full_path, "rb") as f:
             return f.read()
 
+    def _resolve_existing(self, storage_path: str) -> Path:
+        validate_storage_path(storage_path, str(self.base_path))
+        full_path = self.base_path / storage_path
+        if not full_path.is_file():
+            raise FileNotFoundError(f"File not found: {storage_path}")
+        return full_path
+
+    async def get_file_size(self, storage_path: str) -> int:
+        return self._resolve_existing(storage_path).stat().st_size
+
+    async def open_read(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        full_path = self._resolve_existing(storage_path)
+        remaining = None if end is None else end - start + 1
+        with open(full_path, "rb") as f:
+            if start:
+                f.seek(start)
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(f.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
 
 class S3StorageBackend(StorageBackend):
     def __init__(self, bucket_name: str, region: str, access_key_id: str, secret_access_key: str):
@@ -102,23 +243,111 @@ class S3StorageBackend(StorageBackend):
         return self._client
 
     async def save_file(self, file: UploadFile, storage_path: str) -> int:
-        content = await file.read()
-        file_size = len(content)
-        self.client.put_object(
-            Bucket=self.bucket_name,
-            Key=storage_path,
-            Body=content,
-            ContentType=file.content_type or "application/octet-stream"
+        file_size = await self.save_stream(
+            iter_upload_file(file), storage_path, file.content_type or "application/octet-stream"
         )
         await file.seek(0)
         return file_size
 
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Buffer up to one part; small objects use put_object, larger ones a multipart upload."""
+        buffer = bytearray()
+        upload_id = None
+        parts: list[dict] = []
+        file_size = 0
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                file_size += len(chunk)
+                if len(buffer) < MULTIPART_PART_SIZE:
+                    continue
+                if upload_id is None:
+                    response = await asyncio.to_thread(
+                        self.client.create_multipart_upload,
+                        Bucket=self.bucket_name, Key=storage_path, ContentType=content_type,
+                    )
+                    upload_id = response["UploadId"]
+                parts.append(await self._upload_part(storage_path, upload_id, len(parts) + 1, bytes(buffer)))
+                buffer.clear()
+
+            if upload_id is None:
+                await asyncio.to_thread(
+                    self.client.put_object,
+                    Bucket=self.bucket_name, Key=storage_path, Body=bytes(buffer), ContentType=content_type,
+                )
+                return file_size
+
+            if buffer:
+                parts.append(await self._upload_part(storage_path, upload_id, len(parts) + 1, bytes(buffer)))
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket_name, Key=storage_path, UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            return file_size
+        except BaseException:
+            if upload_id is not None:
+                await asyncio.to_thread(
+                    self.client.abort_multipart_upload,
+                    Bucket=self.bucket_name, Key=storage_path, UploadId=upload_id,
+                )
+            raise
+
+    async def _upload_part(self, storage_path: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = await asyncio.to_thread(
+            self.client.upload_part,
+            Bucket=self.bucket_name, Key=storage_path, UploadId=upload_id,
+            PartNumber=part_number, Body=body,
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    async def concatenate(
+        self,
+        part_paths: list[str],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Copy the parts server-side into a multipart upload (UploadPartCopy)."""
+        sizes = [await self.get_file_size(part_path) for part_path in part_paths]
+        if len(part_paths) < 2 or any(size < S3_MIN_PART_SIZE for size in sizes[:-1]):
+            return await super().concatenate(part_paths, storage_path, content_type)
+
+        response = await asyncio.to_thread(
+            self.client.create_multipart_upload,
+            Bucket=self.bucket_name, Key=storage_path, ContentType=content_type,
+        )
+        upload_id = response["UploadId"]
+        try:
+            parts = []
+            for part_number, part_path in enumerate(part_paths, start=1):
+                copied = await asyncio.to_thread(
+                    self.client.upload_part_copy,
+                    Bucket=self.bucket_name, Key=storage_path, UploadId=upload_id, PartNumber=part_number,
+                    CopySource={"Bucket": self.bucket_name, "Key": part_path},
+                )
+                parts.append({"ETag": copied["CopyPartResult"]["ETag"], "PartNumber": part_number})
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket_name, Key=storage_path, UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket_name, Key=storage_path, UploadId=upload_id,
+            )
+            raise
+        return sum(sizes)
+
     async def save_bytes(self, content: bytes, storage_path: str, content_type: str = "application/octet-stream") -> int:
-        self.client.put_object(
-            Bucket=self.bucket_name,
-            Key=storage_path,
-            Body=content,
-            ContentType=content_type,
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket_name, Key=storage_path, Body=content, ContentType=content_type,
         )
         return len(content)
 
@@ -137,6 +366,36 @@ class S3StorageBackend(StorageBackend):
         response = self.client.get_object(Bucket=self.bucket_name, Key=storage_path)
         return response['Body'].read()
 
+    async def get_file_size(self, storage_path: str) -> int:
+        try:
+            response = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket_name, Key=storage_path)
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise FileNotFoundError(f"File not found: {storage_path}") from e
+            raise
+        return response["ContentLength"]
+
+    async def open_read(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        params = {"Bucket": self.bucket_name, "Key": storage_path}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        response = await asyncio.to_thread(self.client.get_object, **params)
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
 
 class GCSStorageBackend(StorageBackend):
     def __init__(self, bucket_name: str, project_id: str = ""):
@@ -150,21 +409,70 @@ class GCSStorageBackend(StorageBackend):
         self.bucket = self.client.bucket(bucket_name)
 
     async def save_file(self, file: UploadFile, storage_path: str) -> int:
-        content = await file.read()
-        file_size = len(content)
-        blob = self.bucket.blob(storage_path)
-        blob.upload_from_string(content, content_type=file.content_type or "application/octet-stream")
+        file_size = await self.save_stream(
+            iter_upload_file(file), storage_path, file.content_type or "application/octet-stream"
+        )
         await file.seek(0)
         return file_size
 
+    async def save_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Write through a resumable upload session so only one chunk is held in memory."""
+        blob = self.bucket.blob(storage_path, chunk_size=GCS_RESUMABLE_CHUNK_SIZE)
+        writer = await asyncio.to_thread(blob.open, "wb", content_type=content_type)
+        file_size = 0
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(writer.write, chunk)
+                file_size += len(chunk)
+        except BaseException:
+            # The writer can only be closed, which finalizes the upload (its finalizer would
+            # do the same later), so close it now and delete the truncated blob
+            await asyncio.to_thread(self._discard_upload, writer, blob)
+            raise
+        await asyncio.to_thread(writer.close)
+        return file_size
+
+    @staticmethod
+    def _discard_upload(writer, blob) -> None:
+        try:
+            writer.close()
+            blob.delete()
+        except Exception as e:
+            logger.warning("Failed to discard partial upload of %s: %s", blob.name, e)
+
     async def save_bytes(self, content: bytes, storage_path: str, content_type: str = "application/octet-stream") -> int:
         blob = self.bucket.blob(storage_path)
-        blob.upload_from_string(content, content_type=content_type)
+        await asyncio.to_thread(blob.upload_from_string, content, content_type=content_type)
         return len(content)
 
+    async def concatenate(
+        self,
+        part_paths: list[str],
+        storage_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Compose the parts server-side, folding batches into the destination blob."""
+        blob = self.bucket.blob(storage_path)
+        blob.content_type = content_type
+        sources = [self.bucket.blob(part_path) for part_path in part_paths]
+        await asyncio.to_thread(blob.compose, sources[:GCS_COMPOSE_LIMIT])
+        remaining = sources[GCS_COMPOSE_LIMIT:]
+        while remaining:
+            batch, remaining = remaining[:GCS_COMPOSE_LIMIT - 1], remaining[GCS_COMPOSE_LIMIT - 1:]
+            await asyncio.to_thread(blob.compose, [blob, *batch])
+        return await self.get_file_size(storage_path)
+
     async def delete_file(self, storage_path: str) -> None:
         blob = self.bucket.blob(storage_path)
-        blob.delete()
+        try:
+            blob.delete()
+        except GCSNotFound as e:
+            raise FileNotFoundError(f"File not found: {storage_path}") from e
 
     def get_file_url(self, storage_path: str) -> str:
         blob = self.bucket.blob(storage_path)
@@ -184,6 +492,37 @@ class GCSStorageBackend(StorageBackend):
         blob = self.bucket.blob(storage_path)
         return blob.download_as_bytes()
 
+    async def get_file_size(self, storage_path: str) -> int:
+        blob = await asyncio.to_thread(self.bucket.get_blob, storage_path)
+        if blob is None:
+            raise FileNotFoundError(f"File not found: {storage_path}")
+        return blob.size
+
+    async def open_read(
+        self,
+        storage_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        # One reader for the whole range: it downloads in large ranged requests and
+        # hands out chunk_size slices from its buffer
+        reader = await asyncio.to_thread(self.bucket.blob(storage_path).open, "rb")
+        try:
+            if start:
+                await asyncio.to_thread(reader.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await asyncio.to_thread(reader.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(reader.close)
+
 
 def _create_storage_backend(settings: Settings) -> StorageBackend:
     """Core function to create storage backend from settings.
@@ -7,6 +7,11 @@ from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# The SDK talks to Stripe itself; give it one pooled client and let it retry, which is safe
+# because its retries carry an idempotency key
+stripe.default_http_client = stripe.RequestsClient(timeout=get_settings().integration_http_timeout_seconds)
+stripe.max_network_retries = get_settings().integration_http_max_retries
+
 
 class StripeService:
     def __init__(self):
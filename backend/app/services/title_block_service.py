@@ -3,10 +3,11 @@
 import json
 import time
 
-from google import genai
 from google.genai import types
 
 from app.config import get_settings
+from app.services.llm_cache_service import get_or_compute, prompt_version
+from app.services.llm_gateway import get_llm_gateway
 
 TITLE_BLOCK_EXTRACTION_PROMPT = """You are an expert in construction drawing analysis. Extract metadata from the title block in this drawing.
 
@@ -54,7 +55,7 @@ Respond ONLY with valid JSON in this exact format:
 Set any field to null if not visible."""
 
 
-def extract_title_block(file_content: bytes, file_type: str) -> dict:
+async def extract_title_block(file_content: bytes, file_type: str) -> dict:
     """Extract title block metadata from a construction drawing using Gemini AI.
 
     Args:
@@ -86,8 +87,19 @@ def extract_title_block(file_content: bytes, file_type: str) -> dict:
         raise ValueError("GEMINI_API_KEY is not configured")
 
     model_name = settings.gemini_model
-    client = genai.Client(api_key=api_key)
 
+    # Failed extractions are not cached so a retry gets a fresh attempt
+    return await get_or_compute(
+        file_content,
+        "title_block",
+        model_name,
+        prompt_version(TITLE_BLOCK_EXTRACTION_PROMPT),
+        lambda: _run_title_block_extraction(file_content, file_type, model_name),
+        should_cache=lambda result: result["success"],
+    )
+
+
+async def _run_title_block_extraction(file_content: bytes, file_type: str, model_name: str) -> dict:
     mime_type = file_type or "application/pdf"
     contents = [
         types.Part.from_bytes(data=file_content, mime_type=mime_type),
@@ -97,7 +109,9 @@ def extract_title_block(file_content: bytes, file_type: str) -> dict:
     start = time.time()
 
     try:
-        response = client.models.generate_content(model=model_name, contents=contents)
+        response = await get_llm_gateway().generate_content(
+            contents, model=model_name, operation="extract_title_block"
+        )
         elapsed_ms = int((time.time() - start) * 1000)
 
         if not response.text:
@@ -1,80 +1,187 @@
 from __future__ import annotations
 
+import logging
 from datetime import timedelta
-from decimal import Decimal
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import func, select, and_
+from sqlalchemy import Row, Select, and_, func, inspect, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.config import get_settings
+from app.core.commit_cache import CommitInvalidatedCache
 from app.models.budget import CostEntry
 from app.models.equipment import Equipment
 from app.models.material import Material
-from app.models.vendor import Vendor
-from app.services.vendor_service import get_vendor, list_vendors
+from app.models.vendor import Vendor, VendorPerformance
 from app.utils import utcnow
 
+logger = logging.getLogger(__name__)
 
-async def get_vendor_analytics(db: AsyncSession, vendor_id: UUID) -> dict:
-    vendor = await get_vendor(db, vendor_id, include_performances=True)
-    if not vendor:
-        return {}
 
-    cost_result = await db.execute(
-        select(func.sum(CostEntry.amount)).where(CostEntry.vendor_id == vendor_id)
-    )
-    total_spending = cost_result.scalar() or Decimal(0)
+LEADERBOARD_SOURCE_MODELS = (Vendor, VendorPerformance, CostEntry, Material, Equipment)
 
-    materials_result = await db.execute(
-        select(func.count(Material.id)).where(Material.vendor_id == vendor_id)
-    )
-    materials_count = materials_result.scalar() or 0
+SORT_FIELDS = (
+    "total_spending",
+    "materials_count",
+    "equipment_count",
+    "projects_count",
+    "avg_delivery_score",
+    "avg_quality_score",
+    "avg_price_score",
+    "overall_rating",
+    "company_name",
+)
 
-    equipment_result = await db.execute(
-        select(func.count(Equipment.id)).where(Equipment.vendor_id == vendor_id)
+
+def _vendor_analytics_query() -> Select:
+    """One row per vendor, with spending, usage counts and performance averages aggregated in SQL."""
+    spending = (
+        select(CostEntry.vendor_id, func.sum(CostEntry.amount).label("total"))
+        .where(CostEntry.vendor_id.isnot(None))
+        .group_by(CostEntry.vendor_id)
+        .subquery()
+    )
+    materials = (
+        select(Material.vendor_id, func.count(Material.id).label("count"))
+        .where(Material.vendor_id.isnot(None))
+        .group_by(Material.vendor_id)
+        .subquery()
+    )
+    equipment = (
+        select(Equipment.vendor_id, func.count(Equipment.id).label("count"))
+        .where(Equipment.vendor_id.isnot(None))
+        .group_by(Equipment.vendor_id)
+        .subquery()
+    )
+    performance = (
+        select(
+            VendorPerformance.vendor_id,
+            func.count(VendorPerformance.id).label("count"),
+            func.avg(VendorPerformance.delivery_score).label("delivery"),
+            func.avg(VendorPerformance.quality_score).label("quality"),
+            func.avg(VendorPerformance.price_score).label("price"),
+        )
+        .group_by(VendorPerformance.vendor_id)
+        .subquery()
+    )
+    return (
+        select(
+            Vendor.id.label("vendor_id"),
+            Vendor.company_name,
+            Vendor.is_verified,
+            Vendor.certifications,
+            func.coalesce(spending.c.total, 0).label("total_spending"),
+            func.coalesce(materials.c.count, 0).label("materials_count"),
+            func.coalesce(equipment.c.count, 0).label("equipment_count"),
+            func.coalesce(performance.c.count, 0).label("projects_count"),
+            func.coalesce(performance.c.delivery, 0.0).label("avg_delivery_score"),
+            func.coalesce(performance.c.quality, 0.0).label("avg_quality_score"),
+            func.coalesce(performance.c.price, 0.0).label("avg_price_score"),
+            func.coalesce(Vendor.rating, 0.0).label("overall_rating"),
+        )
+        .outerjoin(spending, spending.c.vendor_id == Vendor.id)
+        .outerjoin(materials, materials.c.vendor_id == Vendor.id)
+        .outerjoin(equipment, equipment.c.vendor_id == Vendor.id)
+        .outerjoin(performance, performance.c.vendor_id == Vendor.id)
     )
-    equipment_count = equipment_result.scalar() or 0
-
-    performances = vendor.performances
-    avg_delivery = 0.0
-    avg_quality = 0.0
-    avg_price = 0.0
-
-    if performances:
-        delivery_scores = [p.delivery_score for p in performances if p.delivery_score is not None]
-        quality_scores = [p.quality_score for p in performances if p.quality_score is not None]
-        price_scores = [p.price_score for p in performances if p.price_score is not None]
-        if delivery_scores:
-            avg_delivery = sum(delivery_scores) / len(delivery_scores)
-        if quality_scores:
-            avg_quality = sum(quality_scores) / len(quality_scores)
-        if price_scores:
-            avg_price = sum(price_scores) / len(price_scores)
 
+
+def _analytics_row(row: Row) -> dict:
     return {
-        "vendor_id": vendor_id,
-        "company_name": vendor.company_name,
-        "total_spending": float(total_spending),
-        "materials_count": materials_count,
-        "equipment_count": equipment_count,
-        "projects_count": len(performances),
-        "avg_delivery_score": round(avg_delivery, 2),
-        "avg_quality_score": round(avg_quality, 2),
-        "avg_price_score": round(avg_price, 2),
-        "overall_rating": vendor.rating or 0.0,
-        "is_verified": vendor.is_verified,
-        "certifications_count": len(vendor.certifications),
+        "vendor_id": row.vendor_id,
+        "company_name": row.company_name,
+        "total_spending": float(row.total_spending),
+        "materials_count": row.materials_count,
+        "equipment_count": row.equipment_count,
+        "projects_count": row.projects_count,
+        "avg_delivery_score": round(float(row.avg_delivery_score), 2),
+        "avg_quality_score": round(float(row.avg_quality_score), 2),
+        "avg_price_score": round(float(row.avg_price_score), 2),
+        "overall_rating": row.overall_rating,
+        "is_verified": row.is_verified,
+        "certifications_count": len(row.certifications or []),
     }
 
 
-async def get_all_vendors_analytics(db: AsyncSession) -> list[dict]:
-    vendors = await list_vendors(db, include_performances=True)
-    analytics = []
-    for vendor in vendors:
-        vendor_analytics = await get_vendor_analytics(db, vendor.id)
-        analytics.append(vendor_analytics)
-    analytics.sort(key=lambda x: x["total_spending"], reverse=True)
-    return analytics
+async def get_vendor_analytics(db: AsyncSession, vendor_id: UUID) -> dict:
+    result = await db.execute(_vendor_analytics_query().where(Vendor.id == vendor_id))
+    row = result.first()
+    return _analytics_row(row) if row else {}
+
+
+async def query_vendors_analytics(
+    db: AsyncSession,
+    sort_by: str = "total_spending",
+    descending: bool = True,
+    limit: int = 50,
+    offset: int = 0,
+) -> tuple[int, list[dict]]:
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field: {sort_by}")
+    sort_column = literal_column(sort_by)
+    query = (
+        _vendor_analytics_query()
+        .order_by(sort_column.desc() if descending else sort_column.asc(), Vendor.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    total = (await db.execute(select(func.count(Vendor.id)))).scalar() or 0
+    result = await db.execute(query)
+    return total, [_analytics_row(row) for row in result.all()]
+
+
+class VendorLeaderboardCache(CommitInvalidatedCache):
+    """Leaderboard pages kept per process; dropped whenever vendors, performances or costs change."""
+
+    async def get(
+        self, db: AsyncSession, sort_by: str, descending: bool, limit: int, offset: int,
+    ) -> tuple[int, list[dict]]:
+        return await self.get_or_load(
+            db, (sort_by, descending, limit, offset),
+            lambda: query_vendors_analytics(db, sort_by, descending, limit, offset),
+        )
+
+    def watches(self, model: type) -> bool:
+        return issubclass(model, LEADERBOARD_SOURCE_MODELS)
+
+    def collect(self, session: Session) -> list[dict]:
+        if (
+            any(_affects_leaderboard(instance) for instance in [*session.new, *session.dirty])
+            or any(_affects_leaderboard(instance, deleted=True) for instance in session.deleted)
+        ):
+            return [{"kind": "all"}]
+        return []
+
+
+vendor_leaderboard = VendorLeaderboardCache(
+    "vendor_leaderboard",
+    get_settings().vendor_leaderboard_cache_ttl_seconds,
+    get_settings().vendor_leaderboard_cache_max_pages,
+)
+
+
+async def get_all_vendors_analytics(
+    db: AsyncSession,
+    sort_by: str = "total_spending",
+    descending: bool = True,
+    limit: int = 50,
+    offset: int = 0,
+) -> tuple[int, list[dict]]:
+    return await vendor_leaderboard.get(db, sort_by, descending, limit, offset)
+
+
+def _affects_leaderboard(instance: Any, deleted: bool = False) -> bool:
+    if isinstance(instance, (Vendor, VendorPerformance)):
+        return True
+    if isinstance(instance, (CostEntry, Material, Equipment)):
+        state = inspect(instance)
+        if deleted or state.attrs.vendor_id.history.has_changes():
+            return True
+        # Only spending moves with a cost entry's amount
+        return isinstance(instance, CostEntry) and state.attrs.amount.history.has_changes()
+    return False
 
 
 async def get_vendors_by_trade(db: AsyncSession) -> dict:
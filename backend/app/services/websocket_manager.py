@@ -1,47 +1,166 @@
+import asyncio
 import json
 import logging
-from typing import Any
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
 
 from fastapi import WebSocket
 
+from app.config import get_settings
+from app.services.pubsub_broker import PubSubBroker, get_broker
+
 logger = logging.getLogger(__name__)
 
+CHANNEL_PREFIX = "ws:project:"
+SEEN_MESSAGE_LIMIT = 4096
+# Close code for clients that cannot keep up with the message rate ("Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class SocketSender:
+    """Drains a bounded queue into one socket so a slow client only delays itself."""
+
+    def __init__(
+        self, websocket: WebSocket, max_queue_size: int, on_send_failed: Callable[[], Awaitable[None]],
+    ):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self.on_send_failed = on_send_failed
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, message: str) -> bool:
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _run(self) -> None:
+        while True:
+            message = await self.queue.get()
+            try:
+                await self.websocket.send_text(message)
+            except Exception as e:
+                logger.warning(f"WebSocket send failed, disconnecting: {e}")
+                break
+        await self.on_send_failed()
+
+    async def close(self, code: Optional[int] = None) -> None:
+        # Also called from the sender's own task when a send fails
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+            try:
+                await self.task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if code is not None:
+            try:
+                await self.websocket.close(code=code)
+            except Exception:
+                pass
+
 
 class ConnectionManager:
-    def __init__(self):
+    """Project WebSocket connections for this instance, fanned out through a pub/sub broker.
+
+    Broadcasts are published to the project channel; every instance holding sockets for
+    that project is subscribed and delivers the message to its local sockets.
+    """
+
+    def __init__(self, broker: Optional[PubSubBroker] = None):
         self.active_connections: dict[str, list[WebSocket]] = {}
+        self.instance_id = uuid.uuid4().hex
+        self._broker = broker
+        self._senders: dict[WebSocket, SocketSender] = {}
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    @property
+    def broker(self) -> PubSubBroker:
+        if self._broker is None:
+            self._broker = get_broker()
+        return self._broker
 
     async def connect(self, websocket: WebSocket, project_id: str):
         await websocket.accept()
         if project_id not in self.active_connections:
             self.active_connections[project_id] = []
+            await self.broker.subscribe(CHANNEL_PREFIX + project_id, self._on_message)
         self.active_connections[project_id].append(websocket)
+        self._senders[websocket] = SocketSender(
+            websocket,
+            get_settings().websocket_send_queue_size,
+            lambda: self.disconnect(websocket, project_id),
+        )
         logger.info(f"WebSocket connected for project {project_id}. Total: {len(self.active_connections[project_id])}")
 
-    def disconnect(self, websocket: WebSocket, project_id: str):
+    async def disconnect(self, websocket: WebSocket, project_id: str, close_code: Optional[int] = None):
+        sender = self._senders.pop(websocket, None)
+        if sender is not None:
+            await sender.close(close_code)
         if project_id in self.active_connections:
             self.active_connections[project_id] = [
                 ws for ws in self.active_connections[project_id] if ws != websocket
             ]
             if not self.active_connections[project_id]:
                 del self.active_connections[project_id]
+                await self.broker.unsubscribe(CHANNEL_PREFIX + project_id, self._on_message)
             logger.info(f"WebSocket disconnected from project {project_id}")
 
     async def broadcast_to_project(self, project_id: str, message_data: dict[str, Any]):
-        if project_id not in self.active_connections:
+        message_id = uuid.uuid4().hex
+        envelope = json.dumps({"id": message_id, "origin": self.instance_id, "data": message_data})
+        try:
+            await self.broker.publish(CHANNEL_PREFIX + project_id, envelope)
+        except Exception as e:
+            # Still reach this instance's clients; the id guards against a late duplicate
+            logger.warning(f"Broker publish failed for project {project_id}, delivering locally: {e}")
+            await self._deliver_local(project_id, message_id, message_data)
+
+    async def _on_message(self, channel: str, raw: str) -> None:
+        try:
+            envelope = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning(f"Dropping malformed broker message on {channel}")
+            return
+        await self._deliver_local(channel[len(CHANNEL_PREFIX):], envelope.get("id"), envelope.get("data"))
+
+    def _mark_seen(self, message_id: Optional[str]) -> bool:
+        if not message_id:
+            return True
+        if message_id in self._seen:
+            return False
+        self._seen[message_id] = None
+        if len(self._seen) > SEEN_MESSAGE_LIMIT:
+            self._seen.popitem(last=False)
+        return True
+
+    async def _deliver_local(self, project_id: str, message_id: Optional[str], message_data: Any) -> None:
+        if not self._mark_seen(message_id):
+            return
+        sockets = self.active_connections.get(project_id)
+        if not sockets:
             return
-        disconnected = []
         message_json = json.dumps(message_data)
-        for ws in self.active_connections[project_id]:
-            try:
-                await ws.send_text(message_json)
-            except Exception:
-                disconnected.append(ws)
-        for ws in disconnected:
-            self.disconnect(ws, project_id)
+        overflowed = [
+            ws for ws in list(sockets)
+            if ws in self._senders and not self._senders[ws].offer(message_json)
+        ]
+        if overflowed:
+            logger.warning(f"Closing {len(overflowed)} slow WebSocket client(s) for project {project_id}")
+            await asyncio.gather(
+                *(self.disconnect(ws, project_id, SLOW_CONSUMER_CLOSE_CODE) for ws in overflowed),
+                return_exceptions=True,
+            )
 
     def get_connection_count(self, project_id: str) -> int:
         return len(self.active_connections.get(project_id, []))
 
+    async def shutdown(self) -> None:
+        for project_id, sockets in list(self.active_connections.items()):
+            for ws in list(sockets):
+                await self.disconnect(ws, project_id)
+
 
 manager = ConnectionManager()
@@ -0,0 +1,261 @@
+"""
+HTTP conditional and partial-content helpers for serving stored files.
+
+This module provides functions to:
+- Build strong (checksum) or weak (metadata) ETags and Last-Modified values
+- Evaluate If-None-Match / If-Modified-Since / If-Range preconditions
+- Parse Range headers into inclusive byte ranges
+- Build 200, 206 (single or multipart/byteranges), 304 and 416 streaming responses
+"""
+
+import hashlib
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.services.storage_service import StorageBackend
+
+# Content under a checksum ETag never changes, so clients may keep it without revalidating
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+# Requests with more ranges than this are served as a plain 200 (RFC 9110 allows ignoring Range)
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def strong_etag(checksum: str) -> str:
+    return f'"{checksum}"'
+
+
+def weak_etag(*parts: object) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a (naive UTC or aware) datetime as an IMF-fixdate header value."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    """Match an If-None-Match / If-Range list. Weak comparison ignores the W/ prefix."""
+    if header.strip() == "*":
+        return True
+    if not weak and etag.startswith("W/"):
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if not candidate:
+            continue
+        if not weak:
+            if candidate == etag:
+                return True
+        elif _opaque_tag(candidate) == _opaque_tag(etag):
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        since = _parse_http_date(if_modified_since)
+        if since is None:
+            return False
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        return modified.replace(microsecond=0) <= since
+    return False
+
+
+def _range_applies(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return etag_matches(if_range, etag, weak=False)
+    since = _parse_http_date(if_range)
+    if since is None or last_modified is None:
+        return False
+    modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+    return modified.replace(microsecond=0) == since
+
+
+def parse_range_header(header: str, size: int) -> Optional[list[tuple[int, int]]]:
+    """Parse a ``bytes=`` Range header into sorted, merged inclusive ranges.
+
+    Returns None when the header should be ignored (wrong unit, malformed, too many ranges)
+    and raises RangeNotSatisfiable when no requested range overlaps the object.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition("-")
+        if not sep:
+            return None
+        first, last = first.strip(), last.strip()
+        try:
+            if not first:
+                suffix = int(last)
+                if suffix <= 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else None
+                if end is not None and end < start:
+                    return None
+                end = size - 1 if end is None else min(end, size - 1)
+        except ValueError:
+            return None
+        if start >= size or start < 0:
+            continue
+        ranges.append((start, end))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        prev_start, prev_end = merged[-1]
+        if start <= prev_end + 1:
+            merged[-1] = (prev_start, max(prev_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+async def _multipart_body(
+    storage: StorageBackend,
+    storage_path: str,
+    ranges: list[tuple[int, int]],
+    part_headers: list[bytes],
+    closing: bytes,
+) -> AsyncIterator[bytes]:
+    for (start, end), header in zip(ranges, part_headers):
+        yield header
+        async for chunk in storage.open_read(storage_path, start=start, end=end):
+            yield chunk
+        yield b"\r\n"
+    yield closing
+
+
+def build_file_response(
+    request: Request,
+    storage: StorageBackend,
+    storage_path: str,
+    size: int,
+    media_type: str,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = REVALIDATE_CACHE_CONTROL,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    """Stream a stored object honouring Range and If-Range. Call is_not_modified first."""
+    base_headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+        **(headers or {}),
+    }
+    if last_modified is not None:
+        base_headers["Last-Modified"] = http_date(last_modified)
+
+    range_header = request.headers.get("range")
+    ranges = None
+    if range_header and _range_applies(request, etag, last_modified):
+        try:
+            ranges = parse_range_header(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**base_headers, "Content-Range": f"bytes */{size}"},
+            )
+
+    if not ranges:
+        return StreamingResponse(
+            storage.open_read(storage_path),
+            media_type=media_type,
+            headers={**base_headers, "Content-Length": str(size)},
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        return StreamingResponse(
+            storage.open_read(storage_path, start=start, end=end),
+            status_code=206,
+            media_type=media_type,
+            headers={
+                **base_headers,
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+            },
+        )
+
+    boundary = uuid.uuid4().hex
+    part_headers = [
+        (
+            f"--{boundary}\r\nContent-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        for start, end in ranges
+    ]
+    closing = f"--{boundary}--\r\n".encode()
+    content_length = (
+        sum(len(h) for h in part_headers)
+        + sum(end - start + 1 + 2 for start, end in ranges)
+        + len(closing)
+    )
+    return StreamingResponse(
+        _multipart_body(storage, storage_path, ranges, part_headers, closing),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers={**base_headers, "Content-Length": str(content_length)},
+    )
+
+
+def not_modified_response(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = REVALIDATE_CACHE_CONTROL,
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,199 @@
+"""
+Streaming ZIP writer.
+
+Entries are produced as a stream of bytes and never buffered whole: each local header is
+written with the "sizes follow in a data descriptor" flag, and the CRC and sizes are emitted
+after the data. The writer's state is just the current byte offset and the records of the
+entries written so far, so an archive can be continued in a later process from a checkpoint
+and closed with ``finish()`` once all entries are in. ZIP64 records are used where sizes,
+offsets or the entry count exceed the classic limits.
+"""
+
+import struct
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import Optional
+
+from app.utils import utcnow
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+
+# Bit 3: CRC and sizes are in a data descriptor after the data; bit 11: UTF-8 names
+FLAGS = 0x0008 | 0x0800
+VERSION_DEFAULT = 20
+VERSION_ZIP64 = 45
+
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+END_OF_CENTRAL_DIR = struct.Struct("<4s4H2LH")
+ZIP64_END_OF_CENTRAL_DIR = struct.Struct("<4sQ2H2L4Q")
+ZIP64_LOCATOR = struct.Struct("<4sLQL")
+
+# Deflating these only burns CPU: they are compressed formats already
+PRECOMPRESSED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".heif", ".avif",
+    ".mp4", ".mov", ".m4v", ".avi", ".mkv", ".webm", ".mp3", ".m4a", ".aac", ".ogg",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar",
+    ".docx", ".xlsx", ".pptx", ".pdf", ".dwfx",
+}
+PRECOMPRESSED_TYPE_PREFIXES = ("video/", "audio/")
+PRECOMPRESSED_TYPES = {
+    "image/jpeg", "image/png", "image/gif", "image/webp", "image/heic", "image/heif", "image/avif",
+    "application/zip", "application/gzip", "application/x-7z-compressed", "application/pdf",
+}
+
+
+def is_precompressed(filename: str, content_type: Optional[str] = None) -> bool:
+    if content_type:
+        content_type = content_type.split(";")[0].strip().lower()
+        if content_type in PRECOMPRESSED_TYPES or content_type.startswith(PRECOMPRESSED_TYPE_PREFIXES):
+            return True
+    return PurePosixPath(filename).suffix.lower() in PRECOMPRESSED_EXTENSIONS
+
+
+def _dos_datetime(value: datetime) -> tuple[int, int]:
+    value = max(value, datetime(1980, 1, 1))
+    dos_time = (value.hour << 11) | (value.minute << 5) | (value.second // 2)
+    dos_date = ((value.year - 1980) << 9) | (value.month << 5) | value.day
+    return dos_time, dos_date
+
+
+@dataclass
+class ZipEntryRecord:
+    """What the central directory needs to know about one written entry."""
+
+    name: str
+    offset: int
+    crc: int
+    compressed_size: int
+    size: int
+    method: int
+    dos_time: int
+    dos_date: int
+    zip64: bool
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class StreamingZipWriter:
+    def __init__(self, offset: int = 0, entries: Optional[list[ZipEntryRecord]] = None):
+        self.offset = offset
+        self.entries = list(entries or [])
+
+    async def write_entry(
+        self,
+        name: str,
+        chunks: AsyncIterable[bytes],
+        compress: bool = True,
+        size_hint: Optional[int] = None,
+        modified: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the bytes of one entry; its record is added once the data is exhausted.
+
+        Entries of unknown size (or near 4 GB) get ZIP64 headers up front, since the
+        header is already written by the time the real size is known.
+        """
+        method = ZIP_DEFLATED if compress else ZIP_STORED
+        zip64 = size_hint is None or size_hint >= ZIP64_LIMIT or self.offset >= ZIP64_LIMIT
+        dos_time, dos_date = _dos_datetime(modified or utcnow())
+        encoded_name = name.encode("utf-8")
+        extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0) if zip64 else b""
+        placeholder = ZIP64_LIMIT if zip64 else 0
+
+        header_offset = self.offset
+        header = LOCAL_HEADER.pack(
+            b"PK\x03\x04", VERSION_ZIP64 if zip64 else VERSION_DEFAULT, FLAGS, method,
+            dos_time, dos_date, 0, placeholder, placeholder, len(encoded_name), len(extra),
+        ) + encoded_name + extra
+        self.offset += len(header)
+        yield header
+
+        crc = 0
+        size = 0
+        compressed_size = 0
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15) if compress else None
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            data = compressor.compress(chunk) if compressor else chunk
+            if data:
+                compressed_size += len(data)
+                self.offset += len(data)
+                yield data
+        if compressor:
+            data = compressor.flush()
+            compressed_size += len(data)
+            self.offset += len(data)
+            yield data
+
+        if not zip64 and max(size, compressed_size) >= ZIP64_LIMIT:
+            raise ValueError(f"{name} grew past 4 GB without ZIP64 headers; its size hint was wrong")
+        if zip64:
+            descriptor = struct.pack("<4sLQQ", b"PK\x07\x08", crc, compressed_size, size)
+        else:
+            descriptor = struct.pack("<4sLLL", b"PK\x07\x08", crc, compressed_size, size)
+        self.offset += len(descriptor)
+        yield descriptor
+
+        self.entries.append(ZipEntryRecord(
+            name=name, offset=header_offset, crc=crc, compressed_size=compressed_size, size=size,
+            method=method, dos_time=dos_time, dos_date=dos_date, zip64=zip64,
+        ))
+
+    async def write_bytes(
+        self, name: str, content: bytes, compress: bool = True, modified: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        async def single() -> AsyncIterator[bytes]:
+            yield content
+
+        async for data in self.write_entry(name, single(), compress, len(content), modified):
+            yield data
+
+    def finish(self) -> bytes:
+        """Return the central directory and end records that close the archive."""
+        directory_offset = self.offset
+        parts = []
+        for entry in self.entries:
+            encoded_name = entry.name.encode("utf-8")
+            # Values that overflow 32 bits move to the ZIP64 extra field, in this order
+            overflow = [
+                value for value in (entry.size, entry.compressed_size, entry.offset)
+                if value >= ZIP64_LIMIT
+            ]
+            extra = struct.pack(f"<HH{len(overflow)}Q", 0x0001, 8 * len(overflow), *overflow) if overflow else b""
+            version = VERSION_ZIP64 if entry.zip64 or overflow else VERSION_DEFAULT
+            parts.append(CENTRAL_HEADER.pack(
+                b"PK\x01\x02", version, version, FLAGS, entry.method, entry.dos_time, entry.dos_date,
+                entry.crc, min(entry.compressed_size, ZIP64_LIMIT), min(entry.size, ZIP64_LIMIT),
+                len(encoded_name), len(extra), 0, 0, 0, 0, min(entry.offset, ZIP64_LIMIT),
+            ))
+            parts.append(encoded_name)
+            parts.append(extra)
+        directory = b"".join(parts)
+        directory_size = len(directory)
+
+        count = len(self.entries)
+        tail = b""
+        if count >= ZIP64_COUNT_LIMIT or directory_offset >= ZIP64_LIMIT or directory_size >= ZIP64_LIMIT:
+            zip64_end_offset = directory_offset + directory_size
+            tail += ZIP64_END_OF_CENTRAL_DIR.pack(
+                b"PK\x06\x06", ZIP64_END_OF_CENTRAL_DIR.size - 12, VERSION_ZIP64, VERSION_ZIP64,
+                0, 0, count, count, directory_size, directory_offset,
+            )
+            tail += ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, zip64_end_offset, 1)
+        tail += END_OF_CENTRAL_DIR.pack(
+            b"PK\x05\x06", 0, 0, min(count, ZIP64_COUNT_LIMIT), min(count, ZIP64_COUNT_LIMIT),
+            min(directory_size, ZIP64_LIMIT), min(directory_offset, ZIP64_LIMIT), 0,
+        )
+        closing = directory + tail
+        self.offset += len(closing)
+        return closing
@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 
 from app.config import get_settings
 
@@ -26,3 +27,18 @@ celery_app.conf.update(
     task_acks_late=True,
     task_reject_on_worker_lost=True,
 )
+
+celery_app.conf.beat_schedule = {
+    "rebuild-analytics-rollups": {
+        "task": "rebuild_analytics_rollups",
+        "schedule": settings.analytics_rollup_rebuild_interval_seconds,
+    },
+    "poll-acc-rfis": {
+        "task": "poll_acc_rfis",
+        "schedule": settings.acc_poll_interval_seconds,
+    },
+    "record-kpi-snapshots": {
+        "task": "record_kpi_snapshots",
+        "schedule": crontab(hour=settings.kpi_snapshot_hour_utc, minute=0),
+    },
+}
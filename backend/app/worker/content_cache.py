@@ -0,0 +1,96 @@
+"""
+Worker-local cache of downloaded file content.
+
+A file goes through several processing stages (thumbnail, PDF split, title block
+extraction). The cache makes sure it is downloaded from storage once per worker host
+and then read from local disk by every stage, including retries. Entries are evicted
+least-recently-used once the cache exceeds its size budget.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+from app.services.storage_service import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+
+class ContentCache:
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _path(self, storage_path: str) -> Path:
+        return self.root / hashlib.sha256(storage_path.encode()).hexdigest()
+
+    async def get(self, storage: StorageBackend, storage_path: str) -> bytes:
+        """Return the object's content, downloading it only on a cache miss."""
+        path = self._path(storage_path)
+        # Stages of one file running concurrently in this process wait for a single download
+        lock = self._locks.setdefault(path.name, asyncio.Lock())
+        async with lock:
+            try:
+                content = path.read_bytes()
+                os.utime(path)
+                return content
+            except FileNotFoundError:
+                pass
+
+            content = await storage.get_file_content(storage_path)
+            self._store(path, content)
+        self._locks.pop(path.name, None)
+        return content
+
+    def _store(self, path: Path, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            # Atomic, so other worker processes on the host never read a partial entry
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Failed to cache content at %s: %s", path, e)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self.root.iterdir():
+            if entry.suffix == ".tmp":
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def discard(self, storage_path: str) -> None:
+        self._path(storage_path).unlink(missing_ok=True)
+
+
+_cache: Optional[ContentCache] = None
+
+
+def get_content_cache() -> ContentCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        root = Path(settings.worker_content_cache_dir or Path(tempfile.gettempdir()) / "builder-content-cache")
+        _cache = ContentCache(root, settings.worker_content_cache_max_bytes)
+    return _cache
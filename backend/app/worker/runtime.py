@@ -0,0 +1,71 @@
+"""
+Per-process asyncio runtime for Celery tasks.
+
+``asyncio.run`` creates and tears down an event loop on every call, which throws away
+the pooled database connections (they are bound to the loop that opened them) and any
+Redis clients. Tasks instead run on one long-lived loop per worker process, so the
+shared engine, its pool and the pub/sub broker are reused across tasks.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Coroutine
+from typing import Any, Optional, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.db.session import engine, read_engine
+from app.services.integration_http import close_http_clients
+from app.services.pubsub_broker import close_broker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_pid
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on this process's persistent event loop."""
+    return get_worker_loop().run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _reset_after_fork(**kwargs) -> None:
+    # Connections inherited from the parent belong to its loop; drop them without closing
+    # so the parent's sockets stay intact, and let this process open its own
+    for pooled in {engine, read_engine}:
+        pooled.sync_engine.dispose(close=False)
+    get_worker_loop()
+
+
+@worker_process_shutdown.connect
+def _close_runtime(**kwargs) -> None:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+
+    async def close() -> None:
+        await close_broker()
+        await close_http_clients()
+        for pooled in {engine, read_engine}:
+            await pooled.dispose()
+
+    try:
+        _loop.run_until_complete(close())
+    except Exception as e:
+        logger.warning("Failed to close worker resources cleanly: %s", e)
+    finally:
+        _loop.close()
+        _loop = None
@@ -4,6 +4,14 @@ Worker tasks module.
 This module contains Celery tasks for background processing.
 Task implementations will be added in phase 3.
 """
-from app.worker.tasks import document_processing
+from app.worker.tasks import (
+    acc_sync,
+    analytics_rollups,
+    batch_upload,
+    document_processing,
+    kpi_snapshots,
+    notification_delivery,
+    pdf_reports,
+)
 
-__all__ = ["document_processing"]
+__all__ = ["acc_sync", "analytics_rollups", "batch_upload", "document_processing", "kpi_snapshots", "notification_delivery", "pdf_reports"]
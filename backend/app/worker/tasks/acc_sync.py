@@ -0,0 +1,23 @@
+"""Celery task that polls linked ACC projects for changed RFIs, as a fallback to webhooks."""
+
+from app.config import get_settings
+from app.db.session import AsyncSessionLocal
+from app.services.acc_polling_service import ACCPollingService
+from app.services.aps_service import APSService
+from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
+
+
+@celery_app.task(name="poll_acc_rfis")
+def poll_acc_rfis_task() -> dict:
+    """Pull the ACC issues updated since each linked project's last sync.
+
+    Returns:
+        Dict with the number of projects synced and RFIs created, updated or in conflict
+    """
+    return run_async(_poll_acc_rfis())
+
+
+async def _poll_acc_rfis() -> dict:
+    async with AsyncSessionLocal() as session:
+        return await ACCPollingService(session, APSService(get_settings())).poll_acc_rfis_for_all_projects()
@@ -0,0 +1,18 @@
+"""Celery task that reconciles the analytics rollups."""
+
+from app.services.analytics_rollup_service import refresh_all_rollups
+from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
+
+
+@celery_app.task(name="rebuild_analytics_rollups")
+def rebuild_analytics_rollups_task() -> dict:
+    """Recount every rollup from the source tables.
+
+    Write hooks keep the rollups current; this picks up rows that disappeared through
+    database-side cascades, which the hooks never see.
+
+    Returns:
+        Dict with the number of entity types rebuilt and rollup rows
+    """
+    return run_async(refresh_all_rollups())
@@ -0,0 +1,24 @@
+"""Celery task that finalizes resumable batch uploads."""
+
+import uuid
+
+from app.services.batch_upload_service import finalize_batch_upload
+from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
+
+
+@celery_app.task(name="finalize_batch_upload", bind=True, max_retries=3, default_retry_delay=30)
+def finalize_batch_upload_task(self, batch_id: str) -> dict:
+    """Assemble uploaded chunks into stored files for a batch.
+
+    Args:
+        batch_id: UUID of the BatchUpload record
+
+    Returns:
+        Dict with processing summary
+    """
+    try:
+        return run_async(finalize_batch_upload(uuid.UUID(batch_id)))
+    except Exception as exc:
+        # Finalization is idempotent, so a redelivery or retry picks up where it stopped
+        raise self.retry(exc=exc)
@@ -1,8 +1,18 @@
-"""Document processing Celery tasks for batch uploads."""
+"""Document processing Celery tasks for batch uploads.
 
+A batch is processed as a chord: one task per file (a group) runs every pending stage
+for that file, and a callback closes the batch once the group has finished. Each file is
+downloaded once into the worker's content cache and shared by its stages. Completion is
+tracked with atomic counters on the batch row, and progress is pushed to the project's
+WebSocket channel as each stage finishes.
+"""
+
+import logging
 import uuid
+from typing import Optional
 
-from sqlalchemy import select
+from celery import chord, group
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
@@ -10,12 +20,27 @@ from app.db.session import AsyncSessionLocal
 from app.models.batch_upload import BatchUpload
 from app.models.file import File
 from app.models.processing_task import ProcessingTask
+from app.services.batch_upload_service import broadcast_batch_progress
+from app.services.image_derivative_service import derivative_path, generate_derivatives
 from app.services.pdf_service import get_pdf_page_count, split_pdf_pages
-from app.services.storage_service import _create_storage_backend, generate_storage_path
+from app.services.storage_service import (
+    StorageBackend,
+    _create_storage_backend,
+    compute_checksum,
+    generate_storage_path,
+)
 from app.services.thumbnail_service import generate_thumbnail
 from app.services.title_block_service import extract_title_block
 from app.utils import utcnow
 from app.worker.celery_app import celery_app
+from app.worker.content_cache import get_content_cache
+from app.worker.runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+# Cheap stages first so thumbnails show up before slower extraction finishes
+STAGE_ORDER = {"thumbnail": 0, "pdf_split": 1, "title_block_extraction": 2}
+FINISHED_STATUSES = ("completed", "failed")
 
 
 @celery_app.task(name="process_batch_upload")
@@ -28,203 +53,235 @@ def process_batch_upload(batch_id: str) -> dict:
     Returns:
         Dict with processing summary
     """
-    import asyncio
-
-    return asyncio.run(_process_batch_upload_async(batch_id))
+    summary, file_tasks = run_async(_start_batch_processing(batch_id))
+    if file_tasks:
+        header = group(process_file_tasks.s(file_id, task_ids) for file_id, task_ids in file_tasks.items())
+        chord(header)(finish_batch_processing.si(batch_id))
+    return summary
 
 
-async def _process_batch_upload_async(batch_id: str) -> dict:
-    """Async implementation of batch upload processing."""
+async def _start_batch_processing(batch_id: str) -> tuple[dict, dict[str, list[str]]]:
+    """Reset the batch counters from the task rows and group pending tasks by file."""
     async with AsyncSessionLocal() as session:
-        # Fetch batch upload
-        result = await session.execute(
-            select(BatchUpload).where(BatchUpload.id == uuid.UUID(batch_id))
-        )
-        batch = result.scalar_one_or_none()
-
+        batch = await session.get(BatchUpload, uuid.UUID(batch_id))
         if not batch:
-            return {"error": f"BatchUpload {batch_id} not found"}
+            return {"error": f"BatchUpload {batch_id} not found"}, {}
 
-        # Update batch status
-        batch.status = "processing"
-        await session.commit()
-
-        # Get all processing tasks for this batch
-        tasks_result = await session.execute(
-            select(ProcessingTask).where(ProcessingTask.batch_upload_id == batch.id)
-        )
-        tasks = tasks_result.scalars().all()
-
-        processed_count = 0
-        failed_count = 0
+        tasks = (
+            await session.execute(select(ProcessingTask).where(ProcessingTask.batch_upload_id == batch.id))
+        ).scalars().all()
 
-        # Process each task
+        file_tasks: dict[str, list[str]] = {}
         for task in tasks:
-            try:
-                # Call process_single_file for each task
-                process_single_file.delay(str(task.id))
-                processed_count += 1
-            except Exception as e:
-                failed_count += 1
-                task.status = "failed"
-                task.error_message = str(e)
-                task.completed_at = utcnow()
-
+            if task.status not in FINISHED_STATUSES:
+                file_tasks.setdefault(str(task.file_id), []).append(str(task.id))
+
+        # Counters are recomputed so a re-run after a crash starts from the true state
+        batch.total_tasks = len(tasks)
+        batch.completed_tasks = sum(1 for t in tasks if t.status == "completed")
+        batch.failed_tasks = sum(1 for t in tasks if t.status == "failed")
+        batch.status = "processing" if file_tasks else "completed"
+        if not file_tasks:
+            batch.completed_at = utcnow()
         await session.commit()
+        await broadcast_batch_progress(batch)
 
         return {
             "batch_id": batch_id,
             "total_tasks": len(tasks),
-            "processed": processed_count,
-            "failed": failed_count,
-        }
+            "files": len(file_tasks),
+        }, file_tasks
 
 
-@celery_app.task(name="process_single_file")
-def process_single_file(task_id: str) -> dict:
-    """Process a single file based on its task configuration.
+@celery_app.task(name="process_file_tasks", bind=True)
+def process_file_tasks(self, file_id: str, task_ids: list[str]) -> dict:
+    """Run every pending processing stage for one file off a single download.
 
     Args:
-        task_id: UUID of the ProcessingTask record
+        file_id: UUID of the File record
+        task_ids: UUIDs of the ProcessingTask records for that file
 
     Returns:
-        Dict with processing result
+        Dict with the status of each stage
     """
-    import asyncio
+    return run_async(_process_file_tasks_async(file_id, task_ids, self.request.id))
 
-    return asyncio.run(_process_single_file_async(task_id))
 
+async def _process_file_tasks_async(file_id: str, task_ids: list[str], celery_task_id: Optional[str]) -> dict:
+    storage = _create_storage_backend(get_settings())
+    results: dict[str, str] = {}
 
-async def _process_single_file_async(task_id: str) -> dict:
-    """Async implementation of single file processing."""
     async with AsyncSessionLocal() as session:
-        # Fetch processing task
-        result = await session.execute(
-            select(ProcessingTask).where(ProcessingTask.id == uuid.UUID(task_id))
-        )
-        task = result.scalar_one_or_none()
-
-        if not task:
-            return {"error": f"ProcessingTask {task_id} not found"}
-
-        # Update task status
-        task.status = "processing"
-        task.started_at = utcnow()
-        task.progress_percent = 0
-        await session.commit()
-
-        try:
-            # Fetch associated file
-            file_result = await session.execute(
-                select(File).where(File.id == task.file_id)
-            )
-            file = file_result.scalar_one_or_none()
-
-            if not file:
-                raise ValueError(f"File {task.file_id} not found")
-
-            # Process based on task type
-            if task.task_type == "thumbnail":
-                await _generate_thumbnail(session, file, task)
-            elif task.task_type == "pdf_split":
-                await _split_pdf(session, file, task)
-            elif task.task_type == "title_block_extraction":
-                await _extract_title_block(session, file, task)
-            else:
-                raise ValueError(f"Unknown task type: {task.task_type}")
-
-            # Update task as completed
-            task.status = "completed"
-            task.progress_percent = 100
-            task.completed_at = utcnow()
-
-            # Update batch upload counters
-            batch_result = await session.execute(
-                select(BatchUpload).where(BatchUpload.id == task.batch_upload_id)
+        file = await session.get(File, uuid.UUID(file_id))
+        tasks = (
+            await session.execute(
+                select(ProcessingTask).where(ProcessingTask.id.in_([uuid.UUID(t) for t in task_ids]))
             )
-            batch = batch_result.scalar_one()
-            batch.completed_files += 1
-
-            # Check if all tasks are done
-            pending_tasks = await session.execute(
-                select(ProcessingTask).where(
-                    ProcessingTask.batch_upload_id == batch.id,
-                    ProcessingTask.status.in_(["pending", "processing"]),
-                )
-            )
-            if not pending_tasks.scalars().first():
-                batch.status = "completed"
-
+        ).scalars().all()
+
+        for task in sorted(tasks, key=lambda t: STAGE_ORDER.get(t.task_type, len(STAGE_ORDER))):
+            # Reload so a redelivered message skips stages that already reached a final state
+            await session.refresh(task)
+            if task.status in FINISHED_STATUSES:
+                results[str(task.id)] = task.status
+                continue
+
+            task.status = "processing"
+            task.started_at = utcnow()
+            task.progress_percent = 0
+            task.celery_task_id = celery_task_id
             await session.commit()
 
-            return {"task_id": task_id, "status": "completed"}
-
-        except Exception as e:
-            task.status = "failed"
-            task.error_message = str(e)
+            try:
+                if not file:
+                    raise ValueError(f"File {file_id} not found")
+                content = await get_content_cache().get(storage, file.storage_path)
+                await _run_stage(session, storage, file, content, task)
+                task.status = "completed"
+                task.progress_percent = 100
+            except Exception as e:
+                logger.error("Processing task %s (%s) failed: %s", task.id, task.task_type, e)
+                # Drop anything the stage added before failing, then record the failure
+                await session.rollback()
+                await session.refresh(task)
+                if file:
+                    await session.refresh(file)
+                task.status = "failed"
+                task.error_message = str(e)
             task.completed_at = utcnow()
 
-            # Update batch upload failed counter
-            batch_result = await session.execute(
-                select(BatchUpload).where(BatchUpload.id == task.batch_upload_id)
-            )
-            batch = batch_result.scalar_one()
-            batch.failed_files += 1
-
+            batch = await _record_task_outcome(session, task.batch_upload_id, task.status == "completed")
             await session.commit()
+            if batch is not None:
+                await broadcast_batch_progress(batch, task={
+                    "id": str(task.id),
+                    "file_id": file_id,
+                    "task_type": task.task_type,
+                    "status": task.status,
+                    "error": task.error_message,
+                })
+            results[str(task.id)] = task.status
 
-            return {"task_id": task_id, "status": "failed", "error": str(e)}
-
+    return {"file_id": file_id, "tasks": results}
 
-async def _generate_thumbnail(session: AsyncSession, file: File, task: ProcessingTask) -> None:
-    """Generate thumbnail for a file."""
-    settings = get_settings()
-    storage = _create_storage_backend(settings)
 
-    # Get file content
-    file_content = await storage.get_file_content(file.storage_path)
-
-    # Generate thumbnail
-    task.progress_percent = 50
-    await session.commit()
-
-    thumbnail_bytes = generate_thumbnail(file_content, file.file_type or "application/pdf")
-
-    # Save thumbnail to storage
-    thumbnail_path = f"{file.storage_path}_thumb.png"
-    await storage.save_bytes(thumbnail_bytes, thumbnail_path, "image/png")
-
-    task.progress_percent = 100
+async def _record_task_outcome(session: AsyncSession, batch_id: uuid.UUID, succeeded: bool) -> Optional[BatchUpload]:
+    """Count one finished task with a single UPDATE ... RETURNING.
 
+    Concurrent file tasks never read-modify-write the batch row, and whichever task
+    brings the finished count up to the total is the one that marks the batch complete.
+    """
+    counter = BatchUpload.completed_tasks if succeeded else BatchUpload.failed_tasks
+    # SET expressions see the row as it was before this update
+    is_last = BatchUpload.completed_tasks + BatchUpload.failed_tasks + 1 >= BatchUpload.total_tasks
+    result = await session.execute(
+        update(BatchUpload)
+        .where(BatchUpload.id == batch_id)
+        .values({
+            counter: counter + 1,
+            BatchUpload.status: case((is_last, "completed"), else_=BatchUpload.status),
+            BatchUpload.completed_at: case((is_last, utcnow()), else_=BatchUpload.completed_at),
+        })
+        .returning(BatchUpload)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+@celery_app.task(name="finish_batch_processing")
+def finish_batch_processing(batch_id: str) -> dict:
+    """Chord callback: close out a batch once all of its file tasks have run.
 
-async def _split_pdf(session: AsyncSession, file: File, task: ProcessingTask) -> None:
-    """Split multi-page PDF into individual pages."""
-    settings = get_settings()
-    storage = _create_storage_backend(settings)
+    Args:
+        batch_id: UUID of the BatchUpload record
 
-    # Get file content
-    file_content = await storage.get_file_content(file.storage_path)
+    Returns:
+        Dict with the final counters
+    """
+    return run_async(_finish_batch_processing_async(batch_id))
 
-    # Check page count
-    page_count = get_pdf_page_count(file_content)
 
-    if page_count <= 1:
-        # No need to split single-page PDFs
-        task.progress_percent = 100
-        return
+async def _finish_batch_processing_async(batch_id: str) -> dict:
+    async with AsyncSessionLocal() as session:
+        batch = await session.get(BatchUpload, uuid.UUID(batch_id))
+        if not batch:
+            return {"error": f"BatchUpload {batch_id} not found"}
 
-    task.progress_percent = 20
-    await session.commit()
+        # Tasks a crashed worker left behind would otherwise keep the batch open forever
+        stranded = await session.scalar(
+            select(func.count()).select_from(ProcessingTask).where(
+                ProcessingTask.batch_upload_id == batch.id,
+                ProcessingTask.status.notin_(FINISHED_STATUSES),
+            )
+        )
+        if stranded:
+            await session.execute(
+                update(ProcessingTask)
+                .where(
+                    ProcessingTask.batch_upload_id == batch.id,
+                    ProcessingTask.status.notin_(FINISHED_STATUSES),
+                )
+                .values(status="failed", error_message="Processing did not finish", completed_at=utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            batch.failed_tasks += stranded
+        closed_here = batch.status != "completed"
+        if closed_here:
+            batch.status = "completed"
+            batch.completed_at = utcnow()
+        await session.commit()
+        if closed_here:
+            await broadcast_batch_progress(batch)
+
+        files = (
+            await session.execute(
+                select(File.storage_path).join(ProcessingTask, ProcessingTask.file_id == File.id)
+                .where(ProcessingTask.batch_upload_id == batch.id)
+                .distinct()
+            )
+        ).scalars().all()
+
+    cache = get_content_cache()
+    for storage_path in files:
+        cache.discard(storage_path)
+
+    return {
+        "batch_id": batch_id,
+        "total_tasks": batch.total_tasks,
+        "completed": batch.completed_tasks,
+        "failed": batch.failed_tasks,
+    }
+
+
+async def _run_stage(
+    session: AsyncSession, storage: StorageBackend, file: File, content: bytes, task: ProcessingTask,
+) -> None:
+    if task.task_type == "thumbnail":
+        await _save_thumbnail(storage, file, content)
+    elif task.task_type == "pdf_split":
+        await _save_pdf_pages(session, storage, file, content)
+    elif task.task_type == "title_block_extraction":
+        result = await extract_title_block(content, file.file_type or "application/pdf")
+        task.result_data = {**(task.result_data or {}), "title_block_extraction": result}
+    else:
+        raise ValueError(f"Unknown task type: {task.task_type}")
+
+
+async def _save_thumbnail(storage: StorageBackend, file: File, content: bytes) -> str:
+    """Generate and store a thumbnail for a file; returns its storage path."""
+    thumbnail_bytes = generate_thumbnail(content, file.file_type or "application/pdf")
+    thumbnail_path = f"{file.storage_path}_thumb.png"
+    await storage.save_bytes(thumbnail_bytes, thumbnail_path, "image/png")
+    return thumbnail_path
 
-    # Split PDF into pages
-    pages = split_pdf_pages(file_content)
 
-    task.progress_percent = 50
-    await session.commit()
+async def _save_pdf_pages(session: AsyncSession, storage: StorageBackend, file: File, content: bytes) -> list[File]:
+    """Split a multi-page PDF into one stored File per page; single pages are left alone."""
+    if get_pdf_page_count(content) <= 1:
+        return []
 
-    # Create File record for each page and save to storage
-    for i, page_bytes in enumerate(pages, start=1):
-        # Generate storage path for the page
+    page_files = []
+    for i, page_bytes in enumerate(split_pdf_pages(content), start=1):
         page_filename = f"{file.filename.rsplit('.', 1)[0]}_page_{i}.pdf"
         storage_path = generate_storage_path(
             user_id=file.uploaded_by_id or uuid.uuid4(),
@@ -233,12 +290,10 @@ async def _split_pdf(session: AsyncSession, file: File, task: ProcessingTask) ->
             entity_id=file.entity_id,
             filename=page_filename,
         )
-
-        # Save page to storage
         await storage.save_bytes(page_bytes, storage_path, "application/pdf")
 
-        # Create File record
         page_file = File(
+            id=uuid.uuid4(),
             project_id=file.project_id,
             entity_type=file.entity_type,
             entity_id=file.entity_id,
@@ -246,39 +301,12 @@ async def _split_pdf(session: AsyncSession, file: File, task: ProcessingTask) ->
             file_type="application/pdf",
             file_size=len(page_bytes),
             storage_path=storage_path,
+            checksum=compute_checksum(page_bytes),
             uploaded_by_id=file.uploaded_by_id,
         )
         session.add(page_file)
-
-    task.progress_percent = 90
-    await session.commit()
-
-
-async def _extract_title_block(session: AsyncSession, file: File, task: ProcessingTask) -> None:
-    """Extract title block metadata from a construction drawing using AI."""
-    settings = get_settings()
-    storage = _create_storage_backend(settings)
-
-    # Get file content
-    file_content = await storage.get_file_content(file.storage_path)
-
-    task.progress_percent = 30
-    await session.commit()
-
-    # Extract title block metadata using Gemini AI
-    result = extract_title_block(file_content, file.file_type or "application/pdf")
-
-    task.progress_percent = 80
-    await session.commit()
-
-    # Store the extracted metadata in task result_data
-    if task.result_data is None:
-        task.result_data = {}
-
-    task.result_data["title_block_extraction"] = result
-
-    task.progress_percent = 100
-    await session.commit()
+        page_files.append(page_file)
+    return page_files
 
 
 @celery_app.task(name="generate_thumbnail_task")
@@ -291,41 +319,56 @@ def generate_thumbnail_task(file_id: str) -> dict:
     Returns:
         Dict with thumbnail generation result
     """
-    import asyncio
-
-    return asyncio.run(_generate_thumbnail_task_async(file_id))
+    return run_async(_generate_thumbnail_task_async(file_id))
 
 
 async def _generate_thumbnail_task_async(file_id: str) -> dict:
     """Async implementation of thumbnail generation."""
     async with AsyncSessionLocal() as session:
-        # Fetch file
-        result = await session.execute(
-            select(File).where(File.id == uuid.UUID(file_id))
-        )
-        file = result.scalar_one_or_none()
-
+        file = await session.get(File, uuid.UUID(file_id))
         if not file:
             return {"error": f"File {file_id} not found"}
 
         try:
-            settings = get_settings()
-            storage = _create_storage_backend(settings)
+            storage = _create_storage_backend(get_settings())
+            content = await get_content_cache().get(storage, file.storage_path)
+            thumbnail_path = await _save_thumbnail(storage, file, content)
+            return {"file_id": file_id, "status": "completed", "thumbnail_path": thumbnail_path}
 
-            # Get file content
-            file_content = await storage.get_file_content(file.storage_path)
+        except Exception as e:
+            return {"file_id": file_id, "status": "failed", "error": str(e)}
 
-            # Generate thumbnail
-            thumbnail_bytes = generate_thumbnail(file_content, file.file_type or "application/pdf")
 
-            # Save thumbnail to storage
-            thumbnail_path = f"{file.storage_path}_thumb.png"
-            await storage.save_bytes(thumbnail_bytes, thumbnail_path, "image/png")
+@celery_app.task(name="generate_image_derivatives_task")
+def generate_image_derivatives_task(file_id: str) -> dict:
+    """Generate the report and thumbnail renditions of an uploaded image.
 
-            return {"file_id": file_id, "status": "completed", "thumbnail_path": thumbnail_path}
+    Args:
+        file_id: UUID of the File record
 
-        except Exception as e:
-            return {"file_id": file_id, "status": "failed", "error": str(e)}
+    Returns:
+        Dict with the stored rendition paths
+    """
+    return run_async(_generate_image_derivatives_task_async(file_id))
+
+
+async def _generate_image_derivatives_task_async(file_id: str) -> dict:
+    async with AsyncSessionLocal() as session:
+        file = await session.get(File, uuid.UUID(file_id))
+        if not file:
+            return {"error": f"File {file_id} not found"}
+
+    try:
+        storage = _create_storage_backend(get_settings())
+        content = await storage.get_file_content(file.storage_path)
+        derivatives = await generate_derivatives(storage, file.storage_path, content)
+        return {
+            "file_id": file_id,
+            "status": "completed",
+            "paths": [derivative_path(file.storage_path, rendition) for rendition in derivatives],
+        }
+    except Exception as e:
+        return {"file_id": file_id, "status": "failed", "error": str(e)}
 
 
 @celery_app.task(name="split_pdf_task")
@@ -338,76 +381,29 @@ def split_pdf_task(file_id: str) -> dict:
     Returns:
         Dict with split result
     """
-    import asyncio
-
-    return asyncio.run(_split_pdf_task_async(file_id))
+    return run_async(_split_pdf_task_async(file_id))
 
 
 async def _split_pdf_task_async(file_id: str) -> dict:
     """Async implementation of PDF splitting."""
     async with AsyncSessionLocal() as session:
-        # Fetch file
-        result = await session.execute(
-            select(File).where(File.id == uuid.UUID(file_id))
-        )
-        file = result.scalar_one_or_none()
-
+        file = await session.get(File, uuid.UUID(file_id))
         if not file:
             return {"error": f"File {file_id} not found"}
 
         try:
-            settings = get_settings()
-            storage = _create_storage_backend(settings)
-
-            # Get file content
-            file_content = await storage.get_file_content(file.storage_path)
-
-            # Check page count
-            page_count = get_pdf_page_count(file_content)
-
-            if page_count <= 1:
+            storage = _create_storage_backend(get_settings())
+            content = await get_content_cache().get(storage, file.storage_path)
+            page_files = await _save_pdf_pages(session, storage, file, content)
+            if not page_files:
                 return {"file_id": file_id, "status": "completed", "pages": 1, "message": "No split needed"}
-
-            # Split PDF into pages
-            pages = split_pdf_pages(file_content)
-
-            # Create File record for each page and save to storage
-            page_files = []
-            for i, page_bytes in enumerate(pages, start=1):
-                # Generate storage path for the page
-                page_filename = f"{file.filename.rsplit('.', 1)[0]}_page_{i}.pdf"
-                storage_path = generate_storage_path(
-                    user_id=file.uploaded_by_id or uuid.uuid4(),
-                    project_id=file.project_id,
-                    entity_type=file.entity_type,
-                    entity_id=file.entity_id,
-                    filename=page_filename,
-                )
-
-                # Save page to storage
-                await storage.save_bytes(page_bytes, storage_path, "application/pdf")
-
-                # Create File record
-                page_file = File(
-                    project_id=file.project_id,
-                    entity_type=file.entity_type,
-                    entity_id=file.entity_id,
-                    filename=page_filename,
-                    file_type="application/pdf",
-                    file_size=len(page_bytes),
-                    storage_path=storage_path,
-                    uploaded_by_id=file.uploaded_by_id,
-                )
-                session.add(page_file)
-                page_files.append(str(page_file.id))
-
             await session.commit()
 
             return {
                 "file_id": file_id,
                 "status": "completed",
-                "pages": len(pages),
-                "page_file_ids": page_files,
+                "pages": len(page_files),
+                "page_file_ids": [str(f.id) for f in page_files],
             }
 
         except Exception as e:
@@ -0,0 +1,15 @@
+"""Celery task that records the nightly KPI snapshots."""
+
+from app.services.analytics_service import record_all_kpi_snapshots
+from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
+
+
+@celery_app.task(name="record_kpi_snapshots")
+def record_kpi_snapshots_task() -> dict:
+    """Snapshot the active KPIs of every project.
+
+    Returns:
+        Dict with the number of projects, snapshots written and failed batches
+    """
+    return run_async(record_all_kpi_snapshots())
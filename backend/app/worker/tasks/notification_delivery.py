@@ -0,0 +1,95 @@
+"""Celery tasks that deliver notifications over email and WhatsApp.
+
+Requests only record the notification and queue these deliveries once their transaction
+commits. Each task is rate limited per worker to stay under the provider quotas and
+retried with exponential backoff when the provider fails.
+"""
+
+import logging
+
+from app.config import get_settings
+from app.services.email_renderer import render_notification_email
+from app.services.email_service import EmailService
+from app.services.whatsapp_service import WhatsAppService
+from app.worker.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def _backoff(retries: int) -> int:
+    return settings.notification_delivery_retry_backoff_seconds * 2 ** retries
+
+
+@celery_app.task(
+    name="deliver_notification_email",
+    bind=True,
+    rate_limit=settings.notification_email_rate_limit,
+    max_retries=settings.notification_delivery_max_retries,
+)
+def deliver_notification_email(
+    self,
+    to_email: str,
+    title: str,
+    message: str,
+    action_url: str = "",
+    project_name: str = "",
+    language: str = "en",
+) -> dict:
+    """Render and send one notification email.
+
+    Returns:
+        Dict with the delivery status
+    """
+    service = EmailService()
+    if not service.enabled:
+        return {"status": "skipped"}
+
+    subject, html = render_notification_email(title, message, action_url, project_name, language)
+    try:
+        service.send_notification(to_email=to_email, subject=subject, body_html=html)
+    except ValueError:
+        # Invalid address; retrying won't help
+        return {"status": "rejected"}
+    except Exception as exc:
+        logger.warning("Notification email to %s failed (attempt %d): %s", to_email, self.request.retries + 1, exc)
+        raise self.retry(exc=exc, countdown=_backoff(self.request.retries))
+    return {"status": "sent"}
+
+
+@celery_app.task(
+    name="deliver_notification_whatsapp",
+    bind=True,
+    rate_limit=settings.notification_whatsapp_rate_limit,
+    max_retries=settings.notification_delivery_max_retries,
+)
+def deliver_notification_whatsapp(
+    self,
+    to_whatsapp: str,
+    title: str,
+    message: str,
+    action_url: str = "",
+    language: str = "en",
+) -> dict:
+    """Format and send one WhatsApp notification.
+
+    Returns:
+        Dict with the delivery status
+    """
+    service = WhatsAppService()
+    if not service.enabled:
+        return {"status": "skipped"}
+
+    body = service.format_notification_message(
+        title=title,
+        message=message,
+        action_url=action_url or None,
+        language=language,
+    )
+    try:
+        service.send_message(to_whatsapp=to_whatsapp, body=body)
+    except Exception as exc:
+        logger.warning("WhatsApp notification to %s failed (attempt %d): %s", to_whatsapp, self.request.retries + 1, exc)
+        raise self.retry(exc=exc, countdown=_backoff(self.request.retries))
+    return {"status": "sent"}
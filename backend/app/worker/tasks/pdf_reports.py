@@ -0,0 +1,21 @@
+"""Celery task that renders queued report PDFs."""
+
+import uuid
+
+from app.services.pdf_render_service import run_pdf_job
+from app.worker.celery_app import celery_app
+from app.worker.runtime import run_async
+
+
+@celery_app.task(name="render_report_pdf")
+def render_report_pdf_task(job_id: str, report: str, entity_ids: list[str], language: str, filename: str) -> None:
+    """Render a report queued by ``submit_pdf_job``.
+
+    Args:
+        job_id: UUID of the ExportJob record
+        report: Report kind ("defects" or "inspections")
+        entity_ids: UUIDs of the rows the report covers
+        language: Report language
+        filename: Name of the stored PDF
+    """
+    run_async(run_pdf_job(uuid.UUID(job_id), report, [uuid.UUID(i) for i in entity_ids], language, filename))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Index advisor: find hot queries that fall back to sequential scans on large tables.
+
+Runs the test suite while recording every ORM SELECT/UPDATE/DELETE compiled for
+PostgreSQL, then replays the recorded statements with EXPLAIN against a database
+that holds realistic data (a staging copy or a restored production snapshot) and
+reports sequential scans on tables above a row-count threshold.
+
+Usage:
+    python backend/scripts/index_advisor.py capture --output queries.jsonl [-- pytest args]
+    python backend/scripts/index_advisor.py report --input queries.jsonl --dsn postgresql://...
+    python backend/scripts/index_advisor.py report --input queries.jsonl --min-rows 50000 --fail-on-findings
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+from sqlalchemy.orm import Session
+
+PG_DIALECT = pg_asyncpg.dialect()
+
+
+class QueryCapturePlugin:
+    """Pytest plugin that records the PostgreSQL form of every ORM read/update/delete."""
+
+    def __init__(self):
+        self.queries: dict[str, dict] = {}
+        self.current_test = None
+        self.skipped = 0
+
+    def pytest_runtest_setup(self, item):
+        self.current_test = item.nodeid
+
+    def pytest_sessionstart(self, session):
+        event.listen(Session, "do_orm_execute", self._record)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        event.remove(Session, "do_orm_execute", self._record)
+
+    def _record(self, orm_execute_state) -> None:
+        if not (orm_execute_state.is_select or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        statement = orm_execute_state.statement
+        try:
+            # The shape (with placeholders) groups repeated calls; the literal form is what gets explained
+            shape = str(statement.compile(dialect=PG_DIALECT))
+            sql = str(statement.compile(
+                dialect=PG_DIALECT,
+                compile_kwargs={"literal_binds": True, "render_postcompile": True},
+            ))
+        except Exception:
+            self.skipped += 1
+            return
+        entry = self.queries.setdefault(shape, {"sql": sql, "tests": set(), "count": 0})
+        entry["count"] += 1
+        if self.current_test:
+            entry["tests"].add(self.current_test)
+
+    def write(self, path: Path) -> None:
+        with path.open("w") as f:
+            for entry in self.queries.values():
+                f.write(json.dumps({**entry, "tests": sorted(entry["tests"])}) + "\n")
+
+
+def capture(output: Path, pytest_args: list[str]) -> int:
+    import pytest
+
+    plugin = QueryCapturePlugin()
+    exit_code = pytest.main(pytest_args or ["-q", "tests"], plugins=[plugin])
+    plugin.write(output)
+    print(f"Captured {len(plugin.queries)} distinct statements to {output} ({plugin.skipped} could not be compiled)")
+    return int(exit_code)
+
+
+def iter_seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_seq_scans(child)
+
+
+async def explain_queries(dsn: str, queries: list[dict], min_rows: int) -> tuple[list[dict], int]:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        table_rows = {
+            row["relname"]: int(row["reltuples"])
+            for row in await conn.fetch(
+                "SELECT relname, reltuples FROM pg_class "
+                "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+            )
+        }
+        findings: dict[tuple[str, str], dict] = {}
+        failed = 0
+        for query in queries:
+            try:
+                raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {query['sql']}")
+            except asyncpg.PostgresError:
+                failed += 1
+                continue
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            for node in iter_seq_scans(plan):
+                table = node.get("Relation Name")
+                rows = table_rows.get(table, 0)
+                if rows < min_rows:
+                    continue
+                key = (table, node.get("Filter", ""))
+                finding = findings.setdefault(key, {
+                    "table": table,
+                    "rows": rows,
+                    "filter": node.get("Filter", ""),
+                    "calls": 0,
+                    "tests": set(),
+                    "example": query["sql"],
+                })
+                finding["calls"] += query["count"]
+                finding["tests"].update(query["tests"])
+        return sorted(findings.values(), key=lambda f: (f["rows"] * f["calls"]), reverse=True), failed
+    finally:
+        await conn.close()
+
+
+def print_report(findings: list[dict], failed: int, min_rows: int) -> None:
+    if not findings:
+        print(f"No sequential scans on tables with >= {min_rows} rows")
+    for finding in findings:
+        print(f"\n{finding['table']} (~{finding['rows']} rows), {finding['calls']} calls during the suite")
+        print(f"  filter: {finding['filter'] or '(none)'}")
+        for test in sorted(finding["tests"])[:3]:
+            print(f"  seen in: {test}")
+        print(f"  example: {' '.join(finding['example'].split())[:300]}")
+    if failed:
+        print(f"\n{failed} statements failed to explain (schema drift or test-only tables)")
+
+
+def default_dsn() -> str:
+    from app.config import get_settings
+
+    return get_settings().database_url.replace("postgresql+asyncpg://", "postgresql://")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser = sub.add_parser("capture", help="Run pytest and record ORM statements")
+    capture_parser.add_argument("--output", type=Path, default=Path("queries.jsonl"))
+    capture_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+
+    report_parser = sub.add_parser("report", help="EXPLAIN recorded statements and report sequential scans")
+    report_parser.add_argument("--input", type=Path, default=Path("queries.jsonl"))
+    report_parser.add_argument("--dsn", help="PostgreSQL DSN; defaults to DATABASE_URL")
+    report_parser.add_argument("--min-rows", type=int, default=10000, help="Ignore tables smaller than this")
+    report_parser.add_argument("--fail-on-findings", action="store_true", help="Exit 1 when anything is reported")
+
+    args = parser.parse_args()
+    if args.command == "capture":
+        pytest_args = [a for a in args.pytest_args if a != "--"]
+        return capture(args.output, pytest_args)
+
+    queries = [json.loads(line) for line in args.input.read_text().splitlines() if line.strip()]
+    findings, failed = asyncio.run(explain_queries(args.dsn or default_dsn(), queries, args.min_rows))
+    print_report(findings, failed, args.min_rows)
+    return 1 if findings and args.fail_on_findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
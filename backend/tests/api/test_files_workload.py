@@ -28,6 +28,10 @@ def file_download_url(project_id: str, file_id: str) -> str:
     return f"{API_V1}/projects/{project_id}/files/{file_id}/download"
 
 
+def file_content_url(project_id: str, file_id: str) -> str:
+    return f"{API_V1}/projects/{project_id}/files/{file_id}/content"
+
+
 def team_members_url() -> str:
     return f"{API_V1}/team-members"
 
@@ -474,6 +478,84 @@ class TestDownloadFile:
         assert resp.status_code == 403
 
 
+class TestFileContent:
+
+    async def _stored_file(self, db: AsyncSession, project: Project, user: User, mock_storage, checksum=None):
+        f = await create_file_in_db(db, project.id, user.id, checksum=checksum)
+        mock_storage.saved_files[f.storage_path] = b"0123456789" * 10
+        await db.commit()
+        return f
+
+    async def test_content_has_validators(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage, checksum="a" * 64)
+        resp = await file_admin_client.get(file_content_url(str(project.id), str(f.id)))
+        assert resp.status_code == 200
+        assert resp.content == b"0123456789" * 10
+        assert resp.headers["etag"] == f'"{"a" * 64}"'
+        assert resp.headers["accept-ranges"] == "bytes"
+        assert "immutable" in resp.headers["cache-control"]
+        assert "last-modified" in resp.headers
+
+    async def test_content_weak_etag_without_checksum(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage)
+        resp = await file_admin_client.get(file_content_url(str(project.id), str(f.id)))
+        assert resp.headers["etag"].startswith('W/"')
+        assert resp.headers["cache-control"] == "private, no-cache"
+
+    async def test_content_if_none_match_returns_304(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage, checksum="b" * 64)
+        first = await file_admin_client.get(file_content_url(str(project.id), str(f.id)))
+        resp = await file_admin_client.get(
+            file_content_url(str(project.id), str(f.id)),
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+    async def test_content_single_range(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage)
+        resp = await file_admin_client.get(
+            file_content_url(str(project.id), str(f.id)), headers={"Range": "bytes=10-19"}
+        )
+        assert resp.status_code == 206
+        assert resp.content == b"0123456789"
+        assert resp.headers["content-range"] == "bytes 10-19/100"
+
+    async def test_content_multi_range(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage)
+        resp = await file_admin_client.get(
+            file_content_url(str(project.id), str(f.id)), headers={"Range": "bytes=0-1,-2"}
+        )
+        assert resp.status_code == 206
+        assert resp.headers["content-type"].startswith("multipart/byteranges; boundary=")
+        assert b"Content-Range: bytes 0-1/100" in resp.content
+        assert b"Content-Range: bytes 98-99/100" in resp.content
+        assert int(resp.headers["content-length"]) == len(resp.content)
+
+    async def test_content_unsatisfiable_range(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage)
+        resp = await file_admin_client.get(
+            file_content_url(str(project.id), str(f.id)), headers={"Range": "bytes=500-600"}
+        )
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == "bytes */100"
+
+    async def test_content_stale_if_range_returns_full_body(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession, mock_storage):
+        f = await self._stored_file(db, project, admin_user, mock_storage, checksum="c" * 64)
+        resp = await file_admin_client.get(
+            file_content_url(str(project.id), str(f.id)),
+            headers={"Range": "bytes=0-9", "If-Range": '"stale"'},
+        )
+        assert resp.status_code == 200
+        assert len(resp.content) == 100
+
+    async def test_content_missing_in_storage(self, file_admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession):
+        f = await create_file_in_db(db, project.id, admin_user.id)
+        await db.commit()
+        resp = await file_admin_client.get(file_content_url(str(project.id), str(f.id)))
+        assert resp.status_code == 404
+
+
 class TestFileEdgeCases:
 
     async def test_multiple_files_same_entity(self, admin_client: AsyncClient, project: Project, admin_user: User, db: AsyncSession):
@@ -12,7 +12,7 @@ from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.pool import StaticPool
 
 from app.config import get_settings
-from app.db.session import Base, get_db
+from app.db.session import Base, get_db, get_read_db
 from app.middleware.rate_limiter import get_rate_limiter
 from app.main import app
 from app.models.equipment_submission import EquipmentSubmission
@@ -79,6 +79,7 @@ async def client(db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -102,6 +103,7 @@ async def admin_client(db: AsyncSession, admin_user: User) -> AsyncGenerator[Asy
         return admin_user
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
     app.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
 
@@ -131,6 +133,7 @@ async def user_client(db: AsyncSession, regular_user: User) -> AsyncGenerator[As
         raise HTTPException(status_code=403, detail="Admin access required")
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
     app.dependency_overrides[get_current_admin_user] = override_get_current_admin_user
 
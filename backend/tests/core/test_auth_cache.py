@@ -0,0 +1,136 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.core.auth_cache import auth_cache
+from app.core.commit_cache import MISSING
+from app.core.permissions import Permission, get_effective_permissions
+from app.core.security import get_project_member, verify_project_access
+from app.db.session import Base
+from app.models.permission_override import PermissionOverride
+from app.models.project import Project, ProjectMember
+from app.models.user import User
+
+
+@pytest.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements: list[str] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    auth_cache.clear()
+    previous_ttl, auth_cache.ttl_seconds = auth_cache.ttl_seconds, 60
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), statements
+    auth_cache.ttl_seconds = previous_ttl
+    auth_cache.clear()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def membership(sessions):
+    factory, statements = sessions
+    async with factory() as db:
+        user = User(email=f"{uuid.uuid4().hex}@test.com", full_name="Tester")
+        project = Project(name="Tower")
+        db.add_all([user, project])
+        await db.flush()
+        member = ProjectMember(project_id=project.id, user_id=user.id, role="viewer")
+        db.add(member)
+        await db.commit()
+    statements.clear()
+    return user, project, member
+
+
+def member_selects(statements: list[str]) -> int:
+    return sum(1 for s in statements if s.lstrip().upper().startswith("SELECT") and "project_members" in s)
+
+
+@pytest.mark.asyncio
+async def test_repeated_access_checks_in_one_request_query_once(sessions, membership):
+    factory, statements = sessions
+    user, project, _ = membership
+
+    async with factory() as db:
+        first = await verify_project_access(project.id, user, db)
+        second = await verify_project_access(project.id, user, db)
+
+    assert first is second
+    assert member_selects(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_membership_is_shared_across_requests_without_queries(sessions, membership):
+    factory, statements = sessions
+    user, project, member = membership
+
+    async with factory() as db:
+        await get_project_member(project.id, user.id, db)
+    async with factory() as db:
+        cached = await get_project_member(project.id, user.id, db)
+        assert cached in db
+        assert cached.id == member.id and cached.role == "viewer"
+
+    assert member_selects(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_membership_and_permissions(sessions, membership):
+    factory, _ = sessions
+    user, project, _ = membership
+
+    async with factory() as db:
+        member = await get_project_member(project.id, user.id, db)
+        assert Permission.EDIT.value not in await get_effective_permissions(member, db)
+
+    async with factory() as db:
+        member = await get_project_member(project.id, user.id, db)
+        member.role = "contractor"
+        await db.commit()
+
+    async with factory() as db:
+        member = await get_project_member(project.id, user.id, db)
+        assert member.role == "contractor"
+        assert Permission.EDIT.value in await get_effective_permissions(member, db)
+
+
+@pytest.mark.asyncio
+async def test_permission_override_invalidates_cached_permissions(sessions, membership):
+    factory, _ = sessions
+    user, project, member = membership
+
+    async with factory() as db:
+        assert Permission.DELETE.value not in await get_effective_permissions(member, db)
+        db.add(PermissionOverride(
+            project_member_id=member.id,
+            permission=Permission.DELETE.value,
+            granted=True,
+            granted_by_id=user.id,
+        ))
+        await db.commit()
+
+    async with factory() as db:
+        member = await get_project_member(project.id, user.id, db)
+        assert Permission.DELETE.value in await get_effective_permissions(member, db)
+
+
+@pytest.mark.asyncio
+async def test_membership_read_across_a_removal_is_not_cached(sessions, membership):
+    factory, _ = sessions
+    user, project, _ = membership
+
+    async with factory() as db:
+        execute = db.execute
+
+        async def read_while_member_is_removed(*args, **kwargs):
+            result = await execute(*args, **kwargs)
+            auth_cache.invalidate({"kind": "member", "user_id": str(user.id), "project_id": str(project.id)})
+            return result
+
+        db.execute = read_while_member_is_removed
+        assert await get_project_member(project.id, user.id, db) is not None
+
+    assert auth_cache.get_member(user.id, project.id) is MISSING
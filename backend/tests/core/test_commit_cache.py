@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.core.commit_cache import INSTANCE_ID, MISSING, CommitInvalidatedCache
+from app.db.session import Base
+from app.models.project import Project
+
+
+class ProjectNames(CommitInvalidatedCache):
+    def collect(self, session):
+        return [{"kind": "all"}] if any(isinstance(i, Project) for i in [*session.new, *session.dirty]) else []
+
+
+# Registers session listeners, so one instance for the module
+project_names = ProjectNames("test_project_names", ttl_seconds=60, max_entries=2)
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    async def no_broker():
+        return None
+
+    monkeypatch.setattr(project_names, "ensure_subscribed", no_broker)
+    project_names.clear()
+    yield project_names
+    project_names.clear()
+
+
+async def test_entries_are_dropped_on_commit_not_on_rollback(db, cache):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return len(loads)
+
+    assert await cache.get_or_load(db, "names", load) == 1
+    db.add(Project(name="Tower"))
+    await db.flush()
+    # Uncommitted changes bypass the shared entries
+    assert await cache.get_or_load(db, "names", load) == 2
+    await db.rollback()
+    assert await cache.get_or_load(db, "names", load) == 1
+
+    db.add(Project(name="Tower"))
+    await db.commit()
+    assert await cache.get_or_load(db, "names", load) == 3
+
+
+async def test_value_loaded_across_a_commit_is_not_cached(db, cache):
+    async def load_while_committing():
+        cache.invalidate({"kind": "all"})
+        return "stale"
+
+    await cache.get_or_load(db, "names", load_while_committing)
+
+    assert cache.lookup("names") is MISSING
+
+
+async def test_broadcasts_from_this_instance_are_ignored(cache):
+    cache.store("names", "cached")
+
+    await cache._on_changes(cache.channel, json.dumps({"origin": INSTANCE_ID, "changes": [{"kind": "all"}]}))
+    assert cache.lookup("names") == "cached"
+
+    await cache._on_changes(cache.channel, json.dumps({"origin": "other", "changes": [{"kind": "all"}]}))
+    assert cache.lookup("names") is MISSING
@@ -0,0 +1,85 @@
+"""
+Tests for HTTP Range and conditional request helpers.
+"""
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+from app.utils.http_range import (
+    RangeNotSatisfiable,
+    etag_matches,
+    http_date,
+    is_not_modified,
+    parse_range_header,
+    weak_etag,
+)
+
+
+def make_request(**headers: str) -> Request:
+    raw = [(k.replace("_", "-").lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+class TestParseRangeHeader:
+
+    def test_single_range(self):
+        assert parse_range_header("bytes=0-99", 1000) == [(0, 99)]
+
+    def test_open_ended_range(self):
+        assert parse_range_header("bytes=900-", 1000) == [(900, 999)]
+
+    def test_suffix_range(self):
+        assert parse_range_header("bytes=-100", 1000) == [(900, 999)]
+
+    def test_end_clamped_to_size(self):
+        assert parse_range_header("bytes=990-5000", 1000) == [(990, 999)]
+
+    def test_multiple_ranges_sorted_and_merged(self):
+        assert parse_range_header("bytes=500-599,0-99,90-199", 1000) == [(0, 199), (500, 599)]
+
+    def test_unsatisfiable(self):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=1000-1100", 1000)
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=1500-", 1000)
+
+    def test_malformed_is_ignored(self):
+        assert parse_range_header("bytes=abc-def", 1000) is None
+        assert parse_range_header("bytes=50-10", 1000) is None
+        assert parse_range_header("items=0-1", 1000) is None
+
+    def test_too_many_ranges_is_ignored(self):
+        header = "bytes=" + ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(50))
+        assert parse_range_header(header, 1000) is None
+
+
+class TestConditionalHeaders:
+
+    def test_etag_weak_comparison(self):
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', 'W/"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"other"', '"abc"')
+
+    def test_etag_strong_comparison_rejects_weak(self):
+        assert etag_matches('"abc"', '"abc"', weak=False)
+        assert not etag_matches('W/"abc"', 'W/"abc"', weak=False)
+
+    def test_weak_etag_is_stable(self):
+        assert weak_etag("a", 1) == weak_etag("a", 1)
+        assert weak_etag("a", 1) != weak_etag("a", 2)
+
+    def test_if_none_match_takes_precedence(self):
+        modified = datetime(2026, 1, 1, 12, 0, 0)
+        request = make_request(if_none_match='"other"', if_modified_since=http_date(modified))
+        assert not is_not_modified(request, '"abc"', modified)
+
+    def test_if_modified_since(self):
+        modified = datetime(2026, 1, 1, 12, 0, 0, 500000)
+        assert is_not_modified(make_request(if_modified_since=http_date(modified)), '"abc"', modified)
+        earlier = datetime(2025, 12, 31)
+        assert not is_not_modified(make_request(if_modified_since=http_date(earlier)), '"abc"', modified)
+
+    def test_http_date_format(self):
+        assert http_date(datetime(2026, 3, 9, 8, 30, 0)) == "Mon, 09 Mar 2026 08:30:00 GMT"
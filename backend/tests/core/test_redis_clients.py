@@ -0,0 +1,17 @@
+import asyncio
+
+from app.core.redis_clients import get_cache_redis
+
+REDIS_URL = "redis://localhost:6379/0"
+
+
+async def clients_in_one_loop():
+    return get_cache_redis(REDIS_URL), get_cache_redis(REDIS_URL)
+
+
+def test_clients_are_shared_within_a_loop_but_not_across_loops():
+    first, again = asyncio.run(clients_in_one_loop())
+    other, _ = asyncio.run(clients_in_one_loop())
+
+    assert first is again
+    assert other is not first
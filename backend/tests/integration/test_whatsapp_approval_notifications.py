@@ -11,6 +11,13 @@ from app.models.project import Project
 from app.models.user import User
 from app.services.notification_service import notify_user
 from app.utils import utcnow
+from app.worker.celery_app import celery_app
+
+
+@pytest.fixture(autouse=True)
+def eager_deliveries(monkeypatch):
+    # Deliveries are queued when the session commits; run them in-process so the sends are observable
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
 
 
 class TestWhatsAppApprovalNotifications:
@@ -87,7 +94,7 @@ class TestWhatsAppApprovalNotifications:
         )
 
         # Step 4: Manually trigger notification (simulating approval reminder service)
-        with patch("app.services.notification_service.WhatsAppService", return_value=mock_whatsapp_service):
+        with patch("app.worker.tasks.notification_delivery.WhatsAppService", return_value=mock_whatsapp_service):
             title = "אישור ממתין 6 ימים: מנוף לאתר בניין א"
             message = 'הגשת האישור שלך "מנוף לאתר בניין א" ממתינה לבדיקה כבר 6 ימים.'
             action_url = f"https://builderops.com/projects/{project.id}/approvals/{submission.id}"
@@ -106,6 +113,7 @@ class TestWhatsAppApprovalNotifications:
                 language="he",
                 project_id=project.id,
             )
+            await db.commit()
 
         # Step 5: Verify WhatsApp message was sent
         assert len(captured_messages) == 1, "Should send exactly one WhatsApp message"
@@ -195,7 +203,7 @@ class TestWhatsAppApprovalNotifications:
         )
 
         # Step 4: Trigger notification
-        with patch("app.services.notification_service.WhatsAppService", return_value=mock_whatsapp_service):
+        with patch("app.worker.tasks.notification_delivery.WhatsAppService", return_value=mock_whatsapp_service):
             title = "Approval escalation (7 days): Crane for Building Site A"
             message = 'Your equipment approval submission "Crane for Building Site A" has been waiting for review for 7 days.'
             action_url = f"https://builderops.com/projects/{project.id}/approvals/{submission.id}"
@@ -214,6 +222,7 @@ class TestWhatsAppApprovalNotifications:
                 language="en",
                 project_id=project.id,
             )
+            await db.commit()
 
         # Step 5: Verify WhatsApp message was sent
         assert len(captured_messages) == 1, "Should send exactly one WhatsApp message"
@@ -280,7 +289,7 @@ class TestWhatsAppApprovalNotifications:
         mock_service.send_message = MagicMock(return_value={'success': True})
         mock_service.format_notification_message = MagicMock(wraps=real_format)
 
-        with patch("app.services.notification_service.WhatsAppService", return_value=mock_service):
+        with patch("app.worker.tasks.notification_delivery.WhatsAppService", return_value=mock_service):
             # Send notification
             title = "אישור ממתין 6 ימים: טרקטור לעבודות עפר"
             message = 'הגשת האישור שלך "טרקטור לעבודות עפר" ממתינה לבדיקה כבר 6 ימים.'
@@ -299,6 +308,7 @@ class TestWhatsAppApprovalNotifications:
                 language="he",
                 project_id=project.id,
             )
+            await db.commit()
 
             # Verify formatting method was called with correct parameters
             mock_service.format_notification_message.assert_called_once()
@@ -348,7 +358,7 @@ class TestWhatsAppApprovalNotifications:
         mock_whatsapp_service.send_message = MagicMock()
 
         # Trigger notification
-        with patch("app.services.notification_service.WhatsAppService", return_value=mock_whatsapp_service):
+        with patch("app.worker.tasks.notification_delivery.WhatsAppService", return_value=mock_whatsapp_service):
             await notify_user(
                 db=db,
                 user_id=admin_user.id,
@@ -360,6 +370,7 @@ class TestWhatsAppApprovalNotifications:
                 language="he",
                 project_id=project.id,
             )
+            await db.commit()
 
         # Verify WhatsApp message was NOT sent (user not verified)
         assert mock_whatsapp_service.send_message.call_count == 0, "Should not send WhatsApp when user not verified"
@@ -400,7 +411,7 @@ class TestWhatsAppApprovalNotifications:
         mock_whatsapp_service.send_message = MagicMock()
 
         # Trigger notification
-        with patch("app.services.notification_service.WhatsAppService", return_value=mock_whatsapp_service):
+        with patch("app.worker.tasks.notification_delivery.WhatsAppService", return_value=mock_whatsapp_service):
             await notify_user(
                 db=db,
                 user_id=admin_user.id,
@@ -412,6 +423,7 @@ class TestWhatsAppApprovalNotifications:
                 language="he",
                 project_id=project.id,
             )
+            await db.commit()
 
         # Verify WhatsApp message was NOT sent (no phone number)
         assert mock_whatsapp_service.send_message.call_count == 0, "Should not send WhatsApp when user has no number"
@@ -0,0 +1,147 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.config import get_settings
+from app.db.session import Base
+from app.models.acc_sync import AccProjectLink
+from app.models.analytics import AnalyticsRollup
+from app.models.inbox_count import UserInboxCount
+from app.models.project import Project, ProjectMember
+from app.models.rfi import RFI
+from app.models.user import User
+from app.services.acc_rfi_sync_service import ACCRFISyncService
+from app.services.inbox_service import get_inbox_counts
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def issue(number: int, updated_at: str, title: str = "Question", assignee: str = "eng@example.com") -> dict:
+    return {
+        "id": f"acc-{number}",
+        "displayId": number,
+        "title": f"{title} {number}",
+        "description": "Which rebar?",
+        "status": "open",
+        "priority": "high",
+        "updatedAt": updated_at,
+        "createdBy": {"email": "pm@example.com"},
+        "assignedTo": {"email": assignee, "name": "Engineer"},
+    }
+
+
+class FakeIssuesClient:
+    def __init__(self, issues: list[dict]):
+        self.issues = issues
+        self.calls: list[tuple[int, datetime | None]] = []
+
+    async def list_acc_rfis(self, user_token, container_id, limit=100, offset=0, updated_since=None):
+        self.calls.append((offset, updated_since))
+        matching = [
+            i for i in self.issues
+            if updated_since is None
+            or datetime.fromisoformat(i["updatedAt"].replace("Z", "")) >= updated_since
+        ]
+        return {"results": matching[offset:offset + limit], "pagination": {"totalResults": len(matching)}}
+
+
+@pytest.fixture
+async def project(db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "acc_sync_page_size", 2)
+    project = Project(name="Tower")
+    db.add_all([project, User(email="PM@example.com", full_name="PM")])
+    await db.flush()
+    db.add(AccProjectLink(project_id=project.id, acc_project_id="container", acc_hub_id="hub"))
+    await db.commit()
+    return project
+
+
+def sync_service(db, monkeypatch, issues_client) -> ACCRFISyncService:
+    service = ACCRFISyncService(db)
+
+    async def get_user_token(db, user_id):
+        return "token"
+
+    monkeypatch.setattr(service.aps_service, "get_user_token", get_user_token)
+    service.issues_client = issues_client
+    return service
+
+
+async def test_full_pull_creates_every_page_with_batched_users(db, project, monkeypatch):
+    client = FakeIssuesClient([issue(n, f"2026-10-0{n}T08:00:00Z") for n in range(1, 6)])
+
+    result = await sync_service(db, monkeypatch, client).sync_project_rfis(project.id, uuid.uuid4(), "container")
+
+    assert (result["created"], result["updated"], result["conflicts"], result["errors"]) == (5, 0, 0, [])
+    assert sorted(offset for offset, _ in client.calls) == [0, 2, 4]
+    rfis = (await db.execute(select(RFI).order_by(RFI.rfi_number))).scalars().all()
+    assert [r.rfi_number for r in rfis] == [f"RFI-ACC-{n}" for n in range(1, 6)]
+    assert all(r.acc_origin and r.sync_status == "synced" for r in rfis)
+    # The existing user is matched case-insensitively; the assignee gets one placeholder
+    assert await db.scalar(select(func.count(User.id))) == 2
+    link = await db.scalar(select(AccProjectLink))
+    assert link.acc_sync_watermark == datetime(2026, 10, 5, 8, 0)
+
+
+async def test_poll_pulls_only_issues_past_the_watermark(db, project, monkeypatch):
+    issues = [issue(n, f"2026-10-0{n}T08:00:00Z") for n in range(1, 4)]
+    await sync_service(db, monkeypatch, FakeIssuesClient(issues)).sync_project_rfis(project.id, uuid.uuid4(), "c")
+
+    issues[0] = issue(1, "2026-10-09T08:00:00Z", title="Revised")
+    client = FakeIssuesClient(issues)
+    result = await sync_service(db, monkeypatch, client).sync_project_rfis(project.id, uuid.uuid4(), "c")
+
+    assert client.calls == [(0, datetime(2026, 10, 3, 8, 0))]
+    # Issue 3 sits exactly on the watermark and is re-applied harmlessly
+    assert (result["created"], result["updated"], result["conflicts"]) == (0, 2, 0)
+    revised = await db.scalar(select(RFI).where(RFI.acc_rfi_id == "acc-1").execution_options(populate_existing=True))
+    assert revised.subject == "Revised 1"
+    assert revised.rfi_number == "RFI-ACC-1"
+    assert await db.scalar(select(func.count(RFI.id))) == 3
+
+
+async def test_failed_page_stops_the_watermark_before_it(db, project, monkeypatch):
+    class FlakyClient(FakeIssuesClient):
+        async def list_acc_rfis(self, *args, offset=0, **kwargs):
+            if offset == 2:
+                raise RuntimeError("ACC unavailable")
+            return await super().list_acc_rfis(*args, offset=offset, **kwargs)
+
+    client = FlakyClient([issue(n, f"2026-10-0{n}T08:00:00Z") for n in range(1, 5)])
+
+    result = await sync_service(db, monkeypatch, client).sync_project_rfis(project.id, uuid.uuid4(), "container")
+
+    assert result["created"] == 2
+    assert result["errors"] == [{"offset": 2, "error": "ACC unavailable"}]
+    # Only the page before the gap counts: issues 3 and 4 are pulled again next time
+    assert (await db.scalar(select(AccProjectLink))).acc_sync_watermark == datetime(2026, 10, 2, 8, 0)
+
+
+async def test_upserts_update_rollups_and_drop_member_inbox_counts(db, project, monkeypatch):
+    member = await db.scalar(select(User))
+    db.add(ProjectMember(project_id=project.id, user_id=member.id, role="project_manager"))
+    await db.commit()
+    await get_inbox_counts(db, member.id, store=True)
+    client = FakeIssuesClient([issue(n, f"2026-10-0{n}T08:00:00Z") for n in range(1, 4)])
+
+    await sync_service(db, monkeypatch, client).sync_project_rfis(project.id, uuid.uuid4(), "container")
+
+    rfi_rollups = select(func.sum(AnalyticsRollup.count)).where(
+        AnalyticsRollup.project_id == project.id,
+        AnalyticsRollup.entity_type == "rfi",
+        AnalyticsRollup.dimension == "status",
+    )
+    assert await db.scalar(rfi_rollups) == 3
+    assert await db.get(UserInboxCount, member.id, populate_existing=True) is None
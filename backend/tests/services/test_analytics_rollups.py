@@ -0,0 +1,142 @@
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.analytics import AnalyticsRollup
+from app.models.defect import Defect
+from app.models.equipment import Equipment
+from app.models.project import Project, ProjectMember
+from app.services.analytics_rollup_service import rebuild_rollups, rollup_counts, total
+from app.services.analytics_service import get_entity_trends, get_project_benchmarks
+from app.utils import utcnow
+
+
+async def rollup_rows(db: AsyncSession) -> dict:
+    rows = (await db.execute(select(AnalyticsRollup))).scalars().all()
+    return {
+        (row.project_id, row.entity_type, row.day, row.dimension, row.value): row.count
+        for row in rows if row.count
+    }
+
+
+async def assert_matches_rebuild(db: AsyncSession):
+    maintained = await rollup_rows(db)
+    await rebuild_rollups(db)
+    assert maintained == await rollup_rows(db)
+    await db.rollback()
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+async def projects(db):
+    tower, annex = Project(name="Tower"), Project(name="Annex", status="on_hold")
+    db.add_all([tower, annex])
+    await db.flush()
+    creator = uuid.uuid4()
+    last_week = utcnow() - timedelta(days=7)
+    for number, (severity, category) in enumerate([("high", "concrete"), ("low", "concrete"), ("high", "paint")], 1):
+        db.add(Defect(
+            project_id=tower.id, defect_number=number, category=category, severity=severity,
+            description="crack", created_by_id=creator,
+        ))
+    db.add_all([
+        Equipment(project_id=tower.id, name="Pump", created_at=last_week),
+        Equipment(project_id=tower.id, name="Crane", status="approved"),
+        Equipment(project_id=annex.id, name="Lift"),
+    ])
+    await db.commit()
+    return tower, annex
+
+
+async def test_writes_keep_rollups_in_step(db, projects):
+    tower_id, annex_id = (project.id for project in projects)
+    counts = await rollup_counts(db, [tower_id], ["defect", "equipment"], ["total", "status", "severity", "category"])
+    assert total(counts, "defect") == 3
+    assert counts[("defect", "severity")] == {"high": 2, "low": 1}
+    assert counts[("defect", "category")] == {"concrete": 2, "paint": 1}
+    assert counts[("equipment", "status")] == {"draft": 1, "approved": 1}
+    await assert_matches_rebuild(db)
+
+    defect = (await db.execute(select(Defect).where(Defect.severity == "low"))).scalar_one()
+    defect_id = defect.id
+    defect.severity = "high"
+    defect.status = "resolved"
+    pump = (await db.execute(select(Equipment).where(Equipment.name == "Pump"))).scalar_one()
+    pump.project_id = annex_id
+    pump_id = pump.id
+    await db.commit()
+    await assert_matches_rebuild(db)
+
+    # Attributes expired by the commit: the old values are unknown, so the project is recounted
+    defect = await db.get(Defect, defect_id)
+    db.expire(defect, ["severity"])
+    defect.severity = "low"
+    await db.delete(await db.get(Equipment, pump_id))
+    await db.commit()
+    await assert_matches_rebuild(db)
+
+    defect = await db.get(Defect, defect_id)
+    defect.severity = "critical"
+    await db.flush()
+    await db.rollback()
+    counts = await rollup_counts(db, [tower_id], ["defect"], ["severity"])
+    assert counts[("defect", "severity")] == {"high": 2, "low": 1}
+
+
+async def test_bulk_statements_are_recounted_at_commit(db, projects):
+    tower, _ = projects
+    await db.execute(update(Defect).where(Defect.category == "concrete").values(status="closed"))
+    await db.commit()
+
+    counts = await rollup_counts(db, [tower.id], ["defect"], ["status"])
+    assert counts[("defect", "status")] == {"closed": 2, "open": 1}
+    await assert_matches_rebuild(db)
+
+
+async def test_deleting_a_project_leaves_its_rollups_to_the_cascade(db, projects):
+    _, annex = projects
+    before = await rollup_rows(db)
+    await db.delete(annex)
+    await db.commit()
+
+    # No decrements are written for the project's cascaded children; the foreign key
+    # drops its rollup rows (SQLite here doesn't enforce it)
+    assert await rollup_rows(db) == before
+
+
+async def test_benchmarks_and_trends_read_rollups(db, projects):
+    tower, annex = projects
+    user = SimpleNamespace(id=uuid.uuid4(), is_super_admin=False)
+    db.add(ProjectMember(project_id=tower.id, user_id=user.id, role="project_admin"))
+    await db.commit()
+
+    benchmarks = await get_project_benchmarks(db, user)
+    assert [b["project_name"] for b in benchmarks] == ["Tower"]
+    assert benchmarks[0]["metrics"]["defect_count"] == 3.0
+    assert benchmarks[0]["metrics"]["equipment_count"] == 2.0
+    assert benchmarks[0]["metrics"]["task_count"] == 0.0
+
+    trends = await get_entity_trends(db, "equipment", None, days=30, user_id=user.id)
+    today = utcnow().date()
+    assert trends == [
+        {"date": (today - timedelta(days=7)).strftime("%Y-%m-%d"), "count": 1},
+        {"date": today.strftime("%Y-%m-%d"), "count": 1},
+    ]
+    assert await get_entity_trends(db, "equipment", annex.id, days=3) == [
+        {"date": today.strftime("%Y-%m-%d"), "count": 1},
+    ]
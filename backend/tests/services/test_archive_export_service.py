@@ -0,0 +1,121 @@
+import io
+import json
+import uuid
+import zipfile
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.config import get_settings
+from app.db.session import Base
+from app.models.export_job import ExportJob
+from app.models.file import File
+from app.models.project import Project
+from app.services.export_service import ExportService
+from app.services.storage_service import LocalStorageBackend
+
+
+class FlakyStorage(LocalStorageBackend):
+    def __init__(self, base_path: str):
+        super().__init__(base_path)
+        self.downloads: list[str] = []
+        self.fail_on_segment = None
+
+    async def get_file_content(self, storage_path: str) -> bytes:
+        self.downloads.append(storage_path)
+        return await super().get_file_content(storage_path)
+
+    async def save_stream(self, chunks, storage_path, content_type="application/octet-stream"):
+        if self.fail_on_segment and storage_path.endswith(self.fail_on_segment):
+            self.fail_on_segment = None
+            async for _ in chunks:
+                raise ConnectionError("upload interrupted")
+        return await super().save_stream(chunks, storage_path, content_type)
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FlakyStorage(str(tmp_path))
+
+
+@pytest.fixture
+async def job(db, storage):
+    project = Project(name="Tower")
+    db.add(project)
+    await db.flush()
+    contents = {
+        "photo.jpg": b"\xff\xd8" + bytes(range(256)) * 40,
+        "notes.txt": b"pour schedule " * 500,
+        "plan.pdf": b"%PDF-1.7 " * 300,
+    }
+    for name, content in contents.items():
+        await storage.save_bytes(content, f"projects/{name}")
+        db.add(File(
+            project_id=project.id, entity_type="equipment", entity_id=project.id, filename=name,
+            file_type="image/jpeg" if name.endswith(".jpg") else None, file_size=len(content),
+            storage_path=f"projects/{name}",
+        ))
+    db.add(File(
+        project_id=project.id, entity_type="equipment", entity_id=project.id, filename="gone.txt",
+        file_size=10, storage_path="projects/gone.txt",
+    ))
+    job = ExportJob(
+        project_id=project.id, export_format="zip", export_type="project", requested_by_id=uuid.uuid4(),
+    )
+    db.add(job)
+    await db.commit()
+    return job, contents
+
+
+@pytest.mark.asyncio
+async def test_archive_stores_media_and_lists_skipped_files(db, storage, job):
+    job, contents = job
+
+    size = await ExportService(db).create_export_archive(job, storage, "exports/out.zip")
+
+    archive = zipfile.ZipFile(io.BytesIO(await storage.get_file_content("exports/out.zip")))
+    assert size == len(await storage.get_file_content("exports/out.zip"))
+    assert archive.testzip() is None
+    assert archive.read("files/equipment/notes.txt") == contents["notes.txt"]
+    assert archive.getinfo("files/equipment/photo.jpg").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("files/equipment/notes.txt").compress_type == zipfile.ZIP_DEFLATED
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest["total_files"] == 3
+    assert [e["filename"] for e in manifest["errors"]] == ["gone.txt"]
+    assert (job.files_total, job.files_processed, job.checkpoint) == (4, 4, None)
+
+
+@pytest.mark.asyncio
+async def test_interrupted_archive_resumes_from_last_sealed_segment(db, storage, job, monkeypatch):
+    job, contents = job
+    # Every entry seals its own segment
+    monkeypatch.setattr(get_settings(), "export_segment_bytes", 1)
+    storage.fail_on_segment = "00002"
+
+    with pytest.raises(ConnectionError):
+        await ExportService(db).create_export_archive(job, storage, "exports/out.zip")
+    assert len(job.checkpoint["segments"]) == 2
+    sealed = {"projects/" + name.rsplit("/", 1)[1] for _, name in job.checkpoint["written"]}
+    storage.downloads.clear()
+
+    await ExportService(db).create_export_archive(job, storage, "exports/out.zip")
+
+    assert len(sealed) == 2 and not sealed & set(storage.downloads)
+    archive = zipfile.ZipFile(io.BytesIO(await storage.get_file_content("exports/out.zip")))
+    assert archive.testzip() is None
+    assert {n: archive.read(n) for n in archive.namelist() if n.startswith("files/")} == {
+        f"files/equipment/{name}": content for name, content in contents.items()
+    }
+    with pytest.raises(FileNotFoundError):
+        await storage.get_file_content("exports/out.zip.parts/00000")
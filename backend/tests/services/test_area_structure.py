@@ -0,0 +1,125 @@
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.area import ConstructionArea
+from app.models.checklist import ChecklistInstance, ChecklistItemResponse
+from app.models.project import Project
+from app.services.area_structure_service import (
+    collect_descendant_ids,
+    compute_area_checklist_progress,
+    compute_areas_checklist_progress,
+)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+def checklist(project_id, area_id, status="pending", responses=()) -> ChecklistInstance:
+    return ChecklistInstance(
+        template_id=uuid.uuid4(), project_id=project_id, area_id=area_id, unit_identifier="unit", status=status,
+        responses=[ChecklistItemResponse(item_template_id=uuid.uuid4(), status=s) for s in responses],
+    )
+
+
+@pytest.fixture
+async def building(db):
+    project, other = Project(name="Tower"), Project(name="Annex")
+    db.add_all([project, other])
+    await db.flush()
+    tower = ConstructionArea(project_id=project.id, name="Tower", area_level="building")
+    db.add(tower)
+    await db.flush()
+    floors, units = [], []
+    parent = tower
+    for number in range(30):
+        # Floors stacked under each other, so the tree is 30 levels deep
+        floor = ConstructionArea(project_id=project.id, parent_id=parent.id, name=f"Floor {number}")
+        db.add(floor)
+        await db.flush()
+        unit = ConstructionArea(project_id=project.id, parent_id=floor.id, name=f"Unit {number}")
+        db.add(unit)
+        floors.append(floor)
+        units.append(unit)
+        parent = floor
+    await db.flush()
+    db.add_all([
+        checklist(project.id, tower.id, "completed", ["approved", "approved"]),
+        checklist(project.id, units[0].id, "pending", ["approved", "pending", "not_applicable", "rejected"]),
+        checklist(project.id, units[29].id, "completed"),
+        checklist(other.id, None, "completed", ["approved"]),
+    ])
+    db.add(ConstructionArea(project_id=other.id, name="Annex"))
+    await db.commit()
+    return project, tower, floors, units
+
+
+async def test_descendants_are_collected_in_one_query(db, engine, building):
+    project, tower, floors, units = building
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    descendants = await collect_descendant_ids(db, project.id, tower.id)
+
+    assert len(statements) == 1
+    assert set(descendants) == {area.id for area in floors + units}
+    assert await collect_descendant_ids(db, project.id, units[5].id) == []
+
+
+async def test_progress_for_every_area_in_one_query(db, engine, building):
+    project, tower, floors, units = building
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    progress = await compute_areas_checklist_progress(db, project.id)
+
+    assert len(statements) == 1
+    assert len(progress) == 61
+    assert progress[tower.id] == {
+        "total_instances": 3,
+        "completed_instances": 2,
+        "total_items": 6,
+        "completed_items": 4,
+        "completion_percentage": 66.7,
+    }
+    assert progress[floors[1].id] == {
+        "total_instances": 1,
+        "completed_instances": 1,
+        "total_items": 0,
+        "completed_items": 0,
+        "completion_percentage": 0,
+    }
+    assert progress[units[0].id]["completed_items"] == 2
+    assert progress[units[3].id]["total_instances"] == 0
+    assert await compute_area_checklist_progress(db, project.id, floors[0].id) == {
+        "total_instances": 2,
+        "completed_instances": 1,
+        "total_items": 4,
+        "completed_items": 2,
+        "completion_percentage": 50.0,
+    }
+
+
+async def test_parent_cycles_terminate(db, building):
+    project, tower, floors, units = building
+    tower.parent_id = units[29].id
+    await db.commit()
+
+    descendants = await collect_descendant_ids(db, project.id, floors[28].id)
+    assert set(descendants) == {area.id for area in [tower, *floors, *units] if area is not floors[28]}
@@ -0,0 +1,153 @@
+import base64
+import hashlib
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.batch_upload import BatchUpload, BatchUploadFile
+from app.models.file import File
+from app.services.batch_upload_service import (
+    UploadChunkError,
+    chunk_storage_path,
+    finalize_batch_upload,
+    store_chunk,
+)
+from app.services.storage_service import LocalStorageBackend
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def checksum_header(data: bytes) -> str:
+    return "sha256 " + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorageBackend(str(tmp_path))
+
+
+@pytest.fixture
+async def batch(session_factory):
+    project_id = uuid.uuid4()
+    async with session_factory() as db:
+        batch = BatchUpload(
+            project_id=project_id, uploaded_by=uuid.uuid4(), total_files=2, status="uploading",
+            entity_type="project", entity_id=project_id,
+        )
+        batch.upload_files = [
+            BatchUploadFile(
+                id=uuid.uuid4(), filename=name, content_type="text/plain", size=size,
+                received_bytes=0, chunk_sizes=[], status="pending", storage_path=f"final/{name}",
+            )
+            for name, size in (("a.txt", 10), ("b.txt", 4))
+        ]
+        db.add(batch)
+        await db.commit()
+    return batch
+
+
+@pytest.mark.asyncio
+async def test_chunks_resume_from_offset_and_finalize(session_factory, storage, batch):
+    async with session_factory() as db:
+        a = await db.get(BatchUploadFile, batch.upload_files[0].id)
+        b = await db.get(BatchUploadFile, batch.upload_files[1].id)
+        assert await store_chunk(storage, a, 0, stream(b"hello"), checksum_header(b"hello")) == 5
+        with pytest.raises(UploadChunkError) as exc:
+            await store_chunk(storage, a, 0, stream(b"hello"))
+        assert exc.value.status_code == 409
+        assert await store_chunk(storage, a, 5, stream(b"wor", b"ld")) == 10
+        await store_chunk(storage, b, 0, stream(b"abcd"))
+        assert (a.status, b.status) == ("uploaded", "uploaded")
+        await db.commit()
+
+    summary = await finalize_batch_upload(batch.id, session_factory=session_factory, storage=storage)
+
+    assert summary["processed"] == 2 and summary["failed"] == 0
+    assert await storage.get_file_content("final/a.txt") == b"helloworld"
+    with pytest.raises(FileNotFoundError):
+        await storage.get_file_content(chunk_storage_path(a, 0))
+    async with session_factory() as db:
+        files = (await db.execute(select(File).order_by(File.filename))).scalars().all()
+        refreshed = await db.get(BatchUpload, batch.id)
+    assert [f.checksum for f in files] == [hashlib.sha256(b"helloworld").hexdigest(), hashlib.sha256(b"abcd").hexdigest()]
+    assert refreshed.status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_failed_assembly_keeps_its_chunks(session_factory, storage, batch):
+    async with session_factory() as db:
+        a = await db.get(BatchUploadFile, batch.upload_files[0].id)
+        b = await db.get(BatchUploadFile, batch.upload_files[1].id)
+        a.sha256 = hashlib.sha256(b"something else").hexdigest()
+        await store_chunk(storage, a, 0, stream(b"helloworld"))
+        await store_chunk(storage, b, 0, stream(b"abcd"))
+        await db.commit()
+
+    summary = await finalize_batch_upload(batch.id, session_factory=session_factory, storage=storage)
+
+    assert summary["processed"] == 1 and summary["failed"] == 1
+    assert await storage.get_file_content(chunk_storage_path(a, 0)) == b"helloworld"
+    with pytest.raises(FileNotFoundError):
+        await storage.get_file_content(chunk_storage_path(b, 0))
+
+
+@pytest.mark.asyncio
+async def test_spool_failures_are_counted_and_reruns_create_no_duplicates(session_factory, storage, batch):
+    async with session_factory() as db:
+        a = await db.get(BatchUploadFile, batch.upload_files[0].id)
+        b = await db.get(BatchUploadFile, batch.upload_files[1].id)
+        await store_chunk(storage, a, 0, stream(b"helloworld"))
+        b.status, b.error = "failed", "client disconnected"
+        (await db.get(BatchUpload, batch.id)).status = "pending"
+        await db.commit()
+
+    summary = await finalize_batch_upload(batch.id, session_factory=session_factory, storage=storage)
+    rerun = await finalize_batch_upload(batch.id, session_factory=session_factory, storage=storage)
+
+    assert summary["processed"] == 1 and summary["failed"] == 1
+    assert rerun["skipped"] and rerun["processed"] == 1
+    async with session_factory() as db:
+        files = (await db.execute(select(File))).scalars().all()
+        refreshed = await db.get(BatchUpload, batch.id)
+    assert len(files) == 1
+    assert (refreshed.status, refreshed.processed_files, refreshed.failed_files) == ("failed", 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_bad_chunk_checksum_is_rejected_and_not_kept(session_factory, storage, batch):
+    async with session_factory() as db:
+        a = await db.get(BatchUploadFile, batch.upload_files[0].id)
+        with pytest.raises(UploadChunkError) as exc:
+            await store_chunk(storage, a, 0, stream(b"hello"), checksum_header(b"other"))
+
+    assert exc.value.status_code == 460
+    assert a.received_bytes == 0
+    with pytest.raises(FileNotFoundError):
+        await storage.get_file_content(chunk_storage_path(a, 0))
+
+
+@pytest.mark.asyncio
+async def test_chunk_larger_than_declared_size_is_rejected(session_factory, storage, batch):
+    async with session_factory() as db:
+        b = await db.get(BatchUploadFile, batch.upload_files[1].id)
+        with pytest.raises(UploadChunkError) as exc:
+            await store_chunk(storage, b, 0, stream(b"abcdef"))
+
+    assert exc.value.status_code == 413
+    assert b.received_bytes == 0
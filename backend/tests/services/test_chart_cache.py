@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import chart_service
+from app.services.chart_service import chart_cache, chart_key, render_chart, render_chart_async, render_chart_uri
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    def counting_render(*args):
+        calls.append(args)
+        return render_chart(*args)
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(chart_service.chart_pool, "get", lambda: pool)
+    monkeypatch.setattr(chart_service, "render_chart", counting_render)
+    chart_cache.clear()
+    yield calls
+    chart_cache.clear()
+    pool.shutdown()
+
+
+async def test_same_data_renders_once(renders):
+    data = {"completed": 3, "pending": 1}
+
+    first, second = await asyncio.gather(
+        render_chart_async("progress", data, "he", "png"),
+        render_chart_async("progress", dict(reversed(data.items())), "he", "png"),
+    )
+    third = await render_chart_async("progress", data, "he", "png")
+
+    assert first == second == third
+    assert len(renders) == 1
+
+
+async def test_language_and_format_are_part_of_the_key(renders):
+    data = {"approved": 2, "pending": 5}
+
+    await render_chart_async("inspection", data, "he", "png")
+    await render_chart_async("inspection", data, "en", "png")
+    svg_uri = await render_chart_uri("inspection", data, "en", "svg")
+
+    assert len(renders) == 3
+    assert svg_uri.startswith("data:image/svg+xml;base64,")
+
+
+def test_key_ignores_dict_order():
+    assert chart_key("inspection", {"a": 1, "b": 2}, "he", "png") == chart_key("inspection", {"b": 2, "a": 1}, "he", "png")
+
+
+def test_svg_output():
+    assert b"<svg" in render_chart("rfi_aging", {"0-7 days": 5, "30+ days": 1}, fmt="svg")
+
+
+def test_empty_series_fall_back_to_a_message_chart():
+    assert render_chart("approval_trend", []) == render_chart("empty", "No approval data available")
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.collaborative_document import CollaborativeDocument, CollaborativeDocumentUpdate
+from app.services.collab_room_service import CollabRoomService
+from app.services.pubsub_broker import InMemoryBroker
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.binary: list[bytes] = []
+        self.text: list[dict] = []
+
+    async def send_bytes(self, data: bytes):
+        self.binary.append(data)
+
+    async def send_text(self, data: str):
+        self.text.append(json.loads(data))
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(CollaborativeDocument.__table__.create)
+        await conn.run_sync(CollaborativeDocumentUpdate.__table__.create)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def document_id(session_factory):
+    doc_id = uuid.uuid4()
+    async with session_factory() as db:
+        db.add(CollaborativeDocument(id=doc_id, project_id=uuid.uuid4(), title="Minutes", content_type="general"))
+        await db.commit()
+    return str(doc_id)
+
+
+@pytest.fixture(autouse=True)
+def last_update_wins(monkeypatch):
+    # Payloads below are opaque bytes, not real Yjs updates
+    monkeypatch.setattr("app.services.collab_room_service._crdt_merge_updates", None)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    values = SimpleNamespace(
+        collab_flush_interval_seconds=60.0,
+        collab_flush_max_updates=3,
+        collab_compact_after_updates=5,
+    )
+    monkeypatch.setattr("app.services.collab_room_service.get_settings", lambda: values)
+    return values
+
+
+async def count_deltas(session_factory) -> int:
+    async with session_factory() as db:
+        return await db.scalar(select(func.count()).select_from(CollaborativeDocumentUpdate))
+
+
+@pytest.mark.asyncio
+async def test_updates_are_relayed_to_other_instances(session_factory, document_id, settings):
+    broker = InMemoryBroker()
+    instance_a = CollabRoomService(broker, session_factory)
+    instance_b = CollabRoomService(broker, session_factory)
+    alice, bob = FakeWebSocket(), FakeWebSocket()
+    room_a = await instance_a.join(document_id, "alice", alice, "Alice")
+    await instance_b.join(document_id, "bob", bob, "Bob")
+
+    await instance_a.apply_update(room_a, b"\x02update-1", "alice")
+
+    assert bob.binary == [b"\x02update-1"]
+    assert alice.binary == []
+    await instance_a.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_updates_are_buffered_then_persisted_in_batches(session_factory, document_id, settings):
+    service = CollabRoomService(InMemoryBroker(), session_factory)
+    room = await service.join(document_id, "alice", FakeWebSocket(), "Alice")
+
+    await service.apply_update(room, b"\x02a", "alice")
+    await service.apply_update(room, b"\x02b", "alice")
+    assert await count_deltas(session_factory) == 0
+
+    await service.apply_update(room, b"\x02c", "alice")
+    assert await count_deltas(session_factory) == 3
+    assert room.pending_updates == []
+    room.flush_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_compaction_folds_deltas_into_snapshot(session_factory, document_id, settings):
+    service = CollabRoomService(InMemoryBroker(), session_factory)
+    room = await service.join(document_id, "alice", FakeWebSocket(), "Alice")
+
+    for i in range(6):
+        await service.apply_update(room, b"\x02state-%d" % i, "alice")
+    await service.leave(room, "alice")
+
+    assert await count_deltas(session_factory) == 0
+    async with session_factory() as db:
+        doc = await db.get(CollaborativeDocument, uuid.UUID(document_id))
+    assert doc.yjs_state == b"state-5"
+    assert document_id not in service.rooms
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_deltas_it_did_not_read(session_factory, document_id, settings):
+    doc_uuid = uuid.UUID(document_id)
+    async with session_factory() as db:
+        db.add_all([
+            CollaborativeDocumentUpdate(id=10, document_id=doc_uuid, update=b"\x02state-1"),
+            CollaborativeDocumentUpdate(id=11, document_id=doc_uuid, update=b"\x02state-2"),
+        ])
+        await db.commit()
+
+    def racing_session_factory():
+        session = session_factory()
+        execute = session.execute
+
+        async def execute_then_race(statement, *args, **kwargs):
+            result = await execute(statement, *args, **kwargs)
+            if session.info.setdefault("raced", False) is False:
+                session.info["raced"] = True
+                # Committed by another writer after the deltas were read, with a lower id
+                await execute(insert(CollaborativeDocumentUpdate).values(
+                    id=5, document_id=doc_uuid, update=b"\x02late",
+                ))
+            return result
+
+        session.execute = execute_then_race
+        return session
+
+    await CollabRoomService(InMemoryBroker(), racing_session_factory).compact(doc_uuid)
+
+    async with session_factory() as db:
+        remaining = (await db.execute(select(CollaborativeDocumentUpdate.id))).scalars().all()
+    assert remaining == [5]
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_gets_snapshot_plus_pending_deltas(session_factory, document_id, settings):
+    service = CollabRoomService(InMemoryBroker(), session_factory)
+    room = await service.join(document_id, "alice", FakeWebSocket(), "Alice")
+    await service.apply_update(room, b"\x02state-1", "alice")
+
+    late_room = await service.join(document_id, "bob", FakeWebSocket(), "Bob")
+    assert await service.load_state(late_room) == b"state-1"
+    room.flush_task.cancel()
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_presence_merges_users_across_instances(session_factory, document_id, settings):
+    broker = InMemoryBroker()
+    instance_a = CollabRoomService(broker, session_factory)
+    instance_b = CollabRoomService(broker, session_factory)
+    alice = FakeWebSocket()
+    room_a = await instance_a.join(document_id, "alice", alice, "Alice")
+    room_b = await instance_b.join(document_id, "bob", FakeWebSocket(), "Bob")
+
+    await instance_b.broadcast_presence(room_b)
+
+    assert {u["userId"] for u in room_a.get_presence()} == {"alice", "bob"}
+    assert {u["userId"] for u in alice.text[-1]["users"]} == {"alice", "bob"}
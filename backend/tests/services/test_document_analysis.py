@@ -354,17 +354,17 @@ class TestAIServicePrompts:
         assert "analyze" in PROMPTS
         assert len(PROMPTS) == 4
 
-    def test_analyze_document_rejects_unknown_type(self):
+    async def test_analyze_document_rejects_unknown_type(self):
         from app.services.ai_service import analyze_document
         with patch("app.services.ai_service.get_settings") as mock_settings:
             mock_settings.return_value.gemini_api_key = "test-key"
             mock_settings.return_value.gemini_model = "gemini-2.0-flash"
             with pytest.raises(ValueError, match="Unknown analysis type"):
-                analyze_document(b"content", "application/pdf", "invalid_type")
+                await analyze_document(b"content", "application/pdf", "invalid_type")
 
-    def test_analyze_document_rejects_empty_api_key(self):
+    async def test_analyze_document_rejects_empty_api_key(self):
         from app.services.ai_service import analyze_document
         with patch("app.services.ai_service.get_settings") as mock_settings:
             mock_settings.return_value.gemini_api_key = ""
             with pytest.raises(ValueError, match="GEMINI_API_KEY"):
-                analyze_document(b"content", "application/pdf", "extract_text")
+                await analyze_document(b"content", "application/pdf", "extract_text")
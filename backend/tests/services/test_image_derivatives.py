@@ -0,0 +1,131 @@
+import io
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from app.services import image_derivative_service
+from app.services.image_derivative_service import (
+    RENDITIONS,
+    ReportImageCache,
+    delete_derivatives,
+    derivative_path,
+    load_report_photos,
+    make_derivative,
+)
+
+
+def photo_bytes(width: int = 4000, height: int = 3000) -> bytes:
+    output = io.BytesIO()
+    Image.effect_noise((width, height), 64).convert("RGB").save(output, format="JPEG", quality=95)
+    return output.getvalue()
+
+
+class MemoryStorage:
+    def __init__(self, files: dict[str, bytes]):
+        self.files = dict(files)
+        self.reads: list[str] = []
+
+    async def get_file_content(self, storage_path: str) -> bytes:
+        self.reads.append(storage_path)
+        if storage_path not in self.files:
+            raise FileNotFoundError(storage_path)
+        return self.files[storage_path]
+
+    async def open_read(self, storage_path: str):
+        yield await self.get_file_content(storage_path)
+
+    async def save_bytes(self, content: bytes, storage_path: str, content_type: str = "") -> int:
+        self.files[storage_path] = content
+        return len(content)
+
+    async def delete_file(self, storage_path: str) -> None:
+        if storage_path not in self.files:
+            raise FileNotFoundError(storage_path)
+        del self.files[storage_path]
+
+
+def test_report_rendition_is_a_fraction_of_the_original():
+    original = photo_bytes()
+
+    rendition = make_derivative(original, "report")
+
+    assert Image.open(io.BytesIO(rendition)).size == (1280, 960)
+    assert len(rendition) * 10 < len(original)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ReportImageCache(tmp_path, max_bytes=10 * 1024 * 1024, min_age_seconds=0)
+    monkeypatch.setattr(image_derivative_service, "_cache", cache)
+    return cache
+
+
+async def test_missing_renditions_are_generated_once_and_served_from_disk(cache):
+    storage = MemoryStorage({"p/a.jpg": photo_bytes(800, 600)})
+    files = [SimpleNamespace(id=uuid.uuid4(), entity_type="defect", entity_id=uuid.uuid4(),
+                             file_type="image/jpeg", storage_path="p/a.jpg")]
+
+    first = await load_report_photos(storage, files)
+    second = await load_report_photos(storage, files)
+
+    assert first == second
+    [url] = first[files[0].entity_id]
+    assert url.startswith("file://")
+    assert derivative_path("p/a.jpg", "report") in storage.files
+    assert derivative_path("p/a.jpg", "thumb") in storage.files
+    assert storage.reads.count("p/a.jpg") == 1
+
+
+async def test_photos_are_capped_per_entity_and_skip_non_images(cache):
+    entity_id = uuid.uuid4()
+    storage = MemoryStorage({f"p/{i}.jpg": photo_bytes(64, 64) for i in range(5)})
+    files = [
+        SimpleNamespace(id=uuid.uuid4(), entity_type="defect", entity_id=entity_id,
+                        file_type="image/jpeg", storage_path=f"p/{i}.jpg")
+        for i in range(5)
+    ]
+    files.insert(0, SimpleNamespace(id=uuid.uuid4(), entity_type="defect", entity_id=entity_id,
+                                    file_type="application/pdf", storage_path="p/doc.pdf"))
+
+    photos = await load_report_photos(storage, files, max_per_entity=2)
+
+    assert len(photos[entity_id]) == 2
+    assert "p/doc.pdf" not in storage.reads
+
+
+def test_eviction_spares_recently_used_entries(tmp_path):
+    cache = ReportImageCache(tmp_path, max_bytes=4, min_age_seconds=3600)
+    cache._store(cache._path("a"), b"1234")
+    cache._store(cache._path("b"), b"5678")
+
+    assert cache._path("a").exists() and cache._path("b").exists()
+
+
+def test_eviction_scans_at_most_once_per_interval(tmp_path, monkeypatch):
+    cache = ReportImageCache(tmp_path, max_bytes=4, min_age_seconds=0)
+    scans = []
+    monkeypatch.setattr(cache, "_evict", lambda: scans.append(1))
+
+    for name in "abc":
+        cache._store(cache._path(name), b"1234")
+
+    assert len(scans) == 1
+
+
+async def test_deleting_derivatives_skips_missing_renditions_and_logs_failures(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(image_derivative_service.logger, "warning", lambda *args: warnings.append(args))
+    first, *others = RENDITIONS
+    storage = MemoryStorage({derivative_path("photo.jpg", rendition): b"x" for rendition in others})
+    await delete_derivatives(storage, "photo.jpg")
+    assert storage.files == {}
+    assert not warnings
+
+    class FailingStorage(MemoryStorage):
+        async def delete_file(self, storage_path: str) -> None:
+            raise RuntimeError("permission denied")
+
+    await delete_derivatives(FailingStorage({}), "photo.jpg")
+    assert len(warnings) == len(RENDITIONS)
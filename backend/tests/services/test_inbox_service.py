@@ -0,0 +1,213 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.approval import ApprovalRequest, ApprovalStep
+from app.models.contact import Contact
+from app.models.defect import Defect, DefectAssignee
+from app.models.inbox_count import UserInboxCount
+from app.models.meeting import Meeting, MeetingAttendee
+from app.models.project import Project, ProjectMember
+from app.models.rfi import RFI
+from app.models.task import Task
+from app.models.user import User
+from app.services.inbox_service import get_inbox, get_inbox_counts
+from app.utils import utcnow
+
+
+@pytest.fixture
+async def sessions():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements: list[str] = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), statements
+    await engine.dispose()
+
+
+@pytest.fixture
+async def inbox(sessions):
+    factory, statements = sessions
+    today = utcnow().date()
+    async with factory() as db:
+        user = User(email=f"{uuid.uuid4().hex}@test.com", full_name="Tester")
+        project = Project(name="Tower")
+        db.add_all([user, project])
+        await db.flush()
+        contact = Contact(project_id=project.id, contact_type="contractor", contact_name="Tester", user_id=user.id)
+        db.add_all([ProjectMember(project_id=project.id, user_id=user.id, role="contractor"), contact])
+        await db.flush()
+
+        def task(title, due):
+            return Task(
+                project_id=project.id, task_number=1, title=title, assignee_id=user.id,
+                created_by_id=user.id, due_date=due,
+            )
+
+        meeting = Meeting(project_id=project.id, title="Site walk", scheduled_date=utcnow() + timedelta(days=2))
+        defect = Defect(
+            project_id=project.id, defect_number=7, category="concrete", description="Crack",
+            severity="high", created_by_id=user.id,
+        )
+        approval = ApprovalRequest(project_id=project.id, entity_type="equipment", entity_id=uuid.uuid4())
+        db.add_all([
+            task("later", today + timedelta(days=5)),
+            task("overdue", today - timedelta(days=1)),
+            task("today", today),
+            task("undated", None),
+            RFI(
+                project_id=project.id, rfi_number="RFI-2026-0001", subject="Rebar spacing", question="?",
+                to_email="eng@test.com", created_by_id=user.id, assigned_to_id=user.id, status="open",
+                due_date=utcnow() + timedelta(days=1),
+            ),
+            meeting, defect, approval,
+        ])
+        await db.flush()
+        db.add_all([
+            MeetingAttendee(meeting_id=meeting.id, user_id=user.id, attendance_status="pending"),
+            DefectAssignee(defect_id=defect.id, contact_id=contact.id),
+            ApprovalStep(
+                approval_request_id=approval.id, step_order=1, approver_role="consultant",
+                contact_id=contact.id, status="pending",
+            ),
+        ])
+        await db.commit()
+    statements.clear()
+    return user, project
+
+
+@pytest.mark.asyncio
+async def test_inbox_orders_overdue_first_and_pages_with_cursor(sessions, inbox):
+    factory, _ = sessions
+    user, _ = inbox
+
+    async with factory() as db:
+        full = await get_inbox(db, user.id, limit=50)
+        first = await get_inbox(db, user.id, limit=3)
+        rest = await get_inbox(db, user.id, limit=50, cursor=first.next_cursor)
+
+    assert full.counts.total == 8
+    assert full.next_cursor is None
+    assert [getattr(i, "title", None) for i in full.items[:2]] == ["overdue", "today"]
+    assert full.items[2].entity_type == "rfi" and full.items[2].rfi_number == "RFI-2026-0001"
+    assert first.next_cursor is not None
+    assert [i.id for i in first.items + rest.items] == [i.id for i in full.items]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(sessions, inbox):
+    factory, _ = sessions
+    user, _ = inbox
+
+    async with factory() as db:
+        with pytest.raises(ValueError):
+            await get_inbox(db, user.id, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_badge_count_is_materialized_and_invalidated_on_write(sessions, inbox):
+    factory, statements = sessions
+    user, project = inbox
+
+    async with factory() as db:
+        counts = await get_inbox_counts(db, user.id, store=True)
+        await db.commit()
+    assert (counts.task_count, counts.total) == (4, 8)
+
+    statements.clear()
+    async with factory() as db:
+        cached = await get_inbox_counts(db, user.id, store=True)
+    assert cached == counts
+    assert not any("UNION ALL" in s for s in statements)
+
+    async with factory() as db:
+        db.add(Task(project_id=project.id, task_number=2, title="new", assignee_id=user.id, created_by_id=user.id))
+        await db.commit()
+        assert await db.get(UserInboxCount, user.id) is None
+        assert (await get_inbox_counts(db, user.id, store=True)).task_count == 5
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_drops_materialized_counts(sessions, inbox):
+    factory, _ = sessions
+    user, project = inbox
+
+    async with factory() as db:
+        await get_inbox_counts(db, user.id, store=True)
+        await db.commit()
+    async with factory() as db:
+        await db.execute(update(Task).where(Task.project_id == project.id).values(status="completed"))
+        await db.commit()
+        assert await db.get(UserInboxCount, user.id) is None
+        assert (await get_inbox_counts(db, user.id)).task_count == 0
+
+
+async def stored_count(db, user):
+    return await db.get(UserInboxCount, user.id, populate_existing=True)
+
+
+@pytest.mark.asyncio
+async def test_writes_only_drop_the_counts_of_affected_users(sessions, inbox):
+    factory, _ = sessions
+    user, project = inbox
+
+    async with factory() as db:
+        other = User(email=f"{uuid.uuid4().hex}@test.com", full_name="Other")
+        db.add(other)
+        await db.flush()
+        db.add(ProjectMember(project_id=project.id, user_id=other.id, role="contractor"))
+        await db.commit()
+        await get_inbox_counts(db, user.id, store=True)
+        await get_inbox_counts(db, other.id, store=True)
+        await db.commit()
+
+        task = Task(project_id=project.id, task_number=3, title="mine", assignee_id=other.id, created_by_id=user.id)
+        db.add(task)
+        await db.commit()
+        assert await stored_count(db, user) is not None
+        assert await stored_count(db, other) is None
+
+        await get_inbox_counts(db, other.id, store=True)
+        await db.commit()
+        task.title = "renamed"
+        await db.commit()
+        assert await stored_count(db, other) is not None
+
+        task.assignee_id = user.id
+        await db.commit()
+        assert await stored_count(db, user) is None
+        assert await stored_count(db, other) is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_reassignment_drops_old_and_new_assignees(sessions, inbox):
+    factory, _ = sessions
+    user, project = inbox
+
+    async with factory() as db:
+        other = User(email=f"{uuid.uuid4().hex}@test.com", full_name="Other")
+        bystander = User(email=f"{uuid.uuid4().hex}@test.com", full_name="Bystander")
+        db.add_all([other, bystander])
+        await db.flush()
+        db.add_all([
+            ProjectMember(project_id=project.id, user_id=other.id, role="contractor"),
+            ProjectMember(project_id=project.id, user_id=bystander.id, role="contractor"),
+        ])
+        await db.commit()
+        for member in (user, other, bystander):
+            await get_inbox_counts(db, member.id, store=True)
+        await db.commit()
+
+        await db.execute(update(Task).where(Task.assignee_id == user.id).values(assignee_id=other.id))
+        await db.commit()
+
+        assert await stored_count(db, user) is None
+        assert await stored_count(db, other) is None
+        assert await stored_count(db, bystander) is not None
+        assert (await get_inbox_counts(db, other.id)).task_count == 4
@@ -0,0 +1,121 @@
+import uuid
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.core.metrics import metrics
+from app.services.integration_http import CircuitOpenError, IntegrationClient, SyncIntegrationClient, Upstream
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "integration_http_retry_backoff_seconds", 0.0)
+    monkeypatch.setattr(settings, "integration_http_max_retries", 2)
+    monkeypatch.setattr(settings, "integration_breaker_failure_threshold", 3)
+    monkeypatch.setattr(settings, "integration_breaker_reset_seconds", 60.0)
+
+
+def upstream() -> Upstream:
+    # Breakers are shared per name, so every test gets its own upstream
+    return Upstream(f"test-{uuid.uuid4().hex[:8]}", "https://upstream.example.com", http2=False)
+
+
+def scripted(statuses: list[int]):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1], json={"ok": True})
+
+    return calls, httpx.MockTransport(handler)
+
+
+def latency_count(name: str) -> int:
+    series = metrics.snapshot()["histograms"].get("integration_http_latency_ms", [])
+    return sum(s["count"] for s in series if s["labels"]["upstream"] == name)
+
+
+async def test_idempotent_request_retries_transient_failures():
+    calls, transport = scripted([503, 429, 200])
+    target = upstream()
+    client = IntegrationClient(target, transport=transport)
+
+    response = await client.get("/items")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert latency_count(target.name) == 3
+    await client.aclose()
+
+
+async def test_post_is_not_retried_unless_asked():
+    calls, transport = scripted([503, 200])
+    client = IntegrationClient(upstream(), transport=transport)
+
+    assert (await client.post("/items")).status_code == 503
+    assert calls == ["POST"]
+    await client.aclose()
+
+
+async def test_post_is_retried_when_asked():
+    calls, transport = scripted([503, 200])
+    client = IntegrationClient(upstream(), transport=transport)
+
+    assert (await client.post("/token", retry=True)).status_code == 200
+    assert calls == ["POST", "POST"]
+    await client.aclose()
+
+
+async def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    calls, transport = scripted([500])
+    target = upstream()
+    client = IntegrationClient(target, transport=transport)
+
+    assert (await client.get("/items")).status_code == 500
+    with pytest.raises(CircuitOpenError):
+        await client.get("/items")
+
+    assert len(calls) == 3
+    assert client.breaker.is_open
+    await client.aclose()
+
+
+async def test_breaker_closes_after_a_successful_trial():
+    calls, transport = scripted([500, 500, 500, 200])
+    client = IntegrationClient(upstream(), transport=transport)
+    await client.get("/items")
+    assert client.breaker.is_open
+
+    client.breaker.opened_at -= client.breaker.reset_seconds
+    assert (await client.get("/items")).status_code == 200
+    assert not client.breaker.is_open
+    await client.aclose()
+
+
+def test_client_errors_do_not_trip_the_breaker():
+    calls, transport = scripted([404])
+    client = SyncIntegrationClient(upstream(), transport=transport)
+
+    for _ in range(5):
+        assert client.get("/missing").status_code == 404
+
+    assert len(calls) == 5
+    assert not client.breaker.is_open
+    client.close()
+
+
+def test_transport_errors_are_retried_then_raised():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    client = SyncIntegrationClient(upstream(), transport=httpx.MockTransport(handler))
+
+    with pytest.raises(httpx.ConnectError):
+        client.get("/health")
+    assert len(attempts) == 3
+    client.close()
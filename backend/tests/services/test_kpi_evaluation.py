@@ -0,0 +1,127 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.config import get_settings
+from app.db.session import Base
+from app.models.analytics import CustomKpiDefinition, KpiSnapshot
+from app.models.budget import BudgetLineItem, CostEntry
+from app.models.defect import Defect
+from app.models.project import Project
+from app.services import analytics_service
+from app.services.analytics_service import compute_kpi_values, record_all_kpi_snapshots, record_kpi_snapshots
+from app.utils import utcnow
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'kpi.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+def kpi(project_id, entity_type, calculation="count", **fields) -> CustomKpiDefinition:
+    return CustomKpiDefinition(
+        project_id=project_id, name=f"{entity_type} {calculation}", kpi_type="metric",
+        entity_type=entity_type, calculation=calculation, created_by_id=uuid.uuid4(), is_active=True,
+        created_at=utcnow(), updated_at=utcnow(), **fields,
+    )
+
+
+@pytest.fixture
+async def kpis(db):
+    tower, annex = Project(name="Tower"), Project(name="Annex")
+    db.add_all([tower, annex])
+    await db.flush()
+    creator = uuid.uuid4()
+    for project, statuses in ((tower, ["open", "open", "closed"]), (annex, ["open"])):
+        for number, status in enumerate(statuses, 1):
+            db.add(Defect(
+                project_id=project.id, defect_number=number, category="paint", severity="low",
+                description="chip", status=status, created_by_id=creator,
+            ))
+    item = BudgetLineItem(
+        project_id=tower.id, name="Concrete", category="structure", budgeted_amount=Decimal("500"),
+        created_by_id=creator,
+    )
+    db.add(item)
+    await db.flush()
+    for amount in ("100", "300"):
+        db.add(CostEntry(
+            budget_item_id=item.id, project_id=tower.id, amount=Decimal(amount), entry_date=date(2025, 1, 1),
+            created_by_id=creator,
+        ))
+
+    definitions = {
+        "defects": kpi(tower.id, "defect"),
+        "open_defects": kpi(tower.id, "defect", filter_config={"status": "open"}),
+        "closed_defects": kpi(tower.id, "defect", filter_config={"status": "closed"}),
+        "defect_numbers": kpi(tower.id, "defect", "sum", field_name="defect_number"),
+        "spend": kpi(tower.id, "budget", "sum"),
+        "average_spend": kpi(tower.id, "budget", "average"),
+        "line_items": kpi(tower.id, "budget"),
+        "unknown_field": kpi(tower.id, "defect", "sum", field_name="missing"),
+        "unknown_entity": kpi(tower.id, "widget"),
+        "annex_defects": kpi(annex.id, "defect"),
+    }
+    db.add_all(definitions.values())
+    await db.commit()
+    return tower, annex, definitions
+
+
+async def test_kpis_share_one_query_per_source_and_project(db, engine, kpis):
+    _, _, definitions = kpis
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    values = await compute_kpi_values(db, list(definitions.values()))
+
+    assert {name: values[definition.id] for name, definition in definitions.items()} == {
+        "defects": 3.0,
+        "open_defects": 2.0,
+        "closed_defects": 1.0,
+        "defect_numbers": 6.0,
+        "spend": 400.0,
+        "average_spend": 200.0,
+        "line_items": 1.0,
+        "unknown_field": 0.0,
+        "unknown_entity": 0.0,
+        "annex_defects": 1.0,
+    }
+    # Tower defects, tower cost entries, tower line items, annex defects
+    assert len(statements) == 4
+
+
+async def test_snapshots_upsert_per_day(db, engine, kpis, monkeypatch):
+    tower, annex, definitions = kpis
+    assert await record_kpi_snapshots(db, tower.id) == 9
+    await db.commit()
+
+    db.add(Defect(
+        project_id=tower.id, defect_number=4, category="paint", severity="low",
+        description="chip", created_by_id=uuid.uuid4(),
+    ))
+    await db.commit()
+    monkeypatch.setattr(analytics_service, "AsyncSessionLocal", async_sessionmaker(engine, class_=AsyncSession))
+    monkeypatch.setattr(get_settings(), "kpi_snapshot_batch_size", 1)
+    summary = await record_all_kpi_snapshots()
+    assert summary == {"projects": 2, "snapshots": 10, "failed_batches": 0}
+
+    rows = (await db.execute(select(KpiSnapshot.kpi_id, KpiSnapshot.value))).all()
+    assert len(rows) == 10
+    snapshots = dict(rows)
+    assert snapshots[definitions["defects"].id] == 4.0
+    assert snapshots[definitions["annex_defects"].id] == 1.0
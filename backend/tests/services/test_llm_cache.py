@@ -0,0 +1,142 @@
+from datetime import timedelta
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.metrics import metrics
+from app.models.llm_response_cache import LLMResponseCache
+from app.services.llm_cache_service import (
+    LLMCacheBackend,
+    PostgresLLMCache,
+    build_cache_key,
+    file_sha256,
+    get_or_compute,
+    prompt_version,
+)
+from app.utils import utcnow
+
+
+class InMemoryLLMCache(LLMCacheBackend):
+    def __init__(self):
+        self.entries: dict[str, tuple[str, str, dict]] = {}
+
+    async def get(self, key: str, file_hash: str, analysis_type: str) -> Optional[dict]:
+        entry = self.entries.get(key)
+        return entry[2] if entry else None
+
+    async def set(self, key, value, file_hash, analysis_type, model, prompt_ver, language=None) -> None:
+        self.entries[key] = (file_hash, analysis_type, value)
+
+    async def invalidate(self, file_hash=None, analysis_type=None) -> int:
+        doomed = [
+            k for k, (fh, at, _) in self.entries.items()
+            if (file_hash is None or fh == file_hash) and (analysis_type is None or at == analysis_type)
+        ]
+        for k in doomed:
+            del self.entries[k]
+        return len(doomed)
+
+
+@pytest.fixture
+def memory_cache():
+    cache = InMemoryLLMCache()
+    with patch("app.services.llm_cache_service.get_llm_cache", return_value=cache):
+        yield cache
+    metrics.reset()
+
+
+@pytest.fixture
+async def pg_cache():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(LLMResponseCache.__table__.create)
+    yield PostgresLLMCache(
+        ttl_seconds=60,
+        max_entries=2,
+        session_factory=async_sessionmaker(engine, expire_on_commit=False),
+    )
+    await engine.dispose()
+
+
+def test_cache_key_changes_with_every_component():
+    base = build_cache_key("a" * 64, "title_block", "gemini", "v1", "he")
+    assert base != build_cache_key("b" * 64, "title_block", "gemini", "v1", "he")
+    assert base != build_cache_key("a" * 64, "defect_image", "gemini", "v1", "he")
+    assert base != build_cache_key("a" * 64, "title_block", "other", "v1", "he")
+    assert base != build_cache_key("a" * 64, "title_block", "gemini", "v2", "he")
+    assert base != build_cache_key("a" * 64, "title_block", "gemini", "v1", "en")
+    assert prompt_version("prompt") != prompt_version("prompt edited")
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_reuses_result_for_identical_bytes(memory_cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"result": {"summary": "ok"}, "processing_time_ms": 900}
+
+    first = await get_or_compute(b"drawing", "document_summarize", "gemini", "v1", compute)
+    second = await get_or_compute(b"drawing", "document_summarize", "gemini", "v1", compute)
+
+    assert len(calls) == 1
+    assert first["result"] == second["result"]
+    assert second["processing_time_ms"] < 900
+    counters = metrics.snapshot()["counters"]
+    assert counters["llm_cache_hits_total"][0]["value"] == 1
+    assert counters["llm_cache_misses_total"][0]["value"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_skips_results_rejected_by_should_cache(memory_cache):
+    async def compute():
+        return {"success": False}
+
+    await get_or_compute(b"drawing", "title_block", "gemini", "v1", compute, should_cache=lambda r: r["success"])
+
+    assert memory_cache.entries == {}
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_treats_cache_errors_as_miss(memory_cache):
+    async def broken(*args, **kwargs):
+        raise ConnectionError("cache down")
+
+    async def compute():
+        return {"result": 1}
+
+    with patch.object(memory_cache, "get", broken), patch.object(memory_cache, "set", broken):
+        assert await get_or_compute(b"x", "quantities", "gemini", "v1", compute) == {"result": 1}
+
+
+@pytest.mark.asyncio
+async def test_postgres_cache_round_trip_and_invalidate(pg_cache):
+    file_hash = file_sha256(b"plan")
+    key = build_cache_key(file_hash, "title_block", "gemini", "v1")
+    await pg_cache.set(key, {"metadata": {"scale": "1:50"}}, file_hash, "title_block", "gemini", "v1")
+
+    assert await pg_cache.get(key, file_hash, "title_block") == {"metadata": {"scale": "1:50"}}
+    assert await pg_cache.invalidate(file_hash=file_hash) == 1
+    assert await pg_cache.get(key, file_hash, "title_block") is None
+
+
+@pytest.mark.asyncio
+async def test_postgres_cache_expires_and_evicts_least_recently_used(pg_cache):
+    keys = []
+    for i in range(3):
+        file_hash = file_sha256(f"plan-{i}".encode())
+        key = build_cache_key(file_hash, "quantities", "gemini", "v1")
+        keys.append((key, file_hash))
+        await pg_cache.set(key, {"n": i}, file_hash, "quantities", "gemini", "v1")
+
+    # max_entries=2: the first (least recently used) entry has been evicted
+    assert await pg_cache.get(keys[0][0], keys[0][1], "quantities") is None
+    assert await pg_cache.get(keys[2][0], keys[2][1], "quantities") == {"n": 2}
+
+    async with pg_cache.session_factory() as session:
+        entry = await session.get(LLMResponseCache, keys[2][0])
+        entry.expires_at = utcnow() - timedelta(seconds=1)
+        await session.commit()
+    assert await pg_cache.get(keys[2][0], keys[2][1], "quantities") is None
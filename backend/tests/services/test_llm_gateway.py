@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import errors as genai_errors
+
+from app.core.metrics import metrics
+from app.services.llm_gateway import LLMGateway
+
+
+def make_response(text: str = "{}", prompt_tokens: int = 12, output_tokens: int = 34):
+    return SimpleNamespace(
+        text=text,
+        usage_metadata=SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=output_tokens),
+    )
+
+
+@pytest.fixture
+def gateway():
+    with patch("app.services.llm_gateway.genai") as mock_genai:
+        mock_client = MagicMock()
+        mock_client.aio.models.generate_content = AsyncMock()
+        mock_genai.Client.return_value = mock_client
+        gw = LLMGateway(api_key="test-key", max_concurrency=2, timeout_seconds=5, max_retries=2, retry_backoff_seconds=0)
+        yield gw, mock_client.aio.models.generate_content
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_generate_content_records_metrics(gateway):
+    gw, generate = gateway
+    generate.return_value = make_response()
+
+    response = await gw.generate_content(["prompt"], model="gemini-test", operation="unit")
+
+    assert response.text == "{}"
+    generate.assert_awaited_once_with(model="gemini-test", contents=["prompt"], config=None)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["llm_calls_total"][0]["value"] == 1
+    assert snapshot["counters"]["llm_prompt_tokens_total"][0]["value"] == 12
+    assert snapshot["counters"]["llm_output_tokens_total"][0]["value"] == 34
+    assert snapshot["histograms"]["llm_latency_ms"][0]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_content_retries_transient_errors(gateway):
+    gw, generate = gateway
+    generate.side_effect = [
+        genai_errors.ServerError(503, {"error": {"message": "unavailable"}}),
+        make_response("ok"),
+    ]
+
+    response = await gw.generate_content(["prompt"], model="gemini-test", operation="unit")
+
+    assert response.text == "ok"
+    assert generate.await_count == 2
+    assert metrics.snapshot()["counters"]["llm_retries_total"][0]["value"] == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_content_does_not_retry_client_errors(gateway):
+    gw, generate = gateway
+    generate.side_effect = genai_errors.ClientError(400, {"error": {"message": "bad request"}})
+
+    with pytest.raises(genai_errors.ClientError):
+        await gw.generate_content(["prompt"], model="gemini-test", operation="unit")
+    assert generate.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_content_gives_up_after_max_retries(gateway):
+    gw, generate = gateway
+    generate.side_effect = genai_errors.ClientError(429, {"error": {"message": "rate limited"}})
+
+    with pytest.raises(genai_errors.ClientError):
+        await gw.generate_content(["prompt"], model="gemini-test", operation="unit")
+    assert generate.await_count == 3
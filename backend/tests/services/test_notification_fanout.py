@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.notification import Notification, UrgencyLevel
+from app.models.notification_interaction import InteractionType, NotificationInteraction
+from app.models.user import User
+from app.services import notification_service
+from app.services.notification_service import notify_users
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    deliveries = []
+    monkeypatch.setattr(notification_service, "enqueue_deliveries", deliveries.extend)
+    return deliveries
+
+
+@pytest.fixture
+async def users(db):
+    doer = User(email="doer@example.com", language="he", whatsapp_number="+972501234567", whatsapp_verified=True)
+    dismisser = User(email="dismisser@example.com", whatsapp_number="+12125551234")
+    newcomer = User(email="newcomer@example.com")
+    db.add_all([doer, dismisser, newcomer])
+    await db.flush()
+    past = Notification(user_id=doer.id, category="defect", title="Old", message="Old")
+    db.add(past)
+    await db.flush()
+    for user, interaction in ((doer, InteractionType.ACTED_UPON), (dismisser, InteractionType.DISMISSED)):
+        db.add_all([
+            NotificationInteraction(notification_id=past.id, user_id=user.id, interaction_type=interaction.value)
+            for _ in range(5)
+        ])
+    await db.commit()
+    return doer, dismisser, newcomer
+
+
+async def test_fan_out_scores_and_inserts_in_one_query_each(db, engine, users, enqueued):
+    doer, dismisser, newcomer = users
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    await notify_users(
+        db, users, "defect", "Crack", "Crack found in slab", entity_type="defect",
+        action_url="https://example.com/defects/1", project_name="Tower",
+    )
+
+    assert len(statements) == 2
+    # One INSERT carrying all three rows
+    assert statements[1].startswith("INSERT INTO notifications")
+    assert statements[1].count("), (") == 2
+    assert enqueued == []
+    await db.commit()
+
+    urgencies = dict((await db.execute(
+        select(Notification.user_id, Notification.urgency).where(Notification.title == "Crack")
+    )).all())
+    assert urgencies == {
+        doer.id: UrgencyLevel.HIGH.value,
+        dismisser.id: UrgencyLevel.LOW.value,
+        newcomer.id: UrgencyLevel.MEDIUM.value,
+    }
+    assert [(channel, payload.get("to_email") or payload["to_whatsapp"]) for channel, payload in enqueued] == [
+        ("whatsapp", "+972501234567"),
+        ("email", "doer@example.com"),
+        ("email", "dismisser@example.com"),
+        ("email", "newcomer@example.com"),
+    ]
+    assert enqueued[0][1]["language"] == "he"
+
+
+async def test_rolled_back_notifications_are_not_delivered(db, users, enqueued):
+    await notify_users(db, users, "general", "Update", "Schedule moved")
+    await db.rollback()
+    await db.commit()
+
+    assert enqueued == []
+    assert (await db.execute(select(Notification).where(Notification.title == "Update"))).first() is None
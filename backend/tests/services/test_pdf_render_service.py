@@ -0,0 +1,133 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.config import get_settings
+from app.db.session import Base
+from app.models.defect import Defect
+from app.models.export_job import ExportJob, ExportStatus
+from app.models.project import Project
+from app.models.user import User
+from app.services import pdf_render_service
+from app.services.pdf_render_service import (
+    PdfRenderTimeout,
+    PdfTooLargeError,
+    RenderedPdfCache,
+    render_pdf,
+    rendered_pdfs,
+    run_pdf_job,
+    submit_pdf_job,
+)
+from app.services.storage_service import LocalStorageBackend
+from app.worker.tasks.pdf_reports import render_report_pdf_task
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    async def fake_render(html, base_url, timeout_seconds):
+        calls.append(html)
+        await asyncio.sleep(0.01)
+        return f"%PDF {html}".encode()
+
+    monkeypatch.setattr(pdf_render_service, "_render", fake_render)
+    rendered_pdfs.clear()
+    yield calls
+    rendered_pdfs.clear()
+
+
+async def test_identical_reports_render_once(renders):
+    first, second = await asyncio.gather(render_pdf("<p>a</p>"), render_pdf("<p>a</p>"))
+    third = await render_pdf("<p>a</p>")
+
+    assert first == second == third == b"%PDF <p>a</p>"
+    assert renders == ["<p>a</p>"]
+
+
+async def test_changed_context_renders_again(renders):
+    await render_pdf("<p>a</p>")
+    await render_pdf("<p>b</p>")
+
+    assert renders == ["<p>a</p>", "<p>b</p>"]
+
+
+async def test_oversized_html_is_refused_before_rendering(renders, monkeypatch):
+    monkeypatch.setattr(get_settings(), "pdf_render_max_html_bytes", 8)
+
+    with pytest.raises(PdfTooLargeError):
+        await render_pdf("<p>too long</p>")
+    assert renders == []
+
+
+async def test_timed_out_render_leaves_the_pool_to_other_callers(monkeypatch):
+    async def hung(fn, *args):
+        await asyncio.sleep(1)
+
+    shutdowns = []
+    monkeypatch.setattr(pdf_render_service, "WORKER_EXIT_GRACE_SECONDS", 0)
+    monkeypatch.setattr(pdf_render_service.render_pool, "run", hung)
+    monkeypatch.setattr(pdf_render_service.render_pool, "shutdown", lambda: shutdowns.append(1))
+
+    with pytest.raises(PdfRenderTimeout):
+        await pdf_render_service._render("<p>a</p>", "", 0.01)
+    assert not shutdowns
+
+
+def test_cache_evicts_oldest_beyond_its_size_budget():
+    cache = RenderedPdfCache(ttl_seconds=60, max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"12345"
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def test_queued_report_is_rebuilt_from_ids_in_the_worker(renders, session_factory, tmp_path, monkeypatch):
+    queued = []
+    monkeypatch.setattr(render_report_pdf_task, "delay", lambda *args: queued.append(args))
+    async with session_factory() as db:
+        user = User(email="pm@example.com", full_name="PM")
+        project = Project(name="Tower")
+        db.add_all([user, project])
+        await db.flush()
+        defects = [
+            Defect(
+                project_id=project.id, defect_number=n, category="plumbing", description=f"Leak {n}",
+                severity="high", created_by_id=user.id,
+            )
+            for n in (1, 2)
+        ]
+        db.add_all(defects)
+        await db.flush()
+        job = await submit_pdf_job(db, project.id, user.id, "defects", [d.id for d in defects], "defects.pdf", "en")
+
+    [(job_id, report, entity_ids, language, filename)] = queued
+    assert (job_id, report, sorted(entity_ids)) == (str(job.id), "defects", sorted(str(d.id) for d in defects))
+
+    storage = LocalStorageBackend(str(tmp_path))
+    await run_pdf_job(
+        job.id, report, [uuid.UUID(i) for i in entity_ids], language, filename,
+        session_factory=session_factory, storage=storage,
+    )
+
+    async with session_factory() as db:
+        job = await db.get(ExportJob, job.id)
+    assert job.status == ExportStatus.COMPLETED
+    pdf = await storage.get_file_content(job.file_path)
+    assert pdf.startswith(b"%PDF") and b"Leak 2" in pdf and pdf.index(b"Leak 2") < pdf.index(b"Leak 1")
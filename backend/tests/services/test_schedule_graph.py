@@ -0,0 +1,157 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.project import Project
+from app.models.task import Task, TaskDependency
+from app.services.schedule_graph import ScheduleGraph, schedule_graphs
+from app.services.schedule_risk_service import calculate_critical_path, simulate_task_delay
+
+
+def assert_same_schedule(graph: ScheduleGraph, expected: ScheduleGraph):
+    assert graph.schedule.total_duration == pytest.approx(expected.schedule.total_duration)
+    for task_id, node in expected.index.items():
+        other = graph.index[task_id]
+        for field in ("earliest_start", "earliest_finish", "latest_start", "latest_finish"):
+            assert getattr(graph.schedule, field)[other] == pytest.approx(getattr(expected.schedule, field)[node])
+
+
+def test_incremental_updates_match_full_rebuild():
+    rng = random.Random(7)
+    task_ids = [uuid.uuid4() for _ in range(300)]
+    durations = {task_id: float(rng.randint(1, 20)) for task_id in task_ids}
+    edges = {
+        (task_ids[i], task_ids[j])
+        for j in range(1, len(task_ids))
+        for i in rng.sample(range(j), min(j, rng.randint(0, 3)))
+    }
+    graph = ScheduleGraph(task_ids, [durations[t] for t in task_ids], [None] * len(task_ids), edges)
+
+    def rebuilt():
+        return ScheduleGraph(task_ids, [durations[t] for t in task_ids], [None] * len(task_ids), edges)
+
+    for step in range(200):
+        action = rng.random()
+        if action < 0.5:
+            task_id = rng.choice(task_ids)
+            durations[task_id] = float(rng.randint(1, 30))
+            graph.set_task(task_id, durations[task_id], None)
+        elif action < 0.75:
+            source, target = sorted(rng.sample(range(len(task_ids)), 2))
+            edge = (task_ids[source], task_ids[target])
+            edges.add(edge)
+            graph.add_dependency(edge[1], edge[0])
+        elif action < 0.95 and edges:
+            edge = rng.choice(sorted(edges))
+            edges.discard(edge)
+            graph.remove_dependency(edge[1], edge[0])
+        else:
+            task_id = uuid.uuid4()
+            task_ids.append(task_id)
+            durations[task_id] = float(rng.randint(1, 10))
+            graph.set_task(task_id, durations[task_id], None)
+        assert_same_schedule(graph, rebuilt())
+
+    assert graph.acyclic
+    assert graph.critical_path() == rebuilt().critical_path()
+
+
+def test_cycles_are_ordered_like_a_full_rebuild():
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+    graph = ScheduleGraph([a, b, c, d], [2.0, 3.0, 4.0, 1.0], [None] * 4, [(a, b), (b, c), (c, b), (c, d)])
+    assert not graph.acyclic
+    graph.set_task(c, 6.0, None)
+    graph.remove_dependency(b, c)
+
+    expected = ScheduleGraph([a, b, c, d], [2.0, 3.0, 6.0, 1.0], [None] * 4, [(a, b), (b, c), (c, d)])
+    assert graph.acyclic
+    assert_same_schedule(graph, expected)
+    assert graph.schedule.total_duration == 12.0
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    schedule_graphs.clear()
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    schedule_graphs.clear()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def chain(db):
+    """foundation (5d) -> frame (10d) -> roof (3d), plus a 2d side task."""
+    project = Project(name="Tower")
+    db.add(project)
+    await db.flush()
+    start = date(2025, 1, 1)
+    tasks = {}
+    for number, (title, days) in enumerate([("foundation", 5), ("frame", 10), ("roof", 3), ("signage", 2)], 1):
+        tasks[title] = Task(
+            project_id=project.id, task_number=number, title=title, created_by_id=uuid.uuid4(),
+            start_date=start, due_date=start + timedelta(days=days),
+        )
+        db.add(tasks[title])
+    await db.flush()
+    db.add(TaskDependency(task_id=tasks["frame"].id, depends_on_id=tasks["foundation"].id))
+    db.add(TaskDependency(task_id=tasks["roof"].id, depends_on_id=tasks["frame"].id))
+    await db.commit()
+    for task in tasks.values():
+        await db.refresh(task)
+    return project, tasks
+
+
+async def test_cached_graph_follows_committed_changes(db, chain):
+    project, tasks = chain
+    result = await calculate_critical_path(db, project.id)
+    assert result["total_duration"] == 18.0
+    assert [t["task_title"] for t in result["critical_tasks"]] == ["foundation", "frame", "roof"]
+    graph = await schedule_graphs.get(db, project.id)
+
+    tasks["signage"].due_date = tasks["signage"].start_date + timedelta(days=25)
+    await db.commit()
+    assert await schedule_graphs.get(db, project.id) is graph
+    result = await calculate_critical_path(db, project.id)
+    assert result["total_duration"] == 25.0
+    assert [t["task_title"] for t in result["critical_tasks"]] == ["signage"]
+
+    db.add(TaskDependency(task_id=tasks["signage"].id, depends_on_id=tasks["roof"].id))
+    await db.commit()
+    assert await schedule_graphs.get(db, project.id) is graph
+    assert graph.schedule.total_duration == 43.0
+
+    dependency = (await db.execute(
+        select(TaskDependency).where(TaskDependency.task_id == tasks["signage"].id)
+    )).scalar_one()
+    await db.delete(dependency)
+    await db.commit()
+    assert graph.schedule.total_duration == 25.0
+
+    await db.delete(tasks["signage"])
+    await db.commit()
+    fresh = await schedule_graphs.get(db, project.id)
+    assert fresh is not graph
+    assert fresh.schedule.total_duration == 18.0
+
+
+async def test_task_delay_reports_downstream_shift(db, chain):
+    project, tasks = chain
+    result = await simulate_task_delay(db, project.id, tasks["foundation"].id, 4.0)
+
+    assert result["scenario"]["delay_days"] == 4.0
+    assert result["scenario"]["total_duration"] == 22.0
+    assert {t["title"]: t["delay_days"] for t in result["affected_tasks"]} == {
+        "foundation": 4.0, "frame": 4.0, "roof": 4.0,
+    }
+    assert result["scenario"]["end_date"] - result["baseline"]["end_date"] == timedelta(days=4)
+    # The simulation leaves the cached schedule alone
+    assert (await schedule_graphs.get(db, project.id)).schedule.total_duration == 18.0
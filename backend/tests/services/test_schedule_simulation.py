@@ -0,0 +1,104 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.config import get_settings
+from app.db.session import Base
+from app.models.project import Project
+from app.models.task import Task, TaskDependency
+from app.services.schedule_graph import ScheduleGraph, schedule_graphs
+from app.services.schedule_risk_service import run_monte_carlo_simulation, simulation_pool
+from app.services.schedule_simulation import build_plan, simulate
+
+
+def test_zero_spread_reproduces_the_critical_path():
+    rng = random.Random(3)
+    task_ids = [uuid.uuid4() for _ in range(200)]
+    edges = {
+        (task_ids[i], task_ids[j])
+        for j in range(1, len(task_ids))
+        for i in rng.sample(range(j), min(j, rng.randint(0, 3)))
+    }
+    graph = ScheduleGraph(task_ids, [float(rng.randint(1, 15)) for _ in task_ids], [None] * len(task_ids), edges)
+    plan = build_plan(graph.order, graph.position, graph.pred_offsets, graph.pred_targets)
+
+    totals, critical = simulate(plan, np.array(graph.durations), np.zeros(len(graph)), 50)
+
+    assert np.allclose(totals, graph.schedule.total_duration)
+    assert set(np.flatnonzero(critical == 50)) == set(graph.critical_path())
+    assert not set(np.flatnonzero((critical > 0) & (critical < 50)))
+
+
+@pytest.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    schedule_graphs.clear()
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    schedule_graphs.clear()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def project(db):
+    """A 5-10-3 day chain beside a 17-day task, plus completed tasks that ran 50% over."""
+    project = Project(name="Tower")
+    db.add(project)
+    await db.flush()
+    start = date(2025, 3, 1)
+    creator = uuid.uuid4()
+    chain = []
+    for number, (title, days) in enumerate([("foundation", 5), ("frame", 10), ("roof", 3), ("fitout", 17)], 1):
+        task = Task(
+            project_id=project.id, task_number=number, title=title, created_by_id=creator,
+            start_date=start, due_date=start + timedelta(days=days),
+        )
+        db.add(task)
+        chain.append(task)
+    for number in range(5, 10):
+        db.add(Task(
+            project_id=project.id, task_number=number, title=f"done {number}", created_by_id=creator,
+            status="completed", estimated_hours=16, actual_hours=24 * (1 + (number % 2) / 5),
+            start_date=start, due_date=start + timedelta(days=1),
+        ))
+    await db.flush()
+    db.add(TaskDependency(task_id=chain[1].id, depends_on_id=chain[0].id))
+    db.add(TaskDependency(task_id=chain[2].id, depends_on_id=chain[1].id))
+    await db.commit()
+    return project
+
+
+async def test_history_skews_completion_percentiles(db, project):
+    result = await run_monte_carlo_simulation(db, project.id, iterations=2000, seed=11)
+
+    assert result["deterministic_duration"] == 18.0
+    # Completed work ran ~1.5x over plan, so the median lands well past the plan
+    assert 24.0 < result["p50_duration"] <= result["p80_duration"] <= result["p95_duration"]
+    assert result["project_start_date"] == date(2025, 3, 1)
+    assert result["p95_completion_date"] >= result["p50_completion_date"]
+    criticality = {task["task_title"]: task["criticality_index"] for task in result["task_criticality"]}
+    assert criticality["foundation"] == criticality["frame"] == criticality["roof"]
+    assert criticality["foundation"] + criticality["fitout"] == pytest.approx(1.0, abs=0.01)
+    assert criticality["foundation"] > 0.5
+
+    again = await run_monte_carlo_simulation(db, project.id, iterations=2000, seed=11)
+    assert again["p80_duration"] == result["p80_duration"]
+
+
+async def test_large_runs_use_the_process_pool(db, project, monkeypatch):
+    monkeypatch.setattr(get_settings(), "monte_carlo_process_pool_threshold", 1)
+    monkeypatch.setattr(get_settings(), "monte_carlo_workers", 2)
+    try:
+        result = await run_monte_carlo_simulation(db, project.id, iterations=1001, seed=5)
+    finally:
+        simulation_pool.shutdown()
+
+    assert result["iterations"] == 1001
+    assert 24.0 < result["p50_duration"] <= result["p95_duration"]
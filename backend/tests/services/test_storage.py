@@ -4,6 +4,7 @@ Unit tests for storage service backends.
 This module tests:
 - LocalStorageBackend: save_file, delete_file, get_file_url, get_file_content
 - S3StorageBackend: save_file, delete_file, get_file_url, get_file_content (with mocked boto3)
+- Streaming I/O: open_read (full and ranged), save_stream, get_file_size, S3 multipart uploads
 - Storage path generation utilities
 """
 
@@ -16,6 +17,8 @@ import pytest
 from fastapi import UploadFile
 
 from app.services.storage_service import (
+    MULTIPART_PART_SIZE,
+    GCSStorageBackend,
     LocalStorageBackend,
     S3StorageBackend,
     generate_storage_path,
@@ -47,11 +50,9 @@ def mock_upload_file():
         file.content_type = content_type
         file.size = len(content)
         buffer = BytesIO(content)
-        file.read = lambda: buffer.read() if buffer.seek(0) is None else buffer.read()
 
-        async def async_read():
-            buffer.seek(0)
-            return buffer.read()
+        async def async_read(size: int = -1):
+            return buffer.read(size)
 
         async def async_seek(pos):
             buffer.seek(pos)
@@ -644,6 +645,148 @@ class TestS3StorageBackend:
             assert client2 is client3
 
 
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+class TestStreamingStorage:
+    """Test suite for the chunked read/write API."""
+
+    @pytest.mark.asyncio
+    async def test_local_save_stream_and_open_read(self, temp_storage_dir: Path):
+        backend = LocalStorageBackend(str(temp_storage_dir))
+        size = await backend.save_stream(_chunks(b"abc", b"def", b"ghij"), "user/stream.bin")
+
+        assert size == 10
+        assert await backend.get_file_size("user/stream.bin") == 10
+        chunks = [chunk async for chunk in backend.open_read("user/stream.bin", chunk_size=4)]
+        assert chunks == [b"abcd", b"efgh", b"ij"]
+        assert not list((temp_storage_dir / "user").glob("*.part"))
+
+    @pytest.mark.asyncio
+    async def test_local_open_read_range(self, temp_storage_dir: Path):
+        backend = LocalStorageBackend(str(temp_storage_dir))
+        await backend.save_bytes(b"0123456789", "ranged.bin")
+
+        data = b"".join([c async for c in backend.open_read("ranged.bin", chunk_size=3, start=2, end=7)])
+        assert data == b"234567"
+        tail = b"".join([c async for c in backend.open_read("ranged.bin", start=8)])
+        assert tail == b"89"
+
+    @pytest.mark.asyncio
+    async def test_local_get_file_size_not_found(self, temp_storage_dir: Path):
+        backend = LocalStorageBackend(str(temp_storage_dir))
+        with pytest.raises(FileNotFoundError):
+            await backend.get_file_size("missing.bin")
+
+    @pytest.mark.asyncio
+    async def test_local_failed_stream_leaves_no_file(self, temp_storage_dir: Path):
+        backend = LocalStorageBackend(str(temp_storage_dir))
+
+        async def broken():
+            yield b"partial"
+            raise RuntimeError("client disconnected")
+
+        with pytest.raises(RuntimeError):
+            await backend.save_stream(broken(), "user/broken.bin")
+        assert not (temp_storage_dir / "user" / "broken.bin").exists()
+        assert not list((temp_storage_dir / "user").iterdir())
+
+    @pytest.fixture
+    def s3_backend(self):
+        with patch('app.services.storage_service.boto3') as mock_boto3:
+            mock_client = MagicMock()
+            mock_client.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+            mock_client.upload_part.side_effect = lambda **kw: {"ETag": f"etag-{kw['PartNumber']}"}
+            mock_boto3.client.return_value = mock_client
+            backend = S3StorageBackend("test-bucket", "us-east-1", "key", "secret")
+            _ = backend.client
+            yield backend, mock_client
+
+    @pytest.mark.asyncio
+    async def test_s3_save_stream_uses_multipart_for_large_objects(self, s3_backend):
+        backend, mock_client = s3_backend
+        part = b"x" * MULTIPART_PART_SIZE
+
+        size = await backend.save_stream(_chunks(part, part, b"tail"), "big.pdf", "application/pdf")
+
+        assert size == 2 * MULTIPART_PART_SIZE + 4
+        mock_client.put_object.assert_not_called()
+        assert mock_client.upload_part.call_count == 3
+        complete_kwargs = mock_client.complete_multipart_upload.call_args[1]
+        assert complete_kwargs["UploadId"] == "upload-1"
+        assert [p["PartNumber"] for p in complete_kwargs["MultipartUpload"]["Parts"]] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_s3_save_stream_aborts_multipart_on_error(self, s3_backend):
+        backend, mock_client = s3_backend
+
+        async def broken():
+            yield b"x" * MULTIPART_PART_SIZE
+            raise RuntimeError("upstream closed")
+
+        with pytest.raises(RuntimeError):
+            await backend.save_stream(broken(), "big.pdf")
+        mock_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test-bucket", Key="big.pdf", UploadId="upload-1"
+        )
+        mock_client.complete_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_s3_open_read_range(self, s3_backend):
+        backend, mock_client = s3_backend
+        body = BytesIO(b"3456")
+        mock_client.get_object.return_value = {"Body": body}
+
+        data = b"".join([c async for c in backend.open_read("doc.pdf", chunk_size=2, start=3, end=6)])
+
+        assert data == b"3456"
+        mock_client.get_object.assert_called_once_with(Bucket="test-bucket", Key="doc.pdf", Range="bytes=3-6")
+
+    @pytest.mark.asyncio
+    async def test_s3_save_bytes_puts_small_objects(self, s3_backend):
+        backend, mock_client = s3_backend
+
+        assert await backend.save_bytes(b"small", "note.txt", "text/plain") == 5
+        mock_client.put_object.assert_called_once_with(
+            Bucket="test-bucket", Key="note.txt", Body=b"small", ContentType="text/plain"
+        )
+
+    @pytest.mark.asyncio
+    async def test_gcs_open_read_range_uses_one_reader(self):
+        with patch('app.services.storage_service.gcs_storage') as mock_gcs:
+            blob = MagicMock()
+            blob.open.return_value = BytesIO(b"0123456789")
+            mock_gcs.Client.return_value.bucket.return_value.blob.return_value = blob
+            backend = GCSStorageBackend("test-bucket")
+
+            data = b"".join([c async for c in backend.open_read("doc.pdf", chunk_size=2, start=3, end=6)])
+
+        assert data == b"3456"
+        blob.open.assert_called_once_with("rb")
+        blob.download_as_bytes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_gcs_failed_stream_deletes_the_partial_blob(self):
+        with patch('app.services.storage_service.gcs_storage') as mock_gcs:
+            blob = MagicMock()
+            mock_gcs.Client.return_value.bucket.return_value.blob.return_value = blob
+            backend = GCSStorageBackend("test-bucket")
+
+            async def broken():
+                yield b"partial"
+                raise RuntimeError("client disconnected")
+
+            with pytest.raises(RuntimeError):
+                await backend.save_stream(broken(), "user/broken.bin")
+
+        writer = blob.open.return_value
+        writer.write.assert_called_once_with(b"partial")
+        writer.close.assert_called_once_with()
+        blob.delete.assert_called_once_with()
+
+
 class TestGenerateStoragePath:
     """Test suite for storage path generation utility."""
 
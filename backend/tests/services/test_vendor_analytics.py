@@ -0,0 +1,143 @@
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.budget import BudgetLineItem, CostEntry
+from app.models.equipment import Equipment
+from app.models.material import Material
+from app.models.project import Project
+from app.models.vendor import Vendor, VendorPerformance
+from app.services.vendor_analytics_service import (
+    get_all_vendors_analytics,
+    get_vendor_analytics,
+    vendor_leaderboard,
+)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    vendor_leaderboard.clear()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.fixture
+async def vendors(db):
+    project = Project(name="Tower")
+    concrete = Vendor(company_name="Concrete Co", trade="concrete", rating=4.5, certifications=["iso"])
+    steel = Vendor(company_name="Steel Co", trade="steel", is_verified=True)
+    glass = Vendor(company_name="Glass Co", trade="glazing", rating=3.0)
+    db.add_all([project, concrete, steel, glass])
+    await db.flush()
+    creator = uuid.uuid4()
+    item = BudgetLineItem(
+        project_id=project.id, name="Frame", category="structure", budgeted_amount=Decimal("2000"),
+        created_by_id=creator,
+    )
+    db.add(item)
+    await db.flush()
+    for vendor, amount in ((concrete, "100"), (concrete, "250.5"), (steel, "900")):
+        db.add(CostEntry(
+            budget_item_id=item.id, project_id=project.id, vendor_id=vendor.id, amount=Decimal(amount),
+            entry_date=date(2025, 1, 1), created_by_id=creator,
+        ))
+    db.add_all([
+        Material(project_id=project.id, name="Rebar", vendor_id=steel.id),
+        Material(project_id=project.id, name="Mix", vendor_id=concrete.id),
+        Material(project_id=project.id, name="Mesh", vendor_id=concrete.id),
+        Equipment(project_id=project.id, name="Mixer", vendor_id=concrete.id),
+        VendorPerformance(vendor_id=concrete.id, project_id=project.id, delivery_score=4, quality_score=5),
+        VendorPerformance(vendor_id=concrete.id, project_id=project.id, delivery_score=3, price_score=2),
+    ])
+    await db.commit()
+    return project, item, concrete, steel, glass
+
+
+async def test_vendor_analytics_are_aggregated_in_one_query(db, engine, vendors):
+    _, _, concrete, _, glass = vendors
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    analytics = await get_vendor_analytics(db, concrete.id)
+
+    assert len(statements) == 1
+    assert analytics == {
+        "vendor_id": concrete.id,
+        "company_name": "Concrete Co",
+        "total_spending": 350.5,
+        "materials_count": 2,
+        "equipment_count": 1,
+        "projects_count": 2,
+        "avg_delivery_score": 3.5,
+        "avg_quality_score": 5.0,
+        "avg_price_score": 2.0,
+        "overall_rating": 4.5,
+        "is_verified": False,
+        "certifications_count": 1,
+    }
+    assert (await get_vendor_analytics(db, glass.id))["total_spending"] == 0.0
+    assert await get_vendor_analytics(db, uuid.uuid4()) == {}
+
+
+async def test_leaderboard_sorts_and_pages_in_sql(db, vendors):
+    total, page = await get_all_vendors_analytics(db)
+    assert total == 3
+    assert [row["company_name"] for row in page] == ["Steel Co", "Concrete Co", "Glass Co"]
+
+    total, page = await get_all_vendors_analytics(db, sort_by="company_name", descending=False, limit=2, offset=1)
+    assert total == 3
+    assert [row["company_name"] for row in page] == ["Glass Co", "Steel Co"]
+
+    _, page = await get_all_vendors_analytics(db, sort_by="materials_count", limit=1)
+    assert page[0]["company_name"] == "Concrete Co"
+
+    with pytest.raises(ValueError):
+        await get_all_vendors_analytics(db, sort_by="vendor_id; drop table vendors")
+
+
+async def test_leaderboard_cache_is_dropped_by_committed_writes(db, engine, vendors):
+    project, item, _, steel, glass = vendors
+    project_id, item_id, steel_id, glass_id = project.id, item.id, steel.id, glass.id
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    first = await get_all_vendors_analytics(db)
+    assert await get_all_vendors_analytics(db) == first
+    assert len(statements) == 2
+
+    db.add(CostEntry(
+        budget_item_id=item_id, project_id=project_id, vendor_id=glass_id, amount=Decimal("5000"),
+        entry_date=date(2025, 1, 2), created_by_id=uuid.uuid4(),
+    ))
+    await db.flush()
+    # Pending writes are read through, and never cached
+    _, page = await get_all_vendors_analytics(db)
+    assert page[0]["company_name"] == "Glass Co"
+    await db.rollback()
+    assert await get_all_vendors_analytics(db) == first
+
+    await db.execute(update(Vendor).where(Vendor.id == glass_id).values(rating=5.0))
+    await db.commit()
+    _, page = await get_all_vendors_analytics(db, sort_by="overall_rating")
+    assert page[0]["vendor_id"] == glass_id
+
+    db.add(VendorPerformance(vendor_id=steel_id, project_id=project_id, quality_score=1))
+    await db.commit()
+    _, page = await get_all_vendors_analytics(db, sort_by="overall_rating")
+    steel_row = next(row for row in page if row["company_name"] == "Steel Co")
+    assert steel_row["projects_count"] == 1
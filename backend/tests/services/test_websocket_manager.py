@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.pubsub_broker import InMemoryBroker
+from app.services.websocket_manager import (
+    CHANNEL_PREFIX,
+    SLOW_CONSUMER_CLOSE_CODE,
+    ConnectionManager,
+)
+
+
+class FakeWebSocket:
+    def __init__(self, block: bool = False, broken: bool = False):
+        self.sent: list[dict] = []
+        self.broken = broken
+        self.closed_with = None
+        self._gate = asyncio.Event()
+        if not block:
+            self._gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self._gate.wait()
+        if self.broken:
+            raise RuntimeError("connection reset")
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def broker():
+    return InMemoryBroker()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_sockets_on_every_instance(broker):
+    instance_a, instance_b = ConnectionManager(broker), ConnectionManager(broker)
+    ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+    await instance_a.connect(ws_a, "p1")
+    await instance_b.connect(ws_b, "p1")
+
+    await instance_a.broadcast_to_project("p1", {"type": "notification"})
+    await drain()
+
+    assert ws_a.sent == [{"type": "notification"}]
+    assert ws_b.sent == [{"type": "notification"}]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_broker_messages_are_delivered_once(broker):
+    manager = ConnectionManager(broker)
+    ws = FakeWebSocket()
+    await manager.connect(ws, "p1")
+
+    envelope = json.dumps({"id": "m1", "origin": "other", "data": {"n": 1}})
+    await broker.publish(CHANNEL_PREFIX + "p1", envelope)
+    await broker.publish(CHANNEL_PREFIX + "p1", envelope)
+    await drain()
+
+    assert ws.sent == [{"n": 1}]
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_closed_without_blocking_others(broker, monkeypatch):
+    monkeypatch.setattr("app.services.websocket_manager.get_settings", lambda: type("S", (), {"websocket_send_queue_size": 2})())
+    manager = ConnectionManager(broker)
+    slow, fast = FakeWebSocket(block=True), FakeWebSocket()
+    await manager.connect(slow, "p1")
+    await manager.connect(fast, "p1")
+
+    for i in range(5):
+        await manager.broadcast_to_project("p1", {"n": i})
+        await drain()
+
+    assert [m["n"] for m in fast.sent] == [0, 1, 2, 3, 4]
+    assert slow.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert manager.get_connection_count("p1") == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_send_disconnects_the_socket(broker):
+    manager = ConnectionManager(broker)
+    broken, healthy = FakeWebSocket(broken=True), FakeWebSocket()
+    await manager.connect(broken, "p1")
+    await manager.connect(healthy, "p1")
+
+    await manager.broadcast_to_project("p1", {"n": 1})
+    await drain()
+
+    assert manager.get_connection_count("p1") == 1
+    assert broken not in manager._senders
+    assert healthy.sent == [{"n": 1}]
+
+
+@pytest.mark.asyncio
+async def test_last_disconnect_unsubscribes_project_channel(broker):
+    manager = ConnectionManager(broker)
+    ws = FakeWebSocket()
+    await manager.connect(ws, "p1")
+    assert CHANNEL_PREFIX + "p1" in broker._handlers
+
+    await manager.disconnect(ws, "p1")
+
+    assert CHANNEL_PREFIX + "p1" not in broker._handlers
+    assert manager.get_connection_count("p1") == 0
@@ -0,0 +1,134 @@
+import io
+import json
+import uuid
+
+import pytest
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.session import Base
+from app.models.batch_upload import BatchUpload
+from app.models.file import File
+from app.models.processing_task import ProcessingTask
+from app.services.pubsub_broker import get_broker
+from app.services.storage_service import LocalStorageBackend
+from app.services.websocket_manager import CHANNEL_PREFIX
+from app.worker.content_cache import ContentCache
+from app.worker.tasks import document_processing
+
+
+class CountingStorage(LocalStorageBackend):
+    def __init__(self, base_path: str):
+        super().__init__(base_path)
+        self.downloads: list[str] = []
+
+    async def get_file_content(self, storage_path: str) -> bytes:
+        self.downloads.append(storage_path)
+        return await super().get_file_content(storage_path)
+
+
+def png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+async def session_factory(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(document_processing, "AsyncSessionLocal", factory)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = CountingStorage(str(tmp_path / "storage"))
+    cache = ContentCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(document_processing, "_create_storage_backend", lambda settings: storage)
+    monkeypatch.setattr(document_processing, "get_content_cache", lambda: cache)
+    return storage
+
+
+@pytest.fixture
+async def events():
+    received: list[dict] = []
+    channels: list[str] = []
+
+    async def handler(channel: str, raw: str) -> None:
+        received.append(json.loads(raw)["data"])
+
+    yield received, channels, handler
+    for channel in channels:
+        await get_broker().unsubscribe(channel, handler)
+
+
+@pytest.fixture
+async def batch(session_factory, storage, events):
+    received, channels, handler = events
+    project_id = uuid.uuid4()
+    channels.append(CHANNEL_PREFIX + str(project_id))
+    await get_broker().subscribe(channels[0], handler)
+
+    async with session_factory() as db:
+        batch = BatchUpload(project_id=project_id, uploaded_by=uuid.uuid4(), total_files=2, status="completed")
+        db.add(batch)
+        await db.flush()
+        files = []
+        for name in ("a.png", "b.png"):
+            await storage.save_bytes(png_bytes(), f"files/{name}", "image/png")
+            files.append(File(
+                project_id=project_id, entity_type="project", entity_id=project_id, filename=name,
+                file_type="image/png", storage_path=f"files/{name}", batch_upload_id=batch.id,
+            ))
+        db.add_all(files)
+        await db.flush()
+        db.add_all([
+            ProcessingTask(batch_upload_id=batch.id, file_id=files[0].id, task_type="thumbnail"),
+            ProcessingTask(batch_upload_id=batch.id, file_id=files[0].id, task_type="pdf_split"),
+            ProcessingTask(batch_upload_id=batch.id, file_id=files[1].id, task_type="thumbnail"),
+            ProcessingTask(batch_upload_id=batch.id, file_id=files[1].id, task_type="unknown"),
+        ])
+        await db.commit()
+    return batch
+
+
+@pytest.mark.asyncio
+async def test_each_file_is_downloaded_once_and_counters_close_the_batch(session_factory, storage, events, batch):
+    received, _, _ = events
+
+    summary, file_tasks = await document_processing._start_batch_processing(str(batch.id))
+    assert summary["total_tasks"] == 4 and len(file_tasks) == 2
+
+    results = [
+        await document_processing._process_file_tasks_async(file_id, task_ids, "celery-id")
+        for file_id, task_ids in file_tasks.items()
+    ]
+
+    assert sorted(storage.downloads) == ["files/a.png", "files/b.png"]
+    assert await storage.get_file_content("files/a.png_thumb.png")
+    assert sorted(s for r in results for s in r["tasks"].values()) == ["completed", "completed", "completed", "failed"]
+    async with session_factory() as db:
+        refreshed = await db.get(BatchUpload, batch.id)
+    assert (refreshed.completed_tasks, refreshed.failed_tasks, refreshed.status) == (3, 1, "completed")
+
+    progress = [e for e in received if e["type"] == "batch_upload_progress"]
+    assert progress[0]["status"] == "processing"
+    assert [e["completed_tasks"] + e["failed_tasks"] for e in progress[1:]] == [1, 2, 3, 4]
+    assert progress[-1]["status"] == "completed"
+    assert progress[-1]["task"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_finish_fails_stranded_tasks(session_factory, storage, batch):
+    await document_processing._start_batch_processing(str(batch.id))
+
+    summary = await document_processing._finish_batch_processing_async(str(batch.id))
+
+    assert (summary["completed"], summary["failed"]) == (0, 4)
+    async with session_factory() as db:
+        assert (await db.get(BatchUpload, batch.id)).status == "completed"
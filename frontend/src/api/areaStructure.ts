@@ -42,6 +42,11 @@ export const areaStructureApi = {
     return response.data
   },
 
+  getAreaChecklistSummaries: async (projectId: string): Promise<Record<string, AreaChecklistSummary>> => {
+    const response = await apiClient.get(`/projects/${projectId}/area-checklist-summaries`)
+    return response.data
+  },
+
   getEntities: async (projectId: string, areaId: string): Promise<{
     equipment: Array<{ id: string; name: string; equipmentType?: string; status: string }>
     materials: Array<{ id: string; name: string; materialType?: string; status: string }>
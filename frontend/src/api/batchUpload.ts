@@ -6,7 +6,10 @@ export interface BatchUploadResponse {
   totalFiles: number
   processedFiles: number
   failedFiles: number
-  status: 'pending' | 'processing' | 'completed' | 'failed'
+  totalTasks: number
+  completedTasks: number
+  failedTasks: number
+  status: 'uploading' | 'pending' | 'processing' | 'completed' | 'failed'
   metadataJson: Record<string, string> | null
   createdAt: string
   completedAt: string | null
@@ -16,6 +19,18 @@ export interface BatchUploadResponse {
   } | null
 }
 
+export interface BatchUploadProgressEvent {
+  type: 'batch_upload_progress'
+  batch_id: string
+  status: BatchUploadResponse['status']
+  total_files: number
+  processed_files: number
+  failed_files: number
+  total_tasks: number
+  completed_tasks: number
+  failed_tasks: number
+}
+
 export interface BatchUploadFileResponse {
   id: string
   filename: string
@@ -37,25 +52,87 @@ export interface BatchUploadMetadata {
   floor?: string
 }
 
+export interface BatchUploadFileProgress {
+  id: string
+  filename: string
+  size: number
+  receivedBytes: number
+  status: 'pending' | 'uploading' | 'uploaded' | 'stored' | 'failed'
+  error: string | null
+}
+
+export interface BatchUploadSessionResponse extends BatchUploadResponse {
+  chunkSize: number
+  uploadFiles: BatchUploadFileProgress[]
+}
+
+const CHUNK_RETRIES = 3
+const PARALLEL_FILES = 3
+
+async function sha256Base64(data: ArrayBuffer): Promise<string> {
+  const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', data))
+  let binary = ''
+  digest.forEach((byte) => { binary += String.fromCharCode(byte) })
+  return btoa(binary)
+}
+
+async function getUploadOffset(url: string): Promise<number> {
+  const response = await apiClient.head(url)
+  return Number(response.headers['upload-offset'] ?? 0)
+}
+
+async function uploadFileChunks(
+  url: string,
+  file: File,
+  offset: number,
+  chunkSize: number,
+): Promise<void> {
+  let failures = 0
+  while (offset < file.size) {
+    const chunk = await file.slice(offset, offset + chunkSize).arrayBuffer()
+    try {
+      const response = await apiClient.patch(url, chunk, {
+        headers: {
+          'Content-Type': 'application/offset+octet-stream',
+          'Upload-Offset': String(offset),
+          'Upload-Checksum': `sha256 ${await sha256Base64(chunk)}`,
+        },
+      })
+      offset = Number(response.headers['upload-offset'] ?? offset + chunk.byteLength)
+      failures = 0
+    } catch (error) {
+      if (++failures > CHUNK_RETRIES) throw error
+      // Resume from whatever the server actually has
+      offset = await getUploadOffset(url)
+    }
+  }
+}
+
 export async function uploadBatch(
   projectId: string,
   files: File[],
   metadata?: BatchUploadMetadata,
 ): Promise<BatchUploadResponse> {
-  const formData = new FormData()
-  files.forEach((file) => formData.append('files', file))
+  const base = `/projects/${projectId}/batch-uploads`
+  const { data: session } = await apiClient.post<BatchUploadSessionResponse>(`${base}/sessions`, {
+    ...metadata,
+    files: files.map((file) => ({
+      filename: file.name,
+      contentType: file.type || 'application/octet-stream',
+      size: file.size,
+    })),
+  })
 
-  if (metadata?.entityType) formData.append('entity_type', metadata.entityType)
-  if (metadata?.entityId) formData.append('entity_id', metadata.entityId)
-  if (metadata?.category) formData.append('category', metadata.category)
-  if (metadata?.building) formData.append('building', metadata.building)
-  if (metadata?.floor) formData.append('floor', metadata.floor)
+  const queue = session.uploadFiles.map((upload, index) => ({ upload, file: files[index] }))
+  const worker = async () => {
+    for (let next = queue.shift(); next; next = queue.shift()) {
+      const url = `${base}/${session.id}/files/${next.upload.id}`
+      await uploadFileChunks(url, next.file, next.upload.receivedBytes, session.chunkSize)
+    }
+  }
+  await Promise.all(Array.from({ length: Math.min(PARALLEL_FILES, queue.length) }, worker))
 
-  const response = await apiClient.post<BatchUploadResponse>(
-    `/projects/${projectId}/batch-uploads`,
-    formData,
-    { headers: { 'Content-Type': 'multipart/form-data' } },
-  )
+  const response = await apiClient.post<BatchUploadResponse>(`${base}/${session.id}/complete`)
   return response.data
 }
 
@@ -25,6 +25,11 @@ export const exportsApi = {
     return response.data
   },
 
+  resume: async (projectId: string, exportId: string): Promise<ExportJob> => {
+    const response = await apiClient.post(`/projects/${projectId}/exports/${exportId}/resume`)
+    return response.data
+  },
+
   // Organization-level exports
   createOrganizationExport: async (organizationId: string, data: ExportRequest): Promise<ExportJob> => {
     const response = await apiClient.post(`/organizations/${organizationId}/exports`, data)
@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { InboxResponse } from '../types'
+import type { InboxCounts, InboxResponse } from '../types'
 
 export const inboxApi = {
   getMyInbox: async (projectId?: string): Promise<InboxResponse> => {
@@ -9,4 +9,9 @@ export const inboxApi = {
     const response = await apiClient.get(`/my-inbox${qs ? `?${qs}` : ''}`)
     return response.data
   },
+
+  getMyInboxCounts: async (): Promise<InboxCounts> => {
+    const response = await apiClient.get('/my-inbox/counts')
+    return response.data
+  },
 }
@@ -4,6 +4,8 @@ import type {
   WhatIfScenarioRequest,
   WhatIfScenarioResponse,
   CriticalPathResponse,
+  MonteCarloRequest,
+  MonteCarloResponse,
   ProjectRiskSummary,
 } from '../types/scheduleRisk'
 
@@ -30,4 +32,9 @@ export const scheduleRiskApi = {
     const response = await apiClient.post(`/projects/${projectId}/schedule-risk/what-if`, scenario)
     return response.data
   },
+
+  runMonteCarlo: async (projectId: string, request: MonteCarloRequest = {}): Promise<MonteCarloResponse> => {
+    const response = await apiClient.post(`/projects/${projectId}/schedule-risk/monte-carlo`, request)
+    return response.data
+  },
 }
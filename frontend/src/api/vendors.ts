@@ -49,6 +49,22 @@ export interface VendorSearchParams {
   insurance_expiring?: boolean
 }
 
+export interface VendorAnalyticsParams {
+  sort_by?:
+    | 'total_spending'
+    | 'materials_count'
+    | 'equipment_count'
+    | 'projects_count'
+    | 'avg_delivery_score'
+    | 'avg_quality_score'
+    | 'avg_price_score'
+    | 'overall_rating'
+    | 'company_name'
+  sort_order?: 'asc' | 'desc'
+  page?: number
+  page_size?: number
+}
+
 export const vendorsApi = {
   list: async (params?: VendorSearchParams): Promise<Vendor[]> => {
     const response = await apiClient.get('/vendors', { params })
@@ -110,8 +126,8 @@ export const vendorsApi = {
     return response.data
   },
 
-  getAllVendorsAnalytics: async () => {
-    const response = await apiClient.get('/vendors/analytics/all')
+  getAllVendorsAnalytics: async (params?: VendorAnalyticsParams) => {
+    const response = await apiClient.get('/vendors/analytics/all', { params })
     return response.data
   },
 }
@@ -12,6 +12,7 @@ import {
   ErrorIcon,
   HourglassBottomIcon,
   DownloadIcon,
+  RefreshIcon,
 } from '@/icons'
 import { Box, Typography, Button, Card, CardContent, Chip, LinearProgress, SxProps, Theme, Stack } from '@/mui'
 import { exportsApi } from '../api/exports'
@@ -140,6 +141,17 @@ export function DataExportPanel({ projectId, sx }: DataExportPanelProps) {
     }
   }
 
+  const handleResume = async (job: ExportJob) => {
+    try {
+      await exportsApi.resume(projectId, job.id)
+      showSuccess(t('projectSettings.exportPanel.resumeStarted'))
+      await fetchExportJobs()
+    } catch (error) {
+      console.error('Failed to resume export:', error)
+      showError(t('projectSettings.exportPanel.resumeFailed'))
+    }
+  }
+
   const formatFileSize = (bytes?: number): string => {
     if (!bytes) return '-'
     const mb = bytes / (1024 * 1024)
@@ -269,8 +281,20 @@ export function DataExportPanel({ projectId, sx }: DataExportPanelProps) {
                         <Typography variant="caption" color="text.secondary">
                           {t(`projectSettings.exportPanel.status.${job.status}`)}
                         </Typography>
+                        {job.filesTotal > 0 && (
+                          <Typography variant="caption" color="text.secondary">
+                            {t('projectSettings.exportPanel.filesProgress', {
+                              processed: job.filesProcessed,
+                              total: job.filesTotal,
+                            })}
+                          </Typography>
+                        )}
                       </Box>
-                      <LinearProgress />
+                      {job.filesTotal > 0 ? (
+                        <LinearProgress variant="determinate" value={(job.filesProcessed / job.filesTotal) * 100} />
+                      ) : (
+                        <LinearProgress />
+                      )}
                     </Box>
                   )}
 
@@ -302,6 +326,18 @@ export function DataExportPanel({ projectId, sx }: DataExportPanelProps) {
                       </Typography>
                     </Box>
                   )}
+
+                  {job.status === 'failed' && (
+                    <Button
+                      variant="outlined"
+                      size="small"
+                      startIcon={<RefreshIcon />}
+                      onClick={() => handleResume(job)}
+                      sx={{ mt: 1 }}
+                    >
+                      {t('projectSettings.exportPanel.resume')}
+                    </Button>
+                  )}
                 </CardContent>
               </Card>
             )
@@ -1,6 +1,6 @@
 import { useEffect, useState, useRef } from 'react'
 import { useTranslation } from 'react-i18next'
-import { getBatchStatus, BatchUploadStatusResponse } from '../../api/batchUpload'
+import { getBatchStatus, BatchUploadProgressEvent, BatchUploadStatusResponse } from '../../api/batchUpload'
 import { formatFileSize } from '../../utils/fileUtils'
 import { CheckCircleIcon, InsertDriveFileIcon } from '@/icons'
 import {
@@ -21,7 +21,12 @@ interface BatchUploadProgressProps {
   onComplete: () => void
 }
 
-const POLL_INTERVAL = 5000
+// Progress arrives over the project WebSocket; this only covers a dropped connection
+const FALLBACK_REFRESH_INTERVAL = 30000
+
+function isFinished(status: BatchUploadStatusResponse['status']) {
+  return status === 'completed' || status === 'failed'
+}
 
 export function BatchUploadProgress({ projectId, batchId, onComplete }: BatchUploadProgressProps) {
   const { t } = useTranslation()
@@ -32,36 +37,50 @@ export function BatchUploadProgress({ projectId, batchId, onComplete }: BatchUpl
   useEffect(() => {
     let active = true
 
-    const poll = async () => {
+    const stopRefresh = () => {
+      if (intervalRef.current) {
+        clearInterval(intervalRef.current)
+        intervalRef.current = null
+      }
+    }
+
+    const refresh = async () => {
       try {
         const status = await getBatchStatus(projectId, batchId)
         if (!active) return
         setBatch(status)
-
-        if (status.status === 'completed' || status.status === 'failed') {
-          if (intervalRef.current) {
-            clearInterval(intervalRef.current)
-            intervalRef.current = null
-          }
-        }
+        if (isFinished(status.status)) stopRefresh()
       } catch {
         if (!active) return
         setError(t('batchUpload.statusError'))
-        if (intervalRef.current) {
-          clearInterval(intervalRef.current)
-          intervalRef.current = null
-        }
+        stopRefresh()
       }
     }
 
-    poll()
-    intervalRef.current = setInterval(poll, POLL_INTERVAL)
+    const handleProgress = (event: Event) => {
+      const progress = (event as CustomEvent<BatchUploadProgressEvent>).detail
+      if (progress.batch_id !== batchId) return
+      setBatch((current) => current && {
+        ...current,
+        status: progress.status,
+        processedFiles: progress.processed_files,
+        failedFiles: progress.failed_files,
+        totalTasks: progress.total_tasks,
+        completedTasks: progress.completed_tasks,
+        failedTasks: progress.failed_tasks,
+      })
+      // The event only carries counters; fetch once more for the final file list
+      if (isFinished(progress.status)) refresh()
+    }
+
+    refresh()
+    window.addEventListener('ws:batch_upload_progress', handleProgress)
+    intervalRef.current = setInterval(refresh, FALLBACK_REFRESH_INTERVAL)
 
     return () => {
       active = false
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current)
-      }
+      window.removeEventListener('ws:batch_upload_progress', handleProgress)
+      stopRefresh()
     }
   }, [projectId, batchId, t])
 
@@ -91,7 +110,7 @@ export function BatchUploadProgress({ projectId, batchId, onComplete }: BatchUpl
     batch.totalFiles > 0
       ? Math.round(((batch.processedFiles + batch.failedFiles) / batch.totalFiles) * 100)
       : 0
-  const isFinished = batch.status === 'completed' || batch.status === 'failed'
+  const finished = isFinished(batch.status)
 
   return (
     <Box sx={{ py: 1 }}>
@@ -117,7 +136,7 @@ export function BatchUploadProgress({ projectId, batchId, onComplete }: BatchUpl
         </Alert>
       )}
 
-      {isFinished && batch.failedFiles === 0 && (
+      {finished && batch.failedFiles === 0 && (
         <Alert severity="success" sx={{ mb: 2 }}>
           {t('batchUpload.allCompleted')}
         </Alert>
@@ -141,7 +160,7 @@ export function BatchUploadProgress({ projectId, batchId, onComplete }: BatchUpl
         </List>
       )}
 
-      {isFinished && (
+      {finished && (
         <Box sx={{ mt: 2, textAlign: 'center' }}>
           <Button variant="contained" onClick={onComplete}>
             {t('common.close')}
@@ -10,7 +10,7 @@ import PageTransition from '../common/PageTransition'
 import { useAuth } from '../../contexts/AuthContext'
 import { useProject } from '../../contexts/ProjectContext'
 import { useRouteProgress } from '../../hooks/useRouteProgress'
-import { useWebSocket } from '../../hooks/useWebSocket'
+import { useWebSocket, WebSocketMessage } from '../../hooks/useWebSocket'
 import { LoadingPage } from '../common/LoadingPage'
 import OnboardingTour from '../onboarding/OnboardingTour'
 import { useOnboarding } from '../../hooks/useOnboarding'
@@ -42,11 +42,16 @@ export default function Layout() {
     window.dispatchEvent(new CustomEvent('ws:entity_update'))
   }, [])
 
+  const handleWsBatchUploadProgress = useCallback((data: WebSocketMessage) => {
+    window.dispatchEvent(new CustomEvent('ws:batch_upload_progress', { detail: data }))
+  }, [])
+
   useWebSocket({
     projectId,
     token: authToken,
     onNotification: handleWsNotification,
     onEntityUpdate: handleWsEntityUpdate,
+    onBatchUploadProgress: handleWsBatchUploadProgress,
   })
 
   useEffect(() => {
@@ -6,8 +6,8 @@ export function useInboxCount() {
 
   const fetch = useCallback(async () => {
     try {
-      const data = await inboxApi.getMyInbox()
-      setCount(data.counts.total)
+      const counts = await inboxApi.getMyInboxCounts()
+      setCount(counts.total)
     } catch {
       // silently ignore — badge just stays at last known value
     }
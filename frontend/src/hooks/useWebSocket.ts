@@ -10,6 +10,7 @@ interface UseWebSocketParams {
   token?: string | null
   onNotification?: (data: WebSocketMessage) => void
   onEntityUpdate?: (data: WebSocketMessage) => void
+  onBatchUploadProgress?: (data: WebSocketMessage) => void
 }
 
 function buildWebSocketUrl(projectId: string, token: string): string {
@@ -27,16 +28,24 @@ function buildWebSocketUrl(projectId: string, token: string): string {
   return `${wsBase}/ws/${projectId}?token=${encodeURIComponent(token)}`
 }
 
-export function useWebSocket({ projectId, token, onNotification, onEntityUpdate }: UseWebSocketParams) {
+export function useWebSocket({
+  projectId,
+  token,
+  onNotification,
+  onEntityUpdate,
+  onBatchUploadProgress,
+}: UseWebSocketParams) {
   const wsRef = useRef<WebSocket | null>(null)
   const reconnectTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null)
   const backoffRef = useRef(1000)
   const mountedRef = useRef(true)
   const onNotificationRef = useRef(onNotification)
   const onEntityUpdateRef = useRef(onEntityUpdate)
+  const onBatchUploadProgressRef = useRef(onBatchUploadProgress)
 
   onNotificationRef.current = onNotification
   onEntityUpdateRef.current = onEntityUpdate
+  onBatchUploadProgressRef.current = onBatchUploadProgress
 
   const cleanup = useCallback(() => {
     if (reconnectTimeoutRef.current) {
@@ -78,6 +87,8 @@ export function useWebSocket({ projectId, token, onNotification, onEntityUpdate
           onNotificationRef.current(data)
         } else if (data.type === 'entity_update' && onEntityUpdateRef.current) {
           onEntityUpdateRef.current(data)
+        } else if (data.type === 'batch_upload_progress' && onBatchUploadProgressRef.current) {
+          onBatchUploadProgressRef.current(data)
         }
       } catch {
         // Ignore malformed messages
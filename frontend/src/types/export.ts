@@ -22,6 +22,9 @@ export interface ExportJob {
   filePath?: string
   fileSize?: number
   errorMessage?: string
+  filesTotal: number
+  filesProcessed: number
+  bytesWritten: number
   requestedBy?: {
     id: string
     email: string
@@ -1078,7 +1078,7 @@ export interface InboxRFIItem {
   projectId: string
   projectName: string
   subject: string
-  rfiNumber: number
+  rfiNumber: string
   priority: string
   status: string
   dueDate?: string
@@ -1120,4 +1120,5 @@ export interface InboxCounts {
 export interface InboxResponse {
   counts: InboxCounts
   items: InboxItem[]
+  nextCursor?: string
 }
@@ -44,6 +44,33 @@ export interface WhatIfScenarioResponse {
   totalProjectDelayDays: number
 }
 
+export interface MonteCarloRequest {
+  iterations?: number
+  seed?: number
+}
+
+export interface TaskCriticality {
+  taskId: string
+  taskTitle: string
+  criticalityIndex: number
+}
+
+export interface MonteCarloResponse {
+  projectId: string
+  iterations: number
+  deterministicDurationDays: number
+  meanDurationDays: number
+  p50DurationDays: number
+  p80DurationDays: number
+  p95DurationDays: number
+  projectStartDate: string
+  p50CompletionDate: string
+  p80CompletionDate: string
+  p95CompletionDate: string
+  taskCriticality: TaskCriticality[]
+  processingTimeMs: number
+}
+
 export interface CriticalPathTask {
   taskId: string
   taskTitle: string